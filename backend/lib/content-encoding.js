@@ -0,0 +1,117 @@
+/**
+ * Request-body Content-Encoding negotiation for the ingest path.
+ *
+ * The SDK can compress `/events` batches (large prompt payloads make
+ * egress the dominant cost of shipping traces). `express.json()` already
+ * inflates `gzip` / `deflate` bodies transparently, so this middleware
+ * only has to:
+ *
+ *   1. Decode encodings body-parser does not know about — currently
+ *      `zstd`, when the running Node.js build ships `zlib.zstdDecompressSync`.
+ *   2. Reject anything else with `415 Unsupported Media Type` and an
+ *      `Accept-Encoding` header listing what we do accept (RFC 7694), so
+ *      the SDK can downgrade to a supported codec instead of retrying a
+ *      request that can never succeed.
+ *
+ * Mount it before `express.json()` on the ingest routes.
+ */
+
+const zlib = require("zlib");
+
+const DEFAULT_LIMIT_BYTES = 10 * 1024 * 1024; // matches express.json limit
+
+// Encodings inflated natively by body-parser.
+const NATIVE_ENCODINGS = ["gzip", "deflate", "identity"];
+
+const HAS_ZSTD = typeof zlib.zstdDecompressSync === "function";
+
+/** Every request Content-Encoding the ingest path accepts. */
+const SUPPORTED_ENCODINGS = HAS_ZSTD
+  ? [...NATIVE_ENCODINGS, "zstd"]
+  : [...NATIVE_ENCODINGS];
+
+/**
+ * Read the full request body into a single Buffer, aborting past `limit`.
+ *
+ * @param {import("http").IncomingMessage} req
+ * @param {number} limit – maximum compressed bytes to buffer
+ * @returns {Promise<Buffer>}
+ */
+function readBody(req, limit) {
+  return new Promise((resolve, reject) => {
+    const chunks = [];
+    let received = 0;
+    req.on("data", (chunk) => {
+      received += chunk.length;
+      if (received > limit) {
+        reject(Object.assign(new Error("request entity too large"), { status: 413 }));
+        req.destroy();
+        return;
+      }
+      chunks.push(chunk);
+    });
+    req.on("end", () => resolve(Buffer.concat(chunks)));
+    req.on("error", reject);
+  });
+}
+
+/**
+ * Create the Content-Encoding negotiation middleware.
+ *
+ * @param {object} [options]
+ * @param {number} [options.limitBytes] – max *decompressed* body size
+ * @returns {import("express").RequestHandler}
+ */
+function createContentEncodingMiddleware(options) {
+  const limitBytes = (options && options.limitBytes) || DEFAULT_LIMIT_BYTES;
+  const accepted = SUPPORTED_ENCODINGS.join(", ");
+
+  return function contentEncoding(req, res, next) {
+    const encoding = String(req.headers["content-encoding"] || "identity")
+      .trim()
+      .toLowerCase();
+
+    if (NATIVE_ENCODINGS.includes(encoding)) return next();
+
+    if (encoding !== "zstd" || !HAS_ZSTD) {
+      res.set("Accept-Encoding", accepted);
+      return res.status(415).json({
+        error: `Unsupported Content-Encoding '${encoding}'`,
+        accepted: SUPPORTED_ENCODINGS,
+      });
+    }
+
+    readBody(req, limitBytes)
+      .then((compressed) => {
+        let text;
+        try {
+          text = zlib
+            .zstdDecompressSync(compressed, { maxOutputLength: limitBytes })
+            .toString("utf8");
+        } catch (err) {
+          return res.status(400).json({ error: "Malformed zstd request body" });
+        }
+        try {
+          req.body = text.length ? JSON.parse(text) : {};
+        } catch (err) {
+          return res.status(400).json({ error: "Malformed JSON request body" });
+        }
+        // Tell body-parser the body has already been consumed.
+        req._body = true;
+        delete req.headers["content-encoding"];
+        next();
+      })
+      .catch((err) => {
+        if (err.status === 413) {
+          return res.status(413).json({ error: "Request body too large" });
+        }
+        next(err);
+      });
+  };
+}
+
+module.exports = {
+  SUPPORTED_ENCODINGS,
+  createContentEncodingMiddleware,
+  readBody,
+};
@@ -0,0 +1,256 @@
+/**
+ * Binary (MessagePack) ingest batches.
+ *
+ * JSON is the default wire format. The SDK can also send `/events`
+ * batches as MessagePack (`Transport(wire_format="msgpack")`, see
+ * `sdk/agentlens/transport_wire.py`) with `Content-Type:
+ * application/vnd.agentlens.v1+msgpack`. The body is an array of events
+ * using two extension types:
+ *
+ *   - ext 1 (1 byte): index into INTERNED_STRINGS — field names, event
+ *     types and statuses sent as three-byte references.
+ *   - ext 2 (8 bytes): signed big-endian microseconds since the epoch,
+ *     rendered back to the ISO-8601 text the SDK would have sent in JSON.
+ *
+ * The middleware decodes such bodies (inflating gzip/deflate/zstd first)
+ * into `req.body = { events: [...] }`, so the ingest route is the same for
+ * both formats. Anything else is passed through untouched.
+ *
+ * Mount it before the Content-Encoding middleware and `express.json()`.
+ */
+
+const zlib = require("zlib");
+const { readBody } = require("./content-encoding");
+
+const DEFAULT_LIMIT_BYTES = 10 * 1024 * 1024; // matches express.json limit
+
+const MSGPACK_CONTENT_TYPE = "application/vnd.agentlens.v1+msgpack";
+
+// Append-only; must match INTERNED_STRINGS in sdk/agentlens/transport_wire.py.
+const INTERNED_STRINGS = [
+  // Event fields
+  "event_id", "session_id", "event_type", "timestamp", "input_data",
+  "output_data", "model", "tokens_in", "tokens_out", "tool_call",
+  "decision_trace", "duration_ms",
+  // Session lifecycle fields
+  "agent_name", "metadata", "started_at", "ended_at", "total_tokens_in",
+  "total_tokens_out", "status",
+  // Tool call and decision trace fields
+  "tool_call_id", "tool_name", "tool_input", "tool_output", "trace_id",
+  "step", "reasoning", "alternatives_considered", "confidence",
+  // Event types ("tool_call" is listed above)
+  "session_start", "session_end", "llm_call", "tool_error", "agent_call",
+  "agent_error", "error", "generic", "decision",
+  // Session statuses ("error" is listed above)
+  "active", "completed", "timeout",
+];
+
+const EXT_INTERNED = 1;
+const EXT_TIMESTAMP = 2;
+// Same, for timestamps written with "Z" instead of "+00:00".
+const EXT_TIMESTAMP_Z = 3;
+
+// Nesting deeper than this is rejected instead of exhausting the stack.
+const MAX_DEPTH = 64;
+
+const INFLATERS = {
+  identity: null,
+  gzip: zlib.gunzipSync,
+  deflate: zlib.inflateSync,
+};
+if (typeof zlib.zstdDecompressSync === "function") {
+  INFLATERS.zstd = zlib.zstdDecompressSync;
+}
+
+/**
+ * Render epoch microseconds the way Python's `datetime.isoformat()` does
+ * for a UTC datetime, e.g. `2026-01-02T03:04:05.123456+00:00`, or with
+ * `suffix` `"Z"` as Pydantic serializes it.
+ *
+ * @param {number} micros
+ * @param {string} [suffix]
+ * @returns {string}
+ */
+function formatTimestamp(micros, suffix = "+00:00") {
+  const seconds = Math.floor(micros / 1e6);
+  const fraction = micros - seconds * 1e6;
+  const base = new Date(seconds * 1000).toISOString().slice(0, 19);
+  return base + (fraction ? "." + String(fraction).padStart(6, "0") : "") + suffix;
+}
+
+/**
+ * Decode one MessagePack value using the AgentLens extension types.
+ *
+ * @param {Buffer} buf
+ * @returns {*}
+ * @throws {Error} on malformed, truncated or unsupported input
+ */
+function decodeMsgpack(buf) {
+  let pos = 0;
+
+  function need(n) {
+    if (pos + n > buf.length) throw new Error("truncated MessagePack data");
+  }
+
+  function str(n) {
+    need(n);
+    const s = buf.toString("utf8", pos, pos + n);
+    pos += n;
+    return s;
+  }
+
+  function array(n, depth) {
+    // Every element takes at least one byte: reject absurd counts early.
+    need(n);
+    const out = new Array(n);
+    for (let i = 0; i < n; i++) out[i] = value(depth);
+    return out;
+  }
+
+  function map(n, depth) {
+    need(n * 2);
+    const out = {};
+    for (let i = 0; i < n; i++) {
+      const key = String(value(depth));
+      const val = value(depth);
+      if (key === "__proto__") {
+        // Same result as JSON.parse: an own property, not a prototype swap.
+        Object.defineProperty(out, key, {
+          value: val, enumerable: true, writable: true, configurable: true,
+        });
+      } else {
+        out[key] = val;
+      }
+    }
+    return out;
+  }
+
+  function uint(n) {
+    need(n);
+    const v = n === 8 ? Number(buf.readBigUInt64BE(pos)) : buf.readUIntBE(pos, n);
+    pos += n;
+    return v;
+  }
+
+  function int(n) {
+    need(n);
+    const v = n === 8 ? Number(buf.readBigInt64BE(pos)) : buf.readIntBE(pos, n);
+    pos += n;
+    return v;
+  }
+
+  function value(depth) {
+    if (depth > MAX_DEPTH) throw new Error("MessagePack data nested too deeply");
+    need(1);
+    const code = buf[pos++];
+    if (code < 0x80) return code;
+    if (code >= 0xe0) return code - 0x100;
+    if (code >= 0xa0 && code <= 0xbf) return str(code & 0x1f);
+    if (code >= 0x90 && code <= 0x9f) return array(code & 0x0f, depth + 1);
+    if (code >= 0x80 && code <= 0x8f) return map(code & 0x0f, depth + 1);
+    switch (code) {
+      case 0xc0: return null;
+      case 0xc2: return false;
+      case 0xc3: return true;
+      case 0xca: { need(4); const v = buf.readFloatBE(pos); pos += 4; return v; }
+      case 0xcb: { need(8); const v = buf.readDoubleBE(pos); pos += 8; return v; }
+      case 0xcc: return uint(1);
+      case 0xcd: return uint(2);
+      case 0xce: return uint(4);
+      case 0xcf: return uint(8);
+      case 0xd0: return int(1);
+      case 0xd1: return int(2);
+      case 0xd2: return int(4);
+      case 0xd3: return int(8);
+      case 0xd9: return str(uint(1));
+      case 0xda: return str(uint(2));
+      case 0xdb: return str(uint(4));
+      case 0xdc: return array(uint(2), depth + 1);
+      case 0xdd: return array(uint(4), depth + 1);
+      case 0xde: return map(uint(2), depth + 1);
+      case 0xdf: return map(uint(4), depth + 1);
+      case 0xd4: {
+        need(2);
+        const type = buf.readInt8(pos);
+        const index = buf[pos + 1];
+        pos += 2;
+        if (type !== EXT_INTERNED) break;
+        if (index >= INTERNED_STRINGS.length) {
+          throw new Error(`Unknown interned string ${index}`);
+        }
+        return INTERNED_STRINGS[index];
+      }
+      case 0xd7: {
+        need(9);
+        const type = buf.readInt8(pos);
+        const micros = Number(buf.readBigInt64BE(pos + 1));
+        pos += 9;
+        if (type === EXT_TIMESTAMP) return formatTimestamp(micros);
+        if (type === EXT_TIMESTAMP_Z) return formatTimestamp(micros, "Z");
+        break;
+      }
+      default:
+        break;
+    }
+    throw new Error(`Unsupported MessagePack type 0x${code.toString(16)}`);
+  }
+
+  const result = value(0);
+  if (pos !== buf.length) {
+    throw new Error(`${buf.length - pos} trailing bytes after MessagePack value`);
+  }
+  return result;
+}
+
+/**
+ * Create the middleware that decodes MessagePack ingest batches.
+ *
+ * @param {object} [options]
+ * @param {number} [options.limitBytes] – max body size, before and after inflating
+ * @returns {import("express").RequestHandler}
+ */
+function createWireFormatMiddleware(options) {
+  const limitBytes = (options && options.limitBytes) || DEFAULT_LIMIT_BYTES;
+
+  return function wireFormat(req, res, next) {
+    if (!req.is(MSGPACK_CONTENT_TYPE)) return next();
+
+    const encoding = String(req.headers["content-encoding"] || "identity")
+      .trim()
+      .toLowerCase();
+    // Unknown encodings fall through to the Content-Encoding middleware,
+    // which answers 415 with the list of accepted ones.
+    if (!Object.prototype.hasOwnProperty.call(INFLATERS, encoding)) return next();
+    const inflate = INFLATERS[encoding];
+
+    readBody(req, limitBytes)
+      .then((raw) => {
+        let decoded;
+        try {
+          const body = inflate ? inflate(raw, { maxOutputLength: limitBytes }) : raw;
+          decoded = decodeMsgpack(body);
+        } catch (err) {
+          return res.status(400).json({ error: "Malformed MessagePack request body" });
+        }
+        req.body = Array.isArray(decoded) ? { events: decoded } : decoded;
+        // Tell the later body parsers the body has already been consumed.
+        req._body = true;
+        delete req.headers["content-encoding"];
+        next();
+      })
+      .catch((err) => {
+        if (err.status === 413) {
+          return res.status(413).json({ error: "Request body too large" });
+        }
+        next(err);
+      });
+  };
+}
+
+module.exports = {
+  INTERNED_STRINGS,
+  MSGPACK_CONTENT_TYPE,
+  createWireFormatMiddleware,
+  decodeMsgpack,
+  formatTimestamp,
+};
@@ -8,6 +8,8 @@ const {
   createIngestLimiter,
   createApiKeyAuth,
 } = require("./middleware");
+const { createContentEncodingMiddleware } = require("./lib/content-encoding");
+const { createWireFormatMiddleware } = require("./lib/wire-format");
 
 const PORT = process.env.PORT || 3000;
 
@@ -118,6 +120,14 @@ function createApp() {
     next();
   });
 
+  // Compressed ingest batches: express.json() inflates gzip/deflate itself;
+  // this decodes the rest (zstd) and answers 415 + Accept-Encoding for
+  // anything unsupported so the SDK can fall back to a supported codec.
+  // MessagePack batches (Content-Type application/vnd.agentlens.v1+msgpack)
+  // are inflated and decoded here into the same { events } body as JSON.
+  app.use("/events", createWireFormatMiddleware({ limitBytes: 10 * 1024 * 1024 }));
+  app.use("/events", createContentEncodingMiddleware({ limitBytes: 10 * 1024 * 1024 }));
+
   // Body parser with size limit (after rate-limit/auth, before route handlers)
   app.use(express.json({ limit: "10mb" }));
 
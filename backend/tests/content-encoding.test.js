@@ -0,0 +1,78 @@
+/* ── Content-Encoding negotiation tests ── */
+
+const zlib = require("zlib");
+const express = require("express");
+const request = require("supertest");
+
+const {
+  SUPPORTED_ENCODINGS,
+  createContentEncodingMiddleware,
+} = require("../lib/content-encoding");
+
+function buildApp() {
+  const app = express();
+  app.use("/events", createContentEncodingMiddleware({ limitBytes: 1024 * 1024 }));
+  app.use(express.json({ limit: "1mb" }));
+  app.post("/events", (req, res) => res.json({ received: req.body }));
+  return app;
+}
+
+const BATCH = { events: [{ session_id: "s1", event_type: "llm_call" }] };
+
+describe("createContentEncodingMiddleware", () => {
+  test("advertises gzip, deflate and identity", () => {
+    expect(SUPPORTED_ENCODINGS).toEqual(
+      expect.arrayContaining(["gzip", "deflate", "identity"])
+    );
+  });
+
+  test("passes uncompressed JSON through", async () => {
+    const res = await request(buildApp()).post("/events").send(BATCH);
+    expect(res.status).toBe(200);
+    expect(res.body.received).toEqual(BATCH);
+  });
+
+  test("inflates gzip bodies transparently", async () => {
+    const body = zlib.gzipSync(Buffer.from(JSON.stringify(BATCH)));
+    const res = await request(buildApp())
+      .post("/events")
+      .set("Content-Type", "application/json")
+      .set("Content-Encoding", "gzip")
+      .send(body);
+    expect(res.status).toBe(200);
+    expect(res.body.received).toEqual(BATCH);
+  });
+
+  test("rejects unknown encodings with 415 and Accept-Encoding", async () => {
+    const res = await request(buildApp())
+      .post("/events")
+      .set("Content-Type", "application/json")
+      .set("Content-Encoding", "snappy")
+      .send(Buffer.from("xx"));
+    expect(res.status).toBe(415);
+    expect(res.headers["accept-encoding"]).toBe(SUPPORTED_ENCODINGS.join(", "));
+    expect(res.body.accepted).toEqual(SUPPORTED_ENCODINGS);
+  });
+
+  const zstdTest = typeof zlib.zstdCompressSync === "function" ? test : test.skip;
+
+  zstdTest("decodes zstd bodies when the runtime supports it", async () => {
+    const body = zlib.zstdCompressSync(Buffer.from(JSON.stringify(BATCH)));
+    const res = await request(buildApp())
+      .post("/events")
+      .set("Content-Type", "application/json")
+      .set("Content-Encoding", "zstd")
+      .send(body);
+    expect(res.status).toBe(200);
+    expect(res.body.received).toEqual(BATCH);
+  });
+
+  zstdTest("rejects malformed zstd bodies with 400", async () => {
+    const res = await request(buildApp())
+      .post("/events")
+      .set("Content-Type", "application/json")
+      .set("Content-Encoding", "zstd")
+      .send(Buffer.from("definitely not zstd"));
+    expect(res.status).toBe(400);
+  });
+});
@@ -0,0 +1,125 @@
+/* ── MessagePack wire format tests ── */
+
+const zlib = require("zlib");
+const express = require("express");
+const request = require("supertest");
+
+const {
+  INTERNED_STRINGS,
+  MSGPACK_CONTENT_TYPE,
+  createWireFormatMiddleware,
+  decodeMsgpack,
+  formatTimestamp,
+} = require("../lib/wire-format");
+const { createContentEncodingMiddleware } = require("../lib/content-encoding");
+
+function buildApp() {
+  const app = express();
+  app.use("/events", createWireFormatMiddleware({ limitBytes: 1024 * 1024 }));
+  app.use("/events", createContentEncodingMiddleware({ limitBytes: 1024 * 1024 }));
+  app.use(express.json({ limit: "1mb" }));
+  app.post("/events", (req, res) => res.json({ received: req.body }));
+  return app;
+}
+
+// One-event batch produced by the Python SDK:
+//   encode_batch([encode_event_msgpack(EVENT)])
+const BATCH_HEX =
+  "9186d40101a27331d40102d4011ed40103d7020006475ef64cf3bbd40106a667" +
+  "70742d346fd40107cd012cd4010481a670726f6d7074a26869";
+
+const EVENT = {
+  session_id: "s1",
+  event_type: "llm_call",
+  timestamp: "2026-01-02T03:04:05.000123+00:00",
+  model: "gpt-4o",
+  tokens_in: 300,
+  input_data: { prompt: "hi" },
+};
+
+function post(body, encoding) {
+  const req = request(buildApp())
+    .post("/events")
+    .set("Content-Type", MSGPACK_CONTENT_TYPE);
+  if (encoding) req.set("Content-Encoding", encoding);
+  return req.send(body);
+}
+
+describe("decodeMsgpack", () => {
+  test("decodes an SDK batch with interned strings and timestamps", () => {
+    expect(decodeMsgpack(Buffer.from(BATCH_HEX, "hex"))).toEqual([EVENT]);
+  });
+
+  test("keeps the interned table in sync with the SDK", () => {
+    expect(INTERNED_STRINGS[1]).toBe("session_id");
+    expect(INTERNED_STRINGS[30]).toBe("llm_call");
+    expect(new Set(INTERNED_STRINGS).size).toBe(INTERNED_STRINGS.length);
+  });
+
+  test("formats timestamps like Python isoformat()", () => {
+    expect(formatTimestamp(0)).toBe("1970-01-01T00:00:00+00:00");
+    expect(formatTimestamp(-500000)).toBe("1969-12-31T23:59:59.500000+00:00");
+    expect(formatTimestamp(123, "Z")).toBe("1970-01-01T00:00:00.000123Z");
+  });
+
+  test("decodes both timestamp extensions", () => {
+    // {"timestamp": <ext 2: 1767323045000123>, "ended_at": <ext 3: same>}
+    const buf = Buffer.from("82d40103d7020006475ef64cf3bbd4010fd7030006475ef64cf3bb", "hex");
+    expect(decodeMsgpack(buf)).toEqual({
+      timestamp: "2026-01-02T03:04:05.000123+00:00",
+      ended_at: "2026-01-02T03:04:05.000123Z",
+    });
+  });
+
+  test("decodes scalars", () => {
+    // [-1, 200, -200, 1.5, null, true, "é"]
+    const buf = Buffer.from("97ffccc8d1ff38cb3ff8000000000000c0c3a2c3a9", "hex");
+    expect(decodeMsgpack(buf)).toEqual([-1, 200, -200, 1.5, null, true, "é"]);
+  });
+
+  test("keeps __proto__ as an own property", () => {
+    // {"__proto__": {"x": 1}}
+    const buf = Buffer.from("81a95f5f70726f746f5f5f81a17801", "hex");
+    const decoded = decodeMsgpack(buf);
+    expect(Object.getPrototypeOf(decoded)).toBe(Object.prototype);
+    expect(decoded.__proto__).toEqual({ x: 1 });
+  });
+
+  test("rejects truncated, oversized and trailing input", () => {
+    expect(() => decodeMsgpack(Buffer.from(BATCH_HEX.slice(0, -4), "hex"))).toThrow(/truncated/);
+    expect(() => decodeMsgpack(Buffer.from("ddffffffff", "hex"))).toThrow(/truncated/);
+    expect(() => decodeMsgpack(Buffer.from("9000", "hex"))).toThrow(/trailing/);
+    expect(() => decodeMsgpack(Buffer.from("d401ff", "hex"))).toThrow(/interned/);
+    expect(() => decodeMsgpack(Buffer.alloc(100, 0x91))).toThrow(/nested/);
+  });
+});
+
+describe("createWireFormatMiddleware", () => {
+  test("turns a MessagePack body into { events }", async () => {
+    const res = await post(Buffer.from(BATCH_HEX, "hex"));
+    expect(res.status).toBe(200);
+    expect(res.body.received).toEqual({ events: [EVENT] });
+  });
+
+  test("inflates gzip before decoding", async () => {
+    const res = await post(zlib.gzipSync(Buffer.from(BATCH_HEX, "hex")), "gzip");
+    expect(res.status).toBe(200);
+    expect(res.body.received).toEqual({ events: [EVENT] });
+  });
+
+  test("rejects malformed bodies with 400", async () => {
+    const res = await post(Buffer.from("c1", "hex"));
+    expect(res.status).toBe(400);
+  });
+
+  test("leaves unknown encodings to the Content-Encoding middleware", async () => {
+    const res = await post(Buffer.from(BATCH_HEX, "hex"), "snappy");
+    expect(res.status).toBe(415);
+  });
+
+  test("passes JSON through", async () => {
+    const res = await request(buildApp()).post("/events").send({ events: [EVENT] });
+    expect(res.status).toBe(200);
+    expect(res.body.received).toEqual({ events: [EVENT] });
+  });
+});
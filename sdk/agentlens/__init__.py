@@ -5,10 +5,21 @@
 # Python 3.9, where ``type | None`` raises ``TypeError`` at runtime.
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import httpx
+
 from agentlens.models import AgentEvent, ToolCall, DecisionTrace, Session
 from agentlens.tracker import AgentTracker
 from agentlens.decorators import track_agent, track_tool_call
 from agentlens.transport import Transport
+from agentlens.transport_async import AsyncTransport, create_transport
+from agentlens.transport_http import HTTPConfig
+from agentlens.transport_limits import EventLimits, RateLimit
+from agentlens.sampling import Sampler, TailSampling
+from agentlens.session_store import MemorySessionStore, SessionStore
+from agentlens.session_summary import SessionSummary
 from agentlens.health import HealthScorer, HealthReport, HealthGrade, HealthThresholds, MetricScore
 from agentlens.timeline import TimelineRenderer
 from agentlens.span import Span
@@ -24,6 +35,8 @@ __all__ = [
     "start_session",
     "end_session",
     "track",
+    "capture",
+    "track_many",
     "explain",
     "export_session",
     "export_transcript",
@@ -42,6 +55,15 @@ __all__ = [
     "Session",
     "AgentTracker",
     "Transport",
+    "AsyncTransport",
+    "HTTPConfig",
+    "EventLimits",
+    "RateLimit",
+    "Sampler",
+    "TailSampling",
+    "SessionStore",
+    "MemorySessionStore",
+    "SessionSummary",
     "HealthScorer",
     "HealthReport",
     "HealthGrade",
@@ -83,7 +105,24 @@ def _get_tracker(operation: str = "this operation") -> AgentTracker:
     return _tracker
 
 
-def init(api_key: str = "default", endpoint: str = "http://localhost:3000") -> AgentTracker:
+def init(
+    api_key: str = "default",
+    endpoint: str | list[str] = "http://localhost:3000",
+    *,
+    async_mode: bool | None = None,
+    spool_dir: str | None = None,
+    batch_size: int = 10,
+    flush_interval: float = 5.0,
+    max_latency: float | None = None,
+    aggregator: str | None = None,
+    wire_format: str = "json",
+    http: HTTPConfig | None = None,
+    http_client: httpx.Client | httpx.AsyncClient | None = None,
+    sample_rate: float = 1.0,
+    tail_sampling: TailSampling | None = None,
+    limits: EventLimits | None = None,
+    session_store: SessionStore | None = None,
+) -> AgentTracker:
     """Initialize the AgentLens SDK.
 
     If the SDK was already initialized, the previous transport is closed
@@ -91,9 +130,55 @@ def init(api_key: str = "default", endpoint: str = "http://localhost:3000") -> A
     before creating the new one.  This prevents resource leaks when
     ``init()`` is called multiple times (e.g. in tests or notebooks).
 
+    When called from inside a running asyncio event loop the SDK uses an
+    :class:`AsyncTransport`, so tracking never blocks the loop on network
+    I/O.
+
     Args:
         api_key: Your AgentLens API key.
-        endpoint: The AgentLens backend URL.
+        endpoint: The AgentLens backend URL, or a list of collector
+            replicas; batches are round-robined across them and fail over
+            on connection errors.  ``uds:///path/to.sock`` sends events to
+            a local ``agentlens-collector`` process instead, and
+            ``file:///path/to/dir`` writes them to NDJSON files there for
+            a later ``agentlens import``.
+        async_mode: Force (``True``) or disable (``False``) the asyncio
+            transport.  ``None`` (default) auto-detects a running loop.
+        spool_dir: Directory for a durable on-disk spool.  Events that
+            cannot be delivered are written there instead of dropped, and
+            anything left over from a previous run is replayed.
+        batch_size: Events per upload (the minimum when *max_latency* is
+            set).
+        flush_interval: Seconds between background flushes (the maximum
+            when *max_latency* is set).
+        max_latency: Enable adaptive batching: batches grow with the event
+            rate and buffered events are flushed within roughly this many
+            seconds.
+        aggregator: Path of a Unix socket shared by every process on the
+            host.  The first process to claim it uploads events for all of
+            them; the others (including forked workers) send their events
+            over the socket.  Implies the threaded transport.
+        wire_format: ``"json"`` (default) or ``"msgpack"``, a compact
+            binary encoding of event batches (see
+            :mod:`agentlens.transport_wire`).
+        http: HTTP client settings — HTTP/2, connection pool limits and
+            connect/read/write timeouts (see
+            :class:`~agentlens.transport_http.HTTPConfig`).
+        http_client: An ``httpx.Client`` (or ``httpx.AsyncClient``) to
+            upload with, shared with other trackers.  It is not closed when
+            the SDK is re-initialized.
+        sample_rate: Fraction of sessions to ship, decided when each
+            session starts (see :mod:`agentlens.sampling`).
+        tail_sampling: Buffer the sessions *sample_rate* leaves out and
+            ship them anyway if they end with an error or exceed the
+            duration or token thresholds of this policy.
+        limits: Rate limits per event type and per session, and a size
+            budget for event payloads, applied before events are buffered
+            (see :mod:`agentlens.transport_limits`).
+        session_store: Where the tracker keeps sessions and their events
+            locally.  Defaults to a
+            :class:`~agentlens.session_store.MemorySessionStore` that
+            evicts ended sessions after an hour or beyond 10,000.
 
     Returns:
         The global AgentTracker instance.
@@ -106,8 +191,42 @@ def init(api_key: str = "default", endpoint: str = "http://localhost:3000") -> A
             _tracker.transport.close()
         except Exception:
             pass
-    transport = Transport(endpoint=endpoint, api_key=api_key)
-    _tracker = AgentTracker(transport=transport)
+    sampler = None
+    if sample_rate < 1.0 or tail_sampling is not None:
+        sampler = Sampler(sample_rate, tail_sampling)
+    if aggregator is not None:
+        from agentlens.transport_uds import connect_aggregator
+
+        transport = connect_aggregator(
+            aggregator,
+            endpoint=endpoint,
+            api_key=api_key,
+            spool=spool_dir,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            max_latency=max_latency,
+            wire_format=wire_format,
+            http=http,
+            http_client=http_client,
+            limits=limits,
+        )
+    else:
+        transport = create_transport(
+            endpoint=endpoint,
+            api_key=api_key,
+            async_mode=async_mode,
+            spool=spool_dir,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            max_latency=max_latency,
+            wire_format=wire_format,
+            http=http,
+            http_client=http_client,
+            limits=limits,
+        )
+    _tracker = AgentTracker(
+        transport=transport, sampler=sampler, session_store=session_store,
+    )
     return _tracker
 
 
@@ -162,6 +281,57 @@ def track(
     )
 
 
+def capture(
+    event_type: str = "generic",
+    input_data: dict | None = None,
+    output_data: dict | None = None,
+    model: str | None = None,
+    tokens_in: int = 0,
+    tokens_out: int = 0,
+    reasoning: str | None = None,
+    tool_name: str | None = None,
+    tool_input: dict | None = None,
+    tool_output: dict | None = None,
+    duration_ms: float | None = None,
+) -> str | None:
+    """Track an agent event without building Pydantic models.
+
+    See :meth:`AgentTracker.capture`.
+
+    Returns:
+        The event ID, or ``None`` if the session was sampled out.
+    """
+    return _get_tracker("capture").capture(
+        event_type=event_type,
+        input_data=input_data,
+        output_data=output_data,
+        model=model,
+        tokens_in=tokens_in,
+        tokens_out=tokens_out,
+        reasoning=reasoning,
+        tool_name=tool_name,
+        tool_input=tool_input,
+        tool_output=tool_output,
+        duration_ms=duration_ms,
+    )
+
+
+def track_many(
+    events: Iterable[Mapping[str, Any]] | Mapping[str, Iterable[Any]],
+    chunk_size: int = 500,
+) -> list[str]:
+    """Track many events in the current session at once, given as rows or
+    as columns.
+
+    See :meth:`AgentTracker.track_many
+    <agentlens.tracker_batch.BatchMixin.track_many>`.
+
+    Returns:
+        The event IDs, in order.
+    """
+    return _get_tracker("track_many").track_many(events, chunk_size=chunk_size)
+
+
 def explain(session_id: str | None = None) -> str:
     """Get a human-readable explanation of the agent's behavior in the current/specified session.
 
@@ -0,0 +1,118 @@
+"""``agentlens`` — command-line tools for the AgentLens SDK.
+
+``agentlens import`` uploads NDJSON event files written by
+:class:`~agentlens.transport_file.NDJSONFileTransport` to a backend::
+
+    agentlens import /var/spool/agentlens --endpoint https://agentlens.example.com
+    zcat events.ndjson.gz | agentlens import -
+
+Directories contribute their finished ``*.ndjson``, ``*.ndjson.gz`` and
+``*.ndjson.zst`` files.  The API key is read from ``AGENTLENS_API_KEY``
+unless ``--api-key`` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from typing import Sequence
+
+import httpx
+
+from agentlens.transport import _MAX_BATCH_EVENTS, Transport
+from agentlens.transport_file import NDJSONImporter
+
+__all__ = ["build_parser", "main"]
+
+logger = logging.getLogger("agentlens.cli")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for ``agentlens``."""
+    parser = argparse.ArgumentParser(prog="agentlens", description="AgentLens SDK tools.")
+    _add_log_level(parser, default="WARNING")
+    commands = parser.add_subparsers(dest="command", required=True)
+    # Accepted after the subcommand too; SUPPRESS keeps a value given
+    # before it from being reset to the default.
+    common = argparse.ArgumentParser(add_help=False)
+    _add_log_level(common, default=argparse.SUPPRESS)
+
+    imp = commands.add_parser(
+        "import", parents=[common], help="upload NDJSON event files to a backend",
+        description="Upload NDJSON event files to an AgentLens backend.",
+    )
+    imp.add_argument(
+        "paths", nargs="+", metavar="PATH",
+        help="NDJSON file (optionally .gz/.zst), directory of files, or - for stdin",
+    )
+    imp.add_argument(
+        "--endpoint", action="append", metavar="URL",
+        help="backend URL; repeat to load-balance across replicas "
+        "(default: http://localhost:3000)",
+    )
+    imp.add_argument(
+        "--api-key", default=os.environ.get("AGENTLENS_API_KEY", "default"),
+        help="API key (default: $AGENTLENS_API_KEY)",
+    )
+    imp.add_argument(
+        "--compression", choices=("gzip", "zstd"), help="compress uploads",
+    )
+    imp.add_argument(
+        "--batch-size", type=int, default=_MAX_BATCH_EVENTS,
+        help=f"events per request (default and maximum: {_MAX_BATCH_EVENTS})",
+    )
+    imp.add_argument(
+        "--max-retries", type=int, default=5,
+        help="retries per batch before giving up (default: 5)",
+    )
+    return parser
+
+
+def _add_log_level(parser: argparse.ArgumentParser, default: str) -> None:
+    parser.add_argument(
+        "--log-level", default=default,
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+    )
+
+
+def _import(args: argparse.Namespace) -> int:
+    transport = Transport(
+        endpoint=args.endpoint or "http://localhost:3000",
+        api_key=args.api_key,
+        compression=args.compression,
+        # Batches are posted by the importer; no background flushing.
+        flush_interval=3600.0,
+    )
+    importer = NDJSONImporter(
+        transport, batch_size=args.batch_size, max_retries=args.max_retries,
+    )
+    status = 0
+    try:
+        importer.run(args.paths)
+    except (OSError, ImportError, httpx.HTTPError) as e:
+        print(f"agentlens import: {e}", file=sys.stderr)
+        status = 1
+    finally:
+        transport.close()
+    print(
+        f"Imported {importer.events} events in {importer.batches} batches "
+        f"from {importer.files} files ({importer.skipped} malformed or rejected "
+        "lines skipped)",
+        file=sys.stderr,
+    )
+    return status
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point for ``agentlens``; returns the exit status."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(name)s %(levelname)s %(message)s")
+    if args.command == "import":
+        return _import(args)
+    return 2  # pragma: no cover - argparse enforces a known command
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""``agentlens-collector`` — a standalone per-host event collector.
+
+Runs a :class:`~agentlens.transport_uds.Collector` as its own process (a
+sidecar container, a systemd unit, ...) so that the agent processes on a
+host never talk to the backend themselves.  They connect with::
+
+    agentlens.init(endpoint="uds:///run/agentlens/collector.sock")
+
+and hand every batch over the Unix socket; batching, compression, the
+disk spool, retries and the circuit breaker all live in the collector.
+
+Usage::
+
+    agentlens-collector --socket /run/agentlens/collector.sock \\
+        --endpoint https://agentlens.example.com --spool-dir /var/lib/agentlens
+
+The API key is read from ``AGENTLENS_API_KEY`` unless ``--api-key`` is
+given, so it does not show up in the process list.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+from typing import Sequence
+
+from agentlens.transport import Transport
+from agentlens.transport_uds import Collector
+
+__all__ = ["DEFAULT_SOCKET", "build_parser", "main"]
+
+#: Socket path used when ``--socket`` is not given.
+DEFAULT_SOCKET = "/tmp/agentlens-collector.sock"
+
+logger = logging.getLogger("agentlens.collector")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for ``agentlens-collector``."""
+    parser = argparse.ArgumentParser(
+        prog="agentlens-collector",
+        description="Forward events from local AgentLens SDK processes to the backend.",
+    )
+    parser.add_argument(
+        "--socket", default=DEFAULT_SOCKET, metavar="PATH",
+        help=f"Unix socket to listen on (default: {DEFAULT_SOCKET})",
+    )
+    parser.add_argument(
+        "--socket-mode", type=lambda s: int(s, 8), default=0o600, metavar="OCTAL",
+        help="permissions of the socket file (default: 600)",
+    )
+    parser.add_argument(
+        "--endpoint", action="append", metavar="URL",
+        help="backend URL; repeat to load-balance across replicas "
+        "(default: http://localhost:3000)",
+    )
+    parser.add_argument(
+        "--api-key", default=os.environ.get("AGENTLENS_API_KEY", "default"),
+        help="API key (default: $AGENTLENS_API_KEY)",
+    )
+    parser.add_argument("--spool-dir", metavar="DIR", help="durable on-disk spool")
+    parser.add_argument(
+        "--compression", choices=("gzip", "zstd"), help="compress uploads",
+    )
+    parser.add_argument(
+        "--wire-format", choices=("json", "msgpack"), default="json",
+        help="encoding of uploaded batches (default: json)",
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument(
+        "--max-latency", type=float, metavar="SECONDS",
+        help="enable adaptive batching with this latency budget",
+    )
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument(
+        "--log-level", default="INFO",
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point for ``agentlens-collector``; returns the exit status."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=args.log_level, format="%(asctime)s %(name)s %(levelname)s %(message)s",
+    )
+    upstream = Transport(
+        endpoint=args.endpoint or "http://localhost:3000",
+        api_key=args.api_key,
+        batch_size=args.batch_size,
+        flush_interval=args.flush_interval,
+        max_latency=args.max_latency,
+        max_in_flight=args.max_in_flight,
+        compression=args.compression,
+        wire_format=args.wire_format,
+        spool=args.spool_dir,
+    )
+    try:
+        collector = Collector(upstream, args.socket, mode=args.socket_mode)
+    except OSError as e:
+        logger.error("Cannot listen on %s: %s", args.socket, e)
+        upstream.close()
+        return 1
+
+    # SIGTERM (docker stop, systemd) shuts down like Ctrl-C: stop accepting,
+    # let open connections finish, then flush upstream.
+    signal.signal(signal.SIGTERM, lambda signum, frame: collector.detach())
+    logger.info("Listening on %s, forwarding to %s", args.socket, ", ".join(upstream.endpoints))
+    try:
+        collector.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.close()
+        logger.info(
+            "Collector stopped after %d frames (%d events)",
+            collector.frames, collector.events,
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
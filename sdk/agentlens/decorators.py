@@ -42,6 +42,14 @@ def _safe_repr(value: Any, *, max_length: int = 200) -> str:
     return s
 
 
+def _sampled() -> bool:
+    """False when the global tracker's sampler dropped the current session."""
+    import agentlens
+
+    tracker = agentlens._tracker
+    return tracker is None or tracker.sampled
+
+
 def _make_tracker(
     fn: Callable,
     *,
@@ -118,6 +126,8 @@ def _make_tracker(
 
         @functools.wraps(fn)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _sampled():
+                return await fn(*args, **kwargs)
             input_data = _build_safe_input(args, kwargs)
             start = time.perf_counter()
             try:
@@ -145,6 +155,8 @@ def _make_tracker(
 
     @functools.wraps(fn)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not _sampled():
+            return fn(*args, **kwargs)
         input_data = _build_safe_input(args, kwargs)
         start = time.perf_counter()
         try:
@@ -115,8 +115,18 @@ class HealthScorer:
 
         Uses single-pass aggregation to avoid redundant iterations.
         """
-        agg = self._aggregate(events)
+        return self.score_aggregate(self._aggregate(events), session_id)
 
+    def score_aggregate(self, agg: dict, session_id: str = "unknown") -> HealthReport:
+        """Score stats already aggregated, as :meth:`_aggregate` returns them
+        or :meth:`SessionSummary.health_aggregate()
+        <agentlens.session_summary.SessionSummary.health_aggregate>` keeps
+        them for a session that retains no events.
+
+        *agg* may also carry ``duration_count``, the number of durations
+        behind ``total_duration`` when ``durations`` is only a sample of
+        them.
+        """
         metrics = [
             self._score_error_rate(agg),
             self._score_latency(agg),
@@ -150,8 +160,15 @@ class HealthScorer:
         """Score a *Session* model object directly.
 
         Extracts events from ``session.events`` and delegates to
-        :meth:`score`.
+        :meth:`score`, or scores ``session.summary`` for a session that
+        keeps aggregates instead of events.
         """
+        summary = getattr(session, "summary", None)
+        if summary is not None:
+            return self.score_aggregate(
+                summary.health_aggregate(),
+                session_id=getattr(session, "session_id", "unknown"),
+            )
         raw_events: list[dict] = []
         for ev in session.events:
             d: dict[str, Any] = {}
@@ -225,7 +242,9 @@ class HealthScorer:
                 detail="No duration data available",
             )
 
-        avg = sum(durations) / len(durations)
+        # With a sampled ``durations`` the exact average comes from the totals.
+        count = agg.get("duration_count")
+        avg = agg["total_duration"] / count if count else sum(durations) / len(durations)
 
         if avg <= 100.0:
             score = 100.0
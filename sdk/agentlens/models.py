@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+from collections import deque
+from collections.abc import Iterable, Iterator, MutableSequence
 from datetime import datetime
 from functools import partial
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, field_serializer
+from typing_extensions import TypedDict
 
-from agentlens._utils import new_id, utcnow as _utcnow
+from agentlens._utils import format_iso, new_id, utcnow as _utcnow
 
 _new_id = partial(new_id, 16)
 
@@ -74,7 +77,7 @@ class AgentEvent(BaseModel):
             "event_id": self.event_id,
             "session_id": self.session_id,
             "event_type": self.event_type,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": format_iso(self.timestamp),
             "tokens_in": self.tokens_in,
             "tokens_out": self.tokens_out,
         }
@@ -89,6 +92,263 @@ class AgentEvent(BaseModel):
         return d
 
 
+class TrackFields(TypedDict, total=False):
+    """The event fields :meth:`AgentTracker.track()
+    <agentlens.tracker.AgentTracker.track>` takes, with their types, plus
+    ``timestamp`` for events recorded earlier."""
+
+    event_type: str
+    input_data: dict[str, Any] | None
+    output_data: dict[str, Any] | None
+    model: str | None
+    tokens_in: int
+    tokens_out: int
+    reasoning: str | None
+    tool_name: str | None
+    tool_input: dict[str, Any] | None
+    tool_output: dict[str, Any] | None
+    duration_ms: float | None
+    timestamp: datetime
+
+
+_track_fields = TypeAdapter(TrackFields)
+_track_rows = TypeAdapter(list[TrackFields])
+
+
+def validate_track_fields(fields: dict[str, Any]) -> TrackFields:
+    """Check *fields* as :class:`AgentEvent` would, converting where it
+    would (``"5"`` to ``5``, ISO strings to ``datetime``).
+
+    Raises:
+        pydantic.ValidationError: If a value has the wrong type.
+    """
+    return _track_fields.validate_python(fields)
+
+
+def validate_track_rows(rows: list[dict[str, Any]]) -> list[TrackFields]:
+    """:func:`validate_track_fields` for many events in one pass; fails
+    as a whole if any of them is invalid."""
+    return _track_rows.validate_python(rows)
+
+
+def plain_track_fields(
+    event_type: Any, input_data: Any, output_data: Any, model: Any,
+    tokens_in: Any, tokens_out: Any, reasoning: Any, tool_name: Any,
+    tool_input: Any, tool_output: Any, duration_ms: Any,
+) -> bool:
+    """True if the arguments already have the types :class:`TrackFields`
+    declares, so :func:`validate_track_fields` would return them as they
+    are.  Much cheaper than validating."""
+    return (
+        type(event_type) is str
+        and type(tokens_in) is int
+        and type(tokens_out) is int
+        and (model is None or type(model) is str)
+        and (reasoning is None or type(reasoning) is str)
+        and (tool_name is None or type(tool_name) is str)
+        and (duration_ms is None or type(duration_ms) in (float, int))
+        and (input_data is None or type(input_data) is dict)
+        and (output_data is None or type(output_data) is dict)
+        and (tool_input is None or type(tool_input) is dict)
+        and (tool_output is None or type(tool_output) is dict)
+    )
+
+
+def event_payload(
+    session_id: str = "",
+    step: int = 0,
+    event_type: str = "generic",
+    input_data: dict[str, Any] | None = None,
+    output_data: dict[str, Any] | None = None,
+    model: str | None = None,
+    tokens_in: int = 0,
+    tokens_out: int = 0,
+    reasoning: str | None = None,
+    tool_name: str | None = None,
+    tool_input: dict[str, Any] | None = None,
+    tool_output: dict[str, Any] | None = None,
+    duration_ms: float | None = None,
+    timestamp: datetime | str | None = None,
+) -> dict[str, Any]:
+    """Build the wire dict of an event directly, without the models.
+
+    Gives what ``AgentEvent(...).to_api_dict()`` would for the arguments
+    :meth:`AgentTracker.track() <agentlens.tracker.AgentTracker.track>`
+    takes; *step* numbers the decision trace.  Nothing is validated.
+    """
+    if timestamp is None:
+        now = format_iso(_utcnow())
+    elif isinstance(timestamp, datetime):
+        now = format_iso(timestamp)
+    else:
+        now = timestamp
+    payload: dict[str, Any] = {
+        "event_id": _new_id(),
+        "session_id": session_id,
+        "event_type": event_type,
+        "timestamp": now,
+    }
+    if input_data is not None:
+        payload["input_data"] = input_data
+    if output_data is not None:
+        payload["output_data"] = output_data
+    if model is not None:
+        payload["model"] = model
+    payload["tokens_in"] = tokens_in
+    payload["tokens_out"] = tokens_out
+    if tool_name:
+        tool_call: dict[str, Any] = {
+            "tool_call_id": _new_id(),
+            "tool_name": tool_name,
+            "tool_input": tool_input or {},
+        }
+        if tool_output is not None:
+            tool_call["tool_output"] = tool_output
+        tool_call["timestamp"] = now
+        if duration_ms is not None:
+            tool_call["duration_ms"] = duration_ms
+        payload["tool_call"] = tool_call
+    if reasoning:
+        payload["decision_trace"] = {
+            "trace_id": _new_id(),
+            "step": step,
+            "reasoning": reasoning,
+            "alternatives_considered": [],
+            "timestamp": now,
+        }
+    if duration_ms is not None:
+        payload["duration_ms"] = duration_ms
+    return payload
+
+
+class EventList(MutableSequence):
+    """A session's events, some of which may still be wire dicts.
+
+    :meth:`AgentTracker.capture() <agentlens.tracker.AgentTracker.capture>`
+    records events as the dicts it sends, without building models.  They
+    wait here and are turned into :class:`AgentEvent` objects the first time
+    the events are read; appending and ``len()`` do not trigger that.  It is
+    a sequence rather than a ``list`` so that nothing can read the events
+    past that step; slicing, ``+`` and :meth:`copy` give plain lists.
+    """
+
+    __slots__ = ("_items", "_pending")
+
+    def __init__(self, events: Iterable[AgentEvent] = ()) -> None:
+        self._items: list[AgentEvent] = list(events)
+        # Events after _items, not yet built: wire dicts, and events
+        # appended after them.
+        self._pending: deque[AgentEvent | dict[str, Any]] = deque()
+
+    def add_record(self, payload: dict[str, Any]) -> None:
+        """Append the event whose wire dict is *payload*."""
+        self._pending.append(payload)
+
+    def add_records(self, payloads: list[dict[str, Any]]) -> None:
+        """Append the events whose wire dicts are *payloads*."""
+        self._pending.extend(payloads)
+
+    def _events(self) -> list[AgentEvent]:
+        """The events, all of them built."""
+        pending = self._pending
+        if pending:
+            self._items.extend([
+                item if isinstance(item, AgentEvent) else AgentEvent.model_validate(item)
+                for item in pending
+            ])
+            pending.clear()
+        return self._items
+
+    def __len__(self) -> int:
+        return len(self._items) + len(self._pending)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._events()[index]
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        self._events()[index] = value
+
+    def __delitem__(self, index: Any) -> None:
+        # Dropping the oldest event (MemorySessionStore's max_events)
+        # should not build every pending one.
+        if index == 0 and not self._items and self._pending:
+            self._pending.popleft()
+        elif index == 0 and self._items:
+            del self._items[0]
+        else:
+            del self._events()[index]
+
+    def insert(self, index: int, value: AgentEvent) -> None:
+        self._events().insert(index, value)
+
+    def append(self, event: AgentEvent) -> None:
+        if self._pending:
+            self._pending.append(event)
+        else:
+            self._items.append(event)
+
+    def extend(self, events: Iterable[AgentEvent]) -> None:
+        if self._pending:
+            self._pending.extend(events)
+        else:
+            self._items.extend(events)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._pending.clear()
+
+    def __iter__(self) -> Iterator[AgentEvent]:
+        return iter(self._events())
+
+    def __reversed__(self) -> Iterator[AgentEvent]:
+        return reversed(self._events())
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._events()
+
+    def index(self, value: Any, *args: Any) -> int:
+        return self._events().index(value, *args)
+
+    def count(self, value: Any) -> int:
+        return self._events().count(value)
+
+    def sort(self, *, key: Any = None, reverse: bool = False) -> None:
+        self._events().sort(key=key, reverse=reverse)
+
+    def reverse(self) -> None:
+        self._events().reverse()
+
+    def copy(self) -> list[AgentEvent]:
+        return list(self._events())
+
+    def __iadd__(self, events: Iterable[AgentEvent]) -> EventList:
+        self.extend(events)
+        return self
+
+    def __add__(self, other: Any) -> Any:
+        if isinstance(other, (list, EventList)):
+            return self._events() + list(other)
+        return NotImplemented
+
+    def __radd__(self, other: Any) -> Any:
+        if isinstance(other, list):
+            return other + self._events()
+        return NotImplemented
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EventList):
+            other = other._events()
+        if isinstance(other, list):
+            return self._events() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._events())
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        return list, (self._events(),)
+
+
 class Session(BaseModel):
     """Represents an agent tracking session."""
     session_id: str = Field(default_factory=_new_id)
@@ -100,14 +360,70 @@ class Session(BaseModel):
     total_tokens_in: int = 0
     total_tokens_out: int = 0
     status: str = "active"  # active, completed, error
+    # A SessionSummary when the session keeps aggregates instead of events
+    # (see agentlens.session_summary).
+    summary: Any = Field(default=None, exclude=True, repr=False)
+
+    @property
+    def event_count(self) -> int:
+        """Events added to this session, retained or not."""
+        if self.summary is not None:
+            return self.summary.event_count
+        return len(self.events)
+
+    def add_records(self, payloads: list[dict[str, Any]]) -> None:
+        """:meth:`add_record` for several events at once."""
+        if self.summary is not None:
+            for payload in payloads:
+                self.summary.add_payload(payload)
+        else:
+            events = self.events
+            if type(events) is not EventList:
+                self.events = events = EventList(events)
+            events.add_records(payloads)
+        fields = self.__dict__
+        fields["total_tokens_in"] += sum(p.get("tokens_in", 0) for p in payloads)
+        fields["total_tokens_out"] += sum(p.get("tokens_out", 0) for p in payloads)
 
     def add_event(self, event: AgentEvent) -> None:
-        """Add an event to this session."""
+        """Add an event to this session.
+
+        A session with a :attr:`summary` folds the event into it instead of
+        keeping it.
+        """
         event.session_id = self.session_id
-        self.events.append(event)
+        if self.summary is not None:
+            self.summary.add(event)
+        else:
+            self.events.append(event)
         self.total_tokens_in += event.tokens_in
         self.total_tokens_out += event.tokens_out
 
+    def add_record(self, payload: dict[str, Any]) -> None:
+        """Add an event given as its wire dict, as
+        :meth:`AgentTracker.capture() <agentlens.tracker.AgentTracker.capture>`
+        builds it.  The :class:`AgentEvent` is only built when
+        :attr:`events` is read.
+        """
+        if self.summary is not None:
+            self.summary.add_payload(payload)
+        else:
+            events = self.events
+            if type(events) is not EventList:
+                self.events = events = EventList(events)
+            events.add_record(payload)
+        # Straight to the field values: BaseModel.__setattr__ would cost
+        # as much as the rest of this method.
+        fields = self.__dict__
+        fields["total_tokens_in"] += payload.get("tokens_in", 0)
+        fields["total_tokens_out"] += payload.get("tokens_out", 0)
+
+    @field_serializer("events", mode="wrap")
+    def _serialize_events(self, events: list[AgentEvent], handler: Any) -> Any:
+        if type(events) is EventList:
+            events = events.copy()
+        return handler(events)
+
     def end(self) -> None:
         """Mark session as completed."""
         self.ended_at = _utcnow()
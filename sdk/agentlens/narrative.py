@@ -41,6 +41,8 @@ existing import paths stay unchanged.
 
 from __future__ import annotations
 
+from dataclasses import replace
+
 from agentlens import narrative_render as _render
 from agentlens.models import Session
 from agentlens.narrative_types import (
@@ -65,8 +67,16 @@ class NarrativeGenerator:
     """Generates human-readable narratives from agent sessions."""
 
     def generate(self, session: Session, config: NarrativeConfig | None = None) -> Narrative:
-        """Generate a narrative for the given session."""
+        """Generate a narrative for the given session.
+
+        A session that keeps a :class:`~agentlens.session_summary.SessionSummary`
+        instead of its events gets the summary, body, tool and model figures
+        from it, over all its events; the timeline, decision and error
+        sections need the events and are left out.
+        """
         cfg = config or NarrativeConfig()
+        if session.summary is not None:
+            return self._generate_from_summary(session, cfg)
         events = session.events[:cfg.max_steps]
 
         # Compute duration
@@ -134,15 +144,7 @@ class NarrativeGenerator:
         model_agg = _render.aggregate_models(llm_events)
         if model_agg:
             order += 1
-            model_lines = [
-                f"- **{m}**: {model_agg[m][0]} calls, {model_agg[m][1]:,} tokens"
-                for m in sorted(model_agg)
-            ]
-            sections.append(NarrativeSection(
-                title="Models Used",
-                content="\n".join(model_lines),
-                order=order,
-            ))
+            sections.append(_models_section(model_agg, order))
 
         # Build summary and body
         summary = _render.build_summary(
@@ -172,6 +174,59 @@ class NarrativeGenerator:
             style=cfg.style,
         )
 
+    def _generate_from_summary(self, session: Session, cfg: NarrativeConfig) -> Narrative:
+        summary = session.summary
+
+        duration_s = 0.0
+        if session.ended_at and session.started_at:
+            duration_s = (session.ended_at - session.started_at).total_seconds()
+        elif summary.first_timestamp and summary.last_timestamp:
+            duration_s = (summary.last_timestamp - summary.first_timestamp).total_seconds()
+
+        total_tokens = summary.tokens_in + summary.tokens_out
+        cost = 0.0
+        if cfg.include_costs:
+            cost = (
+                (summary.tokens_in / 1000 * cfg.cost_per_1k_input)
+                + (summary.tokens_out / 1000 * cfg.cost_per_1k_output)
+            )
+
+        sections: list[NarrativeSection] = []
+        if summary.models:
+            sections.append(_models_section(summary.models, 1))
+
+        counts = summary.counts
+        error_count = counts.get("error", 0)
+        decision_count = counts.get("decision", 0)
+        tool_map = summary.tools
+        summary_line = _render.build_summary(
+            session, summary.event_count, total_tokens, cost,
+            error_count, decision_count,
+            list(tool_map.keys()), duration_s, cfg.style,
+        )
+        body = _render.build_body_from_counts(
+            session, summary.event_count,
+            counts.get("llm_call", 0), summary.llm_tokens, tool_map,
+            decision_count, error_count,
+            total_tokens, cost, duration_s, cfg.style,
+        )
+
+        return Narrative(
+            session_id=session.session_id,
+            agent_name=session.agent_name,
+            summary=summary_line,
+            body=body,
+            sections=sections,
+            tool_summaries=[replace(ts) for ts in tool_map.values()],
+            total_events=summary.event_count,
+            total_tokens=total_tokens,
+            total_cost_usd=round(cost, 6),
+            duration_seconds=duration_s,
+            error_count=error_count,
+            decision_count=decision_count,
+            style=cfg.style,
+        )
+
     def generate_batch(self, sessions: list[Session], config: NarrativeConfig | None = None) -> list[Narrative]:
         """Generate narratives for multiple sessions."""
         return [self.generate(s, config) for s in sessions]
@@ -212,3 +267,15 @@ class NarrativeGenerator:
                 )
 
         return "\n".join(lines)
+
+
+def _models_section(model_agg: dict[str, list[int]], order: int) -> NarrativeSection:
+    model_lines = [
+        f"- **{m}**: {model_agg[m][0]} calls, {model_agg[m][1]:,} tokens"
+        for m in sorted(model_agg)
+    ]
+    return NarrativeSection(
+        title="Models Used",
+        content="\n".join(model_lines),
+        order=order,
+    )
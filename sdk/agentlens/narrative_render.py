@@ -166,6 +166,21 @@ def build_body(
     tool_map: dict[str, ToolSummary], total_tokens: int,
     cost: float, duration_s: float, style: NarrativeStyle,
 ) -> str:
+    llm_tokens = sum(e.tokens_in + e.tokens_out for e in llm_events)
+    return build_body_from_counts(
+        session, len(events), len(llm_events), llm_tokens, tool_map,
+        len(decision_events), len(error_events),
+        total_tokens, cost, duration_s, style,
+    )
+
+
+def build_body_from_counts(
+    session: Session, event_count: int,
+    llm_count: int, llm_tokens: int, tool_map: dict[str, ToolSummary],
+    decision_count: int, error_count: int, total_tokens: int,
+    cost: float, duration_s: float, style: NarrativeStyle,
+) -> str:
+    """:func:`build_body` from counts, for sessions that keep no events."""
     paragraphs: list[str] = []
 
     # Opening
@@ -173,7 +188,7 @@ def build_body(
     if style == NarrativeStyle.EXECUTIVE:
         opening = (
             f"The agent '{session.agent_name}' executed a session "
-            f"consisting of {len(events)} events"
+            f"consisting of {event_count} events"
         )
         if dur:
             opening += f" over {dur}"
@@ -186,7 +201,7 @@ def build_body(
     else:
         opening = (
             f"Session {session.session_id} ({session.agent_name}) processed "
-            f"{len(events)} events"
+            f"{event_count} events"
         )
         if dur:
             opening += f" in {dur}"
@@ -194,17 +209,16 @@ def build_body(
     paragraphs.append(opening)
 
     # LLM usage
-    if llm_events:
-        llm_tokens = sum(e.tokens_in + e.tokens_out for e in llm_events)
-        avg_tok = llm_tokens // len(llm_events) if llm_events else 0
+    if llm_count:
+        avg_tok = llm_tokens // llm_count
         if style == NarrativeStyle.CASUAL:
             paragraphs.append(
-                f"Made {len(llm_events)} LLM call(s) using {llm_tokens:,} tokens "
+                f"Made {llm_count} LLM call(s) using {llm_tokens:,} tokens "
                 f"(~{avg_tok:,} per call)."
             )
         else:
             paragraphs.append(
-                f"LLM interactions: {len(llm_events)} call(s), {llm_tokens:,} total tokens, "
+                f"LLM interactions: {llm_count} call(s), {llm_tokens:,} total tokens, "
                 f"avg {avg_tok:,} tokens/call."
             )
 
@@ -228,18 +242,18 @@ def build_body(
             )
 
     # Decisions
-    if decision_events:
+    if decision_count:
         if style == NarrativeStyle.CASUAL:
-            paragraphs.append(f"The agent made {len(decision_events)} notable decision(s).")
+            paragraphs.append(f"The agent made {decision_count} notable decision(s).")
         else:
-            paragraphs.append(f"Decision points: {len(decision_events)}.")
+            paragraphs.append(f"Decision points: {decision_count}.")
 
     # Errors
-    if error_events:
+    if error_count:
         if style == NarrativeStyle.CASUAL:
-            paragraphs.append(f"Ran into {len(error_events)} error(s) during the session.")
+            paragraphs.append(f"Ran into {error_count} error(s) during the session.")
         else:
-            paragraphs.append(f"Errors encountered: {len(error_events)}.")
+            paragraphs.append(f"Errors encountered: {error_count}.")
 
     # Cost
     if cost > 0:
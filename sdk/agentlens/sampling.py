@@ -0,0 +1,178 @@
+"""Session sampling: ship a fraction of sessions, but never lose the bad ones.
+
+A :class:`Sampler` decides per session, in two stages:
+
+* **Head sampling** — at ``start_session`` a session is kept with
+  probability *rate*.  The decision is a hash of the session ID, so every
+  process that sees the same session makes the same decision.
+* **Tail sampling** — with a :class:`TailSampling` policy, sessions the head
+  sampler did not keep are not dropped straight away.  Their events are
+  buffered in memory and, at ``end_session``, shipped if the session
+  turned out to be interesting: it had an error, ran longer than
+  *min_duration_ms* or used more than *min_tokens* tokens.  Otherwise the
+  buffer is discarded.
+
+::
+
+    from agentlens.sampling import Sampler, TailSampling
+
+    tracker = AgentTracker(transport, sampler=Sampler(
+        rate=0.05,
+        tail=TailSampling(errors=True, min_duration_ms=60_000),
+    ))
+
+A dropped session costs next to nothing: ``track()`` builds no event
+payloads, spans emit nothing and the ``@track_agent`` / ``@track_tool_call``
+decorators skip argument capture (see :attr:`AgentTracker.sampled
+<agentlens.tracker.AgentTracker.sampled>`).  Kept sessions carry a
+``sampling`` entry in their ``session_start`` metadata — the head rate and
+why the session was kept — so totals can be extrapolated.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+__all__ = ["DEFER", "DROP", "ERROR_EVENT_TYPES", "KEEP", "Sampler", "TailSampling"]
+
+#: Ship the session's events as they happen.
+KEEP = "keep"
+#: Discard the session's events.
+DROP = "drop"
+#: Buffer the session's events until ``end_session`` decides.
+DEFER = "defer"
+
+#: Event types that make a session an error session.
+ERROR_EVENT_TYPES = frozenset({"error", "agent_error", "tool_error"})
+
+
+def _fraction(session_id: str) -> float:
+    """Map *session_id* uniformly onto [0, 1)."""
+    digest = hashlib.blake2b(session_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64
+
+
+@dataclass(frozen=True)
+class TailSampling:
+    """Keep a session the head sampler passed over if, once it ends, it
+
+    - had an error event (*errors*; ``agent_error``, ``tool_error``,
+      ``error``, or a span that ended with status ``"error"``),
+    - lasted at least *min_duration_ms*, or
+    - used at least *min_tokens* tokens (input plus output).
+
+    A deferred session holds at most *max_buffered_events* events in
+    memory.  One that grows past that is kept — its buffer is shipped and
+    the rest of it is sent as it happens — since a session that long is
+    rarely one to lose.
+    """
+
+    errors: bool = True
+    min_duration_ms: float | None = None
+    min_tokens: int | None = None
+    max_buffered_events: int = 10_000
+
+
+@dataclass
+class _Deferred:
+    """Events of a deferred session, plus what the tail decision needs."""
+
+    events: list[dict[str, Any]] = field(default_factory=list)
+    error: bool = False
+
+    def append(self, payload: dict[str, Any]) -> None:
+        event_type = payload.get("event_type")
+        if event_type in ERROR_EVENT_TYPES or (
+            event_type == "span_end" and payload.get("status") == "error"
+        ):
+            self.error = True
+        self.events.append(payload)
+
+
+def _tail_reason(
+    tail: TailSampling | None,
+    deferred: _Deferred,
+    duration_ms: float | None,
+    tokens: int,
+) -> str | None:
+    if tail is None:
+        return None
+    if tail.errors and deferred.error:
+        return "errors"
+    if (
+        tail.min_duration_ms is not None
+        and duration_ms is not None
+        and duration_ms >= tail.min_duration_ms
+    ):
+        return "duration"
+    if tail.min_tokens is not None and tokens >= tail.min_tokens:
+        return "tokens"
+    return None
+
+
+class Sampler:
+    """Decides which sessions a tracker ships.
+
+    Args:
+        rate: Fraction of sessions kept at ``start_session``, from 0.0 to
+            1.0.
+        tail: Decide about the remaining sessions at ``end_session``
+            instead of dropping them; see :class:`TailSampling`.
+    """
+
+    def __init__(self, rate: float = 1.0, tail: TailSampling | None = None) -> None:
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("rate must be between 0.0 and 1.0")
+        self.rate = rate
+        self.tail = tail
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(
+            ("head", "errors", "duration", "tokens", "buffer", "dropped"), 0,
+        )
+
+    def __repr__(self) -> str:
+        return f"Sampler(rate={self.rate!r}, tail={self.tail!r})"
+
+    def head(self, session_id: str) -> str:
+        """Return :data:`KEEP`, :data:`DEFER` or :data:`DROP` for a new session."""
+        if self.rate >= 1.0 or _fraction(session_id) < self.rate:
+            self._count("head")
+            return KEEP
+        if self.tail is not None:
+            return DEFER
+        self._count("dropped")
+        return DROP
+
+    def tail_reason(
+        self,
+        deferred: _Deferred,
+        duration_ms: float | None,
+        tokens: int,
+    ) -> str | None:
+        """Return why a deferred session should be kept, or ``None``."""
+        reason = _tail_reason(self.tail, deferred, duration_ms, tokens)
+        self._count(reason or "dropped")
+        return reason
+
+    def record_overflow(self) -> None:
+        """Count a deferred session kept for outgrowing its buffer."""
+        self._count("buffer")
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return session counts: kept by reason, and dropped.
+
+        ``kept`` is keyed by ``head`` (won the head sample), ``errors``,
+        ``duration``, ``tokens`` (tail sampling) and ``buffer`` (deferred
+        session outgrew *max_buffered_events*).
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        dropped = counts.pop("dropped")
+        return {"rate": self.rate, "kept": counts, "dropped": dropped}
@@ -0,0 +1,354 @@
+"""Where :class:`~agentlens.tracker.AgentTracker` keeps its sessions.
+
+``tracker.sessions`` holds every session the tracker started, with its
+events, for :meth:`~agentlens.tracker.AgentTracker.health_score`,
+:meth:`~agentlens.tracker.AgentTracker.explain`, exports and the like.
+The default :class:`MemorySessionStore` bounds it so a long-running worker
+does not grow without limit:
+
+* ended sessions expire *ttl* seconds after ``end_session``, checked
+  whenever the store is read or written;
+* beyond *max_sessions* sessions, or *max_bytes* of event data, the least
+  recently used ended sessions are evicted first;
+* each session keeps at most its last *max_events* events; its token
+  totals still count every event;
+* with ``keep_event_bodies=False`` an ended session's events are reduced
+  to summaries: type, timing, model, tokens, tool name, errors and
+  reasoning stay, so health scores and explanations are unchanged, but
+  ``input_data``, ``output_data`` and tool inputs and outputs are dropped.
+  They have been shipped to the backend already;
+* with ``keep_events=False`` sessions keep no events at all, only running
+  aggregates (see :mod:`agentlens.session_summary`) — enough for health
+  scores and narrative summaries, for workloads that just ship events.
+
+Active sessions are never evicted.  A tracker uses another store when
+given one::
+
+    tracker = AgentTracker(session_store=MemorySessionStore(
+        max_sessions=1_000, ttl=300, max_bytes=64 * 1024 * 1024,
+        keep_event_bodies=False,
+    ))
+
+Any :class:`SessionStore` subclass can be plugged in the same way.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator, MutableMapping, Sequence
+from typing import Any
+
+from agentlens.models import AgentEvent, Session
+from agentlens.session_summary import SessionSummary
+
+__all__ = ["MemorySessionStore", "SessionStore", "summarize_event"]
+
+# Rough in-memory size of an event reduced to a summary.
+_SUMMARY_BYTES = 256
+
+
+def summarize_event(event: AgentEvent) -> None:
+    """Drop the bodies of *event* in place, keeping what health scores
+    and explanations use."""
+    event.input_data = None
+    event.output_data = None
+    tool_call = event.tool_call
+    if tool_call is not None:
+        tool_call.tool_input = {}
+        output = tool_call.tool_output
+        if isinstance(output, dict) and output.get("error"):
+            tool_call.tool_output = {"error": output["error"]}
+        else:
+            tool_call.tool_output = None
+
+
+# Rough size of an event's JSON without its bodies, and of a tool call's.
+_ENVELOPE_BYTES = 200
+_TOOL_CALL_BYTES = 120
+# Rough size of a value nested two levels deep in a body, per item.
+_NESTED_BYTES = 64
+_SCALAR_BYTES = 8
+
+
+def _leaf_bytes(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (dict, list, tuple)):
+        return _NESTED_BYTES * len(value)
+    return _SCALAR_BYTES
+
+
+def _body_bytes(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(str(key)) + _leaf_bytes(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(map(_leaf_bytes, value))
+    return _SCALAR_BYTES
+
+
+def _payload_bytes(payload: dict[str, Any]) -> int:
+    """Estimated JSON size of *payload*.
+
+    Strings count in full down to the second level of each body; anything
+    deeper counts at a flat rate per item.  Much cheaper than encoding the
+    payload, and close enough for the *max_bytes* budget.
+    """
+    size = (
+        _ENVELOPE_BYTES
+        + _body_bytes(payload.get("input_data"))
+        + _body_bytes(payload.get("output_data"))
+        + _body_bytes(payload.get("reasoning"))
+    )
+    tool_call = payload.get("tool_call")
+    if tool_call:
+        size += (
+            _TOOL_CALL_BYTES
+            + _body_bytes(tool_call.get("tool_input"))
+            + _body_bytes(tool_call.get("tool_output"))
+        )
+    return size
+
+
+class SessionStore(MutableMapping):
+    """A mapping of session ID to :class:`~agentlens.models.Session`, with
+    hooks the tracker calls as sessions progress.
+
+    Subclasses implement the mapping methods and may override the hooks.
+    A subclass that removes sessions on its own, or on ``del``, calls
+    :meth:`_notify_removed` for each so the tracker can drop what it keeps
+    about them.
+    """
+
+    _removal_listeners: tuple[Callable[[str], None], ...] = ()
+
+    def on_remove(self, callback: Callable[[str], None]) -> None:
+        """Call *callback* with the ID of every session removed from the
+        store, by eviction or ``del``."""
+        self._removal_listeners += (callback,)
+
+    def _notify_removed(self, session_id: str) -> None:
+        for callback in self._removal_listeners:
+            callback(session_id)
+
+    def add_event(self, session: Session, event: AgentEvent, payload: dict[str, Any]) -> None:
+        """Record *event* (sent to the backend as *payload*) in *session*."""
+        session.add_event(event)
+
+    def add_record(self, session: Session, payload: dict[str, Any]) -> None:
+        """Record the event sent as *payload* in *session*, without an
+        :class:`~agentlens.models.AgentEvent` (see
+        :meth:`AgentTracker.capture() <agentlens.tracker.AgentTracker.capture>`).
+        """
+        session.add_record(payload)
+
+    def add_records(self, session: Session, payloads: list[dict[str, Any]]) -> None:
+        """:meth:`add_record` for several events at once (see
+        :meth:`AgentTracker.track_many()
+        <agentlens.tracker_batch.BatchMixin.track_many>`)."""
+        session.add_records(payloads)
+
+    def session_ended(self, session: Session) -> None:
+        """Called once *session* has ended and its events were flushed."""
+
+
+class MemorySessionStore(SessionStore):
+    """In-process session store with LRU and TTL eviction.
+
+    Args:
+        max_sessions: Sessions kept.  ``None`` for no limit.
+        ttl: Seconds an ended session is kept.  ``None`` to keep it until
+            evicted for space.
+        max_events: Events kept per session (the most recent).
+        max_bytes: Approximate budget for the events of all sessions,
+            estimated from the JSON size of what was sent.
+        keep_event_bodies: Keep ended sessions' full events; ``False``
+            reduces them to summaries (see :func:`summarize_event`).
+        keep_events: Keep events at all; ``False`` gives every session a
+            :class:`~agentlens.session_summary.SessionSummary` instead.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int | None = 10_000,
+        ttl: float | None = 3600.0,
+        max_events: int | None = None,
+        max_bytes: int | None = None,
+        keep_event_bodies: bool = True,
+        keep_events: bool = True,
+    ) -> None:
+        for name, value in (
+            ("max_sessions", max_sessions), ("max_events", max_events), ("max_bytes", max_bytes),
+        ):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be >= 1")
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.keep_event_bodies = keep_event_bodies
+        self.keep_events = keep_events
+        self._lock = threading.RLock()
+        self._sessions: dict[str, Session] = {}
+        # Ended sessions, least recently used first -> time they ended
+        self._ended: OrderedDict[str, float] = OrderedDict()
+        # (time ended, session ID) in the order sessions ended, for the TTL
+        self._expiry: deque[tuple[float, str]] = deque()
+        # With max_bytes: estimated size of each session's events
+        self._bytes: dict[str, deque[int]] = {}
+        self._nbytes = 0
+        self.evicted = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"MemorySessionStore(sessions={len(self._sessions)}, "
+            f"ended={len(self._ended)}, max_sessions={self.max_sessions!r}, "
+            f"ttl={self.ttl!r})"
+        )
+
+    # ── Mapping ────────────────────────────────────────────────────
+
+    def __getitem__(self, session_id: str) -> Session:
+        with self._lock:
+            self._expire()
+            session = self._sessions[session_id]
+            if session_id in self._ended:
+                self._ended.move_to_end(session_id)
+            return session
+
+    def __setitem__(self, session_id: str, session: Session) -> None:
+        with self._lock:
+            if session_id in self._sessions:
+                self._forget(session_id)
+            if not self.keep_events and session.summary is None:
+                session.summary = SessionSummary()
+                for event in session.events:
+                    session.summary.add(event)
+                session.events.clear()
+            self._sessions[session_id] = session
+            if self.max_bytes is not None and session.summary is None:
+                self._bytes[session_id] = deque()
+            self._evict()
+
+    def __delitem__(self, session_id: str) -> None:
+        with self._lock:
+            if session_id not in self._sessions:
+                raise KeyError(session_id)
+            self._forget(session_id)
+            self._notify_removed(session_id)
+
+    def __contains__(self, session_id: object) -> bool:
+        self._expire_due()
+        return session_id in self._sessions
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self._expire()
+            return iter(list(self._sessions))
+
+    def __len__(self) -> int:
+        self._expire_due()
+        return len(self._sessions)
+
+    # ── Hooks ──────────────────────────────────────────────────────
+
+    def add_event(self, session: Session, event: AgentEvent, payload: dict[str, Any]) -> None:
+        session.add_event(event)
+        self._added(session, (payload,))
+
+    def add_record(self, session: Session, payload: dict[str, Any]) -> None:
+        session.add_record(payload)
+        self._added(session, (payload,))
+
+    def add_records(self, session: Session, payloads: list[dict[str, Any]]) -> None:
+        session.add_records(payloads)
+        self._added(session, payloads)
+
+    def _added(self, session: Session, payloads: Sequence[dict[str, Any]]) -> None:
+        if session.summary is not None or (self.max_events is None and self.max_bytes is None):
+            return
+        with self._lock:
+            sizes = self._bytes.get(session.session_id)
+            if sizes is not None:
+                for payload in payloads:
+                    size = _payload_bytes(payload)
+                    sizes.append(size)
+                    self._nbytes += size
+            if self.max_events is not None:
+                events = session.events
+                while len(events) > self.max_events:
+                    del events[0]
+                    if sizes:
+                        self._nbytes -= sizes.popleft()
+            if self.max_bytes is not None and self._nbytes > self.max_bytes:
+                self._evict()
+
+    def session_ended(self, session: Session) -> None:
+        with self._lock:
+            sid = session.session_id
+            if sid not in self._sessions:
+                return
+            now = time.monotonic()
+            self._ended[sid] = now
+            if self.ttl is not None:
+                self._expiry.append((now, sid))
+            if not self.keep_event_bodies and session.summary is None:
+                self._summarize(sid)
+            self._evict()
+
+    # ── Eviction ───────────────────────────────────────────────────
+
+    def _forget(self, session_id: str) -> None:
+        del self._sessions[session_id]
+        self._ended.pop(session_id, None)
+        sizes = self._bytes.pop(session_id, None)
+        if sizes:
+            self._nbytes -= sum(sizes)
+
+    def _summarize(self, session_id: str) -> None:
+        events = self._sessions[session_id].events
+        for event in events:
+            summarize_event(event)
+        sizes = self._bytes.get(session_id)
+        if sizes is not None:
+            self._nbytes -= sum(sizes)
+            self._bytes[session_id] = deque([_SUMMARY_BYTES] * len(events))
+            self._nbytes += _SUMMARY_BYTES * len(events)
+
+    def _over(self) -> bool:
+        if self.max_sessions is not None and len(self._sessions) > self.max_sessions:
+            return True
+        return self.max_bytes is not None and self._nbytes > self.max_bytes
+
+    def _expire_due(self) -> None:
+        """Expire sessions past their TTL, taking the lock only if one is."""
+        expiry = self._expiry
+        if expiry and expiry[0][0] <= time.monotonic() - self.ttl:
+            with self._lock:
+                self._expire()
+
+    def _expire(self) -> None:
+        expiry = self._expiry
+        if not expiry:
+            return
+        cutoff = time.monotonic() - self.ttl
+        while expiry and expiry[0][0] <= cutoff:
+            ended, sid = expiry.popleft()
+            # Skip entries for sessions evicted or replaced since.
+            if self._ended.get(sid) == ended:
+                self._evict_one(sid)
+
+    def _evict(self) -> None:
+        self._expire()
+        while self._ended and self._over():
+            self._evict_one(next(iter(self._ended)))
+
+    def _evict_one(self, session_id: str) -> None:
+        self._forget(session_id)
+        self.evicted += 1
+        self._notify_removed(session_id)
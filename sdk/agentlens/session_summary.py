@@ -0,0 +1,204 @@
+"""Running aggregates that stand in for a session's events.
+
+A session normally keeps every :class:`~agentlens.models.AgentEvent` it
+tracked, for :meth:`~agentlens.tracker.AgentTracker.health_score`,
+:meth:`~agentlens.tracker.AgentTracker.explain` and narratives.  A pure
+shipping workload does not need them, and holding them roughly doubles the
+SDK's memory.  A session given a :class:`SessionSummary` instead folds each
+event into it and drops the event once it has been sent::
+
+    tracker = AgentTracker(session_store=MemorySessionStore(keep_events=False))
+
+The summary keeps what :class:`~agentlens.health.HealthScorer` and
+:class:`~agentlens.narrative.NarrativeGenerator` summaries need: event
+counts by type, token sums, error and tool success/failure counts, per-tool
+and per-model totals, and durations.  Duration totals are exact; the P95
+latency comes from a uniform reservoir of *reservoir_size* durations, so it
+is exact up to that many events and an estimate beyond.  What needs the
+events themselves — timelines, decision and error details — is not
+available for such a session.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from datetime import datetime
+from typing import Any
+
+from agentlens._utils import parse_iso
+from agentlens.models import AgentEvent
+from agentlens.narrative_types import ToolSummary
+
+__all__ = ["SessionSummary"]
+
+
+def _clean_duration(value: Any) -> float | None:
+    """*value* as a float if it is a finite, non-negative duration."""
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isfinite(value) and value >= 0.0:
+        return value
+    return None
+
+
+class SessionSummary:
+    """Incremental aggregates of a session's events.
+
+    Args:
+        reservoir_size: Durations sampled for percentiles.
+    """
+
+    __slots__ = (
+        "reservoir_size", "event_count", "counts", "tokens_in", "tokens_out",
+        "llm_tokens", "error_count", "tool_count", "tool_failures",
+        "duration_count", "total_duration", "durations", "tools", "models",
+        "first_timestamp", "last_timestamp", "_rng",
+    )
+
+    def __init__(self, reservoir_size: int = 1024) -> None:
+        if reservoir_size < 1:
+            raise ValueError("reservoir_size must be >= 1")
+        self.reservoir_size = reservoir_size
+        self.event_count = 0
+        #: Events by ``event_type``.
+        self.counts: dict[str, int] = {}
+        self.tokens_in = 0
+        self.tokens_out = 0
+        #: Tokens of ``llm_call`` events.
+        self.llm_tokens = 0
+        #: Errors as :class:`~agentlens.health.HealthScorer` counts them.
+        self.error_count = 0
+        self.tool_count = 0
+        self.tool_failures = 0
+        self.duration_count = 0
+        self.total_duration = 0.0
+        #: Uniform sample of at most *reservoir_size* event durations.
+        self.durations: list[float] = []
+        self.tools: dict[str, ToolSummary] = {}
+        #: ``model -> [calls, tokens]`` of ``llm_call`` events.
+        self.models: dict[str, list[int]] = {}
+        self.first_timestamp: datetime | None = None
+        self.last_timestamp: datetime | None = None
+        self._rng: random.Random | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"SessionSummary(events={self.event_count}, "
+            f"tokens={self.tokens_in + self.tokens_out}, errors={self.error_count})"
+        )
+
+    def add(self, event: AgentEvent) -> None:
+        """Fold *event* into the aggregates."""
+        tool_call = event.tool_call
+        self._add(
+            event.event_type, event.tokens_in, event.tokens_out, event.timestamp,
+            event.model, event.output_data, event.duration_ms,
+            tool_call is not None,
+            tool_call.tool_name if tool_call is not None else None,
+            tool_call.tool_output if tool_call is not None else None,
+            tool_call.duration_ms if tool_call is not None else None,
+        )
+
+    def add_payload(self, payload: dict[str, Any]) -> None:
+        """Fold in an event given as its wire dict."""
+        tool_call = payload.get("tool_call")
+        if tool_call is None:
+            tool_call = {}
+        timestamp = payload.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = parse_iso(timestamp)
+        self._add(
+            payload.get("event_type", "generic"),
+            payload.get("tokens_in", 0), payload.get("tokens_out", 0), timestamp,
+            payload.get("model"), payload.get("output_data"), payload.get("duration_ms"),
+            bool(tool_call), tool_call.get("tool_name"),
+            tool_call.get("tool_output"), tool_call.get("duration_ms"),
+        )
+
+    def _add(
+        self, event_type: str, tokens_in: int, tokens_out: int,
+        timestamp: datetime | None, model: str | None,
+        output_data: dict[str, Any] | None, duration_ms: float | None,
+        has_tool: bool, tool_name: str | None, tool_output: Any,
+        tool_duration_ms: float | None,
+    ) -> None:
+        self.event_count += 1
+        self.counts[event_type] = self.counts.get(event_type, 0) + 1
+        tokens = tokens_in + tokens_out
+        self.tokens_in += tokens_in
+        self.tokens_out += tokens_out
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+
+        if event_type == "llm_call":
+            self.llm_tokens += tokens
+            if model:
+                bucket = self.models.get(model)
+                if bucket is None:
+                    bucket = self.models[model] = [0, 0]
+                bucket[0] += 1
+                bucket[1] += tokens
+
+        tool_error = False
+        if has_tool:
+            self.tool_count += 1
+            tool_error = isinstance(tool_output, dict) and bool(tool_output.get("error"))
+            if tool_error:
+                self.tool_failures += 1
+            if event_type == "tool_call":
+                self._add_tool(tool_name, output_data, tool_duration_ms)
+        if event_type == "error" or tool_error:
+            self.error_count += 1
+
+        duration = _clean_duration(duration_ms)
+        if duration is not None:
+            self._add_duration(duration)
+
+    def _add_tool(
+        self, tool_name: str, output_data: dict[str, Any] | None, duration: float | None,
+    ) -> None:
+        # Same rules as narrative_render.build_tool_summaries.
+        summary = self.tools.get(tool_name)
+        if summary is None:
+            summary = self.tools[tool_name] = ToolSummary(tool_name=tool_name)
+        summary.call_count += 1
+        if output_data and output_data.get("error"):
+            summary.failure_count += 1
+        else:
+            summary.success_count += 1
+        if duration and math.isfinite(duration) and duration > 0:
+            summary.total_duration_ms += duration
+        summary.avg_duration_ms = summary.total_duration_ms / summary.call_count
+
+    def _add_duration(self, duration: float) -> None:
+        self.duration_count += 1
+        self.total_duration += duration
+        if len(self.durations) < self.reservoir_size:
+            self.durations.append(duration)
+            return
+        # Algorithm R: keep each of the n durations seen with equal chance.
+        if self._rng is None:
+            self._rng = random.Random()
+        slot = self._rng.randrange(self.duration_count)
+        if slot < self.reservoir_size:
+            self.durations[slot] = duration
+
+    def health_aggregate(self) -> dict[str, Any]:
+        """The pre-aggregated stats :class:`~agentlens.health.HealthScorer`
+        scores."""
+        return {
+            "total": self.event_count,
+            "error_count": self.error_count,
+            "total_tokens": self.tokens_in + self.tokens_out,
+            "total_duration": self.total_duration,
+            "duration_count": self.duration_count,
+            "durations": list(self.durations),
+            "tool_count": self.tool_count,
+            "tool_failures": self.tool_failures,
+        }
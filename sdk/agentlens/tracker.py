@@ -2,17 +2,31 @@
 
 from __future__ import annotations
 
+import threading
 import time
 from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 from collections.abc import Generator
 
-from agentlens.models import AgentEvent, ToolCall, DecisionTrace, Session
+from agentlens.models import (
+    AgentEvent,
+    DecisionTrace,
+    Session,
+    ToolCall,
+    event_payload,
+    plain_track_fields,
+    validate_track_fields,
+)
+from agentlens.sampling import DEFER, DROP, Sampler, _Deferred
+from agentlens.session_store import MemorySessionStore, SessionStore
 from agentlens.transport import Transport
+from agentlens.transport_async import create_transport
 from agentlens.health import HealthScorer, HealthReport, HealthThresholds
 from agentlens.timeline import TimelineRenderer
 from agentlens.span import Span
 from agentlens.tracker_alerts import AlertMixin
+from agentlens.tracker_batch import BatchMixin
 from agentlens.tracker_tags import TagMixin
 from agentlens.tracker_annotations import AnnotationMixin
 from agentlens.tracker_retention import RetentionMixin
@@ -24,14 +38,54 @@ class AgentTracker(
     AnnotationMixin,
     RetentionMixin,
     QueryMixin,
+    BatchMixin,
 ):
-    """Central tracker for agent observability."""
-
-    def __init__(self, transport: Transport) -> None:
-        self.transport = transport
-        self.sessions: dict[str, Session] = {}
-        self._current_session_id: str | None = None
-        self._active_spans: list[Span] = []
+    """Central tracker for agent observability.
+
+    If no *transport* is given, one is created for the default local
+    endpoint — an :class:`~agentlens.transport_async.AsyncTransport` when
+    constructed inside a running event loop, a threaded
+    :class:`~agentlens.transport.Transport` otherwise.
+
+    With a *sampler* only some sessions are shipped; see
+    :mod:`agentlens.sampling`.
+
+    Sessions and their events are kept in :attr:`sessions`, a
+    *session_store* — by default a
+    :class:`~agentlens.session_store.MemorySessionStore` that expires
+    ended sessions after an hour and keeps at most 10,000.
+
+    The current session and the stack of open spans are kept in
+    :mod:`contextvars`, so each thread and each asyncio task has its own:
+    one tracker can drive many concurrent sessions, and events and spans
+    are attributed to the session and parent span of the code that
+    produced them.  A task inherits the session and spans current when it
+    was created.  A thread starts with no current session; run it in
+    :func:`contextvars.copy_context` to give it the caller's.
+    """
+
+    def __init__(
+        self,
+        transport: Transport | None = None,
+        sampler: Sampler | None = None,
+        session_store: SessionStore | None = None,
+    ) -> None:
+        self.transport = transport if transport is not None else create_transport()
+        self.sampler = sampler
+        self.sessions: SessionStore = (
+            session_store if session_store is not None else MemorySessionStore()
+        )
+        self._session_var: ContextVar[str | None] = ContextVar(f"agentlens_session_{id(self)}")
+        self._spans_var: ContextVar[tuple[Span, ...]] = ContextVar(
+            f"agentlens_spans_{id(self)}", default=(),
+        )
+        # Sessions the sampler did not keep outright: dropped ones, and
+        # deferred ones whose events wait here for the tail decision.
+        # Guarded by _sampling_lock; both forget sessions the store removes.
+        self._dropped: set[str] = set()
+        self._deferred: dict[str, _Deferred] = {}
+        self._sampling_lock = threading.Lock()
+        self.sessions.on_remove(self._session_removed)
 
     def __repr__(self) -> str:
         return (
@@ -42,19 +96,76 @@ class AgentTracker(
 
     def _emit(self, event_type: str, **fields: Any) -> None:
         """Send a single event dict to the transport."""
+        if self._dropped and fields.get("session_id") in self._dropped:
+            return
         payload = {"event_type": event_type, **fields}
+        if self._deferred and self._defer(payload):
+            return
         self.transport.send_events([payload])
 
+    @property
+    def sampled(self) -> bool:
+        """Whether events for the current session are recorded.
+
+        False when the sampler dropped the current session; instrumentation
+        can then skip building event data altogether.
+        """
+        return not (self._dropped and self._current_session_id in self._dropped)
+
+    def _defer(self, payload: dict[str, Any]) -> bool:
+        """Buffer *payload* if its session awaits the tail decision."""
+        sid = payload.get("session_id")
+        with self._sampling_lock:
+            deferred = self._deferred.get(sid)
+            if deferred is None:
+                return False
+            deferred.append(payload)
+            if len(deferred.events) <= self.sampler.tail.max_buffered_events:
+                return True
+            # Later events go out directly.
+            del self._deferred[sid]
+        self.sampler.record_overflow()
+        self._release(deferred, "buffer")
+        return True
+
+    def _release(self, deferred: _Deferred, reason: str) -> None:
+        """Ship the buffer of a deferred session, already taken out of
+        :attr:`_deferred`."""
+        events = deferred.events
+        start = events[0]
+        if start["event_type"] == "session_start":
+            start["metadata"] = {**start["metadata"], "sampling": self._sampling_info(reason)}
+        self.transport.send_events(events)
+
+    def _sampling_info(self, kept_by: str) -> dict[str, Any]:
+        return {"rate": self.sampler.rate, "kept_by": kept_by}
+
+    @property
+    def _current_session_id(self) -> str | None:
+        """ID of the current session in this thread / asyncio task."""
+        return self._session_var.get(None)
+
+    @_current_session_id.setter
+    def _current_session_id(self, session_id: str | None) -> None:
+        self._session_var.set(session_id)
+
+    @property
+    def _active_spans(self) -> tuple[Span, ...]:
+        """Open spans in this thread / asyncio task, outermost first."""
+        return self._spans_var.get()
+
     @property
     def current_session(self) -> Session | None:
-        if self._current_session_id and self._current_session_id in self.sessions:
-            return self.sessions[self._current_session_id]
+        sid = self._current_session_id
+        if sid and sid in self.sessions:
+            return self.sessions[sid]
         return None
 
     @property
     def current_span(self) -> Span | None:
         """Return the innermost active span, or None."""
-        return self._active_spans[-1] if self._active_spans else None
+        spans = self._spans_var.get()
+        return spans[-1] if spans else None
 
     def _resolve_session(
         self,
@@ -122,7 +233,8 @@ class AgentTracker(
                 s.set_attribute("sources_found", 3)
         """
         sid = self._current_session_id or ""
-        parent = self.current_span
+        spans = self._spans_var.get()
+        parent = spans[-1] if spans else None
 
         sp = Span(
             name=name,
@@ -147,7 +259,7 @@ class AgentTracker(
             attributes=sp.attributes,
         )
 
-        self._active_spans.append(sp)
+        token = self._spans_var.set(spans + (sp,))
         try:
             yield sp
             if sp.status == "active":
@@ -160,7 +272,11 @@ class AgentTracker(
             from agentlens.span import _utcnow
             sp.ended_at = _utcnow()
             sp.duration_ms = (time.monotonic() - sp._mono_start) * 1000
-            self._active_spans.pop()
+            try:
+                self._spans_var.reset(token)
+            except ValueError:
+                # Exited in another context than it was entered in.
+                self._spans_var.set(spans)
 
             # Emit span_end event
             self._emit(
@@ -184,12 +300,24 @@ class AgentTracker(
         self.sessions[session.session_id] = session
         self._current_session_id = session.session_id
 
+        sent_metadata = metadata or {}
+        if self.sampler is not None:
+            decision = self.sampler.head(session.session_id)
+            if decision == DROP:
+                with self._sampling_lock:
+                    self._dropped.add(session.session_id)
+            elif decision == DEFER:
+                with self._sampling_lock:
+                    self._deferred[session.session_id] = _Deferred()
+            else:
+                sent_metadata = {**sent_metadata, "sampling": self._sampling_info("head")}
+
         # Send session start event
         self._emit(
             "session_start",
             session_id=session.session_id,
             agent_name=agent_name,
-            metadata=metadata or {},
+            metadata=sent_metadata,
             timestamp=session.started_at.isoformat(),
         )
 
@@ -209,9 +337,35 @@ class AgentTracker(
                 total_tokens_out=session.total_tokens_out,
                 status="completed",
             )
-            self.transport.flush()
+            with self._sampling_lock:
+                dropped = sid in self._dropped
+                self._dropped.discard(sid)
+                deferred = self._deferred.pop(sid, None)
+            if not dropped and (deferred is None or self._decide_tail(session, deferred)):
+                self.transport.flush()
+            self.sessions.session_ended(session)
             if sid == self._current_session_id:
-                self._current_session_id = None
+                self._session_var.set(None)
+
+    def _session_removed(self, session_id: str) -> None:
+        with self._sampling_lock:
+            self._dropped.discard(session_id)
+            self._deferred.pop(session_id, None)
+
+    def _decide_tail(self, session: Session, deferred: _Deferred) -> bool:
+        """Ship a deferred *session* if the tail policy keeps it."""
+        duration_ms = None
+        if session.ended_at is not None:
+            duration_ms = (session.ended_at - session.started_at).total_seconds() * 1000
+        reason = self.sampler.tail_reason(
+            deferred,
+            duration_ms,
+            session.total_tokens_in + session.total_tokens_out,
+        )
+        if reason is None:
+            return False
+        self._release(deferred, reason)
+        return True
 
     def health_score(
         self,
@@ -287,7 +441,16 @@ class AgentTracker(
         tool_output: dict | None = None,
         duration_ms: float | None = None,
     ) -> AgentEvent:
-        """Track a single agent event."""
+        """Track a single agent event.
+
+        In a session the sampler dropped, nothing is recorded or sent and
+        the returned event is a bare placeholder.
+        """
+        sid = self._current_session_id
+        if self._dropped and sid in self._dropped:
+            return AgentEvent.model_construct(session_id=sid, event_type=event_type)
+        session = self.sessions.get(sid) if sid else None
+
         # Build tool call if provided
         tool_call = None
         if tool_name:
@@ -303,11 +466,11 @@ class AgentTracker(
         if reasoning:
             decision_trace = DecisionTrace(
                 reasoning=reasoning,
-                step=len(self.current_session.events) + 1 if self.current_session else 0,
+                step=session.event_count + 1 if session else 0,
             )
 
         event = AgentEvent(
-            session_id=self._current_session_id or "",
+            session_id=sid or "",
             event_type=event_type,
             input_data=input_data,
             output_data=output_data,
@@ -319,23 +482,87 @@ class AgentTracker(
             duration_ms=duration_ms,
         )
 
-        # Add to current session
-        if self.current_session:
-            self.current_session.add_event(event)
+        api_dict = event.to_api_dict()
+        self._enter_spans(api_dict)
+        if session:
+            self.sessions.add_event(session, event, api_dict)
+        self._send_tracked(api_dict)
+        return event
+
+    def capture(
+        self,
+        event_type: str = "generic",
+        input_data: dict | None = None,
+        output_data: dict | None = None,
+        model: str | None = None,
+        tokens_in: int = 0,
+        tokens_out: int = 0,
+        reasoning: str | None = None,
+        tool_name: str | None = None,
+        tool_input: dict | None = None,
+        tool_output: dict | None = None,
+        duration_ms: float | None = None,
+    ) -> str | None:
+        """Track an event like :meth:`track`, at a fraction of the cost.
+
+        The event is written straight to the dict that is sent, with no
+        Pydantic models built.  The session records that dict; it becomes
+        an :class:`~agentlens.models.AgentEvent` only if the session's
+        ``events`` are read, e.g. by :meth:`explain` or an export.
 
+        Arguments that already have the types :meth:`track` documents are
+        only type-checked; others are validated and converted as
+        :meth:`track` would, at about the cost of :meth:`track`.
+
+        Returns:
+            The event ID, or ``None`` in a session the sampler dropped.
+
+        Raises:
+            pydantic.ValidationError: If an argument has the wrong type.
+        """
+        sid = self._current_session_id
+        if self._dropped and sid in self._dropped:
+            return None
+        if not plain_track_fields(
+            event_type, input_data, output_data, model, tokens_in, tokens_out,
+            reasoning, tool_name, tool_input, tool_output, duration_ms,
+        ):
+            return self.capture(**validate_track_fields(dict(
+                event_type=event_type, input_data=input_data, output_data=output_data,
+                model=model, tokens_in=tokens_in, tokens_out=tokens_out,
+                reasoning=reasoning, tool_name=tool_name, tool_input=tool_input,
+                tool_output=tool_output, duration_ms=duration_ms,
+            )))
+        session = self.sessions.get(sid) if sid else None
+
+        payload = event_payload(
+            sid or "",
+            session.event_count + 1 if session and reasoning else 0,
+            event_type, input_data, output_data, model, tokens_in, tokens_out,
+            reasoning, tool_name, tool_input, tool_output, duration_ms,
+        )
+        self._enter_spans(payload)
+        if session:
+            self.sessions.add_record(session, payload)
+        self._send_tracked(payload)
+        return payload["event_id"]
+
+    def _enter_spans(self, api_dict: dict[str, Any]) -> None:
+        """Count the event on the open spans and tag *api_dict* with the
+        innermost one, before the session records it."""
         # Increment event count on active span(s)
-        for sp in self._active_spans:
+        spans = self._spans_var.get()
+        for sp in spans:
             sp.event_count += 1
+        # Attach span context so the backend can associate events with spans
+        if spans:
+            api_dict["span_id"] = spans[-1].span_id
 
+    def _send_tracked(self, api_dict: dict[str, Any]) -> None:
         # Send to backend — use send_event() directly to skip the
         # single-element list allocation and unpacking in send_events().
-        api_dict = event.to_api_dict()
-        # Attach span context so the backend can associate events with spans
-        if self._active_spans:
-            api_dict["span_id"] = self._active_spans[-1].span_id
-        self.transport.send_event(api_dict)
-
-        return event
+        if not (self._deferred and self._defer(api_dict)):
+            self.transport.send_event(api_dict)
 
     def track_tool(
         self,
@@ -360,7 +587,9 @@ class AgentTracker(
         (agent name, session ID, start time, status, total token counts)
         followed by a numbered event timeline.  Each event line shows its
         type and, when present, the model, the invoked tool, the decision
-        reasoning, and the per-event token counts.
+        reasoning, and the per-event token counts.  A session that keeps
+        a :class:`~agentlens.session_summary.SessionSummary` instead of its
+        events lists event counts by type and per-tool call counts instead.
 
         Unlike the other query methods, this never raises for a missing
         session - it returns a friendly placeholder string instead, so it is
@@ -392,9 +621,19 @@ class AgentTracker(
             f"**Status:** {session.status}",
             f"**Total tokens:** {session.total_tokens_in} in / {session.total_tokens_out} out",
             "",
-            "### Event Timeline:",
         ]
 
+        summary = session.summary
+        if summary is not None:
+            # The session kept aggregates, not events: no timeline to show.
+            lines.append("### Event Summary:")
+            for event_type, count in sorted(summary.counts.items()):
+                lines.append(f"- **{event_type}**: {count}")
+            for name, tool in sorted(summary.tools.items()):
+                lines.append(f"- tool {name}: {tool.call_count} calls, {tool.failure_count} failed")
+            return "\n".join(lines)
+
+        lines.append("### Event Timeline:")
         for i, event in enumerate(session.events, 1):
             ts = event.timestamp.strftime("%H:%M:%S.%f")[:-3]
             line = f"{i}. [{ts}] **{event.event_type}**"
@@ -0,0 +1,172 @@
+"""Bulk event tracking mixin for AgentTracker.
+
+Ingesting a trace recorded elsewhere means pushing hundreds of events into
+a session in a tight loop.  :meth:`BatchMixin.track_many` takes them all at
+once — as a list of rows or as columns — checks the field names and
+values in one pass, builds the events the way :meth:`AgentTracker.capture()
+<agentlens.tracker.AgentTracker.capture>` does, adds them to the session in
+one step and hands them to the transport a chunk at a time::
+
+    tracker.track_many([
+        {"event_type": "llm_call", "model": "gpt-4o", "tokens_in": 812},
+        {"event_type": "tool_call", "tool_name": "search", "duration_ms": 95.0},
+    ])
+
+    tracker.track_many({
+        "event_type": ["llm_call", "llm_call"],
+        "tokens_in": [812, 640],
+        "timestamp": ["2025-01-01T12:00:00+00:00", "2025-01-01T12:00:02+00:00"],
+    })
+
+    with tracker.batch() as batch:
+        for step in recorded_steps:
+            batch.add(event_type=step.kind, tokens_in=step.tokens)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from agentlens.models import TrackFields, event_payload, validate_track_rows
+
+__all__ = ["BatchMixin", "EventBatch", "TRACK_FIELDS"]
+
+#: Fields an event passed to :meth:`BatchMixin.track_many` may have: the
+#: arguments of ``track()``, plus ``timestamp`` (a ``datetime`` or an ISO
+#: 8601 string) for events recorded earlier.
+TRACK_FIELDS = frozenset(TrackFields.__annotations__)
+
+
+def _check_fields(fields: Iterable[str]) -> None:
+    unknown = set(fields) - TRACK_FIELDS
+    if unknown:
+        raise TypeError(f"Unknown event field(s): {', '.join(sorted(unknown))}")
+
+
+def _rows(events: Iterable[Mapping[str, Any]] | Mapping[str, Iterable[Any]]) -> list[TrackFields]:
+    """*events* as a list of rows, with their field names and values
+    checked."""
+    if isinstance(events, Mapping):
+        _check_fields(events)
+        names = list(events)
+        columns = [list(column) for column in events.values()]
+        if len({len(column) for column in columns}) > 1:
+            raise ValueError("All columns must have the same length")
+        return validate_track_rows([dict(zip(names, values)) for values in zip(*columns)])
+    rows = list(events)
+    if rows:
+        _check_fields(set().union(*rows))
+    return validate_track_rows(rows)
+
+
+class EventBatch:
+    """Collects events and tracks them with one
+    :meth:`~BatchMixin.track_many` call.
+
+    Returned by :meth:`BatchMixin.batch`.  Used as a context manager, the
+    batch is flushed on exit — also when the block raises, so the events
+    recorded up to the error are not lost.
+    """
+
+    def __init__(self, tracker: BatchMixin, chunk_size: int = 500) -> None:
+        self._tracker = tracker
+        self.chunk_size = chunk_size
+        self._rows: list[dict[str, Any]] = []
+        #: IDs of the events flushed so far.
+        self.event_ids: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __repr__(self) -> str:
+        return f"EventBatch(pending={len(self._rows)}, flushed={len(self.event_ids)})"
+
+    def add(self, **fields: Any) -> None:
+        """Queue an event; *fields* as for ``track()``, plus ``timestamp``."""
+        self._rows.append(fields)
+
+    def flush(self) -> list[str]:
+        """Track the queued events and return their IDs."""
+        rows, self._rows = self._rows, []
+        ids = self._tracker.track_many(rows, chunk_size=self.chunk_size)
+        self.event_ids.extend(ids)
+        return ids
+
+    def __enter__(self) -> EventBatch:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.flush()
+
+
+class BatchMixin:
+    """Mixin providing bulk event tracking.
+
+    Requires ``self.transport``, ``self.sessions``, ``self._current_session_id``,
+    ``self._dropped``, ``self._deferred``, ``self._defer()`` and
+    ``self._spans_var``.
+    """
+
+    def track_many(
+        self,
+        events: Iterable[Mapping[str, Any]] | Mapping[str, Iterable[Any]],
+        chunk_size: int = 500,
+    ) -> list[str]:
+        """Track many events in the current session at once.
+
+        Args:
+            events: Either rows — one mapping of ``track()`` arguments per
+                event — or columns — one sequence per argument, all of the
+                same length.  A ``timestamp`` field (``datetime`` or ISO
+                8601 string) keeps the time an event was recorded.
+            chunk_size: Events per ``Transport.send_events`` call.
+
+        Returns:
+            The event IDs, in order; empty in a session the sampler
+            dropped.
+
+        Values are checked and converted as ``track()`` would before
+        anything is recorded or sent; one invalid event rejects the call.
+
+        Raises:
+            TypeError: If an event has a field ``track()`` does not take.
+            pydantic.ValidationError: If a value has the wrong type.
+            ValueError: If the columns differ in length, or *chunk_size*
+                is not positive.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        rows = _rows(events)
+        sid = self._current_session_id
+        if not rows or (self._dropped and sid in self._dropped):
+            return []
+        session = self.sessions.get(sid) if sid else None
+        step = session.event_count if session else None
+
+        payloads = [
+            event_payload(sid or "", step + i if step is not None else 0, **row)
+            for i, row in enumerate(rows, 1)
+        ]
+
+        spans = self._spans_var.get()
+        for sp in spans:
+            sp.event_count += len(payloads)
+        if spans:
+            span_id = spans[-1].span_id
+            for payload in payloads:
+                payload["span_id"] = span_id
+
+        if session:
+            self.sessions.add_records(session, payloads)
+        outgoing = payloads
+        if self._deferred:
+            outgoing = [p for p in payloads if not self._defer(p)]
+        for start in range(0, len(outgoing), chunk_size):
+            self.transport.send_events(outgoing[start:start + chunk_size])
+        return [p["event_id"] for p in payloads]
+
+    def batch(self, chunk_size: int = 500) -> EventBatch:
+        """Return an :class:`EventBatch` that tracks what is added to it
+        with :meth:`track_many`."""
+        return EventBatch(self, chunk_size)
@@ -2,14 +2,41 @@
 
 from __future__ import annotations
 
+import atexit
+import concurrent.futures
+import json
 import logging
+import os
+import queue
 import threading
+import time
 import warnings
-from typing import Any
+import weakref
+from typing import Any, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
 import httpx
 
+from agentlens.transport_adaptive import AdaptiveBatching
+from agentlens.transport_buffer import EventBuffer
+from agentlens.transport_buffer import flatten as _flatten
+from agentlens.transport_codecs import Codec, GzipCodec, get_codec
+from agentlens.transport_endpoints import EndpointPool
+from agentlens.transport_http import HTTPConfig
+from agentlens.transport_lanes import partition, session_first
+from agentlens.transport_limits import EventLimits
+from agentlens.transport_metrics import TransportMetrics
+from agentlens.transport_retry import CircuitBreaker, ExponentialBackoff, parse_retry_after
+from agentlens.transport_shutdown import ShutdownReport
+from agentlens.transport_spool import DiskSpool
+from agentlens.transport_wire import (
+    MSGPACK_CONTENT_TYPE,
+    WIRE_FORMATS,
+    decode_event,
+    encode_batch,
+    encode_event_msgpack,
+)
+
 logger = logging.getLogger("agentlens.transport")
 
 _LOCALHOST_HOSTS = {"localhost", "127.0.0.1", "::1", "[::1]"}
@@ -24,62 +51,384 @@ def _is_plaintext_remote(endpoint: str) -> bool:
     host = (parsed.hostname or "").lower()
     return host not in _LOCALHOST_HOSTS
 
-# Hard cap to prevent unbounded memory growth if the backend is down
+# Endpoint scheme for a local collector socket (see agentlens.transport_uds)
+UDS_SCHEME = "uds://"
+
+# Endpoint scheme for an NDJSON output directory (see agentlens.transport_file)
+FILE_SCHEME = "file://"
+
+# Hard caps to prevent unbounded memory growth if the backend is down
 _MAX_BUFFER_SIZE = 5000
+_MAX_BUFFER_BYTES = 64 * 1024 * 1024
+
+# Mirrors the backend's MAX_BATCH_SIZE: larger /events batches are rejected
+_MAX_BATCH_EVENTS = 500
+
+# Default cap on the serialized (uncompressed) size of one /events batch
+_DEFAULT_MAX_BATCH_BYTES = 1024 * 1024
+
+# Queue sentinel telling a sender worker to exit
+_STOP_WORKER = None
+
+# Client errors worth retrying: the rest mean the batch itself is refused.
+_RETRYABLE_4XX = frozenset({408, 429})
+
+
+# Transports to re-initialise in the child after os.fork()
+_live_transports: weakref.WeakSet[Transport] = weakref.WeakSet()
+
+
+def _reinit_after_fork() -> None:
+    for transport in list(_live_transports):
+        try:
+            transport._after_fork()
+        except Exception:  # pragma: no cover - defensive
+            logger.exception("Failed to re-initialise transport after fork")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def _remaining(deadline: float) -> float:
+    """Seconds left until the ``time.monotonic()`` *deadline*, never negative."""
+    return max(0.0, deadline - time.monotonic())
+
+
+def close_all(timeout: float | None = None) -> ShutdownReport:
+    """Close every open transport within one overall deadline.
+
+    Registered with :mod:`atexit`, so events still buffered when the
+    interpreter exits are delivered or spooled instead of lost.  *timeout*
+    defaults to the largest ``shutdown_timeout`` among the transports.
+
+    Returns:
+        The combined :class:`~agentlens.transport_shutdown.ShutdownReport`.
+    """
+    transports = list(_live_transports)
+    if timeout is None:
+        timeout = max((t.shutdown_timeout for t in transports), default=0.0)
+    deadline = time.monotonic() + timeout
+    report = ShutdownReport()
+    for transport in transports:
+        try:
+            result = transport.close(timeout=_remaining(deadline))
+        except Exception:  # pragma: no cover - defensive
+            logger.exception("Failed to close %r at shutdown", transport)
+            continue
+        if result is not None:
+            report += result
+    return report
+
+
+atexit.register(close_all)
+
+
+# Outcome of one lane: unsent events, whether that was a failure, and
+# the backend's Retry-After delay if it gave one.
+_LaneResult = Tuple[List[bytes], bool, Optional[float]]
+
+
+def encode_event(event: dict[str, Any]) -> bytes:
+    """Serialize one event to compact UTF-8 JSON.
+
+    Events are encoded once, when they enter the buffer, so batches can be
+    assembled by joining bytes and measured exactly.
+
+    Raises:
+        TypeError / ValueError: If *event* is not JSON-serializable.
+    """
+    return json.dumps(
+        event, ensure_ascii=False, separators=(",", ":"), allow_nan=False,
+    ).encode("utf-8")
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Return the delay requested by *response*'s ``Retry-After`` header."""
+    return parse_retry_after(response.headers.get("Retry-After"))
+
+
+def _deadline_post(post: Any, deadline: float) -> Any:
+    """Wrap *post* so that each request only gets the time left until
+    *deadline*, and fails straight away once it has passed."""
+
+    def bounded(url: str, **kwargs: Any) -> httpx.Response:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise httpx.TimeoutException("shutdown deadline passed")
+        return post(url, timeout=remaining, **kwargs)
+
+    return bounded
 
 
 class Transport:
     """Batched HTTP transport for sending events to the AgentLens API.
 
-    Events are buffered in memory and flushed either when *batch_size* events
-    accumulate or every *flush_interval* seconds (whichever comes first).
+    Events are serialized to JSON once, when they are buffered, and flushed
+    either when *batch_size* events or *max_batch_bytes* bytes accumulate or
+    every *flush_interval* seconds (whichever comes first).  Each upload is
+    cut to at most ``_MAX_BATCH_EVENTS`` events and *max_batch_bytes* bytes,
+    so request sizes stay predictable regardless of payload size.
 
     Failed flushes are retried up to *max_retries* times.  After that the
-    events are dropped and a warning is logged.  The internal buffer is also
-    capped at ``_MAX_BUFFER_SIZE`` to prevent unbounded memory growth when the
-    backend is unreachable for an extended period.
+    events are dropped and a warning is logged.  Retries are spaced by
+    *backoff* (exponential with full jitter, or the backend's
+    ``Retry-After``): until the delay has passed, neither the flush thread
+    nor full batches trigger an upload.  *circuit_breaker* stops uploads
+    altogether after repeated failures and probes the backend with a
+    single request once its recovery timeout has passed.
+
+    The internal buffer is capped at *max_buffer_size* events and
+    *max_buffer_bytes* bytes to prevent unbounded memory growth when the
+    backend is unreachable for an extended period.  *overflow_policy*
+    decides what happens at the cap — ``"drop_oldest"`` (default),
+    ``"drop_newest"``, ``"block"`` (wait up to *block_timeout* seconds for
+    room) or ``"priority"`` (keep session boundaries and errors); see
+    :mod:`agentlens.transport_buffer`.
+
+    With a *spool* (a directory path or a
+    :class:`~agentlens.transport_spool.DiskSpool`) nothing is dropped:
+    failed batches and buffer overflow are appended to disk instead, and
+    while the spool holds events every new batch goes through it too, so
+    uploads stay in order.  The spool is drained on each flush once the
+    backend accepts requests again — also by a later process opening the
+    same directory.
+
+    *endpoint* may also be a list of backend URLs.  Each batch then goes to
+    one of them — ``load_balancing="round_robin"`` (default) or
+    ``"least_inflight"`` — and a connection error fails the batch over to
+    the next endpoint straight away.  An endpoint that fails *eject_after*
+    times in a row is taken out of rotation for *eject_for* seconds; see
+    :mod:`agentlens.transport_endpoints`.
+
+    *max_in_flight* allows that many concurrent ``/events`` requests.  A
+    backlog larger than one request is split into lanes by ``session_id``
+    and the lanes are posted in parallel, so each session's events still
+    arrive in order; see :mod:`agentlens.transport_lanes`.
+
+    With *max_latency* (seconds) the batch size and flush interval adapt
+    to the observed event rate: batches grow towards ``_MAX_BATCH_EVENTS``
+    under load and a quiet transport flushes within *max_latency* instead
+    of waiting out *flush_interval*.  *batch_size* and *flush_interval*
+    become the bounds; see :mod:`agentlens.transport_adaptive`.
+
+    ``wire_format="msgpack"`` sends batches in a compact MessagePack
+    encoding instead of JSON; see :mod:`agentlens.transport_wire`.  The
+    spool always stores JSON.
+
+    By default a full batch is uploaded on the thread that filled it.  With
+    ``sender_workers >= 1`` producers never touch the network: full batches
+    (and explicit :meth:`flush` calls) are handed to a queue consumed by that
+    many dedicated sender threads, making ``send_event`` an O(1),
+    non-blocking append.  :meth:`enqueue_latency` reports the producer-side
+    cost of ``send_event`` / ``send_events`` in either mode.
+
+    *limits* (:class:`~agentlens.transport_limits.EventLimits`) rate
+    limits events per type and per session, and truncates oversized
+    ``input_data`` / ``output_data``, before they are buffered.
+
+    :meth:`stats` returns counters and histograms of what the transport
+    has done — events enqueued, sent, retried, spooled and dropped (by
+    reason), batch sizes, upload latency and buffer lock contention; see
+    :mod:`agentlens.transport_metrics`.
+
+    The HTTP client is built from *http* (an
+    :class:`~agentlens.transport_http.HTTPConfig`: HTTP/2, connection pool
+    limits and per-phase timeouts).  Pass *http_client* instead to share
+    one ``httpx.Client`` between transports; it is never closed by the
+    transport.
+
+    :meth:`close` drains what is left within *shutdown_timeout* seconds
+    and spools or drops the rest, reporting which; transports still open
+    at interpreter exit are closed the same way.  See
+    :mod:`agentlens.transport_shutdown`.
     """
 
     def __init__(
         self,
-        endpoint: str = "http://localhost:3000",
+        endpoint: str | Sequence[str] = "http://localhost:3000",
         api_key: str = "default",
         batch_size: int = 10,
         flush_interval: float = 5.0,
         max_retries: int = 3,
+        sender_workers: int = 0,
+        compression: str | Codec | None = None,
+        compression_threshold: int = 1024,
+        max_batch_bytes: int = _DEFAULT_MAX_BATCH_BYTES,
+        spool: str | os.PathLike[str] | DiskSpool | None = None,
+        backoff: ExponentialBackoff | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        overflow_policy: str = "drop_oldest",
+        block_timeout: float = 1.0,
+        max_buffer_size: int = _MAX_BUFFER_SIZE,
+        max_buffer_bytes: int = _MAX_BUFFER_BYTES,
+        load_balancing: str = "round_robin",
+        eject_after: int = 3,
+        eject_for: float = 30.0,
+        max_in_flight: int = 1,
+        max_latency: float | None = None,
+        wire_format: str = "json",
+        shutdown_timeout: float = 10.0,
+        http: HTTPConfig | None = None,
+        http_client: Any = None,
+        limits: EventLimits | None = None,
     ) -> None:
-        self.endpoint = endpoint.rstrip("/")
+        if http_client is not None and not isinstance(http_client, self._client_class):
+            raise TypeError(
+                f"{type(self).__name__} needs an {self._client_class.__module__}."
+                f"{self._client_class.__name__}; got {type(http_client).__name__}"
+            )
+        if sender_workers < 0:
+            raise ValueError("sender_workers must be >= 0")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if max_batch_bytes <= 0:
+            raise ValueError("max_batch_bytes must be > 0")
+        if wire_format not in WIRE_FORMATS:
+            raise ValueError(
+                f"wire_format must be one of {', '.join(WIRE_FORMATS)}; got {wire_format!r}"
+            )
+        urls = [endpoint] if isinstance(endpoint, str) else list(endpoint)
+        for scheme, cls_name in (
+            (UDS_SCHEME, "UnixSocketTransport"), (FILE_SCHEME, "NDJSONFileTransport"),
+        ):
+            if any(url.startswith(scheme) for url in urls):
+                raise ValueError(
+                    f"{scheme} endpoints are served by {cls_name}; "
+                    "use create_transport() or agentlens.init()"
+                )
+        self._endpoints = EndpointPool(
+            urls, load_balancing, eject_after=eject_after, eject_for=eject_for,
+        )
+        # Batches are spread over every endpoint; the convenience
+        # request helpers (get/post/put/delete) use the first one.
+        self.endpoint = self._endpoints.endpoints[0].url
         self._api_key = api_key
 
         # Warn when API credentials would be sent in cleartext over the
         # network.  Localhost is exempt (dev/testing), but any remote
         # endpoint should use HTTPS to protect the API key in transit.
-        if api_key != "default" and _is_plaintext_remote(self.endpoint):
-            warnings.warn(
-                f"AgentLens API key is being sent over plaintext HTTP to "
-                f"{self.endpoint}. This exposes your credentials on the "
-                f"network. Use HTTPS for non-localhost endpoints.",
-                stacklevel=2,
-            )
-            logger.warning(
-                "API key sent over plaintext HTTP to %s — use HTTPS",
-                self.endpoint,
-            )
+        for url in self.endpoints:
+            if api_key != "default" and _is_plaintext_remote(url):
+                warnings.warn(
+                    f"AgentLens API key is being sent over plaintext HTTP to "
+                    f"{url}. This exposes your credentials on the "
+                    f"network. Use HTTPS for non-localhost endpoints.",
+                    stacklevel=2,
+                )
+                logger.warning(
+                    "API key sent over plaintext HTTP to %s — use HTTPS",
+                    url,
+                )
 
         self.batch_size = batch_size
         self.flush_interval = flush_interval
+        self._adaptive = (
+            AdaptiveBatching(batch_size, _MAX_BATCH_EVENTS, flush_interval, max_latency)
+            if max_latency is not None
+            else None
+        )
         self.max_retries = max_retries
+        self.sender_workers = sender_workers
+        self.max_in_flight = max_in_flight
+        self._codec = get_codec(compression)
+        self.compression_threshold = compression_threshold
+        self.max_batch_bytes = max_batch_bytes
+        self.wire_format = wire_format
+        self._encode_event = encode_event_msgpack if wire_format == "msgpack" else encode_event
+        if spool is not None and not isinstance(spool, DiskSpool):
+            spool = DiskSpool(spool)
+        self.spool: DiskSpool | None = spool
+        self.backoff = backoff if backoff is not None else ExponentialBackoff()
+        self.circuit_breaker = (
+            circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        )
+        # time.monotonic() before which automatic flushes are suppressed
+        self._retry_at = 0.0
 
-        self._buffer: list[dict[str, Any]] = []
-        self._pending_batch: list[dict[str, Any]] | None = None
+        self._buffer = EventBuffer(max_buffer_size, max_buffer_bytes, overflow_policy)
+        self.block_timeout = block_timeout
+        self.shutdown_timeout = shutdown_timeout
+        self.limits = limits
+        self.http = http if http is not None else HTTPConfig()
+        # A client passed in belongs to the caller and may be shared.
+        self._shared_client = http_client
         self._consecutive_failures: int = 0
+        self._init_process_state()
+        self._client = self._make_client()
+        self._start_flusher()
+        _live_transports.add(self)
+
+    def _init_process_state(self) -> None:
+        """Create the locks, queues and worker bookkeeping.
+
+        Called again in a forked child (see :meth:`_after_fork`): a lock
+        held by one of the parent's threads at ``fork()`` time would stay
+        locked forever in the child.
+        """
+        self._pending_batch: Sequence[list[bytes]] | None = None
+        self._pending_spill: list[bytes] | None = None
+        self._spool_drain_lock = threading.Lock()
         self._lock = threading.Lock()
-        self._client = httpx.Client(timeout=10.0)
+        # Signalled whenever the buffer is drained (for overflow_policy="block")
+        self._not_full = threading.Condition(self._lock)
+        # With max_in_flight > 1 one upload round runs at a time, so a
+        # failed lane is re-queued before anything newer is drained.
+        self._round_active = False
+        self._round_done = threading.Condition(self._lock)
+        self._lane_pool: concurrent.futures.ThreadPoolExecutor | None = None
+        self._metrics = TransportMetrics()
+        self._batch_queue: queue.SimpleQueue[list[bytes] | None] = queue.SimpleQueue()
+        self._sender_threads: list[threading.Thread] = []
+
+    def _after_fork(self) -> None:
+        """Make this transport usable in a freshly forked child process.
+
+        The child inherits the parent's buffer, but not its flush thread,
+        sender workers or any lock state it can trust.  The buffered events
+        still belong to the parent (which will send them), so the child
+        starts empty, with new locks, threads and HTTP connections.  The
+        inherited client is abandoned rather than closed: its sockets are
+        shared with the parent.  That includes a shared *http_client*; the
+        child builds its own from :attr:`http`.  A spool moves to a per-process
+        subdirectory so parent and children never write the same segment.
+        """
+        self._init_process_state()
+        self._buffer.clear()
+        self._consecutive_failures = 0
+        self._retry_at = 0.0
+        for obj in (self.circuit_breaker, self._endpoints, self.limits):
+            if obj is not None:
+                obj._lock = threading.Lock()
+        self._endpoints.reset_inflight()
+        if self.spool is not None:
+            self.spool = self.spool.for_child(os.getpid())
+        self._shared_client = None
+        self._client = self._make_client()
+        self._start_flusher()
+
+    #: Type a shared *http_client* must have.
+    _client_class: type = httpx.Client
 
-        # Start background flush thread
+    def _make_client(self) -> Any:
+        """Create the HTTP client used for batch uploads."""
+        if self._shared_client is not None:
+            return self._shared_client
+        return self.http.build_client()
+
+    def _start_flusher(self) -> None:
+        """Start the background thread that flushes every *flush_interval*."""
         self._stop_event = threading.Event()
         self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
         self._flush_thread.start()
+        for i in range(self.sender_workers):
+            worker = threading.Thread(
+                target=self._sender_loop,
+                name=f"agentlens-sender-{i}",
+                daemon=True,
+            )
+            worker.start()
+            self._sender_threads.append(worker)
 
     @property
     def api_key(self) -> str:
@@ -88,6 +437,19 @@ class Transport:
         preventing accidental exposure via ``__dict__`` or ``vars()``."""
         return self._api_key
 
+    @property
+    def endpoints(self) -> list[str]:
+        """Every backend URL batches are load-balanced across."""
+        return [e.url for e in self._endpoints.endpoints]
+
+    @property
+    def overflow_policy(self) -> str:
+        return self._buffer.policy
+
+    @property
+    def _buffer_bytes(self) -> int:
+        return self._buffer.nbytes
+
     def __repr__(self) -> str:
         masked = (
             self._api_key[:4] + "****"
@@ -95,49 +457,141 @@ class Transport:
             else "****"
         )
         return (
-            f"Transport(endpoint={self.endpoint!r}, api_key={masked!r}, "
-            f"batch_size={self.batch_size}, buffer={len(self._buffer)})"
+            f"{type(self).__name__}(endpoint={self.endpoint!r}, api_key={masked!r}, "
+            f"batch_size={self.batch_size}, buffer={len(self._buffer)}, "
+            f"buffer_bytes={self._buffer_bytes})"
         )
 
-    def _buffer_and_maybe_flush(self) -> None:
+    def _buffer_and_maybe_flush(self, added: int = 0) -> None:
         """Check buffer limits and flush if ready.  Must be called with lock held.
 
-        Drops oldest events when the buffer exceeds ``_MAX_BUFFER_SIZE``
-        and returns a batch to send if ``batch_size`` is reached.  The
-        caller must call ``_send_batch`` on the returned batch (if any)
-        **after** releasing the lock.
+        Drops (or spills) oldest events when the buffer exceeds its caps and
+        returns a batch to send if ``batch_size`` events or
+        ``max_batch_bytes`` bytes have accumulated.  The caller must flatten
+        and dispatch the returned batch segments (if any) **after**
+        releasing the lock.
 
         This method mutates ``self._pending_batch`` — an internal slot
         used to pass the batch out of the locked section without returning
         it (keeping the call ergonomic for callers that hold the lock in
-        a ``with`` block).
+        a ``with`` block).  ``self._pending_spill`` works the same way for
+        evicted events bound for the spool.
+
+        *added* is the number of events just appended; it feeds the
+        adaptive batch size (if enabled).
         """
-        if len(self._buffer) > _MAX_BUFFER_SIZE:
-            dropped = len(self._buffer) - _MAX_BUFFER_SIZE
-            self._buffer = self._buffer[dropped:]
-            logger.warning(
-                "Event buffer exceeded %d entries; dropped %d oldest events",
-                _MAX_BUFFER_SIZE,
-                dropped,
-            )
-        if len(self._buffer) >= self.batch_size:
+        self._pending_spill = None
+        self._adapt(added)
+        self._enforce_buffer_cap()
+        if (
+            len(self._buffer) >= self.batch_size
+            or self._buffer_bytes >= self.max_batch_bytes
+        ) and self._may_send() and not self._round_active:
             self._pending_batch = self._drain_buffer()
+            self._round_active = self._serial_rounds
         else:
             self._pending_batch = None
 
+    def _enforce_buffer_cap(self) -> None:
+        """Evict events beyond the buffer caps according to the overflow
+        policy.  Must be called with lock held.
+
+        Evicted events are dropped, or with a spool handed out through
+        ``self._pending_spill`` so the disk write happens outside the lock.
+        """
+        evicted = self._buffer.evict()
+        if not evicted:
+            return
+        if self.spool is not None:
+            self._pending_spill = evicted
+            return
+        self._metrics.record_drop("overflow", len(evicted))
+        logger.warning(
+            "Event buffer exceeded %d entries / %d bytes; dropped %d events (%s)",
+            self._buffer.max_events,
+            self._buffer.max_bytes,
+            len(evicted),
+            self._buffer.policy,
+        )
+
+    def _wait_for_room(self, events: int, nbytes: int) -> None:
+        """Under ``overflow_policy="block"``, wait up to ``block_timeout``
+        for the buffer to drain enough to take *events* / *nbytes* more.
+        Must be called with lock held; the lock is released while waiting."""
+        buffer = self._buffer
+        if buffer.policy != "block" or buffer.has_room(events, nbytes):
+            return
+        if not self._can_block():
+            return
+        deadline = time.monotonic() + self.block_timeout
+        while not buffer.has_room(events, nbytes):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(
+                    "Timed out after %.1fs waiting for buffer space", self.block_timeout,
+                )
+                return
+            self._not_full.wait(remaining)
+
+    def _can_block(self) -> bool:
+        """Whether the calling thread may wait for buffer space.  Sender
+        threads never wait: they are the ones making room."""
+        return threading.current_thread() not in self._sender_threads
+
+    def _serialize(self, event: dict[str, Any]) -> bytes | None:
+        """Encode *event* in the wire format, or log and return None if it
+        cannot be serialized (so one bad event never poisons a whole batch)
+        or is rate limited."""
+        limits = self.limits
+        if limits is not None and limits.rate_limited and not limits.admit(event):
+            self._metrics.record_drop("rate_limited", 1)
+            return None
+        if self.max_in_flight > 1:
+            event = session_first(event)
+        try:
+            data = self._encode_event(event)
+            if (
+                limits is not None
+                and limits.max_field_bytes is not None
+                and len(data) > limits.max_field_bytes
+            ):
+                event, truncated = limits.truncate(event)
+                if truncated:
+                    self._metrics.record_truncate(truncated)
+                    data = self._encode_event(event)
+            return self._buffer.tag(event, data)
+        except (TypeError, ValueError) as e:
+            self._metrics.record_drop("unserializable", 1)
+            logger.warning("Dropping event that is not JSON-serializable: %s", e)
+            return None
+
     def send_event(self, event: dict[str, Any]) -> None:
         """Add a single event to the buffer. Flushes when batch_size is reached.
 
+        The event is serialized here, once, outside the buffer lock; the
+        buffer only ever holds the encoded bytes.
+
         This is more efficient than ``send_events([event])`` as it avoids
         creating and unpacking a single-element list.
         """
+        start = time.perf_counter()
+        data = self._serialize(event)
+        if data is None:
+            return
+        locking = time.perf_counter()
         with self._lock:
-            self._buffer.append(event)
-            self._buffer_and_maybe_flush()
+            lock_wait = time.perf_counter() - locking
+            self._wait_for_room(1, len(data))
+            self._buffer.append(data)
+            self._buffer_and_maybe_flush(1)
             batch_to_send = self._pending_batch
+            spill = self._pending_spill
 
+        if spill:
+            self._spool_append(spill)
         if batch_to_send is not None:
-            self._send_batch(batch_to_send)
+            self._dispatch(_flatten(batch_to_send))
+        self._metrics.record_enqueue(1, time.perf_counter() - start, lock_wait)
 
     def send_events(self, events: list[dict[str, Any]]) -> None:
         """Add events to the buffer. Flushes when batch_size is reached."""
@@ -147,78 +601,625 @@ class Transport:
         if len(events) == 1:
             self.send_event(events[0])
             return
+        start = time.perf_counter()
+        encoded = [data for data in map(self._serialize, events) if data is not None]
+        self._enqueue_encoded(encoded, start)
+
+    def send_serialized(self, events: list[bytes]) -> None:
+        """Add events that are already JSON-encoded, one ``bytes`` object
+        per event — e.g. as received from another process by a
+        :class:`~agentlens.transport_uds.Collector`.  Each one must decode to
+        a JSON object; any other line is dropped and counted under
+        ``dropped["unserializable"]`` so it cannot poison a batch.  Valid
+        events are buffered as-is unless the wire format is MessagePack.
+        """
+        start = time.perf_counter()
+        msgpack = self.wire_format == "msgpack"
+        encoded: list[bytes] = []
+        for data in events:
+            try:
+                event = json.loads(data)
+            except ValueError:
+                event = None
+            if not isinstance(event, dict):
+                self._metrics.record_drop("unserializable", 1)
+                logger.warning("Dropping serialized event that is not a JSON object")
+                continue
+            encoded.append(self._buffer.tag(
+                event, encode_event_msgpack(event) if msgpack else data,
+            ))
+        if encoded:
+            self._enqueue_encoded(encoded, start)
+
+    def _spool_append(self, events: list[bytes]) -> None:
+        """Append *events* to the spool, which stores JSON whatever the
+        wire format: its records are newline-delimited."""
+        if self.wire_format == "msgpack":
+            events = [
+                data if data[:1] == b"{" else encode_event(decode_event(data))
+                for data in events
+            ]
+        self.spool.append(events)
+        self._metrics.record_spool(len(events))
+
+    def _enqueue_encoded(self, encoded: list[bytes], start: float) -> None:
+        """Buffer encoded events and dispatch a batch if one is due.
+
+        *start* is the ``time.perf_counter()`` at which the producer's
+        call began, for :meth:`stats`.
+        """
+        size = sum(map(len, encoded))
+        locking = time.perf_counter()
         with self._lock:
-            self._buffer.extend(events)
-            self._buffer_and_maybe_flush()
+            lock_wait = time.perf_counter() - locking
+            self._wait_for_room(len(encoded), size)
+            self._buffer.extend(encoded, size)
+            self._buffer_and_maybe_flush(len(encoded))
             batch_to_send = self._pending_batch
+            spill = self._pending_spill
 
+        if spill:
+            self._spool_append(spill)
         if batch_to_send is not None:
-            self._send_batch(batch_to_send)
+            self._dispatch(_flatten(batch_to_send))
+        self._metrics.record_enqueue(len(encoded), time.perf_counter() - start, lock_wait)
 
     def flush(self) -> None:
-        """Force-flush all buffered events."""
+        """Force-flush all buffered events.
+
+        With sender workers the batch is queued for upload and this returns
+        immediately; otherwise it is sent on the calling thread.  Spooled
+        events are drained too, even when the buffer is empty.  An explicit
+        flush ignores the retry backoff, but not an open circuit breaker.
+        With ``max_in_flight > 1`` it first waits for the upload round in
+        progress, if any.
+        """
         with self._lock:
-            batch = self._drain_buffer()
-        if batch:
+            if self._serial_rounds:
+                while self._round_active:
+                    self._round_done.wait()
+                self._round_active = True
+            segments = self._drain_buffer()
+        batch = _flatten(segments)
+        if batch or self._spool_pending():
+            self._dispatch(batch)
+        else:
+            self._end_round()
+
+    @property
+    def _serial_rounds(self) -> bool:
+        """Whether uploads run as one round at a time (see :meth:`_end_round`)."""
+        return self.max_in_flight > 1
+
+    def _end_round(self) -> None:
+        """Release the upload round claimed when the buffer was drained."""
+        if not self._serial_rounds:
+            return
+        with self._lock:
+            self._round_active = False
+            self._round_done.notify_all()
+
+    def _may_send(self) -> bool:
+        """True unless a retry delay is pending or the circuit is open."""
+        return time.monotonic() >= self._retry_at and not self.circuit_breaker.is_open()
+
+    def _adapt(self, added: int) -> None:
+        """Feed *added* arrivals to the adaptive controller and adopt its
+        batch size.  Must be called with lock held."""
+        adaptive = self._adaptive
+        if adaptive is not None and adaptive.record(added):
+            self.batch_size = adaptive.batch_size
+
+    def _linger(self) -> float:
+        """Current flush interval: adaptive, or the configured one."""
+        if self._adaptive is not None:
+            return self._adaptive.linger
+        return self.flush_interval
+
+    def _next_flush_delay(self) -> float:
+        """Seconds until the flush loop should next wake: the flush
+        interval, or sooner if a pending retry delay expires first."""
+        interval = self._linger()
+        remaining = self._retry_at - time.monotonic()
+        if 0 < remaining < interval:
+            return remaining
+        return interval
+
+    def enqueue_latency(self) -> dict[str, float]:
+        """Producer-side latency of ``send_event`` / ``send_events``.
+
+        Returns:
+            A dict with ``count``, ``mean_ms`` and ``max_ms``.  In inline
+            mode this includes any upload triggered by a full batch; with
+            sender workers it is only the cost of the buffer append.
+        """
+        latency = self._metrics.snapshot()["enqueue_latency"]
+        count = latency["count"]
+        return {
+            "count": count,
+            "mean_ms": (latency["sum"] / count) * 1000 if count else 0.0,
+            "max_ms": latency["max"] * 1000,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of the transport's counters, histograms and buffer.
+
+        Returns:
+            A dict with
+
+            * ``events`` — ``enqueued``, ``sent`` (accepted by the backend,
+              including events replayed from the spool), ``retried``,
+              ``spooled``, ``truncated`` (payload fields cut to the
+              *limits* budget) and ``dropped``, a dict of counts by reason
+              (``overflow``, ``rate_limited``, ``rejected``,
+              ``retries_exhausted``, ``shutdown``, ``unserializable``);
+            * ``requests`` — ``/events`` uploads, ``ok`` and ``failed``;
+            * ``buffer`` — current ``events`` and ``bytes``, and their caps;
+            * histograms ``batch_events``, ``batch_bytes`` (as sent, after
+              compression) and ``send_latency`` (seconds), each with
+              ``count``, ``sum``, ``max`` and cumulative ``buckets``;
+            * ``enqueue_latency`` and ``lock_wait`` — ``count`` (calls),
+              ``sum`` and ``max`` seconds spent in ``send_event`` /
+              ``send_events`` and waiting for the buffer lock there;
+            * ``limits`` — with *limits*, the breakdown from
+              :meth:`EventLimits.stats()
+              <agentlens.transport_limits.EventLimits.stats>`.
+
+            Counters start at zero when the transport is created, and
+            again in a forked child.  Render the snapshot for Prometheus
+            with :func:`agentlens.transport_metrics.to_prometheus`.
+        """
+        stats = self._metrics.snapshot()
+        buffer = self._buffer
+        stats["buffer"] = {
+            "events": len(buffer),
+            "bytes": buffer.nbytes,
+            "max_events": buffer.max_events,
+            "max_bytes": buffer.max_bytes,
+        }
+        if self.limits is not None:
+            stats["limits"] = self.limits.stats()
+        return stats
+
+    def _dispatch(self, batch: list[bytes]) -> None:
+        """Send *batch* inline, or hand it to the sender workers."""
+        if self._sender_threads:
+            self._batch_queue.put(batch)
+        else:
             self._send_batch(batch)
 
-    def _drain_buffer(self) -> list[dict[str, Any]]:
-        """Drain and return buffer contents.  Must be called with lock held.
+    def _sender_loop(self) -> None:
+        """Sender worker: upload queued batches until told to stop."""
+        while True:
+            batch = self._batch_queue.get()
+            if batch is _STOP_WORKER:
+                return
+            try:
+                self._send_batch(batch)
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Sender worker failed to send batch")
+
+    def _drain_buffer(self) -> Sequence[list[bytes]]:
+        """Drain the buffer and return its segments, oldest first; flatten
+        them after releasing the lock.  Must be called with lock held.
 
-        Uses reference swap instead of copy+clear for O(1) drain regardless
-        of buffer size.
+        Wakes producers waiting for room under ``overflow_policy="block"``.
         """
-        events = self._buffer
-        self._buffer = []
-        return events
+        self._adapt(0)
+        segments = self._buffer.drain()
+        if segments:
+            self._not_full.notify_all()
+        return segments
 
-    def _send_batch(self, events: list[dict[str, Any]]) -> None:
-        """Send a batch of events to the backend.
+    def _requeue(self, events: list[bytes]) -> None:
+        """Put *events* back at the front of the buffer, ahead of anything
+        that arrived since they were drained.  Must be called with lock held."""
+        self._buffer.prepend(events)
 
-        The HTTP call runs **outside** the buffer lock so that
+    def _split_batch(self, events: list[bytes]) -> list[list[bytes]]:
+        """Cut *events* into request-sized batches.
+
+        Each batch holds at most ``_MAX_BATCH_EVENTS`` events (the backend's
+        ``MAX_BATCH_SIZE``) and at most ``max_batch_bytes`` bytes of
+        serialized events.  A single event larger than ``max_batch_bytes``
+        is sent on its own.
+        """
+        batches: list[list[bytes]] = []
+        current: list[bytes] = []
+        size = 0
+        limit = self.max_batch_bytes
+        for data in events:
+            n = len(data) + 1  # +1 for the separating comma
+            if current and (len(current) >= _MAX_BATCH_EVENTS or size + n > limit):
+                batches.append(current)
+                current = []
+                size = 0
+            current.append(data)
+            size += n
+        if current:
+            batches.append(current)
+        return batches
+
+    def _send_batch(self, events: list[bytes]) -> None:
+        """Send buffered events to the backend.
+
+        The HTTP calls run **outside** the buffer lock so that
         ``send_events`` and the background flush thread do not block
-        each other during network I/O.
+        each other during network I/O.  *events* is cut into request-sized
+        batches with :meth:`_split_batch` and posted in order.
 
-        On failure the events are re-queued into the buffer (preserving
-        any events that arrived during the HTTP call) and a consecutive
-        failure counter is incremented.  After ``max_retries`` consecutive
-        failures the events are dropped to prevent infinite retry loops.
-        The counter resets on any successful flush.
+        On failure the unsent events are re-queued into the buffer
+        (preserving any events that arrived during the HTTP call) and a
+        consecutive failure counter is incremented.  After ``max_retries``
+        consecutive failures the events are dropped to prevent infinite
+        retry loops.  The counter resets on any successful flush.  With a
+        spool, failed events go to disk instead (see :meth:`_on_batch_failed`).
         """
-        if not events:
-            return
+        try:
+            self._deliver(events, self._client.post)
+        finally:
+            self._end_round()
+
+    def _spool_pending(self) -> bool:
+        """True if the spool holds events not yet delivered."""
+        return self.spool is not None and not self.spool.is_empty()
 
+    def _drain_spool(self, post: Any) -> None:
+        """Upload spooled events oldest-first with *post* until the spool is
+        empty or a request fails.  Only one thread drains at a time; others
+        return immediately and leave their events for the active drainer."""
+        spool = self.spool
+        if spool is None or not self._spool_drain_lock.acquire(blocking=False):
+            return
         try:
-            response = self._client.post(
-                f"{self.endpoint}/events",
-                json={"events": events},
-                headers={
-                    "Content-Type": "application/json",
-                    "X-API-Key": self.api_key,
-                },
-            )
-            if 200 <= response.status_code < 300:
-                # Success — reset consecutive failure counter
-                with self._lock:
-                    self._consecutive_failures = 0
-                return
+            allowed = False
+            while True:
+                batch = spool.peek(_MAX_BATCH_EVENTS, self.max_batch_bytes)
+                if not batch:
+                    return
+                if not allowed and not self.circuit_breaker.allow_request():
+                    return
+                allowed = True
+                try:
+                    response = self._post_batch(post, batch)
+                except httpx.HTTPError as e:
+                    logger.warning("Failed to send %d spooled events: %s", len(batch), e)
+                    self._record_failure()
+                    return
+                if not self._on_spooled_response(batch, response):
+                    return
+                spool.ack()
+        finally:
+            self._spool_drain_lock.release()
 
+    def _defer(self, events: list[bytes]) -> None:
+        """Hold *events* back while the circuit is open, without counting
+        a failure: to the spool if there is one, else back into the buffer."""
+        logger.debug("Circuit open; deferring %d events", len(events))
+        if self.spool is not None:
+            self._spool_append(events)
+            return
+        with self._lock:
+            self._requeue(events)
+
+    def _on_spooled_response(
+        self, batch: list[bytes], response: httpx.Response,
+    ) -> bool:
+        """Record the outcome of posting a spooled *batch*; returns True if
+        it can leave the spool: it was accepted, or refused for good (see
+        :meth:`_rejected`).  Otherwise it stays in the spool to be retried."""
+        if self._accepted(response):
+            return True
+        if self._rejected(batch, response):
+            return True
+        if not self._renegotiated(response):
             logger.warning(
-                "Failed to send %d events: HTTP %d — %s",
-                len(events),
+                "Failed to send %d spooled events: HTTP %d — %s",
+                len(batch),
                 response.status_code,
                 response.text[:200],
             )
-        except httpx.HTTPError as e:
-            logger.warning("Failed to send %d events: %s", len(events), e)
+            self._record_failure(_retry_after(response))
+        return False
+
+    def _deliver(self, events: list[bytes], post: Any) -> None:
+        """Post *events* batch by batch with *post*, stopping at the first
+        failure so later batches never overtake a failed one."""
+        if self._spool_pending():
+            # Older events are on disk: go through the spool to keep order.
+            self._spool_append(events)
+            self._drain_spool(post)
+            return
+        if not events:
+            return
+        if not self.circuit_breaker.allow_request():
+            self._defer(events)
+            return
+        batches = self._split_batch(events)
+        if self._use_lanes(batches):
+            lanes = partition(events, self.max_in_flight)
+            pool = self._get_lane_pool()
+            self._settle_lanes(list(pool.map(lambda lane: self._post_lane(lane, post), lanes)))
+            return
+        for i, batch in enumerate(batches):
+            try:
+                response = self._post_batch(post, batch)
+            except httpx.HTTPError as e:
+                logger.warning("Failed to send %d events: %s", len(batch), e)
+                self._on_batch_failed(_flatten(batches[i:]))
+                return
+            if not self._on_batch_response(batches[i:], response):
+                return
+
+    def _use_lanes(self, batches: list[list[bytes]]) -> bool:
+        """Post in concurrent session lanes?  Only for a backlog of more
+        than one request, and never while the circuit breaker probes."""
+        return (
+            self.max_in_flight > 1
+            and len(batches) > 1
+            and self.circuit_breaker.state == CircuitBreaker.CLOSED
+        )
+
+    def _get_lane_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._lane_pool is None:
+            self._lane_pool = concurrent.futures.ThreadPoolExecutor(
+                self.max_in_flight, thread_name_prefix="agentlens-lane",
+            )
+        return self._lane_pool
+
+    def _post_lane(self, events: list[bytes], post: Any) -> _LaneResult:
+        """Post one lane's *events* batch by batch, stopping at the first
+        failure.  Runs on a lane thread; see :meth:`_settle_lanes`."""
+        batches = self._split_batch(events)
+        for i, batch in enumerate(batches):
+            try:
+                response = self._post_batch(post, batch)
+            except httpx.HTTPError as e:
+                logger.warning("Failed to send %d events: %s", len(batch), e)
+                return _flatten(batches[i:]), True, None
+            result = self._lane_response(batches[i:], response)
+            if result is not None:
+                return result
+        return [], False, None
+
+    def _lane_response(
+        self, batches: list[list[bytes]], response: httpx.Response,
+    ) -> _LaneResult | None:
+        """Lane counterpart of :meth:`_on_batch_response`: None if the
+        batch was accepted, else the unsent events, whether this counts
+        as a failure, and the backend's ``Retry-After``."""
+        if self._accepted(response):
+            return None
+        unsent = _flatten(batches)
+        if self._renegotiated(response):
+            return unsent, False, None
+        logger.warning(
+            "Failed to send %d events: HTTP %d — %s",
+            len(batches[0]),
+            response.status_code,
+            response.text[:200],
+        )
+        return unsent, True, _retry_after(response)
+
+    def _settle_lanes(self, results: list[_LaneResult]) -> None:
+        """Re-queue what the lanes could not send.  Failed lanes count as a
+        single failed upload, so a round spends one retry, not one per lane."""
+        failed: list[bytes] = []
+        resend: list[bytes] = []
+        retry_after: float | None = None
+        for unsent, is_failure, delay in results:
+            if not is_failure:
+                resend.extend(unsent)
+                continue
+            failed.extend(unsent)
+            if delay is not None:
+                retry_after = max(delay, retry_after or 0.0)
+        if resend:
+            with self._lock:
+                self._requeue(resend)
+        if failed:
+            self._on_batch_failed(failed, retry_after)
 
-        # --- Retry logic ---
+    def _post_batch(self, post: Any, batch: list[bytes]) -> httpx.Response:
+        """POST one *batch* to ``/events``, failing over across endpoints.
+
+        Endpoints are tried in :meth:`EndpointPool.attempt_order`; a
+        connection-level error moves the same batch on to the next one.
+        The last error is re-raised once every endpoint has failed.
+        """
+        kwargs = self._encode_batch(batch)
+        start = time.perf_counter()
+        pool = self._endpoints
+        error: httpx.TransportError | None = None
+        for endpoint in pool.attempt_order():
+            pool.acquire(endpoint)
+            try:
+                response = post(f"{endpoint.url}/events", **kwargs)
+            except httpx.TransportError as e:
+                pool.release(endpoint, ok=False)
+                if len(pool) > 1:
+                    logger.warning("Endpoint %s failed, failing over: %s", endpoint.url, e)
+                error = e
+                continue
+            pool.release(endpoint, ok=response.status_code < 500)
+            self._record_request(batch, kwargs, start, response)
+            return response
+        self._record_request(batch, kwargs, start, None)
+        assert error is not None
+        raise error
+
+    def _record_request(
+        self,
+        batch: list[bytes],
+        kwargs: dict[str, Any],
+        start: float,
+        response: httpx.Response | None,
+    ) -> None:
+        """Count one ``/events`` upload begun at *start*; *response* is
+        None if no endpoint could be reached."""
+        self._metrics.record_request(
+            len(batch),
+            len(kwargs["content"]),
+            time.perf_counter() - start,
+            response is not None and 200 <= response.status_code < 300,
+        )
+
+    def _batch_headers(self) -> dict[str, str]:
+        """Return the headers sent with every ``/events`` batch."""
+        return {
+            "Content-Type": "application/json",
+            "X-API-Key": self.api_key,
+        }
+
+    def _encode_batch(self, events: list[bytes]) -> dict[str, Any]:
+        """Assemble pre-serialized *events* into ``content``/``headers`` POST
+        arguments.
+
+        The events are already encoded, so the body is a plain byte join.
+        Spooled events are always JSON, so a MessagePack transport sends
+        them as a JSON batch.  The body is compressed with the configured
+        codec once it reaches ``compression_threshold`` bytes; below that
+        the codec overhead outweighs the savings.
+        """
+        headers = self._batch_headers()
+        if events and events[0][:1] != b"{":
+            body = encode_batch(events)
+            headers["Content-Type"] = MSGPACK_CONTENT_TYPE
+        else:
+            body = b'{"events":[' + b",".join(events) + b"]}"
+        codec = self._codec
+        if codec is not None and len(body) >= self.compression_threshold:
+            body = codec.compress(body)
+            headers["Content-Encoding"] = codec.name
+        return {"content": body, "headers": headers}
+
+    def _on_batch_response(
+        self, batches: list[list[bytes]], response: httpx.Response,
+    ) -> bool:
+        """Record the outcome of a completed ``/events`` POST.
+
+        *batches* starts with the batch that was just posted, followed by
+        any batches not yet attempted; on failure all of them are
+        re-queued together.  Returns True if the batch was accepted.
+
+        Shared by the sync and async transports so both apply the same
+        success/retry bookkeeping regardless of how the request was made.
+        """
+        if self._accepted(response):
+            return True
+
+        unsent = _flatten(batches)
+        if self._renegotiated(response):
+            # Not a delivery failure: resend on the next flush uncompressed
+            # (or with the fallback codec) without spending a retry.
+            with self._lock:
+                self._requeue(unsent)
+            return False
+
+        logger.warning(
+            "Failed to send %d events: HTTP %d — %s",
+            len(batches[0]),
+            response.status_code,
+            response.text[:200],
+        )
+        self._on_batch_failed(unsent, _retry_after(response))
+        return False
+
+    def _accepted(self, response: httpx.Response) -> bool:
+        """Return True for a 2xx response, resetting the failure counter,
+        the retry delay and the circuit breaker."""
+        if 200 <= response.status_code < 300:
+            self.circuit_breaker.record_success()
+            with self._lock:
+                self._consecutive_failures = 0
+                self._retry_at = 0.0
+            return True
+        return False
+
+    def _rejected(self, batch: list[bytes], response: httpx.Response) -> bool:
+        """Drop *batch* if the backend refused it for good.
+
+        A 4xx other than 408 and 429 — and other than a 415 that a codec
+        downgrade can fix — will be refused again however often it is
+        resent.  Spooled events are retried without limit, so such a batch
+        would block everything behind it in the spool; it is dropped and
+        counted as ``rejected`` instead.
+        """
+        status = response.status_code
+        if not 400 <= status < 500 or status in _RETRYABLE_4XX:
+            return False
+        if status == 415 and self._codec is not None:
+            return False
+        # The backend is up and answering; this is not a health failure.
+        self.circuit_breaker.record_success()
+        logger.error(
+            "Dropping %d events the backend rejected: HTTP %d — %s",
+            len(batch),
+            status,
+            response.text[:200],
+        )
+        self._metrics.record_drop("rejected", len(batch))
+        return True
+
+    def _renegotiated(self, response: httpx.Response) -> bool:
+        """Handle a ``415`` for a compressed batch by downgrading the codec.
+
+        Returns True if the batch should simply be resent.
+        """
+        if response.status_code == 415 and self._codec is not None:
+            # The backend is up and answering; this is not a health failure.
+            self.circuit_breaker.record_success()
+            self._downgrade_codec(response.headers.get("Accept-Encoding", ""))
+            return True
+        return False
+
+    def _downgrade_codec(self, accept_encoding: str) -> None:
+        """Switch to a codec the backend accepts after a ``415`` response."""
+        accepted = {
+            token.split(";")[0].strip().lower()
+            for token in accept_encoding.split(",")
+        }
+        rejected = self._codec.name if self._codec is not None else "identity"
+        if rejected != "gzip" and "gzip" in accepted:
+            self._codec = GzipCodec()
+        else:
+            self._codec = None
+        logger.warning(
+            "Backend rejected %s-compressed batches; falling back to %s",
+            rejected,
+            self._codec.name if self._codec is not None else "no compression",
+        )
+
+    def _record_failure(self, retry_after: float | None = None) -> None:
+        """Count a failed upload, report it to the circuit breaker and
+        schedule the next automatic attempt — after *retry_after* seconds
+        if the backend asked for that, otherwise per :attr:`backoff`."""
+        self.circuit_breaker.record_failure()
+        if retry_after is None:
+            retry_after = self.backoff.delay(self.circuit_breaker.failures - 1)
         with self._lock:
             self._consecutive_failures += 1
+            self._retry_at = time.monotonic() + retry_after
+
+    def _on_batch_failed(
+        self, events: list[bytes], retry_after: float | None = None,
+    ) -> None:
+        """Re-queue *events* for retry, or drop them after ``max_retries``.
 
+        With a spool the events are appended to disk instead; they are
+        retried from there on every flush, and only dropped if the backend
+        refuses them for good (see :meth:`_rejected`).
+        """
+        self._record_failure(retry_after)
+        if self.spool is not None:
+            self._spool_append(events)
+            logger.info("Spooled %d events to disk after a failed send", len(events))
+            return
+        with self._lock:
             if self._consecutive_failures <= self.max_retries:
                 # Prepend failed events *before* anything new that arrived
-                self._buffer[0:0] = events
+                self._requeue(events)
+                self._metrics.record_retry(len(events))
                 logger.info(
                     "Queued %d events for retry (attempt %d/%d)",
                     len(events),
@@ -231,6 +1232,7 @@ class Transport:
                     len(events),
                     self._consecutive_failures,
                 )
+                self._metrics.record_drop("retries_exhausted", len(events))
                 self._consecutive_failures = 0
 
     # ── Convenience HTTP methods ───────────────────────────────────
@@ -277,15 +1279,119 @@ class Transport:
         return self._request("DELETE", path, **kwargs)
 
     def _flush_loop(self) -> None:
-        """Background thread that periodically flushes the buffer."""
-        while not self._stop_event.wait(timeout=self.flush_interval):
-            self.flush()
+        """Background thread that periodically flushes the buffer, holding
+        off while a retry delay is pending or the circuit is open."""
+        while not self._stop_event.wait(timeout=self._next_flush_delay()):
+            if self._may_send():
+                self.flush()
 
-    def close(self) -> None:
-        """Flush remaining events and stop the background thread."""
+    def close(self, timeout: float | None = None) -> ShutdownReport:
+        """Deliver remaining events within a deadline and stop the
+        background threads.
+
+        The flush thread and sender workers get to finish what they are
+        doing, then everything still buffered is posted (concurrently
+        across session lanes with ``max_in_flight > 1``).  Each request is
+        given only the time left, so the whole call takes about *timeout*
+        seconds (default: ``shutdown_timeout``) at most.  Events not
+        delivered by then go to the spool if there is one, else they are
+        dropped.
+
+        Returns:
+            A :class:`~agentlens.transport_shutdown.ShutdownReport`.
+        """
+        start = time.monotonic()
+        deadline = start + (self.shutdown_timeout if timeout is None else timeout)
+        _live_transports.discard(self)
         self._stop_event.set()
-        self.flush()
-        self._flush_thread.join(timeout=10.0)
+        self._flush_thread.join(timeout=_remaining(deadline))
         if self._flush_thread.is_alive():
             logger.warning("Flush thread did not exit within timeout")
-        self._client.close()
+        for _ in self._sender_threads:
+            self._batch_queue.put(_STOP_WORKER)
+        for worker in self._sender_threads:
+            worker.join(timeout=_remaining(deadline))
+            if worker.is_alive():
+                logger.warning("Sender worker %s did not exit within timeout", worker.name)
+        report = self._drain_for_shutdown(start, deadline, self._client.post)
+        self._close_lane_pool()
+        if self._shared_client is None:
+            self._client.close()
+        if self.spool is not None:
+            self.spool.close()
+        return report
+
+    def _take_for_shutdown(self) -> list[bytes]:
+        """Remove every event not yet sent: batches still queued for
+        sender workers that did not exit in time, then the buffer."""
+        queued: list[bytes] = []
+        stops = 0
+        while True:
+            try:
+                batch = self._batch_queue.get_nowait()
+            except queue.Empty:
+                break
+            if batch is _STOP_WORKER:
+                stops += 1
+            else:
+                queued.extend(batch)
+        for _ in range(stops):
+            self._batch_queue.put(_STOP_WORKER)
+        with self._lock:
+            segments = self._drain_buffer()
+        return queued + _flatten(segments)
+
+    def _drain_for_shutdown(self, start: float, deadline: float, post: Any) -> ShutdownReport:
+        """Post what is left with *post* until *deadline*, then spool or
+        drop the rest."""
+        sent_before = self._metrics.sent
+        events = self._take_for_shutdown()
+        post = _deadline_post(post, deadline)
+        if self._spool_pending():
+            self._drain_spool(post)
+        if events and not self._spool_pending() and self.circuit_breaker.allow_request():
+            lanes = partition(events, self.max_in_flight) if self.max_in_flight > 1 else [events]
+            if len(lanes) > 1:
+                pool = self._get_lane_pool()
+                events = _flatten(list(pool.map(lambda lane: self._post_remaining(lane, post), lanes)))
+            else:
+                events = self._post_remaining(events, post)
+        return self._settle_shutdown(events, start, sent_before)
+
+    def _post_remaining(self, events: list[bytes], post: Any) -> list[bytes]:
+        """Post *events* batch by batch, stopping at the first failure;
+        returns the events that were not delivered."""
+        batches = self._split_batch(events)
+        for i, batch in enumerate(batches):
+            try:
+                response = self._post_batch(post, batch)
+            except httpx.HTTPError as e:
+                logger.warning("Failed to send %d events at shutdown: %s", len(batch), e)
+                return _flatten(batches[i:])
+            if not self._accepted(response):
+                logger.warning(
+                    "Failed to send %d events at shutdown: HTTP %d",
+                    len(batch), response.status_code,
+                )
+                return _flatten(batches[i:])
+        return []
+
+    def _settle_shutdown(
+        self, unsent: list[bytes], start: float, sent_before: int,
+    ) -> ShutdownReport:
+        """Spool (or drop) the *unsent* events and build the report."""
+        report = ShutdownReport(flushed=self._metrics.sent - sent_before)
+        if unsent and self.spool is not None:
+            self._spool_append(unsent)
+            report.persisted = len(unsent)
+        elif unsent:
+            self._metrics.record_drop("shutdown", len(unsent))
+            logger.error("Dropping %d events that could not be sent before shutdown", len(unsent))
+            report.dropped = len(unsent)
+        report.elapsed = time.monotonic() - start
+        return report
+
+    def _close_lane_pool(self) -> None:
+        if self._lane_pool is not None:
+            self._lane_pool.shutdown(wait=True)
+            self._lane_pool = None
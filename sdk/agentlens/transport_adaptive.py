@@ -0,0 +1,106 @@
+"""Adaptive batch size and linger time driven by the observed event rate.
+
+A fixed ``batch_size`` is wrong at both ends of the load range: at 2k
+events/s a batch of 10 means 200 requests per second, and at one event a
+minute every event waits out the full ``flush_interval``.
+:class:`AdaptiveBatching` tracks the arrival rate (an exponentially
+weighted moving average over short windows) and sizes batches to hold
+roughly what arrives within the latency budget *max_latency*:
+
+* ``batch_size = rate * max_latency``, clamped between the configured
+  ``batch_size`` and the backend's per-request cap, so batches grow under
+  load;
+* ``linger = batch_size / rate`` — the time a batch takes to fill —
+  capped at *max_latency* and ``flush_interval``, so a quiet transport
+  flushes within the budget instead of waiting out the full interval.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+__all__ = ["AdaptiveBatching"]
+
+# Shortest linger the controller will pick.
+_MIN_LINGER = 0.05
+
+
+class AdaptiveBatching:
+    """Rate-driven batch size / linger controller.
+
+    Not thread-safe: the transport calls it with its buffer lock held.
+
+    Args:
+        min_batch_size: Smallest batch size (the transport's *batch_size*).
+        max_batch_size: Largest batch size (the backend's per-request cap).
+        max_linger: Longest linger time (the transport's *flush_interval*).
+        max_latency: Target upper bound, in seconds, on how long an event
+            waits in the buffer before its batch is sent.
+        smoothing: EWMA weight of the newest rate sample, in ``(0, 1]``.
+        window: Minimum seconds between rate samples.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        min_batch_size: int,
+        max_batch_size: int,
+        max_linger: float,
+        max_latency: float,
+        smoothing: float = 0.3,
+        window: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_latency <= 0:
+            raise ValueError("max_latency must be > 0")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+        self.min_batch_size = max(1, min_batch_size)
+        self.max_batch_size = max(self.min_batch_size, max_batch_size)
+        self.max_linger = max_linger
+        self.max_latency = max_latency
+        self.smoothing = smoothing
+        self.window = window
+        self._clock = clock
+        self._window_start = clock()
+        self._arrivals = 0
+        self.rate = 0.0
+        self.batch_size = self.min_batch_size
+        self.linger = min(max_linger, max_latency)
+
+    def __repr__(self) -> str:
+        return (
+            f"AdaptiveBatching(rate={self.rate:.1f}/s, batch_size={self.batch_size}, "
+            f"linger={self.linger:.3f}s)"
+        )
+
+    def record(self, events: int) -> bool:
+        """Count *events* arrivals; returns True if the targets changed.
+
+        Call with ``0`` on idle ticks so the rate decays when traffic stops.
+        """
+        self._arrivals += events
+        now = self._clock()
+        elapsed = now - self._window_start
+        if elapsed < self.window:
+            return False
+        sample = self._arrivals / elapsed
+        self._arrivals = 0
+        self._window_start = now
+        self.rate += self.smoothing * (sample - self.rate)
+        return self._retarget()
+
+    def _retarget(self) -> bool:
+        rate = self.rate
+        batch_size = min(
+            self.max_batch_size,
+            max(self.min_batch_size, int(rate * self.max_latency)),
+        )
+        linger = min(self.max_linger, self.max_latency)
+        if rate > 0:
+            linger = max(_MIN_LINGER, min(linger, batch_size / rate))
+        changed = batch_size != self.batch_size or linger != self.linger
+        self.batch_size = batch_size
+        self.linger = linger
+        return changed
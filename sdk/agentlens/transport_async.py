@@ -0,0 +1,479 @@
+"""Asyncio-native transport for sending events to the AgentLens backend.
+
+:class:`AsyncTransport` keeps the buffering and retry semantics of
+:class:`~agentlens.transport.Transport` but never performs network I/O on
+the caller's thread.  Producers only append to the buffer; an asyncio task
+running on the owning event loop drains it with ``httpx.AsyncClient``::
+
+    async def main():
+        tracker = agentlens.init(api_key="...")   # picks AsyncTransport
+        agentlens.start_session("my-agent")
+        agentlens.track(event_type="llm_call", ...)  # never blocks the loop
+        agentlens.end_session()
+        await tracker.transport.aclose()
+
+The sync convenience methods (``get``/``post``/...) used by the tracker's
+query helpers still work; they go through a lazily created blocking client,
+since those are explicit request/response calls made by the user.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import threading
+import time
+from typing import Any, Sequence
+
+import httpx
+
+from agentlens.transport import (
+    _MAX_BATCH_EVENTS,
+    Transport,
+    _flatten,
+    _LaneResult,
+    _live_transports,
+    _remaining,
+)
+from agentlens.transport_file import NDJSONFileTransport, file_path_from_endpoint
+from agentlens.transport_lanes import partition
+from agentlens.transport_shutdown import ShutdownReport
+from agentlens.transport_uds import UnixSocketTransport, socket_path_from_endpoint
+
+logger = logging.getLogger("agentlens.transport")
+
+
+def running_loop() -> asyncio.AbstractEventLoop | None:
+    """Return the event loop running in this thread, or ``None``."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class AsyncTransport(Transport):
+    """Batched transport driven by an asyncio task and ``httpx.AsyncClient``.
+
+    ``send_event`` / ``send_events`` are O(1) appends that never await and
+    never touch the network; reaching *batch_size* merely wakes the flush
+    task.  The task also flushes every *flush_interval* seconds.  Failed
+    batches are backed off, retried and eventually dropped exactly as in
+    :class:`Transport`.
+
+    The transport binds to the event loop running when it is created (or,
+    failing that, the loop of the first ``send_event`` call).  It is safe to
+    call ``send_event`` from other threads; wake-ups are delivered with
+    ``call_soon_threadsafe``.  The event loop is the sender, so
+    *sender_workers* is ignored; with *max_in_flight* > 1 the session lanes
+    are posted concurrently on the loop.  A shared *http_client* must be an
+    ``httpx.AsyncClient``.
+    """
+
+    _client_class = httpx.AsyncClient
+
+    def _make_client(self) -> Any:
+        self._sync_client: httpx.Client | None = None
+        if self._shared_client is not None:
+            return self._shared_client
+        return self.http.build_async_client()
+
+    def _start_flusher(self) -> None:
+        self._stop_event = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        # Full batches handed over by producers, awaiting the flush task
+        self._ready: collections.deque[list[bytes]] = collections.deque()
+        self._ensure_started()
+
+    def _ensure_started(self) -> bool:
+        """Bind to the running loop and start the flush task if needed.
+
+        Returns True once the transport is bound to a loop.
+        """
+        if self._loop is not None:
+            return True
+        loop = running_loop()
+        if loop is None or self._stop_event.is_set():
+            return False
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._flush_task = loop.create_task(self._flush_loop())
+        return True
+
+    def _wake(self) -> None:
+        """Ask the flush task to drain the buffer now."""
+        if not self._ensure_started() or self._wakeup is None:
+            return
+        loop = self._loop
+        if running_loop() is loop:
+            self._wakeup.set()
+        elif loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _buffer_and_maybe_flush(self, added: int = 0) -> None:
+        """Queue a due batch for the flush task while the lock is still held.
+
+        Handing it over after the lock is released would let the flush task
+        drain newer buffered events first and send them ahead of it.
+        """
+        super()._buffer_and_maybe_flush(added)
+        if (
+            self._pending_batch is not None
+            and self._ensure_started()
+            and not self._loop_is_gone()
+        ):
+            self._ready.append(_flatten(self._pending_batch))
+            self._pending_batch = None
+            self._wake()
+
+    def _dispatch(self, batch: list[bytes]) -> None:
+        """Queue a full batch for the flush task and wake it.
+
+        Called by ``send_event`` / ``send_events`` once *batch_size* is
+        reached; the upload itself always happens on the event loop, never
+        on the caller's stack.
+        """
+        if self._ensure_started() and not self._loop_is_gone():
+            self._ready.append(batch)
+            self._wake()
+            return
+        self._send_batch_blocking(batch)
+
+    def flush(self) -> None:
+        """Schedule a flush of all buffered events and return immediately.
+
+        Use :meth:`aflush` to wait for the upload to complete.  When no
+        event loop is available (e.g. after the loop has stopped) the
+        buffer is sent synchronously instead, so events are never stranded.
+        """
+        if self._ensure_started() and not self._loop_is_gone():
+            self._wake()
+            return
+        with self._lock:
+            segments = self._take_all()
+        batch = _flatten(segments)
+        if batch or self._spool_pending():
+            self._send_batch_blocking(batch)
+
+    async def aflush(self) -> None:
+        """Send all buffered (and spooled) events and wait for the upload
+        to finish."""
+        with self._lock:
+            segments = self._take_all()
+        batch = _flatten(segments)
+        if batch or self._spool_pending():
+            await self._asend_batch(batch)
+
+    def _take_all(self) -> list[list[bytes]]:
+        """Drain queued full batches and the buffer as segments, oldest
+        first.  Must be called with lock held; flatten after releasing it."""
+        segments = list(self._ready)
+        self._ready.clear()
+        segments.extend(self._drain_buffer())
+        return segments
+
+    async def _asend_batch(self, events: list[bytes]) -> None:
+        """Async counterpart of :meth:`Transport._send_batch`."""
+        if self._spool_pending():
+            self._spool_append(events)
+            await self._adrain_spool()
+            return
+        if not events:
+            return
+        if not self.circuit_breaker.allow_request():
+            self._defer(events)
+            return
+        batches = self._split_batch(events)
+        if self._use_lanes(batches):
+            lanes = partition(events, self.max_in_flight)
+            self._settle_lanes(
+                await asyncio.gather(*(self._apost_lane(lane) for lane in lanes))
+            )
+            return
+        for i, batch in enumerate(batches):
+            try:
+                response = await self._apost_batch(batch)
+            except httpx.HTTPError as e:
+                logger.warning("Failed to send %d events: %s", len(batch), e)
+                self._on_batch_failed(_flatten(batches[i:]))
+                return
+            if not self._on_batch_response(batches[i:], response):
+                return
+
+    async def _apost_lane(self, events: list[bytes]) -> _LaneResult:
+        """Async counterpart of :meth:`Transport._post_lane`."""
+        batches = self._split_batch(events)
+        for i, batch in enumerate(batches):
+            try:
+                response = await self._apost_batch(batch)
+            except httpx.HTTPError as e:
+                logger.warning("Failed to send %d events: %s", len(batch), e)
+                return _flatten(batches[i:]), True, None
+            result = self._lane_response(batches[i:], response)
+            if result is not None:
+                return result
+        return [], False, None
+
+    async def _apost_batch(self, batch: list[bytes]) -> httpx.Response:
+        """Async counterpart of :meth:`Transport._post_batch`."""
+        kwargs = self._encode_batch(batch)
+        start = time.perf_counter()
+        pool = self._endpoints
+        error: httpx.TransportError | None = None
+        for endpoint in pool.attempt_order():
+            pool.acquire(endpoint)
+            try:
+                response = await self._client.post(f"{endpoint.url}/events", **kwargs)
+            except httpx.TransportError as e:
+                pool.release(endpoint, ok=False)
+                if len(pool) > 1:
+                    logger.warning("Endpoint %s failed, failing over: %s", endpoint.url, e)
+                error = e
+                continue
+            pool.release(endpoint, ok=response.status_code < 500)
+            self._record_request(batch, kwargs, start, response)
+            return response
+        self._record_request(batch, kwargs, start, None)
+        assert error is not None
+        raise error
+
+    async def _adrain_spool(self) -> None:
+        """Async counterpart of :meth:`Transport._drain_spool`."""
+        spool = self.spool
+        if spool is None or not self._spool_drain_lock.acquire(blocking=False):
+            return
+        try:
+            allowed = False
+            while True:
+                batch = spool.peek(_MAX_BATCH_EVENTS, self.max_batch_bytes)
+                if not batch:
+                    return
+                if not allowed and not self.circuit_breaker.allow_request():
+                    return
+                allowed = True
+                try:
+                    response = await self._apost_batch(batch)
+                except httpx.HTTPError as e:
+                    logger.warning("Failed to send %d spooled events: %s", len(batch), e)
+                    self._record_failure()
+                    return
+                if not self._on_spooled_response(batch, response):
+                    return
+                spool.ack()
+        finally:
+            self._spool_drain_lock.release()
+
+    def _send_batch(self, events: list[bytes]) -> None:
+        """Hand *events* to the loop; falls back to a blocking send."""
+        if events:
+            self._dispatch(events)
+
+    def _send_batch_blocking(self, events: list[bytes]) -> None:
+        """Upload *events* with the blocking client (no loop available)."""
+        self._deliver(events, self._get_sync_client().post)
+
+    @property
+    def _serial_rounds(self) -> bool:
+        # The flush task is already the only sender.
+        return False
+
+    def _can_block(self) -> bool:
+        # Blocking the loop would also stall the flush task that makes room.
+        return running_loop() is None
+
+    def _loop_is_gone(self) -> bool:
+        loop = self._loop
+        return loop is None or loop.is_closed() or not loop.is_running()
+
+    async def _flush_loop(self) -> None:  # type: ignore[override]
+        """Flush on wake-up or every *flush_interval* seconds, holding off
+        while a retry delay is pending or the circuit is open."""
+        assert self._wakeup is not None
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self._next_flush_delay(),
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stop_event.is_set():
+                # aclose() does the final, deadline-bounded drain.
+                return
+            if not self._may_send():
+                continue
+            try:
+                await self.aflush()
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Background flush failed")
+
+    # ── Convenience HTTP methods ───────────────────────────────────
+
+    def _get_sync_client(self) -> httpx.Client:
+        if self._sync_client is None:
+            self._sync_client = self.http.build_client()
+        return self._sync_client
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        headers = {**self._auth_headers(), **kwargs.pop("headers", {})}
+        response = self._get_sync_client().request(
+            method, f"{self.endpoint}{path}", headers=headers, **kwargs,
+        )
+        response.raise_for_status()
+        return response
+
+    # ── Shutdown ───────────────────────────────────────────────────
+
+    async def aclose(self, timeout: float | None = None) -> ShutdownReport:
+        """Stop the flush task, deliver remaining events within *timeout*
+        seconds (default: ``shutdown_timeout``) and close the clients.
+
+        Works like :meth:`Transport.close`: lanes are posted concurrently
+        on the loop, and what is not delivered in time is spooled or
+        dropped.
+        """
+        start = time.monotonic()
+        deadline = start + (self.shutdown_timeout if timeout is None else timeout)
+        _live_transports.discard(self)
+        self._stop_event.set()
+        task = self._flush_task
+        if task is not None and not task.done():
+            if self._wakeup is not None:
+                self._wakeup.set()
+            try:
+                await asyncio.wait_for(task, timeout=_remaining(deadline))
+            except asyncio.TimeoutError:
+                logger.warning("Flush task did not exit within timeout")
+                task.cancel()
+        report = await self._adrain_for_shutdown(start, deadline)
+        if self._shared_client is None:
+            await self._client.aclose()
+        self._close_lane_pool()
+        if self._sync_client is not None:
+            self._sync_client.close()
+        if self.spool is not None:
+            self.spool.close()
+        return report
+
+    async def _adrain_for_shutdown(self, start: float, deadline: float) -> ShutdownReport:
+        """Async counterpart of :meth:`Transport._drain_for_shutdown`."""
+        sent_before = self._metrics.sent
+        events = self._take_for_shutdown()
+        if self._spool_pending():
+            try:
+                await asyncio.wait_for(self._adrain_spool(), _remaining(deadline))
+            except asyncio.TimeoutError:
+                logger.warning("Spool not drained before the shutdown deadline")
+        if events and not self._spool_pending() and self.circuit_breaker.allow_request():
+            lanes = partition(events, self.max_in_flight) if self.max_in_flight > 1 else [events]
+            results = await asyncio.gather(
+                *(self._apost_remaining(lane, deadline) for lane in lanes)
+            )
+            events = _flatten(results)
+        return self._settle_shutdown(events, start, sent_before)
+
+    async def _apost_remaining(self, events: list[bytes], deadline: float) -> list[bytes]:
+        """Async counterpart of :meth:`Transport._post_remaining`; each
+        request is cut off at *deadline*."""
+        batches = self._split_batch(events)
+        for i, batch in enumerate(batches):
+            try:
+                response = await asyncio.wait_for(
+                    self._apost_batch(batch), _remaining(deadline),
+                )
+            except (httpx.HTTPError, asyncio.TimeoutError) as e:
+                logger.warning(
+                    "Failed to send %d events at shutdown: %s",
+                    len(batch), e or "deadline passed",
+                )
+                return _flatten(batches[i:])
+            if not self._accepted(response):
+                logger.warning(
+                    "Failed to send %d events at shutdown: HTTP %d",
+                    len(batch), response.status_code,
+                )
+                return _flatten(batches[i:])
+        return []
+
+    def _take_for_shutdown(self) -> list[bytes]:
+        with self._lock:
+            return _flatten(self._take_all())
+
+    def close(self, timeout: float | None = None) -> ShutdownReport | None:
+        """Deliver remaining events and stop the flush task.
+
+        Inside the owning loop this schedules :meth:`aclose` and returns
+        None (await ``aclose()`` directly to wait for it and get the
+        report).  From another thread it blocks until the loop has
+        finished closing.  If the loop is no longer running the buffer is
+        drained with a blocking client, as in :meth:`Transport.close`.
+        """
+        start = time.monotonic()
+        deadline = start + (self.shutdown_timeout if timeout is None else timeout)
+        loop = self._loop
+        if loop is not None and not self._loop_is_gone():
+            if running_loop() is loop:
+                self._close_task = loop.create_task(self.aclose(timeout))
+                return None
+            future = asyncio.run_coroutine_threadsafe(self.aclose(timeout), loop)
+            try:
+                # A little longer than aclose() itself needs, so its own
+                # deadline handling gets to spool what is left.
+                return future.result(timeout=_remaining(deadline) + 1.0)
+            except Exception as e:
+                logger.warning("Async transport did not close cleanly: %s", e)
+            return None
+
+        _live_transports.discard(self)
+        self._stop_event.set()
+        report = self._drain_for_shutdown(start, deadline, self._get_sync_client().post)
+        self._close_lane_pool()
+        if self._sync_client is not None:
+            self._sync_client.close()
+        if self.spool is not None:
+            self.spool.close()
+        return report
+
+
+def create_transport(
+    endpoint: str | Sequence[str] = "http://localhost:3000",
+    api_key: str = "default",
+    *,
+    async_mode: bool | None = None,
+    **kwargs: Any,
+) -> Transport:
+    """Build the transport best suited to the calling context.
+
+    Args:
+        endpoint: The AgentLens backend URL, or a list of URLs to
+            load-balance across.  A ``uds:///path/to.sock`` endpoint
+            returns a :class:`~agentlens.transport_uds.UnixSocketTransport`
+            that hands events to a local ``agentlens-collector``; writing
+            to the socket never blocks for long, so *async_mode* is
+            ignored.  Likewise ``file:///path/to/dir`` returns an
+            :class:`~agentlens.transport_file.NDJSONFileTransport` that
+            writes events to files in that directory.
+        api_key: Your AgentLens API key.
+        async_mode: ``True`` forces :class:`AsyncTransport`, ``False``
+            forces the threaded :class:`Transport`.  ``None`` (default)
+            picks :class:`AsyncTransport` when called from inside a
+            running asyncio event loop, or to match the type of a shared
+            *http_client*.
+        **kwargs: Forwarded to the transport constructor.
+    """
+    socket_path = socket_path_from_endpoint(endpoint) if isinstance(endpoint, str) else None
+    if socket_path is not None:
+        return UnixSocketTransport(socket_path, api_key=api_key, **kwargs)
+    file_path = file_path_from_endpoint(endpoint) if isinstance(endpoint, str) else None
+    if file_path is not None:
+        return NDJSONFileTransport(file_path, api_key=api_key, **kwargs)
+    if async_mode is None:
+        http_client = kwargs.get("http_client")
+        if http_client is not None:
+            async_mode = isinstance(http_client, httpx.AsyncClient)
+        else:
+            async_mode = running_loop() is not None
+    cls = AsyncTransport if async_mode else Transport
+    return cls(endpoint=endpoint, api_key=api_key, **kwargs)
@@ -0,0 +1,262 @@
+"""Bounded event buffer and overflow (backpressure) policies.
+
+The transport buffers serialized events until they are uploaded.  When the
+backend is unreachable the buffer eventually hits its caps and something
+has to give; :class:`EventBuffer` applies one of :data:`OVERFLOW_POLICIES`:
+
+* ``"drop_oldest"`` (default) — evict the oldest events; recent activity
+  is usually the most useful when debugging a live incident.
+* ``"drop_newest"`` — reject incoming events and keep the backlog intact.
+* ``"block"`` — the producer waits up to ``block_timeout`` seconds for the
+  flusher to make room, then falls back to dropping the newest events.
+  Never blocks an event loop thread.
+* ``"priority"`` — evict the oldest *ordinary* events first, keeping
+  ``session_start`` / ``session_end`` / ``error`` events (which the
+  dashboard needs to make sense of a session) until nothing else is left.
+
+Storage is a deque of list *segments*.  Appends go to the tail segment,
+a failed batch is put back as a new head segment, and a drain hands over
+the segments themselves, so every operation done under the transport lock
+is O(1) or O(batch) — never O(buffer).
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+from typing import Any, Iterator, Sequence
+
+__all__ = [
+    "EventBuffer",
+    "OVERFLOW_POLICIES",
+    "PRIORITY_EVENT_TYPES",
+    "PriorityEvent",
+    "flatten",
+]
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block", "priority")
+
+#: Event types the ``"priority"`` policy preserves over bulk events.
+PRIORITY_EVENT_TYPES = frozenset({"session_start", "session_end", "error"})
+
+
+class PriorityEvent(bytes):
+    """Serialized event that the ``"priority"`` policy evicts last.
+
+    A plain ``bytes`` subclass, so it can be joined into request bodies and
+    spooled like any other event while carrying its priority through
+    drains and re-queues.
+    """
+
+    __slots__ = ()
+
+
+# Events per tail segment before a new one is started.
+_SEGMENT_EVENTS = 256
+
+
+class EventBuffer:
+    """FIFO of serialized events with event-count and byte caps.
+
+    Not thread-safe: the transport guards it with its own lock.
+
+    Args:
+        max_events: Maximum number of buffered events.
+        max_bytes: Maximum total size of buffered events.
+        policy: One of :data:`OVERFLOW_POLICIES`; decides which events
+            :meth:`evict` removes.
+    """
+
+    def __init__(
+        self, max_events: int, max_bytes: int, policy: str = "drop_oldest",
+    ) -> None:
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"overflow_policy must be one of {OVERFLOW_POLICIES}, got {policy!r}"
+            )
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.nbytes = 0
+        self._segments: collections.deque[list[bytes]] = collections.deque()
+        self._len = 0
+        # Events already evicted from the front of ``_segments[0]``
+        self._head = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[bytes]:
+        segments = iter(self._segments)
+        first = next(segments, None)
+        if first is None:
+            return iter(())
+        return itertools.chain(
+            itertools.islice(first, self._head, None), itertools.chain.from_iterable(segments),
+        )
+
+    def __getitem__(self, index: int) -> bytes:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("EventBuffer index out of range")
+        index += self._head
+        for segment in self._segments:
+            if index < len(segment):
+                return segment[index]
+            index -= len(segment)
+        raise IndexError("EventBuffer index out of range")  # pragma: no cover
+
+    def __repr__(self) -> str:
+        return (
+            f"EventBuffer(events={self._len}, nbytes={self.nbytes}, "
+            f"segments={len(self._segments)}, policy={self.policy!r})"
+        )
+
+    def tag(self, event: dict[str, Any], data: bytes) -> bytes:
+        """Mark *data* as a :class:`PriorityEvent` if the policy cares."""
+        if self.policy == "priority" and event.get("event_type") in PRIORITY_EVENT_TYPES:
+            return PriorityEvent(data)
+        return data
+
+    def _tail(self) -> list[bytes]:
+        segments = self._segments
+        if not segments or len(segments[-1]) >= _SEGMENT_EVENTS:
+            segments.append([])
+        return segments[-1]
+
+    def append(self, data: bytes) -> None:
+        self._tail().append(data)
+        self._len += 1
+        self.nbytes += len(data)
+
+    def extend(self, events: list[bytes], nbytes: int | None = None) -> None:
+        if not events:
+            return
+        if len(events) >= _SEGMENT_EVENTS:
+            self._segments.append(list(events))
+        else:
+            self._tail().extend(events)
+        self._len += len(events)
+        self.nbytes += sum(map(len, events)) if nbytes is None else nbytes
+
+    def prepend(self, events: list[bytes]) -> None:
+        """Put *events* back at the front, in order.  O(len(events))."""
+        if not events:
+            return
+        self._compact_head()
+        self._segments.appendleft(list(events))
+        self._len += len(events)
+        self.nbytes += sum(map(len, events))
+
+    def _compact_head(self) -> None:
+        """Drop the evicted prefix of the head segment.  O(segment)."""
+        if self._head:
+            self._segments[0] = self._segments[0][self._head:]
+            self._head = 0
+
+    def drain(self) -> collections.deque[list[bytes]]:
+        """Remove every buffered event; return them as segments, oldest
+        first.  Flatten with :func:`flatten` outside the lock."""
+        self._compact_head()
+        segments = self._segments
+        self._segments = collections.deque()
+        self._len = 0
+        self.nbytes = 0
+        return segments
+
+    def clear(self) -> None:
+        self._segments.clear()
+        self._len = 0
+        self._head = 0
+        self.nbytes = 0
+
+    def has_room(self, events: int, nbytes: int) -> bool:
+        """True if *events* / *nbytes* more would fit under the caps, or
+        could never fit (so waiting for room would be pointless)."""
+        if events > self.max_events or nbytes > self.max_bytes:
+            return True
+        return (
+            self._len + events <= self.max_events
+            and self.nbytes + nbytes <= self.max_bytes
+        )
+
+    def over_capacity(self) -> bool:
+        return self._len > self.max_events or self.nbytes > self.max_bytes
+
+    def evict(self) -> list[bytes]:
+        """Remove events until the buffer is within its caps.
+
+        Returns the evicted events, oldest first.
+        """
+        if not self.over_capacity():
+            return []
+        if self.policy in ("drop_newest", "block"):
+            return self._evict_newest()
+        if self.policy == "priority":
+            return self._evict_by_priority()
+        return self._evict_oldest()
+
+    def _evict_oldest(self) -> list[bytes]:
+        segments = self._segments
+        evicted = []
+        while self.over_capacity():
+            data = segments[0][self._head]
+            self._head += 1
+            if self._head == len(segments[0]):
+                segments.popleft()
+                self._head = 0
+            self._len -= 1
+            self.nbytes -= len(data)
+            evicted.append(data)
+        return evicted
+
+    def _evict_newest(self) -> list[bytes]:
+        segments = self._segments
+        evicted = []
+        while self.over_capacity():
+            tail = segments[-1]
+            data = tail.pop()
+            if len(tail) == (self._head if len(segments) == 1 else 0):
+                segments.pop()
+                self._head = 0
+            self._len -= 1
+            self.nbytes -= len(data)
+            evicted.append(data)
+        evicted.reverse()
+        return evicted
+
+    def _evict_by_priority(self) -> list[bytes]:
+        self._compact_head()
+        segments = self._segments
+        evicted = []
+        # Priority events are rare, so the scan for the oldest ordinary
+        # event stops within a few entries of where the last one was found.
+        seg_index, index = 0, 0
+        while self.over_capacity():
+            while seg_index < len(segments):
+                segment = segments[seg_index]
+                while index < len(segment) and isinstance(segment[index], PriorityEvent):
+                    index += 1
+                if index < len(segment):
+                    break
+                seg_index, index = seg_index + 1, 0
+            if seg_index == len(segments):
+                # Only priority events left: fall back to the oldest.
+                seg_index, index = 0, 0
+            segment = segments[seg_index]
+            data = segment.pop(index)
+            if not segment:
+                del segments[seg_index]
+                index = 0
+            self._len -= 1
+            self.nbytes -= len(data)
+            evicted.append(data)
+        return evicted
+
+
+def flatten(segments: Sequence[list[bytes]]) -> list[bytes]:
+    """Concatenate *segments* into a single list of events."""
+    if len(segments) == 1:
+        return segments[0]
+    return [data for segment in segments for data in segment]
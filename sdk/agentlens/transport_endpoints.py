@@ -0,0 +1,134 @@
+"""Endpoint selection, health ejection and failover for batch uploads.
+
+``Transport(endpoint=[...])`` spreads ``/events`` uploads over several
+collector replicas without an external load balancer.  An
+:class:`EndpointPool` picks the endpoint for each batch — round-robin or
+least in-flight requests — and ejects an endpoint after repeated failures
+for a cool-down period.  On a connection-level error the same batch is
+retried immediately on the next healthy endpoint, so a dead replica costs
+one failed connect rather than a retry cycle.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Sequence
+
+logger = logging.getLogger("agentlens.transport")
+
+__all__ = ["Endpoint", "EndpointPool", "LOAD_BALANCING_STRATEGIES"]
+
+LOAD_BALANCING_STRATEGIES = ("round_robin", "least_inflight")
+
+
+class Endpoint:
+    """Health and load bookkeeping for one backend URL."""
+
+    __slots__ = ("url", "inflight", "failures", "ejected_until")
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.inflight = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"Endpoint(url={self.url!r}, inflight={self.inflight}, "
+            f"failures={self.failures})"
+        )
+
+
+class EndpointPool:
+    """Chooses which endpoint each upload goes to.
+
+    Args:
+        urls: Backend base URLs.
+        strategy: One of :data:`LOAD_BALANCING_STRATEGIES`.
+        eject_after: Consecutive failures after which an endpoint is
+            taken out of rotation.
+        eject_for: Seconds an ejected endpoint stays out of rotation.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        strategy: str = "round_robin",
+        eject_after: int = 3,
+        eject_for: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not urls:
+            raise ValueError("at least one endpoint is required")
+        if strategy not in LOAD_BALANCING_STRATEGIES:
+            raise ValueError(
+                f"load_balancing must be one of {LOAD_BALANCING_STRATEGIES}, "
+                f"got {strategy!r}"
+            )
+        self.endpoints = [Endpoint(url.rstrip("/")) for url in urls]
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.eject_for = eject_for
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def __repr__(self) -> str:
+        return (
+            f"EndpointPool(urls={[e.url for e in self.endpoints]!r}, "
+            f"strategy={self.strategy!r})"
+        )
+
+    def attempt_order(self) -> list[Endpoint]:
+        """Return the endpoints to try for one upload, best first.
+
+        Healthy endpoints come first, ordered by the strategy.  Ejected
+        endpoints are only included — soonest to return first — when no
+        healthy endpoint is left, so an all-ejected pool still probes.
+        """
+        with self._lock:
+            now = self._clock()
+            healthy = [e for e in self.endpoints if e.ejected_until <= now]
+            if not healthy:
+                return sorted(self.endpoints, key=lambda e: e.ejected_until)
+            start = next(self._counter) % len(healthy)
+            rotated = healthy[start:] + healthy[:start]
+            if self.strategy == "least_inflight":
+                # sorted() is stable, so ties keep round-robin order.
+                rotated.sort(key=lambda e: e.inflight)
+            return rotated
+
+    def reset_inflight(self) -> None:
+        """Forget in-flight counts (after ``fork()`` none of them are ours)."""
+        with self._lock:
+            for endpoint in self.endpoints:
+                endpoint.inflight = 0
+
+    def acquire(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.inflight += 1
+
+    def release(self, endpoint: Endpoint, ok: bool) -> None:
+        """Record the outcome of an upload to *endpoint*."""
+        with self._lock:
+            endpoint.inflight -= 1
+            if ok:
+                endpoint.failures = 0
+                endpoint.ejected_until = 0.0
+                return
+            endpoint.failures += 1
+            if endpoint.failures >= self.eject_after and len(self.endpoints) > 1:
+                endpoint.ejected_until = self._clock() + self.eject_for
+                logger.warning(
+                    "Ejecting endpoint %s for %.0fs after %d consecutive failures",
+                    endpoint.url,
+                    self.eject_for,
+                    endpoint.failures,
+                )
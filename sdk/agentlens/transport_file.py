@@ -0,0 +1,390 @@
+"""Offline transport: write events to NDJSON files, import them later.
+
+For batch jobs and air-gapped environments, :class:`NDJSONFileTransport`
+keeps the buffering and batching of :class:`~agentlens.transport.Transport`
+but appends each batch to a local file instead of POSTing it — one JSON
+event per line, optionally gzip- or zstd-compressed.  It is a drop-in for
+``AgentTracker``::
+
+    tracker = AgentTracker(transport=NDJSONFileTransport("/var/spool/agentlens"))
+    # or: agentlens.init(endpoint="file:///var/spool/agentlens")
+
+Files rotate by size (and optionally age).  The file being written ends in
+``.part`` and is renamed once complete, so a shipping job can pick up
+every ``*.ndjson*`` file that does not.  ``NDJSONFileTransport("-")``
+writes to standard output instead.
+
+:class:`NDJSONImporter` (the ``agentlens import`` command) streams such
+files into the backend's ``/events`` endpoint in full-size batches.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Union
+
+import httpx
+
+from agentlens.transport import (
+    _MAX_BATCH_EVENTS,
+    _RETRYABLE_4XX,
+    FILE_SCHEME,
+    Transport,
+    _retry_after,
+)
+
+logger = logging.getLogger("agentlens.transport")
+
+__all__ = [
+    "NDJSONFileTransport",
+    "NDJSONFileWriter",
+    "NDJSONImporter",
+    "file_path_from_endpoint",
+    "read_ndjson",
+]
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+#: Path that means standard output (writing) or standard input (reading).
+STDIO = "-"
+
+_SUFFIXES = {None: ".ndjson", "gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+_PART = ".part"
+
+
+def file_path_from_endpoint(endpoint: str) -> str | None:
+    """Return the directory of a ``file://`` endpoint, or None.
+
+    ``file:///var/spool/agentlens`` names ``/var/spool/agentlens``.
+    """
+    if not endpoint.startswith(FILE_SCHEME):
+        return None
+    path = endpoint[len(FILE_SCHEME):]
+    if not path:
+        raise ValueError(f"no directory in {endpoint!r}")
+    return path
+
+
+class NDJSONFileWriter:
+    """Drop-in for the ``post`` method of ``httpx.Client`` that appends
+    each request body to rotating files in *directory*.
+
+    Write errors are raised as ``httpx.WriteError`` so the transport's
+    retry handling applies unchanged.
+
+    Args:
+        directory: Output directory (created if missing), or ``"-"`` for
+            standard output.
+        suffix: File name suffix, e.g. ``".ndjson.gz"``.
+        max_bytes: Start a new file once the current one would exceed this.
+        max_age: Also start a new file once the current one is this many
+            seconds old (checked on write).  None disables it.
+        prefix: File name prefix.
+    """
+
+    def __init__(
+        self,
+        directory: PathLike,
+        suffix: str = ".ndjson",
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: float | None = None,
+        prefix: str = "events",
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self.directory = os.fspath(directory)
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._file: IO[bytes] | None = None
+        self._part: Path | None = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._seq = 0
+
+    def __repr__(self) -> str:
+        return f"NDJSONFileWriter(directory={self.directory!r}, suffix={self.suffix!r})"
+
+    def post(self, url: str, *, content: bytes, **kwargs: Any) -> httpx.Response:
+        request = httpx.Request("POST", url)
+        with self._lock:
+            try:
+                if self.directory == STDIO:
+                    sys.stdout.buffer.write(content)
+                    sys.stdout.buffer.flush()
+                else:
+                    self._write(content)
+            except OSError as e:
+                raise httpx.WriteError(f"{self.directory}: {e}", request=request) from e
+        return httpx.Response(202, request=request)
+
+    def _write(self, content: bytes) -> None:
+        if self._file is not None and self._due_for_rotation(len(content)):
+            self._finish()
+        if self._file is None:
+            self._open()
+        assert self._file is not None
+        self._file.write(content)
+        self._file.flush()
+        self._size += len(content)
+
+    def _due_for_rotation(self, incoming: int) -> bool:
+        if self._size and self._size + incoming > self.max_bytes:
+            return True
+        return self.max_age is not None and time.monotonic() - self._opened_at >= self.max_age
+
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._seq += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        name = f"{self.prefix}-{stamp}-{os.getpid()}-{self._seq:04d}{self.suffix}{_PART}"
+        self._part = Path(self.directory) / name
+        self._file = open(self._part, "ab")
+        self._size = 0
+        self._opened_at = time.monotonic()
+
+    def _finish(self) -> None:
+        """Close the current file and drop its ``.part`` suffix."""
+        if self._file is None or self._part is None:
+            return
+        self._file.close()
+        self._file = None
+        if self._size:
+            os.replace(self._part, self._part.with_name(self._part.name[: -len(_PART)]))
+        else:
+            self._part.unlink()
+        self._part = None
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._finish()
+            except OSError as e:
+                logger.warning("Failed to finish %s: %s", self._part, e)
+
+
+class NDJSONFileTransport(Transport):
+    """Transport that writes batches to local NDJSON files.
+
+    Buffering and batching work as in
+    :class:`~agentlens.transport.Transport`; a "request" is an append to
+    the current file, so nothing touches the network.  Events are always
+    JSON (``wire_format`` does not apply).  With *compression* each batch
+    is written as one gzip member or zstd frame; concatenated, they form a
+    valid compressed file.
+
+    Args:
+        path: Output directory, or ``"-"`` for standard output.
+        max_file_bytes: Rotate once a file would grow past this size.
+        max_file_age: Also rotate files older than this many seconds.
+        **kwargs: Forwarded to :class:`~agentlens.transport.Transport`.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        max_file_bytes: int = 64 * 1024 * 1024,
+        max_file_age: float | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if kwargs.get("wire_format", "json") != "json":
+            raise ValueError("NDJSONFileTransport always writes JSON")
+        path = os.fspath(path)
+        self.path = file_path_from_endpoint(path) or path
+        self.max_file_bytes = max_file_bytes
+        self.max_file_age = max_file_age
+        super().__init__(**kwargs)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(path={self.path!r}, buffer={len(self._buffer)})"
+
+    def _make_client(self) -> Any:
+        codec = self._codec
+        return NDJSONFileWriter(
+            self.path,
+            suffix=_SUFFIXES.get(codec.name if codec else None, ".ndjson"),
+            max_bytes=self.max_file_bytes,
+            max_age=self.max_file_age,
+        )
+
+    def _encode_batch(self, events: list[bytes]) -> dict[str, Any]:
+        body = b"\n".join(events) + b"\n"
+        if self._codec is not None:
+            body = self._codec.compress(body)
+        return {"content": body}
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        raise RuntimeError(
+            "NDJSONFileTransport has no backend to query; import the files "
+            "with `agentlens import` and query the backend directly"
+        )
+
+
+# ── Import ──────────────────────────────────────────────────────────
+
+
+def _open_for_reading(path: str) -> IO[bytes]:
+    if path == STDIO:
+        return sys.stdin.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ImportError(
+                f"Reading {path} requires the 'zstandard' package: "
+                "pip install agentlens[zstd]"
+            ) from exc
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            raw, read_across_frames=True, closefd=True,
+        )
+        return io.BufferedReader(reader)
+    return open(path, "rb")
+
+
+def read_ndjson(path: PathLike) -> Iterator[bytes]:
+    """Yield the non-empty lines of an NDJSON file (``.gz`` / ``.zst``
+    compressed, or ``"-"`` for standard input), without trailing newlines."""
+    path = os.fspath(path)
+    f = _open_for_reading(path)
+    try:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+    finally:
+        if path != STDIO:
+            f.close()
+
+
+def _expand(paths: Iterable[PathLike]) -> Iterator[str]:
+    """Yield files to import; directories contribute their finished
+    ``*.ndjson*`` files in name order."""
+    for path in map(os.fspath, paths):
+        if path != STDIO and os.path.isdir(path):
+            names = sorted(
+                name for name in os.listdir(path)
+                if ".ndjson" in name and not name.endswith(_PART)
+            )
+            for name in names:
+                yield os.path.join(path, name)
+        else:
+            yield path
+
+
+class NDJSONImporter:
+    """Upload NDJSON event files to the backend in full-size batches.
+
+    Batches go through *transport*'s encoding and endpoint handling
+    (compression, failover), but are posted synchronously: a batch that
+    keeps failing stops the import instead of being dropped.  A batch the
+    backend refuses outright (a 4xx other than 401, 403, 408 and 429) is
+    skipped, and its events counted in ``skipped`` with the malformed
+    lines, so one bad batch does not block the rest of the import.  The
+    counters tell how far an interrupted import got.
+
+    Args:
+        transport: Used for encoding and posting; its buffer is not used.
+        batch_size: Events per request (at most the backend's 500).
+        max_retries: Retries per batch for connection errors, 5xx and 429
+            responses, spaced by the transport's backoff.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        batch_size: int = _MAX_BATCH_EVENTS,
+        max_retries: int = 5,
+    ) -> None:
+        self.transport = transport
+        self.batch_size = max(1, min(batch_size, _MAX_BATCH_EVENTS))
+        self.max_retries = max_retries
+        self.files = 0
+        self.events = 0
+        self.batches = 0
+        self.skipped = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"NDJSONImporter(files={self.files}, events={self.events}, "
+            f"batches={self.batches}, skipped={self.skipped})"
+        )
+
+    def run(self, paths: Iterable[PathLike]) -> NDJSONImporter:
+        """Import every file (or directory of files) in *paths*; returns self.
+
+        Raises:
+            httpx.HTTPStatusError: If the backend refuses the API key (401
+                or 403), or keeps failing after *max_retries* retries.
+            httpx.TransportError: If a batch still cannot be delivered
+                after *max_retries* retries.
+        """
+        for path in _expand(paths):
+            self.import_file(path)
+        return self
+
+    def import_file(self, path: PathLike) -> None:
+        """Import one file; see :meth:`run`."""
+        batch: list[bytes] = []
+        size = 0
+        limit = self.transport.max_batch_bytes
+        for line in read_ndjson(path):
+            try:
+                json.loads(line)
+            except ValueError:
+                self.skipped += 1
+                logger.warning("Skipping malformed line in %s", path)
+                continue
+            if batch and (len(batch) >= self.batch_size or size + len(line) > limit):
+                self._upload(batch)
+                batch, size = [], 0
+            batch.append(line)
+            size += len(line) + 1
+        if batch:
+            self._upload(batch)
+        self.files += 1
+
+    def _upload(self, batch: list[bytes]) -> None:
+        transport = self.transport
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = transport._post_batch(transport._client.post, batch)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning("Import batch failed, retrying: %s", e)
+            else:
+                if 200 <= response.status_code < 300:
+                    self.events += len(batch)
+                    self.batches += 1
+                    return
+                if transport._renegotiated(response):
+                    continue
+                if response.status_code in (401, 403):
+                    response.raise_for_status()
+                if response.status_code < 500 and response.status_code not in _RETRYABLE_4XX:
+                    self.skipped += len(batch)
+                    logger.error(
+                        "Backend rejected a batch of %d events with HTTP %d; skipping it",
+                        len(batch),
+                        response.status_code,
+                    )
+                    return
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+                retry_after = _retry_after(response)
+                logger.warning("Import batch failed with HTTP %d, retrying", response.status_code)
+            time.sleep(retry_after if retry_after is not None else transport.backoff.delay(attempt))
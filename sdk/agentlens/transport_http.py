@@ -0,0 +1,117 @@
+"""HTTP client settings for the transports: HTTP/2, pool limits, timeouts.
+
+Every :class:`~agentlens.transport.Transport` builds its ``httpx`` client
+from an :class:`HTTPConfig`.  The defaults suit a long-running service
+talking to one collector; tune them when many threads or lanes upload at
+once::
+
+    from agentlens.transport_http import HTTPConfig
+
+    http = HTTPConfig(http2=True, max_connections=8, read_timeout=30.0)
+    transport = Transport("https://collector:3000", http=http, max_in_flight=8)
+
+With ``http2=True`` concurrent uploads (``max_in_flight > 1``, sender
+workers) are multiplexed over a single connection instead of opening one
+per request.  It needs the ``h2`` package: ``pip install agentlens[http2]``.
+
+Several transports — or trackers — can share one connection pool by
+passing the same client::
+
+    client = HTTPConfig(http2=True).build_client()
+    tracker_a = AgentTracker(Transport(endpoint, http_client=client))
+    tracker_b = AgentTracker(Transport(endpoint, http_client=client))
+
+A transport never closes a client it was given; the caller does, after
+closing the transports that use it.  Use an ``httpx.AsyncClient``
+(:meth:`HTTPConfig.build_async_client`) for an
+:class:`~agentlens.transport_async.AsyncTransport`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+__all__ = ["HTTPConfig"]
+
+
+@dataclass(frozen=True)
+class HTTPConfig:
+    """Connection settings for the ``httpx`` clients a transport creates.
+
+    Attributes:
+        http2: Negotiate HTTP/2 and multiplex requests over one
+            connection.  Requires ``h2``.
+        connect_timeout: Seconds to wait for a TCP/TLS connection.  Kept
+            short so failover to another endpoint happens quickly.
+        read_timeout: Seconds to wait for each chunk of the response.
+        write_timeout: Seconds to wait for each chunk of the request body
+            to be sent.
+        pool_timeout: Seconds to wait for a free connection from the pool.
+        max_connections: Upper bound on open connections.  Without HTTP/2
+            it should be at least ``max_in_flight``.
+        max_keepalive_connections: Idle connections kept for reuse.
+        keepalive_expiry: Seconds an idle connection is kept.  Below the
+            5-second keep-alive timeout of the Node.js backend, so the
+            client never reuses a connection the server is closing.
+        verify: TLS verification: ``True``, ``False`` or a CA bundle path.
+    """
+
+    http2: bool = False
+    connect_timeout: float = 3.0
+    read_timeout: float = 10.0
+    write_timeout: float = 10.0
+    pool_timeout: float = 5.0
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_expiry: float = 4.0
+    verify: bool | str = True
+
+    def __post_init__(self) -> None:
+        if self.max_connections < 1:
+            raise ValueError("max_connections must be >= 1")
+        if not 0 <= self.max_keepalive_connections <= self.max_connections:
+            raise ValueError("max_keepalive_connections must be between 0 and max_connections")
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError as exc:
+                raise ImportError(
+                    "http2=True requires the 'h2' package: pip install agentlens[http2]"
+                ) from exc
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def client_kwargs(self) -> dict[str, Any]:
+        """Keyword arguments for ``httpx.Client`` / ``httpx.AsyncClient``."""
+        return {
+            "http2": self.http2,
+            "timeout": self.timeout,
+            "limits": self.limits,
+            "verify": self.verify,
+        }
+
+    def build_client(self) -> httpx.Client:
+        """Create a blocking client with these settings."""
+        return httpx.Client(**self.client_kwargs())
+
+    def build_async_client(self) -> httpx.AsyncClient:
+        """Create an asyncio client with these settings."""
+        return httpx.AsyncClient(**self.client_kwargs())
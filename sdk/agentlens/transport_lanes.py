@@ -0,0 +1,77 @@
+"""Session lanes: concurrent uploads that keep each session in order.
+
+With ``Transport(max_in_flight=N)`` a backlog larger than one request is
+partitioned into up to *N* lanes by ``session_id`` and the lanes are
+posted concurrently, each lane sending its batches one after another.
+Every event of a session lands in the same lane, so a ``session_start``
+can never arrive after the events that follow it.
+
+Events are already serialized when they are partitioned.  To find the
+session cheaply, the transport encodes ``session_id`` as the first key of
+each event in this mode (:func:`session_first`), which lets
+:func:`lane_of` read it from a fixed prefix instead of parsing JSON (or
+MessagePack, see :mod:`agentlens.transport_wire`).
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Any
+
+from agentlens.transport_wire import INTERNED_STRINGS
+
+__all__ = ["lane_of", "partition", "session_first"]
+
+_SESSION_PREFIX = b'{"session_id":'
+# Interned "session_id" key of a MessagePack event
+_MSGPACK_SESSION_KEY = bytes((0xD4, 1, INTERNED_STRINGS.index("session_id")))
+
+
+def session_first(event: dict[str, Any]) -> dict[str, Any]:
+    """Return *event* with ``session_id`` (if any) as its first key."""
+    if "session_id" not in event or next(iter(event)) == "session_id":
+        return event
+    return {"session_id": event["session_id"], **event}
+
+
+def lane_of(data: bytes, lanes: int) -> int:
+    """Lane index for one serialized event.
+
+    Events without a leading ``session_id`` all share lane 0.  The key is
+    the raw encoded value (in JSON, up to the next comma): identical for
+    every event of a session, which is all the ordering guarantee needs.
+    """
+    if data.startswith(_SESSION_PREFIX):
+        start = len(_SESSION_PREFIX)
+        end = data.find(b",", start)
+        key = data[start:end] if end != -1 else data[start:-1]
+    else:
+        key = _msgpack_session(data)
+        if key is None:
+            return 0
+    return zlib.crc32(key) % lanes
+
+
+def _msgpack_session(data: bytes) -> bytes | None:
+    """Raw ``session_id`` string of a MessagePack event whose first key
+    it is, or None."""
+    head = data[0]
+    start = 1 if 0x80 <= head <= 0x8F else 3 if head == 0xDE else 0
+    if not start or data[start:start + 3] != _MSGPACK_SESSION_KEY:
+        return None
+    start += 3
+    kind = data[start]
+    if 0xA0 <= kind <= 0xBF:
+        return data[start + 1:start + 1 + (kind & 0x1F)]
+    if kind == 0xD9:
+        return data[start + 2:start + 2 + data[start + 1]]
+    return None
+
+
+def partition(events: list[bytes], lanes: int) -> list[list[bytes]]:
+    """Split *events* into per-lane lists, preserving order within each
+    lane.  Empty lanes are omitted."""
+    buckets: list[list[bytes]] = [[] for _ in range(lanes)]
+    for data in events:
+        buckets[lane_of(data, lanes)].append(data)
+    return [bucket for bucket in buckets if bucket]
@@ -0,0 +1,259 @@
+"""Rate limits and a payload budget applied before events are buffered.
+
+A runaway agent loop can emit thousands of events a second, each with
+kilobytes of prompt text.  :class:`EventLimits` caps that at the SDK edge,
+in :meth:`Transport.send_event() <agentlens.transport.Transport.send_event>`,
+before anything is buffered:
+
+* **Rate limits** — token buckets per event type (process-wide) and per
+  session.  An event that finds its bucket empty is dropped and counted
+  as ``rate_limited``.  ``session_start`` and ``session_end`` are never
+  limited, so the backend's view of a session stays consistent.  Errors
+  and span boundaries are limited only by a limit for their own type, not
+  by ``"*"`` or the session limit, so a busy loop cannot hide its failures
+  or leave spans half open.  An event is admitted only if every bucket
+  that applies has a token; only then is one taken from each.
+* **Payload budget** — ``input_data``, ``output_data`` and a tool call's
+  ``tool_input`` / ``tool_output`` larger than *max_field_bytes* (as JSON)
+  are replaced by a stub carrying the original size, its SHA-256 and a
+  short preview.  Only events whose whole encoding exceeds the budget are
+  inspected, so small events pay nothing for it.
+
+::
+
+    from agentlens.transport_limits import EventLimits, RateLimit
+
+    limits = EventLimits(
+        rates={"llm_call": RateLimit(20, burst=100), "*": RateLimit(500)},
+        session_rate=RateLimit(50, burst=200),
+        max_field_bytes=16_384,
+    )
+    agentlens.init(api_key="...", limits=limits)
+
+What was limited shows up in :meth:`Transport.stats()
+<agentlens.transport.Transport.stats>`: the ``rate_limited`` drop reason,
+the ``truncated`` field count and a ``limits`` breakdown by event type and
+field.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from agentlens.sampling import ERROR_EVENT_TYPES
+
+__all__ = [
+    "EXEMPT_EVENT_TYPES", "EventLimits", "PROTECTED_EVENT_TYPES", "RateLimit", "TokenBucket",
+]
+
+#: Event types that are never rate limited.
+EXEMPT_EVENT_TYPES = frozenset({"session_start", "session_end"})
+#: Event types limited only by a :class:`RateLimit` for the type itself.
+PROTECTED_EVENT_TYPES = ERROR_EVENT_TYPES | {"span_start", "span_end"}
+
+# Fields subject to the payload budget: top level, then inside tool_call.
+_EVENT_FIELDS = ("input_data", "output_data")
+_TOOL_FIELDS = ("tool_input", "tool_output")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """*per_second* events on average, in bursts of up to *burst*
+    (default: one second's worth)."""
+
+    per_second: float
+    burst: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.per_second <= 0:
+            raise ValueError("per_second must be > 0")
+        if self.burst is not None and self.burst < 1:
+            raise ValueError("burst must be >= 1")
+
+    def bucket(self, now: float) -> TokenBucket:
+        burst = self.burst if self.burst is not None else max(1.0, self.per_second)
+        return TokenBucket(self.per_second, burst, now)
+
+
+class TokenBucket:
+    """Classic token bucket.  Not thread-safe; :class:`EventLimits` locks."""
+
+    __slots__ = ("rate", "burst", "tokens", "stamp")
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+
+    def refill(self, now: float) -> float:
+        """Add the tokens earned since the last call; return how many
+        there are."""
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        return self.tokens
+
+    def take(self, now: float) -> bool:
+        """Take one token if there is one."""
+        if self.refill(now) >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class EventLimits:
+    """Per-event-type and per-session rate limits plus a payload budget.
+
+    Args:
+        rates: :class:`RateLimit` by event type.  ``"*"`` applies to every
+            type without an entry of its own, except
+            :data:`PROTECTED_EVENT_TYPES`.
+        session_rate: Limit for each session, across all its events but
+            :data:`PROTECTED_EVENT_TYPES`.
+        max_field_bytes: Budget for each of ``input_data``,
+            ``output_data``, ``tool_call.tool_input`` and
+            ``tool_call.tool_output``, in bytes of JSON.  ``None`` disables
+            truncation.
+        preview_bytes: How much of an oversized field to keep as preview.
+        max_sessions: Per-session buckets kept; the least recently used
+            is evicted beyond that.  A session's bucket is also discarded
+            at its ``session_end``.
+    """
+
+    def __init__(
+        self,
+        rates: Mapping[str, RateLimit] | None = None,
+        session_rate: RateLimit | None = None,
+        max_field_bytes: int | None = None,
+        preview_bytes: int = 256,
+        max_sessions: int = 10_000,
+    ) -> None:
+        if max_field_bytes is not None and max_field_bytes <= 0:
+            raise ValueError("max_field_bytes must be > 0")
+        self.rates = dict(rates or {})
+        self.session_rate = session_rate
+        self.max_field_bytes = max_field_bytes
+        self.preview_bytes = preview_bytes
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._type_buckets: dict[str, TokenBucket] = {}
+        self._session_buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._limited: dict[str, int] = {}
+        self._session_limited = 0
+        self._truncated: dict[str, int] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"EventLimits(rates={self.rates!r}, session_rate={self.session_rate!r}, "
+            f"max_field_bytes={self.max_field_bytes!r})"
+        )
+
+    @property
+    def rate_limited(self) -> bool:
+        return bool(self.rates) or self.session_rate is not None
+
+    def admit(self, event: Mapping[str, Any]) -> bool:
+        """Take a token for *event* from each bucket that applies; False,
+        taking none, if one is empty."""
+        event_type = event.get("event_type", "generic")
+        session_id = event.get("session_id")
+        if event_type in EXEMPT_EVENT_TYPES:
+            if event_type == "session_end" and session_id is not None:
+                with self._lock:
+                    self._session_buckets.pop(session_id, None)
+            return True
+        protected = event_type in PROTECTED_EVENT_TYPES
+        limit = self.rates.get(event_type)
+        if limit is None and not protected:
+            limit = self.rates.get("*")
+        now = time.monotonic()
+        with self._lock:
+            type_bucket = None
+            if limit is not None:
+                type_bucket = self._type_buckets.get(event_type)
+                if type_bucket is None:
+                    type_bucket = self._type_buckets[event_type] = limit.bucket(now)
+                if type_bucket.refill(now) < 1.0:
+                    self._limited[event_type] = self._limited.get(event_type, 0) + 1
+                    return False
+            if self.session_rate is not None and session_id and not protected:
+                bucket = self._session_buckets.get(session_id)
+                if bucket is None:
+                    bucket = self._session_buckets[session_id] = self.session_rate.bucket(now)
+                    if len(self._session_buckets) > self.max_sessions:
+                        self._session_buckets.popitem(last=False)
+                else:
+                    self._session_buckets.move_to_end(session_id)
+                if not bucket.take(now):
+                    self._session_limited += 1
+                    return False
+            if type_bucket is not None:
+                type_bucket.tokens -= 1.0
+        return True
+
+    def truncate(self, event: dict[str, Any]) -> tuple[dict[str, Any], int]:
+        """Return *event* with oversized fields replaced, and how many were.
+
+        *event* itself is not modified; a shallow copy is returned if
+        anything changes.
+        """
+        out = event
+        count = 0
+        for key in _EVENT_FIELDS:
+            stub = self._stub(event.get(key))
+            if stub is not None:
+                if out is event:
+                    out = dict(event)
+                out[key] = stub
+                count += self._count(key)
+        tool_call = event.get("tool_call")
+        if isinstance(tool_call, dict):
+            new_call = tool_call
+            for key in _TOOL_FIELDS:
+                stub = self._stub(tool_call.get(key))
+                if stub is not None:
+                    if new_call is tool_call:
+                        new_call = dict(tool_call)
+                    new_call[key] = stub
+                    count += self._count(f"tool_call.{key}")
+            if new_call is not tool_call:
+                if out is event:
+                    out = dict(event)
+                out["tool_call"] = new_call
+        return out, count
+
+    def _stub(self, value: Any) -> dict[str, Any] | None:
+        if value is None:
+            return None
+        data = json.dumps(
+            value, ensure_ascii=False, separators=(",", ":"), allow_nan=False,
+        ).encode("utf-8")
+        if len(data) <= self.max_field_bytes:
+            return None
+        return {
+            "truncated": True,
+            "bytes": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "preview": data[: self.preview_bytes].decode("utf-8", "ignore"),
+        }
+
+    def _count(self, field: str) -> int:
+        with self._lock:
+            self._truncated[field] = self._truncated.get(field, 0) + 1
+        return 1
+
+    def stats(self) -> dict[str, Any]:
+        """Events dropped by event-type limit and by session limit, and
+        fields truncated, by field."""
+        with self._lock:
+            return {
+                "rate_limited": dict(self._limited),
+                "session_limited": self._session_limited,
+                "truncated": dict(self._truncated),
+            }
@@ -0,0 +1,305 @@
+"""Self-telemetry for the transport: counters, histograms and exposition.
+
+Every :class:`~agentlens.transport.Transport` keeps a
+:class:`TransportMetrics` and returns a snapshot of it from
+:meth:`~agentlens.transport.Transport.stats`::
+
+    stats = tracker.transport.stats()
+    stats["events"]["dropped"]         # {"overflow": 0, "retries_exhausted": 12, ...}
+    stats["batch_events"]["buckets"]   # [(1.0, 3), (5.0, 3), ..., (inf, 41)]
+
+The snapshot shows whether events are being lost silently (``dropped``
+by reason) and how batches are really sized — ``batch_events`` piling
+up well below ``batch_size`` means the flush interval, not the batch
+size, is what triggers uploads.
+
+:func:`to_prometheus` renders a snapshot in the Prometheus text format
+(or OpenMetrics), ready to be served from an existing ``/metrics``
+handler::
+
+    body = to_prometheus(transport.stats(), labels={"service": "planner"})
+
+Histograms use Prometheus semantics: cumulative bucket counts keyed by
+upper bound, plus a running sum and count.  The two per-event timings
+(``enqueue_latency`` and ``lock_wait``) are only counted, summed and
+maxed, which keeps ``send_event`` cheap.  Times are in seconds.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Any, Mapping, Sequence
+
+__all__ = [
+    "DROP_REASONS",
+    "Histogram",
+    "OPENMETRICS_CONTENT_TYPE",
+    "PROMETHEUS_CONTENT_TYPE",
+    "TransportMetrics",
+    "to_prometheus",
+]
+
+#: ``Content-Type`` for :func:`to_prometheus` output.
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+#: ``Content-Type`` for :func:`to_prometheus` output with ``openmetrics=True``.
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Bucket upper bounds; batch sizes stop at the backend's 500 events.
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_BATCH_EVENT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500)
+_BATCH_BYTE_BUCKETS = tuple(1024 * 4**i for i in range(7))  # 1 KiB .. 4 MiB
+
+#: Reasons for which events are dropped (see ``stats()["events"]["dropped"]``).
+DROP_REASONS = (
+    "overflow", "rate_limited", "rejected", "retries_exhausted", "shutdown", "unserializable",
+)
+
+
+class Histogram:
+    """Bucketed distribution of observed values.
+
+    Not thread-safe on its own: :class:`TransportMetrics` updates its
+    histograms under its lock.
+    """
+
+    __slots__ = ("bounds", "_counts", "count", "sum", "max")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(float(b) for b in bounds)
+        # One slot per bound plus the +Inf overflow bucket
+        self._counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return ``count``, ``sum``, ``max`` and cumulative ``buckets``
+        as ``(upper_bound, count)`` pairs ending with ``(inf, count)``."""
+        buckets = []
+        running = 0
+        for bound, n in zip(self.bounds + (math.inf,), self._counts):
+            running += n
+            buckets.append((bound, running))
+        return {"count": self.count, "sum": self.sum, "max": self.max, "buckets": buckets}
+
+
+class TransportMetrics:
+    """Counters and histograms describing one transport's traffic.
+
+    All updates take a single, private lock; the per-event path
+    (:meth:`record_enqueue`) takes it once per ``send_event`` call and
+    does plain arithmetic under it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.sent = 0
+        self.retried = 0
+        self.spooled = 0
+        self.truncated = 0
+        self.dropped = dict.fromkeys(DROP_REASONS, 0)
+        self.requests_ok = 0
+        self.requests_failed = 0
+        self.enqueue_calls = 0
+        self.enqueue_seconds = 0.0
+        self.enqueue_max = 0.0
+        self.lock_wait_seconds = 0.0
+        self.lock_wait_max = 0.0
+        self.send_seconds = Histogram(_LATENCY_BUCKETS)
+        self.batch_events = Histogram(_BATCH_EVENT_BUCKETS)
+        self.batch_bytes = Histogram(_BATCH_BYTE_BUCKETS)
+
+    def record_enqueue(self, events: int, seconds: float, lock_wait: float) -> None:
+        """Record one ``send_event`` / ``send_events`` call that buffered
+        *events* events in *seconds*, *lock_wait* of them spent waiting
+        for the buffer lock."""
+        with self._lock:
+            self.enqueued += events
+            self.enqueue_calls += 1
+            self.enqueue_seconds += seconds
+            if seconds > self.enqueue_max:
+                self.enqueue_max = seconds
+            self.lock_wait_seconds += lock_wait
+            if lock_wait > self.lock_wait_max:
+                self.lock_wait_max = lock_wait
+
+    def record_request(self, events: int, nbytes: int, seconds: float, ok: bool) -> None:
+        """Record one ``/events`` upload of *events* events in an *nbytes*
+        body (as sent, after compression)."""
+        with self._lock:
+            self.batch_events.observe(events)
+            self.batch_bytes.observe(nbytes)
+            self.send_seconds.observe(seconds)
+            if ok:
+                self.requests_ok += 1
+                self.sent += events
+            else:
+                self.requests_failed += 1
+
+    def record_drop(self, reason: str, events: int) -> None:
+        with self._lock:
+            self.dropped[reason] = self.dropped.get(reason, 0) + events
+
+    def record_retry(self, events: int) -> None:
+        with self._lock:
+            self.retried += events
+
+    def record_spool(self, events: int) -> None:
+        with self._lock:
+            self.spooled += events
+
+    def record_truncate(self, fields: int) -> None:
+        with self._lock:
+            self.truncated += fields
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a consistent copy of every counter and histogram."""
+        with self._lock:
+            return {
+                "events": {
+                    "enqueued": self.enqueued,
+                    "sent": self.sent,
+                    "retried": self.retried,
+                    "spooled": self.spooled,
+                    "truncated": self.truncated,
+                    "dropped": dict(self.dropped),
+                },
+                "requests": {"ok": self.requests_ok, "failed": self.requests_failed},
+                "enqueue_latency": {
+                    "count": self.enqueue_calls,
+                    "sum": self.enqueue_seconds,
+                    "max": self.enqueue_max,
+                },
+                "lock_wait": {
+                    "count": self.enqueue_calls,
+                    "sum": self.lock_wait_seconds,
+                    "max": self.lock_wait_max,
+                },
+                "send_latency": self.send_seconds.snapshot(),
+                "batch_events": self.batch_events.snapshot(),
+                "batch_bytes": self.batch_bytes.snapshot(),
+            }
+
+
+# ── Exposition ─────────────────────────────────────────────────────
+
+# (stats key, metric name, help) for each summary / histogram in a snapshot
+_SUMMARIES = (
+    ("enqueue_latency", "enqueue_seconds", "Time spent in send_event / send_events calls."),
+    ("lock_wait", "lock_wait_seconds", "Time producers waited for the buffer lock."),
+)
+_HISTOGRAMS = (
+    ("send_latency", "send_seconds", "Duration of /events uploads, including failover."),
+    ("batch_events", "batch_events", "Events per /events upload."),
+    ("batch_bytes", "batch_bytes", "Body size of /events uploads, after compression."),
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(base: str, extra: Mapping[str, str] | None = None) -> str:
+    """Join the sample's own *base* labels and the constant *extra* ones."""
+    pairs = [base] if base else []
+    pairs.extend(f'{k}="{_escape(str(v))}"' for k, v in (extra or {}).items())
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def to_prometheus(
+    stats: Mapping[str, Any],
+    *,
+    namespace: str = "agentlens_transport",
+    labels: Mapping[str, str] | None = None,
+    openmetrics: bool = False,
+) -> str:
+    """Render a :meth:`~agentlens.transport.Transport.stats` snapshot as
+    Prometheus text exposition.
+
+    Args:
+        stats: The snapshot to render.
+        namespace: Prefix of every metric name.
+        labels: Constant labels added to every sample, e.g. to tell
+            several transports in one process apart.
+        openmetrics: Emit the OpenMetrics format (serve it as
+            :data:`OPENMETRICS_CONTENT_TYPE`) instead of the classic one
+            (:data:`PROMETHEUS_CONTENT_TYPE`).
+    """
+    common = _labels("", labels)
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str) -> str:
+        full = f"{namespace}_{name}"
+        lines.append(f"# HELP {full} {help_text}")
+        lines.append(f"# TYPE {full} {kind}")
+        return full
+
+    def counter(name: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+        # OpenMetrics names the family without the _total suffix its
+        # samples carry; the classic format names it after the samples.
+        full = family(name if openmetrics else f"{name}_total", "counter", help_text)
+        sample = f"{full}_total" if openmetrics else full
+        for label, value in samples:
+            lines.append(f"{sample}{_labels(label, labels)} {_number(value)}")
+
+    events = stats["events"]
+    counter("events_enqueued", "Events accepted into the buffer.", [("", events["enqueued"])])
+    counter("events_sent", "Events accepted by the backend.", [("", events["sent"])])
+    counter("events_retried", "Events re-queued after a failed upload.", [("", events["retried"])])
+    counter("events_spooled", "Events written to the disk spool.", [("", events["spooled"])])
+    counter(
+        "fields_truncated", "Payload fields cut to the size budget.",
+        [("", events["truncated"])],
+    )
+    counter(
+        "events_dropped", "Events discarded without being delivered.",
+        [(f'reason="{reason}"', n) for reason, n in sorted(events["dropped"].items())],
+    )
+    counter(
+        "requests", "Uploads to /events by outcome.",
+        [('outcome="ok"', stats["requests"]["ok"]),
+         ('outcome="failed"', stats["requests"]["failed"])],
+    )
+
+    buffer = stats.get("buffer")
+    if buffer is not None:
+        full = family("buffer_events", "gauge", "Events waiting in the buffer.")
+        lines.append(f"{full}{common} {buffer['events']}")
+        full = family("buffer_bytes", "gauge", "Serialized size of the buffered events.")
+        lines.append(f"{full}{common} {buffer['bytes']}")
+
+    for key, name, help_text in _SUMMARIES:
+        summary = stats[key]
+        full = family(name, "summary", help_text)
+        lines.append(f"{full}_sum{common} {_number(float(summary['sum']))}")
+        lines.append(f"{full}_count{common} {summary['count']}")
+
+    for key, name, help_text in _HISTOGRAMS:
+        hist = stats[key]
+        full = family(name, "histogram", help_text)
+        for bound, count in hist["buckets"]:
+            le = f'le="{_number(bound)}"'
+            lines.append(f"{full}_bucket{_labels(le, labels)} {count}")
+        lines.append(f"{full}_sum{common} {_number(float(hist['sum']))}")
+        lines.append(f"{full}_count{common} {hist['count']}")
+
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,190 @@
+"""Retry scheduling and circuit breaking for batch uploads.
+
+During a backend brownout, retrying every failed batch on the next flush
+tick turns every SDK instance into load on an already struggling server.
+The transport therefore spaces retries with :class:`ExponentialBackoff`
+(full jitter, so many clients do not retry in lockstep), honours a
+``Retry-After`` header when the backend sends one (e.g. with ``429`` from
+its rate limiter), and stops sending altogether while a
+:class:`CircuitBreaker` is open.
+"""
+
+from __future__ import annotations
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger("agentlens.transport")
+
+__all__ = [
+    "CircuitBreaker",
+    "ExponentialBackoff",
+    "parse_retry_after",
+]
+
+# Upper bound on a server-requested delay, so a bogus header cannot stall
+# uploads indefinitely.
+_MAX_RETRY_AFTER = 600.0
+
+
+class ExponentialBackoff:
+    """Exponential backoff with "full jitter".
+
+    The delay before retry *attempt* (0-based) is drawn uniformly from
+    ``[0, min(cap, base * multiplier ** attempt)]``.
+
+    Args:
+        base: Upper bound of the first delay, in seconds.
+        cap: Maximum delay, in seconds.
+        multiplier: Growth factor per attempt.
+    """
+
+    def __init__(
+        self, base: float = 0.5, cap: float = 60.0, multiplier: float = 2.0,
+    ) -> None:
+        if base <= 0 or cap <= 0 or multiplier < 1:
+            raise ValueError("base and cap must be > 0 and multiplier >= 1")
+        self.base = base
+        self.cap = cap
+        self.multiplier = multiplier
+
+    def delay(self, attempt: int) -> float:
+        """Return the jittered delay in seconds before retry *attempt*."""
+        # Cap the exponent so huge attempt counts cannot overflow a float.
+        ceiling = min(self.cap, self.base * self.multiplier ** min(attempt, 64))
+        return random.uniform(0.0, ceiling)
+
+    def __repr__(self) -> str:
+        return (
+            f"ExponentialBackoff(base={self.base}, cap={self.cap}, "
+            f"multiplier={self.multiplier})"
+        )
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker.
+
+    *closed*: requests flow normally.  After *failure_threshold*
+    consecutive failures the breaker **opens** and rejects every request
+    for *recovery_timeout* seconds.  It then goes **half-open** and lets a
+    single probe request through: success closes the breaker, failure
+    opens it again.
+
+    Args:
+        failure_threshold: Consecutive failures that open the breaker.
+        recovery_timeout: Seconds to stay open before probing.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._changed_at = 0.0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        """Consecutive failures since the last success."""
+        return self._failures
+
+    def is_open(self) -> bool:
+        """True while the breaker is rejecting requests outright."""
+        with self._lock:
+            return (
+                self._state == self.OPEN
+                and self._clock() - self._changed_at < self.recovery_timeout
+            )
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now.
+
+        Moves an open breaker to half-open once *recovery_timeout* has
+        passed; the caller that gets True must then report the outcome
+        with :meth:`record_success` or :meth:`record_failure`.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            # Open, or half-open with a probe that never reported back.
+            if self._clock() - self._changed_at < self.recovery_timeout:
+                return False
+            if self._state == self.OPEN:
+                logger.info("Circuit half-open; probing backend")
+            self._state = self.HALF_OPEN
+            self._changed_at = self._clock()
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit closed; backend recovered")
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                logger.warning(
+                    "Circuit opened after %d consecutive failures; pausing "
+                    "uploads for %.1fs",
+                    self._failures,
+                    self.recovery_timeout,
+                )
+                self._state = self.OPEN
+                self._changed_at = self._clock()
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitBreaker(state={self._state!r}, failures={self._failures}, "
+            f"failure_threshold={self.failure_threshold})"
+        )
+
+
+def parse_retry_after(value: Any, now: float | None = None) -> float | None:
+    """Parse a ``Retry-After`` header into a delay in seconds.
+
+    Accepts delta-seconds (``"120"``) or an HTTP-date.  Returns ``None``
+    for a missing or malformed header; the result is clamped to
+    ``[0, 600]`` seconds.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            return None
+        seconds = when.timestamp() - (time.time() if now is None else now)
+    if seconds != seconds:  # NaN
+        return None
+    return min(max(seconds, 0.0), _MAX_RETRY_AFTER)
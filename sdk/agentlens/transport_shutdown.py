@@ -0,0 +1,94 @@
+"""Bounded shutdown: drain transports within a deadline and report on it.
+
+:meth:`Transport.close() <agentlens.transport.Transport.close>` gives the
+final drain a deadline (``shutdown_timeout``, 10 seconds by default).
+What is still buffered is posted — concurrently across session lanes when
+``max_in_flight > 1`` — and whatever has not been delivered when the
+deadline passes is written to the disk spool if there is one, or dropped.
+The returned :class:`ShutdownReport` says which::
+
+    report = transport.close(timeout=3.0)
+    if report.dropped:
+        print(f"lost {report.dropped} events")
+
+Every transport still open at interpreter exit is closed by an
+:mod:`atexit` hook (:func:`agentlens.transport.close_all`), sharing one
+overall deadline, so short-lived scripts no longer lose their last batch.
+``SIGTERM`` kills a Python process without running :mod:`atexit`; call
+:func:`install_signal_handlers` to drain on it too.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+__all__ = ["ShutdownReport", "install_signal_handlers"]
+
+
+@dataclass
+class ShutdownReport:
+    """What became of a transport's remaining events at shutdown.
+
+    Attributes:
+        flushed: Events delivered to the backend during shutdown,
+            including any replayed from the spool.
+        persisted: Events written to the disk spool, to be sent by the
+            next process that opens it.
+        dropped: Events lost: undelivered by the deadline, with no spool.
+        elapsed: Seconds the shutdown took.
+    """
+
+    flushed: int = 0
+    persisted: int = 0
+    dropped: int = 0
+    elapsed: float = 0.0
+
+    def __add__(self, other: ShutdownReport) -> ShutdownReport:
+        return ShutdownReport(
+            flushed=self.flushed + other.flushed,
+            persisted=self.persisted + other.persisted,
+            dropped=self.dropped + other.dropped,
+            elapsed=self.elapsed + other.elapsed,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "flushed": self.flushed,
+            "persisted": self.persisted,
+            "dropped": self.dropped,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+def install_signal_handlers(
+    signals: Iterable[int] = (signal.SIGTERM,),
+    timeout: float | None = None,
+) -> None:
+    """Close every open transport when one of *signals* arrives.
+
+    The handler runs :func:`agentlens.transport.close_all` with *timeout*
+    and then hands the signal on to the handler that was installed before
+    — or, if that was the default action, re-raises it so the process
+    still terminates with the usual status.  Must be called from the main
+    thread.
+    """
+    for signum in signals:
+        previous = signal.getsignal(signum)
+        if getattr(previous, "_agentlens_shutdown", False):
+            continue
+
+        def handler(received: int, frame: Any, previous: Any = previous) -> None:
+            from agentlens.transport import close_all
+
+            close_all(timeout)
+            if callable(previous):
+                previous(received, frame)
+            elif previous in (signal.SIG_DFL, None):
+                signal.signal(received, signal.SIG_DFL)
+                os.kill(os.getpid(), received)
+
+        handler._agentlens_shutdown = True  # type: ignore[attr-defined]
+        signal.signal(signum, handler)
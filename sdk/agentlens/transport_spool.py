@@ -0,0 +1,379 @@
+"""Durable on-disk spool for events the transport could not deliver.
+
+When the backend is unreachable the in-memory buffer eventually overflows
+and failed batches run out of retries.  A :class:`DiskSpool` catches those
+events instead of dropping them: it is an append-only log of segment files
+that the transport drains, in order, once the backend recovers — including
+after a process restart, since the spool directory is simply reopened on
+the next ``agentlens.init(spool_dir=...)``.
+
+Layout of the spool directory::
+
+    0000000000000001.seg   # oldest segment, one JSON event per line
+    0000000000000002.seg   # ...
+    cursor                 # "<segment> <byte offset>" of the next unread event
+    worker-<pid>/          # spool of a forked child (see DiskSpool.for_child)
+
+Segments are newline-delimited JSON (event JSON never contains a raw
+newline).  A record without its trailing newline — a write torn by a crash
+— is ignored.  Delivery is at-least-once: events read but not yet
+acknowledged when the process dies are sent again on replay.
+
+A forked child spools into its own ``worker-<pid>`` subdirectory.  When a
+spool is opened, the unread events of every such subdirectory whose
+process has exited are moved into it and the subdirectory is removed, so a
+restarted parent sends what its workers left behind.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import BinaryIO, Union
+
+logger = logging.getLogger("agentlens.transport")
+
+__all__ = ["DiskSpool", "FSYNC_POLICIES"]
+
+#: ``"always"`` fsyncs every append, ``"rotate"`` fsyncs when a segment is
+#: closed, ``"never"`` leaves durability to the OS page cache.
+FSYNC_POLICIES = ("always", "rotate", "never")
+
+_SEGMENT_SUFFIX = ".seg"
+_CURSOR_FILE = "cursor"
+_WORKER_PREFIX = "worker-"
+_ADOPT_BATCH_EVENTS = 1000
+
+
+def _process_exists(pid: int) -> bool:
+    """True if a process with *pid* exists (it may belong to another user)."""
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class DiskSpool:
+    """Append-only, size-capped, segment-file event spool.
+
+    Thread-safe for any number of writers and a single reader (the
+    transport serialises draining).
+
+    Args:
+        directory: Spool directory; created if missing.
+        max_bytes: Cap on total segment bytes.  When exceeded the oldest
+            segments are deleted (and their events lost) to make room.
+        segment_bytes: Size at which the active segment is closed and a new
+            one started.  Fully drained segments are deleted whole.
+        fsync: One of :data:`FSYNC_POLICIES`.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike[str]],
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        segment_bytes: int = 8 * 1024 * 1024,
+        fsync: str = "rotate",
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        if max_bytes <= 0 or segment_bytes <= 0:
+            raise ValueError("max_bytes and segment_bytes must be > 0")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.dropped_bytes = 0
+
+        self._lock = threading.Lock()
+        self._sizes: dict[int, int] = {}
+        for path in self.directory.glob(f"*{_SEGMENT_SUFFIX}"):
+            try:
+                self._sizes[int(path.stem)] = path.stat().st_size
+            except (ValueError, OSError):
+                continue
+        self._segments = sorted(self._sizes)
+        if self._segments:
+            self._repair_tail(self._segments[-1])
+        # Running total of ``_sizes``, so readers need not walk the dict.
+        self._total_bytes = sum(self._sizes.values())
+        self._active: BinaryIO | None = None
+        self._active_seq: int | None = None
+        self._peeked: tuple[int, int] | None = None
+        self._cursor_seq, self._cursor_offset = self._load_cursor()
+        self.adopt_orphans()
+
+    def __repr__(self) -> str:
+        return (
+            f"DiskSpool(directory={str(self.directory)!r}, "
+            f"segments={len(self._segments)}, pending_bytes={self.pending_bytes})"
+        )
+
+    # ── Cursor ─────────────────────────────────────────────────────
+
+    def _path(self, seq: int) -> Path:
+        return self.directory / f"{seq:016d}{_SEGMENT_SUFFIX}"
+
+    def _load_cursor(self) -> tuple[int, int]:
+        """Read the persisted cursor, discarding segments it has passed."""
+        seq, offset = 0, 0
+        try:
+            raw = (self.directory / _CURSOR_FILE).read_text().split()
+            seq, offset = int(raw[0]), int(raw[1])
+        except (OSError, ValueError, IndexError):
+            pass
+        for old in [s for s in self._segments if s < seq]:
+            self._delete_segment(old)
+        if not self._segments:
+            return 0, 0
+        if seq != self._segments[0]:
+            return self._segments[0], 0
+        return seq, offset
+
+    def _repair_tail(self, seq: int) -> None:
+        """Truncate a record torn by a crash off the end of segment *seq*."""
+        path = self._path(seq)
+        data = path.read_bytes()
+        keep = data.rfind(b"\n") + 1
+        if keep < len(data):
+            logger.warning(
+                "Discarding %d bytes of torn record at end of %s",
+                len(data) - keep,
+                path.name,
+            )
+            with open(path, "r+b") as f:
+                f.truncate(keep)
+            self._sizes[seq] = keep
+
+    def _save_cursor(self) -> None:
+        tmp = self.directory / f"{_CURSOR_FILE}.tmp"
+        with open(tmp, "w") as f:
+            f.write(f"{self._cursor_seq} {self._cursor_offset}\n")
+            if self.fsync == "always":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, self.directory / _CURSOR_FILE)
+
+    # ── Writing ────────────────────────────────────────────────────
+
+    def append(self, events: list[bytes]) -> None:
+        """Append serialized *events* to the active segment."""
+        if not events:
+            return
+        data = b"\n".join(events) + b"\n"
+        with self._lock:
+            if self._active is None or self._sizes[self._active_seq] >= self.segment_bytes:
+                self._open_segment()
+            assert self._active is not None and self._active_seq is not None
+            self._active.write(data)
+            self._active.flush()
+            if self.fsync == "always":
+                os.fsync(self._active.fileno())
+            self._sizes[self._active_seq] += len(data)
+            self._total_bytes += len(data)
+            self._enforce_cap()
+
+    def _open_segment(self) -> None:
+        """Close the active segment (if any) and start a new one.  Lock held."""
+        self._close_active()
+        seq = (self._segments[-1] + 1) if self._segments else 1
+        self._active = open(self._path(seq), "ab")
+        self._active_seq = seq
+        self._segments.append(seq)
+        self._sizes[seq] = 0
+        if not self._cursor_seq or len(self._segments) == 1:
+            self._cursor_seq, self._cursor_offset = seq, 0
+
+    def _close_active(self) -> None:
+        """Close the active segment so it can be read.  Lock held."""
+        if self._active is None:
+            return
+        self._active.flush()
+        if self.fsync in ("always", "rotate"):
+            os.fsync(self._active.fileno())
+        self._active.close()
+        self._active = None
+        self._active_seq = None
+
+    def _enforce_cap(self) -> None:
+        """Delete the oldest segments while over ``max_bytes``.  Lock held."""
+        while self._total_bytes > self.max_bytes and len(self._segments) > 1:
+            oldest = self._segments[0]
+            lost = self._sizes[oldest] - (
+                self._cursor_offset if oldest == self._cursor_seq else 0
+            )
+            self._delete_segment(oldest)
+            self.dropped_bytes += lost
+            logger.error(
+                "Spool exceeded %d bytes; discarded oldest segment (%d bytes)",
+                self.max_bytes,
+                lost,
+            )
+            self._cursor_seq, self._cursor_offset = self._segments[0], 0
+            self._peeked = None
+
+    def _delete_segment(self, seq: int) -> None:
+        try:
+            self._path(seq).unlink()
+        except FileNotFoundError:
+            pass
+        self._total_bytes -= self._sizes.pop(seq, 0)
+        if seq in self._segments:
+            self._segments.remove(seq)
+
+    # ── Reading ────────────────────────────────────────────────────
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes of spooled events not yet acknowledged."""
+        with self._lock:
+            return self._total_bytes - self._cursor_offset
+
+    def is_empty(self) -> bool:
+        """True when every spooled event has been acknowledged."""
+        return self.pending_bytes <= 0
+
+    def peek(self, max_events: int, max_bytes: int) -> list[bytes]:
+        """Return up to *max_events* / *max_bytes* of the oldest unread events.
+
+        The events stay spooled until :meth:`ack` is called; calling
+        ``peek`` again without ``ack`` returns the same events.  At least
+        one event is returned if any are pending, even if it alone exceeds
+        *max_bytes*.
+        """
+        with self._lock:
+            events: list[bytes] = []
+            size = 0
+            peeked = None
+            for seq in self._segments:
+                start = self._cursor_offset if seq == self._cursor_seq else 0
+                end, size, exhausted = self._read_segment(
+                    seq, start, events, max_events, max_bytes, size,
+                )
+                peeked = (seq, end)
+                if not exhausted:
+                    break
+            self._peeked = peeked if events else None
+            return events
+
+    def _read_segment(
+        self,
+        seq: int,
+        offset: int,
+        events: list[bytes],
+        max_events: int,
+        max_bytes: int,
+        size: int,
+    ) -> tuple[int, int, bool]:
+        """Append records of segment *seq* from *offset* to *events*.
+
+        Returns the offset reached, the running byte total, and whether the
+        end of the segment was reached.  Lock held.
+        """
+        try:
+            f = open(self._path(seq), "rb")
+        except FileNotFoundError:
+            return offset, size, True
+        with f:
+            f.seek(offset)
+            while len(events) < max_events:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    return offset, size, True  # EOF, or a torn record
+                if events and size + len(line) > max_bytes:
+                    break
+                offset += len(line)
+                size += len(line)
+                if len(line) > 1:
+                    events.append(line[:-1])
+            return offset, size, False
+
+    def ack(self) -> None:
+        """Mark the events returned by the last :meth:`peek` as delivered."""
+        with self._lock:
+            if self._peeked is None:
+                return
+            self._cursor_seq, self._cursor_offset = self._peeked
+            self._peeked = None
+            # Segments behind the cursor, and the cursor's own segment once
+            # fully read and closed, are no longer needed.
+            for seq in [s for s in self._segments if s < self._cursor_seq]:
+                self._delete_segment(seq)
+            seq = self._cursor_seq
+            if seq != self._active_seq and self._cursor_offset >= self._sizes.get(seq, 0):
+                self._delete_segment(seq)
+                if self._segments:
+                    self._cursor_seq, self._cursor_offset = self._segments[0], 0
+                else:
+                    self._cursor_seq, self._cursor_offset = 0, 0
+            self._save_cursor()
+
+    def adopt_orphans(self) -> int:
+        """Move the unread events of ``worker-<pid>`` subdirectories whose
+        process has exited into this spool, and remove those directories.
+
+        Called when the spool is opened; returns the number of events
+        adopted.  Directories of running processes are left alone.
+        """
+        adopted = 0
+        for path in sorted(self.directory.glob(f"{_WORKER_PREFIX}*")):
+            try:
+                pid = int(path.name[len(_WORKER_PREFIX):])
+            except ValueError:
+                continue
+            if not path.is_dir() or _process_exists(pid):
+                continue
+            try:
+                orphan = DiskSpool(
+                    path,
+                    max_bytes=self.max_bytes,
+                    segment_bytes=self.segment_bytes,
+                    fsync=self.fsync,
+                )
+                while True:
+                    events = orphan.peek(_ADOPT_BATCH_EVENTS, self.segment_bytes)
+                    if not events:
+                        break
+                    self.append(events)
+                    orphan.ack()
+                    adopted += len(events)
+                orphan.close()
+                shutil.rmtree(path)
+            except OSError as e:
+                logger.warning("Could not adopt worker spool %s: %s", path.name, e)
+        if adopted:
+            logger.info("Adopted %d spooled events from exited workers", adopted)
+        return adopted
+
+    def for_child(self, pid: int) -> DiskSpool:
+        """Return a spool with the same settings in a ``worker-<pid>``
+        subdirectory, for a forked child process.
+
+        Two processes must never append to the same segment; the parent
+        keeps this directory and each child gets its own.  Whatever the
+        child leaves unsent is picked up by :meth:`adopt_orphans` once it
+        has exited.
+        """
+        return DiskSpool(
+            self.directory / f"{_WORKER_PREFIX}{pid}",
+            max_bytes=self.max_bytes,
+            segment_bytes=self.segment_bytes,
+            fsync=self.fsync,
+        )
+
+    def close(self) -> None:
+        """Close the active segment, keeping all pending events on disk."""
+        with self._lock:
+            self._close_active()
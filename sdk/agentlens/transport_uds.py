@@ -0,0 +1,439 @@
+"""Per-host event aggregation over a Unix domain socket.
+
+In a pre-fork server (gunicorn, celery, uwsgi) every worker process would
+otherwise keep its own buffer, flush thread and connection pool to the
+backend.  With an aggregator, one process per host uploads for all of them:
+
+* :class:`Collector` listens on a Unix socket, accepts event frames from
+  any number of local processes and feeds them into an ordinary
+  :class:`~agentlens.transport.Transport`, which batches, compresses,
+  spools and retries as usual.
+* :class:`UnixSocketTransport` is what the workers use.  It buffers and
+  batches exactly like ``Transport``, but each "upload" is a frame written
+  to the socket instead of an HTTPS request.
+
+:func:`connect_aggregator` picks the role: the first process to bind the
+socket becomes the uploader (running the collector in a background
+thread), every later one — including children forked from it — becomes a
+client.
+
+Wire format: each frame is a 4-byte big-endian payload length followed by
+the payload, which is the events' compact JSON joined with ``\\n``.
+Encoded events never contain a raw newline, so the collector can buffer
+them without decoding.
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Any, Iterator, Union
+
+import httpx
+
+from agentlens.transport import UDS_SCHEME, Transport, _live_transports
+from agentlens.transport_lanes import session_first
+from agentlens.transport_shutdown import ShutdownReport
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger("agentlens.transport")
+
+__all__ = [
+    "Collector",
+    "MAX_FRAME_BYTES",
+    "UnixSocketClient",
+    "UnixSocketTransport",
+    "bind_socket",
+    "connect_aggregator",
+    "decode_frame",
+    "encode_frame",
+    "read_frames",
+    "socket_path_from_endpoint",
+]
+
+_FRAME_HEADER = struct.Struct(">I")
+
+#: Largest frame a collector accepts; bigger ones drop the connection.
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def socket_path_from_endpoint(endpoint: str) -> str | None:
+    """Return the socket path of a ``uds://`` endpoint, or None.
+
+    ``uds:///run/agentlens.sock`` names ``/run/agentlens.sock``.
+    """
+    if not endpoint.startswith(UDS_SCHEME):
+        return None
+    path = endpoint[len(UDS_SCHEME):]
+    if not path:
+        raise ValueError(f"no socket path in {endpoint!r}")
+    return path
+
+
+def encode_frame(events: list[bytes]) -> bytes:
+    """Build one length-prefixed frame carrying *events*."""
+    payload = b"\n".join(events)
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_frame(payload: bytes) -> list[bytes]:
+    """Split a frame payload back into encoded events."""
+    return [line for line in payload.split(b"\n") if line]
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes | None:
+    """Read exactly *n* bytes; None on a clean EOF before the first byte."""
+    chunks = []
+    remaining = n
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            if remaining == n:
+                return None
+            raise ConnectionError("connection closed mid-frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frames(sock: socket.socket) -> Iterator[bytes]:
+    """Yield frame payloads from *sock* until the peer disconnects.
+
+    Raises:
+        ValueError: If a frame exceeds :data:`MAX_FRAME_BYTES`.
+        ConnectionError: If the peer disconnects in the middle of a frame.
+    """
+    while True:
+        header = _recv_exact(sock, _FRAME_HEADER.size)
+        if header is None:
+            return
+        (length,) = _FRAME_HEADER.unpack(header)
+        if length > MAX_FRAME_BYTES:
+            raise ValueError(f"frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+        payload = _recv_exact(sock, length) if length else b""
+        if payload is None:
+            raise ConnectionError("connection closed mid-frame")
+        yield payload
+
+
+def _is_listening(path: str) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+def bind_socket(path: PathLike, mode: int = 0o600) -> socket.socket | None:
+    """Bind and listen on the Unix socket *path*.
+
+    Returns None if another live process is already listening there.  A
+    stale socket file left by a dead process is replaced.  Concurrent
+    callers are serialized with an advisory lock on ``<path>.lock``.
+    """
+    path = os.fspath(path)
+    lock_fd = os.open(path + ".lock", os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            try:
+                sock.bind(path)
+            except OSError as e:
+                if e.errno != errno.EADDRINUSE:
+                    raise
+                if _is_listening(path):
+                    sock.close()
+                    return None
+                os.unlink(path)
+                sock.bind(path)
+            os.chmod(path, mode)
+            sock.listen(128)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+    finally:
+        os.close(lock_fd)
+
+
+class UnixSocketClient:
+    """Drop-in for the ``post`` method of ``httpx.Client`` that writes each
+    request body as a frame to a Unix socket.
+
+    Socket errors are raised as ``httpx.ConnectError`` so the transport's
+    retry, backoff and spool handling apply unchanged.  A frame is
+    "accepted" once the kernel has taken it; there is no per-frame ack.
+    """
+
+    def __init__(self, path: PathLike, timeout: float = 10.0) -> None:
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._lock = threading.Lock()
+
+    def post(self, url: str, *, content: bytes, **kwargs: Any) -> httpx.Response:
+        request = httpx.Request("POST", url)
+        if len(content) > MAX_FRAME_BYTES:
+            return httpx.Response(413, request=request, text="frame too large")
+        frame = _FRAME_HEADER.pack(len(content)) + content
+        with self._lock:
+            try:
+                if self._sock is None:
+                    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    sock.settimeout(self.timeout)
+                    try:
+                        sock.connect(self.path)
+                    except OSError:
+                        sock.close()
+                        raise
+                    self._sock = sock
+                self._sock.sendall(frame)
+            except OSError as e:
+                self._close_socket()
+                raise httpx.ConnectError(f"{self.path}: {e}", request=request) from e
+        return httpx.Response(202, request=request)
+
+    def _close_socket(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:  # pragma: no cover - defensive
+                pass
+            self._sock = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_socket()
+
+
+class Collector:
+    """Accept event frames on a Unix socket and upload them via *transport*.
+
+    Args:
+        transport: Upstream transport the received events are buffered in.
+            The collector owns it and closes it in :meth:`close`.
+        path: Socket path to bind (ignored when *listener* is given).
+        listener: An already bound and listening socket, e.g. from
+            :func:`bind_socket`.
+        mode: Permissions of the socket file created for *path*.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        path: PathLike | None = None,
+        *,
+        listener: socket.socket | None = None,
+        mode: int = 0o600,
+    ) -> None:
+        if listener is None:
+            if path is None:
+                raise ValueError("either path or listener is required")
+            listener = bind_socket(path, mode)
+            if listener is None:
+                raise OSError(errno.EADDRINUSE, f"a collector is already listening on {path}")
+        self.transport = transport
+        self.path = listener.getsockname()
+        self._listener = listener
+        # Poll so close() is noticed without relying on accept() being
+        # interrupted by a close from another thread.
+        self._listener.settimeout(0.5)
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._handlers: set[threading.Thread] = set()
+        self._stats_lock = threading.Lock()
+        self.frames = 0
+        self.events = 0
+        # Only the process that created the collector can use the upstream
+        # transport; a forked child must not restart its threads.
+        _live_transports.discard(transport)
+
+    def __repr__(self) -> str:
+        return f"Collector(path={self.path!r}, frames={self.frames}, events={self.events})"
+
+    def start(self) -> Collector:
+        """Serve in a background daemon thread; returns self."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="agentlens-collector", daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Accept connections until :meth:`close` is called."""
+        while not self._closed.is_set():
+            try:
+                conn, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._closed.is_set():
+                    return
+                raise
+            conn.settimeout(None)
+            handler = threading.Thread(
+                target=self._handle, args=(conn,),
+                name="agentlens-collector-conn", daemon=True,
+            )
+            with self._stats_lock:
+                self._handlers.add(handler)
+            handler.start()
+
+    def _handle(self, conn: socket.socket) -> None:
+        with conn:
+            try:
+                for payload in read_frames(conn):
+                    events = decode_frame(payload)
+                    with self._stats_lock:
+                        self.frames += 1
+                        self.events += len(events)
+                    self.transport.send_serialized(events)
+            except (OSError, ValueError) as e:
+                logger.warning("Dropping collector connection: %s", e)
+            finally:
+                with self._stats_lock:
+                    self._handlers.discard(threading.current_thread())
+
+    def detach(self) -> None:
+        """Close this process's copy of the listening socket without
+        removing the socket file (used in forked children)."""
+        self._closed.set()
+        self._listener.close()
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Stop accepting, remove the socket file and close the upstream
+        transport (flushing what it holds).
+
+        Connections that are still open get up to *timeout* seconds in
+        total to deliver what they have already sent.
+        """
+        self.detach()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        deadline = time.monotonic() + timeout
+        with self._stats_lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            handler.join(timeout=max(0.0, deadline - time.monotonic()))
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        self.transport.close()
+
+
+class UnixSocketTransport(Transport):
+    """Transport that hands batches to a local :class:`Collector`.
+
+    Buffering, batching, backoff and spooling work as in
+    :class:`~agentlens.transport.Transport`; only the upload goes to the
+    Unix socket *socket_path* (a path or a ``uds://`` endpoint).  *endpoint* and *api_key* are still used for
+    the request helpers (``get`` / ``post`` / ...) that query the backend
+    directly.  Events are encoded with ``session_id`` first so a collector
+    with ``max_in_flight > 1`` can lane them (see
+    :mod:`agentlens.transport_lanes`).
+    """
+
+    def __init__(
+        self,
+        socket_path: PathLike,
+        endpoint: str = "http://localhost:3000",
+        api_key: str = "default",
+        **kwargs: Any,
+    ) -> None:
+        if kwargs.get("wire_format", "json") != "json":
+            raise ValueError("UnixSocketTransport sends JSON; set wire_format on the collector")
+        socket_path = os.fspath(socket_path)
+        self.socket_path = socket_path_from_endpoint(socket_path) or socket_path
+        self._api_client: httpx.Client | None = None
+        self._collector: Collector | None = None
+        super().__init__(endpoint, api_key, **kwargs)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(socket_path={self.socket_path!r}, "
+            f"uploader={self._collector is not None}, buffer={len(self._buffer)})"
+        )
+
+    def _make_client(self) -> Any:
+        return UnixSocketClient(self.socket_path)
+
+    def _serialize(self, event: dict[str, Any]) -> bytes | None:
+        return super()._serialize(session_first(event))
+
+    def _encode_batch(self, events: list[bytes]) -> dict[str, Any]:
+        return {"content": b"\n".join(events)}
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        if self._api_client is None:
+            self._api_client = self._shared_client or self.http.build_client()
+        headers = {**self._auth_headers(), **kwargs.pop("headers", {})}
+        response = self._api_client.request(
+            method, f"{self.endpoint}{path}", headers=headers, **kwargs,
+        )
+        response.raise_for_status()
+        return response
+
+    def _after_fork(self) -> None:
+        # The parent keeps uploading; this child becomes a plain client.
+        if self._collector is not None:
+            self._collector.detach()
+            self._collector = None
+        self._api_client = None
+        super()._after_fork()
+
+    def close(self, timeout: float | None = None) -> ShutdownReport:
+        report = super().close(timeout)
+        if self._api_client is not None and self._api_client is not self._shared_client:
+            self._api_client.close()
+        if self._collector is not None:
+            self._collector.close()
+            self._collector = None
+        return report
+
+
+def connect_aggregator(
+    socket_path: PathLike,
+    endpoint: str = "http://localhost:3000",
+    api_key: str = "default",
+    **kwargs: Any,
+) -> UnixSocketTransport:
+    """Join (or become) the per-host aggregator at *socket_path*.
+
+    If nothing is listening on the socket, this process binds it and
+    starts a :class:`Collector` thread that uploads to *endpoint* through a
+    ``Transport(endpoint, api_key, **kwargs)``.  Either way the returned
+    transport sends this process's events over the socket.
+    """
+    listener = bind_socket(socket_path)
+    client_kwargs = {
+        key: kwargs[key]
+        for key in ("batch_size", "flush_interval", "max_latency")
+        if key in kwargs
+    }
+    # Limits apply where events are produced, in each process.
+    client_kwargs["limits"] = kwargs.pop("limits", None)
+    transport = UnixSocketTransport(
+        socket_path, endpoint=endpoint, api_key=api_key, **client_kwargs,
+    )
+    if listener is not None:
+        upstream = Transport(endpoint, api_key, **kwargs)
+        transport._collector = Collector(upstream, listener=listener).start()
+        logger.info("Uploading events for all local processes via %s", socket_path)
+    return transport
@@ -0,0 +1,400 @@
+"""Compact binary wire format for ``/events`` batches.
+
+JSON stays the default.  ``Transport(wire_format="msgpack")`` encodes each
+event as MessagePack instead, with AgentLens-specific extension types
+that the backend's ingest route decodes (see ``backend/lib/wire-format.js``):
+
+* **Interned strings** (ext type 1, one-byte index): field names, event
+  types and statuses from :data:`INTERNED_STRINGS` are sent as three-byte
+  references instead of text.  The table is part of the protocol: entries
+  may only ever be appended.
+* **Timestamps** (ext types 2 and 3, eight bytes): UTC ISO-8601 strings
+  under ``timestamp`` / ``started_at`` / ``ended_at`` become signed
+  big-endian microseconds since the epoch — type 2 for the ``+00:00`` form
+  ``datetime.isoformat()`` produces, type 3 for the ``Z`` form of
+  Pydantic's JSON serializer, which event timestamps use.  The backend
+  turns them back into the same text, so stored events are identical in
+  both formats.
+
+MessagePack values can be concatenated, so events are still encoded once,
+when they are buffered, and a batch is an array header followed by the
+joined events.  A batch is sent with ``Content-Type:``
+:data:`MSGPACK_CONTENT_TYPE` and may be compressed like a JSON one.
+
+The encoder accepts exactly what :func:`~agentlens.transport.encode_event`
+accepts, so an event that is valid in one format is valid in the other.
+The only exception is integers outside the 64-bit range.
+"""
+
+from __future__ import annotations
+
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+__all__ = [
+    "INTERNED_STRINGS",
+    "MSGPACK_CONTENT_TYPE",
+    "WIRE_FORMATS",
+    "decode_batch",
+    "decode_event",
+    "encode_batch",
+    "encode_event_msgpack",
+]
+
+#: Accepted values of ``Transport(wire_format=...)``.
+WIRE_FORMATS = ("json", "msgpack")
+
+#: Content-Type of a MessagePack batch.
+MSGPACK_CONTENT_TYPE = "application/vnd.agentlens.v1+msgpack"
+
+#: Strings sent as one-byte references.  Append-only: the index of an
+#: entry is its wire code, shared with the backend decoder.
+INTERNED_STRINGS = (
+    # Event fields
+    "event_id", "session_id", "event_type", "timestamp", "input_data",
+    "output_data", "model", "tokens_in", "tokens_out", "tool_call",
+    "decision_trace", "duration_ms",
+    # Session lifecycle fields
+    "agent_name", "metadata", "started_at", "ended_at", "total_tokens_in",
+    "total_tokens_out", "status",
+    # Tool call and decision trace fields
+    "tool_call_id", "tool_name", "tool_input", "tool_output", "trace_id",
+    "step", "reasoning", "alternatives_considered", "confidence",
+    # Event types ("tool_call" is listed above)
+    "session_start", "session_end", "llm_call", "tool_error", "agent_call",
+    "agent_error", "error", "generic", "decision",
+    # Session statuses ("error" is listed above)
+    "active", "completed", "timeout",
+)
+
+_EXT_INTERNED = 1
+_EXT_TIMESTAMP = 2
+_EXT_TIMESTAMP_Z = 3
+
+_INTERN_CODES = {
+    s: bytes((0xD4, _EXT_INTERNED, i)) for i, s in enumerate(INTERNED_STRINGS)
+}
+_TIMESTAMP_KEYS = frozenset({"timestamp", "started_at", "ended_at"})
+_TIMESTAMP_HEADER = bytes((0xD7, _EXT_TIMESTAMP))
+_TIMESTAMP_Z_HEADER = bytes((0xD7, _EXT_TIMESTAMP_Z))
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+_DOUBLE = struct.Struct(">d")
+_INF = float("inf")
+
+
+# ── Encoding ────────────────────────────────────────────────────────
+
+
+def encode_event_msgpack(event: dict[str, Any]) -> bytes:
+    """Serialize one event to the AgentLens MessagePack format.
+
+    Raises:
+        TypeError / ValueError: If *event* is not JSON-serializable, or
+            holds an integer outside the 64-bit range.
+    """
+    out = bytearray()
+    _pack(event, out)
+    return bytes(out)
+
+
+def encode_batch(events: list[bytes]) -> bytes:
+    """Build a batch body from events encoded by :func:`encode_event_msgpack`."""
+    return _container_header(len(events), 0x90, 0xDC) + b"".join(events)
+
+
+def _container_header(n: int, fix: int, code16: int) -> bytes:
+    # Array and map headers differ only in their type codes (+1 for 32-bit).
+    if n < 16:
+        return bytes((fix | n,))
+    if n < 0x10000:
+        return bytes((code16,)) + n.to_bytes(2, "big")
+    return bytes((code16 + 1,)) + n.to_bytes(4, "big")
+
+
+def _pack(obj: Any, out: bytearray) -> None:
+    t = type(obj)
+    if t is str:
+        _pack_str(obj, out)
+    elif t is int:
+        _pack_int(obj, out)
+    elif t is dict:
+        _pack_map(obj, out)
+    elif obj is None:
+        out.append(0xC0)
+    elif t is bool:
+        out.append(0xC3 if obj else 0xC2)
+    elif t is float:
+        _pack_float(obj, out)
+    elif t is list or t is tuple:
+        _pack_array(obj, out)
+    # Subclasses, encoded the way the json module encodes them.
+    elif isinstance(obj, str):
+        _pack_str(str(obj), out)
+    elif isinstance(obj, bool):
+        out.append(0xC3 if obj else 0xC2)
+    elif isinstance(obj, int):
+        _pack_int(int(obj), out)
+    elif isinstance(obj, float):
+        _pack_float(float(obj), out)
+    elif isinstance(obj, dict):
+        _pack_map(obj, out)
+    elif isinstance(obj, (list, tuple)):
+        _pack_array(obj, out)
+    else:
+        raise TypeError(f"Object of type {t.__name__} is not JSON serializable")
+
+
+def _pack_str(s: str, out: bytearray) -> None:
+    code = _INTERN_CODES.get(s)
+    if code is not None:
+        out += code
+        return
+    data = s.encode("utf-8")
+    n = len(data)
+    if n < 32:
+        out.append(0xA0 | n)
+    elif n < 0x100:
+        out.append(0xD9)
+        out.append(n)
+    elif n < 0x10000:
+        out.append(0xDA)
+        out += n.to_bytes(2, "big")
+    else:
+        out.append(0xDB)
+        out += n.to_bytes(4, "big")
+    out += data
+
+
+def _pack_int(i: int, out: bytearray) -> None:
+    if 0 <= i < 0x80:
+        out.append(i)
+    elif -32 <= i < 0:
+        out.append(i & 0xFF)
+    elif i > 0:
+        if i < 0x100:
+            out.append(0xCC)
+            out.append(i)
+        elif i < 0x10000:
+            out.append(0xCD)
+            out += i.to_bytes(2, "big")
+        elif i < 0x100000000:
+            out.append(0xCE)
+            out += i.to_bytes(4, "big")
+        elif i < 0x10000000000000000:
+            out.append(0xCF)
+            out += i.to_bytes(8, "big")
+        else:
+            raise ValueError(f"integer {i} does not fit in 64 bits")
+    elif i >= -0x80:
+        out.append(0xD0)
+        out += i.to_bytes(1, "big", signed=True)
+    elif i >= -0x8000:
+        out.append(0xD1)
+        out += i.to_bytes(2, "big", signed=True)
+    elif i >= -0x80000000:
+        out.append(0xD2)
+        out += i.to_bytes(4, "big", signed=True)
+    elif i >= -0x8000000000000000:
+        out.append(0xD3)
+        out += i.to_bytes(8, "big", signed=True)
+    else:
+        raise ValueError(f"integer {i} does not fit in 64 bits")
+
+
+def _pack_float(f: float, out: bytearray) -> None:
+    if f != f or f == _INF or f == -_INF:
+        raise ValueError("Out of range float values are not JSON compliant")
+    out.append(0xCB)
+    out += _DOUBLE.pack(f)
+
+
+def _pack_array(items: Any, out: bytearray) -> None:
+    out += _container_header(len(items), 0x90, 0xDC)
+    for item in items:
+        _pack(item, out)
+
+
+def _json_key(key: Any) -> str:
+    """Coerce a non-string dict key the way ``json.dumps`` does."""
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return float.__repr__(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _pack_map(d: dict[Any, Any], out: bytearray) -> None:
+    out += _container_header(len(d), 0x80, 0xDE)
+    intern = _INTERN_CODES.get
+    # Keys and small values are inlined: this loop is the per-event hot path.
+    for key, value in d.items():
+        code = intern(key)
+        if code is not None:
+            out += code
+        else:
+            if type(key) is not str:
+                key = _json_key(key)
+            _pack_str(key, out)
+        t = type(value)
+        if t is str:
+            if key in _TIMESTAMP_KEYS:
+                stamp = _pack_timestamp(value)
+                if stamp is not None:
+                    out += stamp
+                    continue
+            _pack_str(value, out)
+        elif t is int and 0 <= value < 0x80:
+            out.append(value)
+        else:
+            _pack(value, out)
+
+
+def _pack_timestamp(value: str) -> bytes | None:
+    """Timestamp extension for a UTC ISO-8601 string, else None.
+
+    Only text the decoder reproduces exactly (``datetime.isoformat()`` of
+    a UTC datetime, or the same with ``Z`` for ``+00:00``) is converted;
+    anything else is sent as-is.
+    """
+    if value.endswith("Z"):
+        header = _TIMESTAMP_Z_HEADER
+        value = value[:-1] + "+00:00"  # fromisoformat() takes "Z" only on 3.11+
+    elif value.endswith("+00:00"):
+        header = _TIMESTAMP_HEADER
+    else:
+        return None
+    # Cheap shape check instead of comparing against dt.isoformat(), which
+    # costs more than the parse: YYYY-MM-DDTHH:MM:SS[.ffffff]+00:00.
+    n = len(value)
+    if (
+        not (n == 25 or (n == 32 and value[19] == "."))
+        or value[7] != "-"
+        or value[10] != "T"
+    ):
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if n == 32 and not dt.microsecond:
+        return None  # isoformat() would drop the ".000000"
+    micros = (dt - _EPOCH) // _ONE_MICROSECOND
+    return header + micros.to_bytes(8, "big", signed=True)
+
+
+# ── Decoding ────────────────────────────────────────────────────────
+
+
+def decode_event(data: bytes) -> Any:
+    """Decode one event encoded by :func:`encode_event_msgpack`.
+
+    Raises:
+        ValueError: If *data* is malformed or has trailing bytes.
+    """
+    value, pos = _unpack(data, 0)
+    if pos != len(data):
+        raise ValueError(f"{len(data) - pos} trailing bytes after event")
+    return value
+
+
+def decode_batch(body: bytes) -> list[Any]:
+    """Decode a batch body built by :func:`encode_batch`."""
+    events = decode_event(body)
+    if not isinstance(events, list):
+        raise ValueError("batch body is not an array")
+    return events
+
+
+def _unpack(data: bytes, pos: int) -> tuple[Any, int]:
+    try:
+        code = data[pos]
+    except IndexError:
+        raise ValueError("truncated MessagePack data") from None
+    pos += 1
+    if code < 0x80:
+        return code, pos
+    if code >= 0xE0:
+        return code - 0x100, pos
+    if 0xA0 <= code <= 0xBF:
+        return _read_str(data, pos, code & 0x1F)
+    if 0x90 <= code <= 0x9F:
+        return _read_array(data, pos, code & 0x0F)
+    if 0x80 <= code <= 0x8F:
+        return _read_map(data, pos, code & 0x0F)
+    if code == 0xC0:
+        return None, pos
+    if code == 0xC2:
+        return False, pos
+    if code == 0xC3:
+        return True, pos
+    if code == 0xCB:
+        return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+    if code in _UINT_SIZES:
+        size = _UINT_SIZES[code]
+        return int.from_bytes(_take(data, pos, size), "big"), pos + size
+    if code in _INT_SIZES:
+        size = _INT_SIZES[code]
+        return int.from_bytes(_take(data, pos, size), "big", signed=True), pos + size
+    if code in _STR_SIZES:
+        size = _STR_SIZES[code]
+        return _read_str(data, pos + size, int.from_bytes(_take(data, pos, size), "big"))
+    if code in (0xDC, 0xDD):
+        size = 2 if code == 0xDC else 4
+        return _read_array(data, pos + size, int.from_bytes(_take(data, pos, size), "big"))
+    if code in (0xDE, 0xDF):
+        size = 2 if code == 0xDE else 4
+        return _read_map(data, pos + size, int.from_bytes(_take(data, pos, size), "big"))
+    if code == 0xD4 and _take(data, pos, 2)[0] == _EXT_INTERNED:
+        index = data[pos + 1]
+        if index >= len(INTERNED_STRINGS):
+            raise ValueError(f"unknown interned string {index}")
+        return INTERNED_STRINGS[index], pos + 2
+    if code == 0xD7 and _take(data, pos, 9)[0] in (_EXT_TIMESTAMP, _EXT_TIMESTAMP_Z):
+        micros = int.from_bytes(data[pos + 1:pos + 9], "big", signed=True)
+        text = (_EPOCH + micros * _ONE_MICROSECOND).isoformat()
+        if data[pos] == _EXT_TIMESTAMP_Z:
+            text = text[:-6] + "Z"
+        return text, pos + 9
+    raise ValueError(f"unsupported MessagePack type 0x{code:02x}")
+
+
+_UINT_SIZES = {0xCC: 1, 0xCD: 2, 0xCE: 4, 0xCF: 8}
+_INT_SIZES = {0xD0: 1, 0xD1: 2, 0xD2: 4, 0xD3: 8}
+_STR_SIZES = {0xD9: 1, 0xDA: 2, 0xDB: 4}
+
+
+def _take(data: bytes, pos: int, n: int) -> bytes:
+    chunk = data[pos:pos + n]
+    if len(chunk) != n:
+        raise ValueError("truncated MessagePack data")
+    return chunk
+
+
+def _read_str(data: bytes, pos: int, n: int) -> tuple[str, int]:
+    return _take(data, pos, n).decode("utf-8"), pos + n
+
+
+def _read_array(data: bytes, pos: int, n: int) -> tuple[list[Any], int]:
+    items = []
+    for _ in range(n):
+        item, pos = _unpack(data, pos)
+        items.append(item)
+    return items, pos
+
+
+def _read_map(data: bytes, pos: int, n: int) -> tuple[dict[Any, Any], int]:
+    d = {}
+    for _ in range(n):
+        key, pos = _unpack(data, pos)
+        d[key], pos = _unpack(data, pos)
+    return d, pos
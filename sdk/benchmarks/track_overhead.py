@@ -0,0 +1,98 @@
+"""Microbenchmark: per-event cost of ``track()``, ``capture()`` and ``track_many()``.
+
+``AgentTracker.track()`` builds and validates up to three Pydantic models
+per event (``ToolCall``, ``DecisionTrace``, ``AgentEvent``) and then dumps
+them back to the dict that is sent.  ``AgentTracker.capture()`` writes that
+dict directly; the session turns it into an ``AgentEvent`` only when its
+events are read.  This script times both for a plain LLM event, a tool
+call and a decision, against a transport that discards what it is given,
+and then the one-off cost of reading the captured events back.
+``track_many()`` builds events like ``capture()`` but adds them to the
+session and the transport buffer a chunk at a time.
+
+Usage::
+
+    python benchmarks/track_overhead.py [--events 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from agentlens.tracker import AgentTracker
+from agentlens.transport import Transport
+
+CASES = {
+    "llm_call": dict(
+        event_type="llm_call", model="gpt-4o", tokens_in=512, tokens_out=128,
+        input_data={"prompt": "x" * 200}, output_data={"response": "y" * 200},
+        duration_ms=840.0,
+    ),
+    "tool_call": dict(
+        event_type="tool_call", tool_name="web_search", tool_input={"query": "agentlens"},
+        tool_output={"results": ["a", "b", "c"]}, duration_ms=120.0,
+    ),
+    "decision": dict(event_type="decision", reasoning="The question is factual; search first."),
+}
+
+
+class NullTransport(Transport):
+    """Transport that drops events instead of buffering them."""
+
+    def __init__(self) -> None:
+        pass
+
+    def send_event(self, event: dict) -> None:
+        pass
+
+    def send_events(self, events: list[dict]) -> None:
+        pass
+
+
+def _per_event_us(method, kwargs: dict, events: int) -> float:
+    start = time.perf_counter()
+    for _ in range(events):
+        method(**kwargs)
+    return (time.perf_counter() - start) / events * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"per-event cost over {args.events} events (us)")
+    print(f"  {'event':<10} {'track()':>9} {'capture()':>10} {'speed-up':>9}")
+    for name, kwargs in CASES.items():
+        timings = []
+        for method_name in ("track", "capture"):
+            tracker = AgentTracker(transport=NullTransport())
+            tracker.start_session(agent_name="bench")
+            timings.append(_per_event_us(getattr(tracker, method_name), kwargs, args.events))
+        track_us, capture_us = timings
+        print(f"  {name:<10} {track_us:9.2f} {capture_us:10.2f} {track_us / capture_us:8.1f}x")
+
+    tracker = AgentTracker(transport=NullTransport())
+    tracker.start_session(agent_name="bench")
+    rows = [CASES["tool_call"]] * args.events
+    start = time.perf_counter()
+    tracker.track_many(rows)
+    print()
+    print(f"track_many() of {args.events} tool calls: "
+          f"{(time.perf_counter() - start) / args.events * 1e6:.2f} us/event")
+
+    tracker = AgentTracker(transport=NullTransport())
+    session = tracker.start_session(agent_name="bench")
+    for _ in range(args.events):
+        tracker.capture(**CASES["tool_call"])
+    start = time.perf_counter()
+    len(session.events[0:1])
+    elapsed = time.perf_counter() - start
+    print()
+    print(f"first read of {args.events} captured events: {elapsed * 1e3:.1f} ms "
+          f"({elapsed / args.events * 1e6:.2f} us/event)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Microbenchmark: producer lock hold time while the backend is failing.
+
+Every failed upload puts its batch back at the front of the transport
+buffer under ``Transport._lock``; producers calling ``send_event`` queue up
+behind it.  This script drives several producer threads against a
+transport whose backend always refuses connections (retries are never
+exhausted and backoff is negligible, so batches are re-queued constantly)
+and reports how long each critical section held the lock.
+
+It also times re-queueing a 500-event batch in front of buffers of
+increasing depth, comparing the old ``list[0:0] = batch`` (O(buffer)) with
+``EventBuffer.prepend`` (O(batch)).
+
+Usage::
+
+    python benchmarks/transport_lock_hold.py [--producers 4] [--events 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import threading
+import time
+
+import httpx
+
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_buffer import EventBuffer
+from agentlens.transport_retry import CircuitBreaker, ExponentialBackoff
+
+
+class TimedLock:
+    """``threading.Lock`` that records how long each acquisition is held."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._acquired_at = 0.0
+        self.holds: list[float] = []
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            self._acquired_at = time.perf_counter()
+        return acquired
+
+    def release(self) -> None:
+        self.holds.append(time.perf_counter() - self._acquired_at)
+        self._lock.release()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+
+class RefusingClient:
+    """Stand-in for ``httpx.Client`` whose backend is always down."""
+
+    def __init__(self) -> None:
+        self.attempts = 0
+
+    def post(self, url: str, **kwargs: object) -> httpx.Response:
+        self.attempts += 1
+        raise httpx.ConnectError("connection refused")
+
+    def close(self) -> None:
+        pass
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def run_failing_backend(producers: int, events: int) -> None:
+    transport = Transport(
+        endpoint="http://localhost:3000",
+        batch_size=100,
+        flush_interval=0.05,
+        max_retries=10**9,
+        sender_workers=2,
+        backoff=ExponentialBackoff(base=1e-6, cap=1e-6),
+        circuit_breaker=CircuitBreaker(failure_threshold=10**9),
+    )
+    client = RefusingClient()
+    transport._client = client
+    lock = TimedLock()
+    transport._lock = lock
+    transport._not_full = threading.Condition(lock)
+
+    payload = {"event_type": "llm_call", "output": "x" * 200}
+    per_thread = events // producers
+
+    def produce() -> None:
+        for i in range(per_thread):
+            transport.send_event({**payload, "n": i})
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    holds_us = [h * 1e6 for h in lock.holds]
+    print(f"{producers} producers x {per_thread} events against a refusing backend")
+    print(f"  wall time           {elapsed:8.3f} s")
+    print(f"  failed uploads      {client.attempts:8d}")
+    print(f"  lock acquisitions   {len(holds_us):8d}")
+    print(f"  hold p50            {statistics.median(holds_us):8.1f} us")
+    print(f"  hold p99            {_percentile(holds_us, 0.99):8.1f} us")
+    print(f"  hold max            {max(holds_us):8.1f} us")
+    print(f"  enqueue latency     {transport.enqueue_latency()}")
+
+    transport._stop_event.set()
+    for _ in transport._sender_threads:
+        transport._batch_queue.put(None)
+
+
+def run_requeue_comparison(depth: int, batch: int = 500, rounds: int = 200) -> None:
+    data = encode_event({"event_type": "llm_call", "output": "x" * 200})
+    events = [data] * batch
+    timings: dict[str, list[float]] = {"list": [], "ring": []}
+    for _ in range(rounds):
+        buffer = [data] * depth
+        nbytes = len(data) * depth
+        start = time.perf_counter()
+        buffer[0:0] = events
+        nbytes += sum(map(len, events))
+        timings["list"].append(time.perf_counter() - start)
+
+        ring = EventBuffer(max_events=depth + batch, max_bytes=1 << 40)
+        ring.extend([data] * depth)
+        start = time.perf_counter()
+        ring.prepend(events)
+        timings["ring"].append(time.perf_counter() - start)
+
+    print(f"re-queue {batch} events in front of {depth} (median of {rounds})")
+    print(f"  list[0:0] = batch   {statistics.median(timings['list']) * 1e6:8.1f} us")
+    print(f"  EventBuffer.prepend {statistics.median(timings['ring']) * 1e6:8.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    # Every failed upload logs a warning; keep the output readable.
+    logging.getLogger("agentlens").setLevel(logging.CRITICAL)
+    run_failing_backend(args.producers, args.events)
+    for depth in (5_000, 100_000, 1_000_000):
+        print()
+        run_requeue_comparison(depth)
+
+
+if __name__ == "__main__":
+    main()
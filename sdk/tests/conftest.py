@@ -0,0 +1,17 @@
+"""Shared fixtures for the AgentLens SDK tests."""
+
+import pytest
+
+from agentlens import transport
+
+
+@pytest.fixture(autouse=True)
+def _forget_open_transports():
+    """Stop transports a test leaves open and unregister them, so the
+    ``close_all`` atexit hook does not try to deliver their events to the
+    tests' fake endpoints when pytest exits."""
+    before = set(transport._live_transports)
+    yield
+    for t in set(transport._live_transports) - before:
+        transport._live_transports.discard(t)
+        t._stop_event.set()
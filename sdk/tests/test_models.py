@@ -5,6 +5,7 @@ from datetime import timezone
 from agentlens.models import (
     AgentEvent,
     DecisionTrace,
+    EventList,
     Session,
     ToolCall,
     _new_id,
@@ -170,3 +171,49 @@ class TestSession:
         d = s.to_api_dict()
         assert d["ended_at"] is not None
         assert d["status"] == "completed"
+
+
+class TestEventList:
+    def _payload(self, event_type="generic", **kw):
+        return AgentEvent(event_type=event_type, **kw).to_api_dict()
+
+    def test_len_and_append_do_not_materialize(self):
+        events = EventList()
+        events.add_record(self._payload("a"))
+        events.append(AgentEvent(event_type="b"))
+        assert len(events) == 2
+        assert len(events._pending) == 2
+        assert [e.event_type for e in events] == ["a", "b"]
+        assert all(isinstance(e, AgentEvent) for e in events)
+
+    def test_consumers_see_pending_events(self):
+        events = EventList([AgentEvent(event_type="a")])
+        events.add_records([self._payload("b"), self._payload("c")])
+        assert not isinstance(events, list)
+        assert [e.event_type for e in list(events)] == ["a", "b", "c"]
+        events.add_record(self._payload("d"))
+        assert [e.event_type for e in sorted(events, key=lambda e: e.event_type)] == list("abcd")
+        events.add_record(self._payload("e"))
+        assert [e.event_type for e in events[-2:]] == ["d", "e"]
+        assert type(events[:]) is list
+        events.add_record(self._payload("f"))
+        first, *rest = events
+        assert len(rest) == 5
+        assert events == list(events)
+        assert events + [] == list(events)
+
+    def test_delete_oldest_pending(self):
+        events = EventList()
+        for t in "abc":
+            events.add_record(self._payload(t))
+        del events[0]
+        assert len(events._pending) == 2
+        assert [e.event_type for e in events] == ["b", "c"]
+
+    def test_session_dump_includes_pending(self):
+        s = Session()
+        s.add_record(self._payload("llm_call", tokens_in=7))
+        assert s.total_tokens_in == 7
+        dumped = s.model_dump()
+        assert [e["event_type"] for e in dumped["events"]] == ["llm_call"]
+        assert s.model_copy(deep=True).events[0].tokens_in == 7
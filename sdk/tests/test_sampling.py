@@ -0,0 +1,242 @@
+"""Tests for agentlens.sampling — head and tail session sampling."""
+
+import contextvars
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import agentlens
+from agentlens.decorators import track_tool_call
+from agentlens.sampling import DEFER, DROP, KEEP, Sampler, TailSampling, _Deferred
+from agentlens.tracker import AgentTracker
+from agentlens.transport import Transport
+
+
+def _tracker(sampler):
+    transport = MagicMock(spec=Transport)
+    transport.endpoint = "http://test:3000"
+    return AgentTracker(transport=transport, sampler=sampler)
+
+
+def _sent(tracker):
+    """Every payload handed to the transport, in order."""
+    events = []
+    for call in tracker.transport.method_calls:
+        if call[0] == "send_event":
+            events.append(call[1][0])
+        elif call[0] == "send_events":
+            events.extend(call[1][0])
+    return events
+
+
+def _record_shipped(tracker):
+    """Copy payloads as they are handed over, so later changes show up."""
+    shipped = []
+    tracker.transport.send_event.side_effect = lambda event: shipped.append(dict(event))
+    tracker.transport.send_events.side_effect = lambda events: shipped.extend(map(dict, events))
+    return shipped
+
+
+def _run_threads(target, count):
+    """Run *target* in *count* threads, each with a copy of this context."""
+    threads = [
+        threading.Thread(target=contextvars.copy_context().run, args=(target,))
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@pytest.fixture
+def slow_append():
+    """Hold each buffered event for a moment, so races show up."""
+    append = _Deferred.append
+
+    def slow(self, payload):
+        time.sleep(0.0005)
+        append(self, payload)
+
+    with patch.object(_Deferred, "append", slow):
+        yield
+
+
+class TestHeadSampling:
+    def test_decision_is_stable_and_proportional(self):
+        sampler = Sampler(rate=0.25)
+        ids = [f"session-{i}" for i in range(4000)]
+        decisions = [sampler.head(sid) for sid in ids]
+        assert decisions == [Sampler(rate=0.25).head(sid) for sid in ids]
+        assert 0.2 < decisions.count(KEEP) / len(ids) < 0.3
+        assert set(decisions) == {KEEP, DROP}
+
+    def test_rejects_bad_rate(self):
+        with pytest.raises(ValueError, match="rate"):
+            Sampler(rate=1.5)
+
+    def test_kept_session_is_annotated(self):
+        tracker = _tracker(Sampler(rate=1.0))
+        tracker.start_session(metadata={"v": 1})
+        start = _sent(tracker)[0]
+        assert start["metadata"] == {"v": 1, "sampling": {"rate": 1.0, "kept_by": "head"}}
+
+    def test_dropped_session_sends_nothing(self):
+        tracker = _tracker(Sampler(rate=0.0))
+        session = tracker.start_session()
+        assert not tracker.sampled
+        with tracker.span("step"):
+            event = tracker.track(event_type="llm_call", tokens_in=5)
+        tracker.end_session()
+        assert event.session_id == session.session_id
+        assert _sent(tracker) == []
+        tracker.transport.flush.assert_not_called()
+        assert session.events == []
+        assert tracker.sampled
+        assert tracker.sampler.stats()["dropped"] == 1
+
+
+class TestTailSampling:
+    def test_uninteresting_session_is_discarded(self):
+        tracker = _tracker(Sampler(rate=0.0, tail=TailSampling()))
+        tracker.start_session()
+        assert tracker.sampled
+        tracker.track(event_type="llm_call")
+        tracker.end_session()
+        assert _sent(tracker) == []
+        assert tracker._deferred == {}
+
+    def test_error_session_is_shipped_in_order(self):
+        tracker = _tracker(Sampler(rate=0.0, tail=TailSampling()))
+        tracker.start_session()
+        tracker.track(event_type="llm_call")
+        tracker.track(event_type="tool_error", tool_name="search")
+        assert _sent(tracker) == []
+        tracker.end_session()
+        sent = _sent(tracker)
+        assert [e["event_type"] for e in sent] == [
+            "session_start", "llm_call", "tool_error", "session_end",
+        ]
+        assert sent[0]["metadata"]["sampling"] == {"rate": 0.0, "kept_by": "errors"}
+        tracker.transport.flush.assert_called_once()
+
+    def test_failed_span_counts_as_error(self):
+        tracker = _tracker(Sampler(rate=0.0, tail=TailSampling()))
+        tracker.start_session()
+        with pytest.raises(RuntimeError):
+            with tracker.span("step"):
+                raise RuntimeError("boom")
+        tracker.end_session()
+        assert tracker.sampler.stats()["kept"]["errors"] == 1
+
+    def test_duration_and_token_thresholds(self):
+        tracker = _tracker(Sampler(rate=0.0, tail=TailSampling(min_tokens=100)))
+        tracker.start_session()
+        tracker.track(event_type="llm_call", tokens_in=60, tokens_out=50)
+        tracker.end_session()
+        assert _sent(tracker)[0]["metadata"]["sampling"]["kept_by"] == "tokens"
+
+        tracker = _tracker(Sampler(rate=0.0, tail=TailSampling(min_duration_ms=1000)))
+        session = tracker.start_session()
+        session.started_at -= timedelta(seconds=2)
+        tracker.end_session()
+        assert _sent(tracker)[0]["metadata"]["sampling"]["kept_by"] == "duration"
+
+    def test_buffer_overflow_ships_the_session(self):
+        tracker = _tracker(Sampler(rate=0.0, tail=TailSampling(max_buffered_events=2)))
+        tracker.start_session()
+        tracker.track(event_type="llm_call")
+        assert _sent(tracker) == []
+        tracker.track(event_type="llm_call")
+        assert len(_sent(tracker)) == 3
+        tracker.track(event_type="llm_call")
+        assert len(_sent(tracker)) == 4
+        assert tracker.sampler.stats()["kept"]["buffer"] == 1
+
+    def test_concurrent_overflow_ships_each_event_once(self, slow_append):
+        for _ in range(10):
+            tracker = _tracker(Sampler(rate=0.0, tail=TailSampling(max_buffered_events=2)))
+            shipped = _record_shipped(tracker)
+            tracker.start_session()
+            errors = []
+
+            def worker():
+                try:
+                    for _ in range(5):
+                        tracker.track(event_type="llm_call")
+                except Exception as exc:  # pragma: no cover - reported below
+                    errors.append(exc)
+
+            _run_threads(worker, 4)
+            assert errors == []
+            ids = [e["event_id"] for e in shipped if e["event_type"] == "llm_call"]
+            assert len(ids) == len(set(ids)) == 20
+            assert tracker.sampler.stats()["kept"]["buffer"] == 1
+
+    def test_end_session_racing_track_loses_nothing(self, slow_append):
+        for _ in range(10):
+            tracker = _tracker(Sampler(rate=0.0, tail=TailSampling(errors=True)))
+            shipped = _record_shipped(tracker)
+            session = tracker.start_session()
+            tracker.track(event_type="error")
+            tracked = []
+
+            def worker():
+                for _ in range(20):
+                    tracked.append(tracker.track(event_type="llm_call").event_id)
+
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(worker,))
+            thread.start()
+            time.sleep(0.002)
+            tracker.end_session(session.session_id)
+            thread.join()
+            sent = [e["event_id"] for e in shipped if e["event_type"] == "llm_call"]
+            assert sorted(sent) == sorted(tracked)
+            assert tracker._deferred == {}
+
+    def test_store_removal_forgets_sampling_state(self):
+        tracker = _tracker(Sampler(rate=0.0, tail=TailSampling()))
+        session = tracker.start_session()
+        tracker.track(event_type="llm_call")
+        del tracker.sessions[session.session_id]
+        assert tracker._deferred == {}
+
+        tracker = _tracker(Sampler(rate=0.0))
+        session = tracker.start_session()
+        del tracker.sessions[session.session_id]
+        assert tracker._dropped == set()
+
+    def test_head_decision_defers(self):
+        assert Sampler(rate=0.0, tail=TailSampling()).head("s") == DEFER
+
+
+class TestDecorators:
+    def test_dropped_session_skips_capture(self):
+        tracker = _tracker(Sampler(rate=0.0))
+        tracker.start_session()
+
+        @track_tool_call
+        def search(query):
+            return "ok"
+
+        with patch.object(agentlens, "_tracker", tracker), \
+                patch("agentlens.decorators._safe_repr") as safe_repr:
+            assert search("q") == "ok"
+        safe_repr.assert_not_called()
+        assert _sent(tracker) == []
+
+
+class TestInit:
+    def test_init_builds_sampler(self):
+        tracker = agentlens.init(
+            endpoint="http://test:3000", sample_rate=0.1, tail_sampling=TailSampling(),
+        )
+        try:
+            assert tracker.sampler.rate == 0.1
+            assert tracker.sampler.tail == TailSampling()
+        finally:
+            tracker.transport.close()
+            agentlens._tracker = None
@@ -0,0 +1,190 @@
+"""Tests for agentlens.session_store — bounded local session storage."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agentlens.models import AgentEvent, Session, ToolCall
+from agentlens.session_store import (
+    MemorySessionStore,
+    SessionStore,
+    _payload_bytes,
+    summarize_event,
+)
+from agentlens.tracker import AgentTracker
+from agentlens.transport import Transport
+
+
+def _tracker(store):
+    transport = MagicMock(spec=Transport)
+    transport.endpoint = "http://test:3000"
+    return AgentTracker(transport=transport, session_store=store)
+
+
+def _clock(start=1000.0):
+    now = [start]
+    return now, patch("agentlens.session_store.time.monotonic", side_effect=lambda: now[0])
+
+
+class TestMemorySessionStore:
+    def test_evicts_least_recently_used_ended_session(self):
+        store = MemorySessionStore(max_sessions=2, ttl=None)
+        a, b, c = Session(), Session(), Session()
+        store[a.session_id] = a
+        store[b.session_id] = b
+        store.session_ended(a)
+        store.session_ended(b)
+        store[a.session_id]  # touch a: b is now least recently used
+        store[c.session_id] = c
+        assert list(store) == [a.session_id, c.session_id]
+        assert store.evicted == 1
+
+    def test_never_evicts_active_sessions(self):
+        store = MemorySessionStore(max_sessions=1, ttl=None)
+        sessions = [Session() for _ in range(3)]
+        for s in sessions:
+            store[s.session_id] = s
+        assert len(store) == 3
+
+    def test_ttl_expires_ended_sessions(self):
+        now, clock = _clock()
+        store = MemorySessionStore(ttl=60)
+        active, ended = Session(), Session()
+        with clock:
+            store[active.session_id] = active
+            store[ended.session_id] = ended
+            store.session_ended(ended)
+            now[0] += 61
+            store[Session().session_id] = Session()
+        assert ended.session_id not in store
+        assert active.session_id in store
+
+    def test_ttl_expires_on_read(self):
+        now, clock = _clock()
+        store = MemorySessionStore(ttl=60)
+        session = Session()
+        with clock:
+            store[session.session_id] = session
+            store.session_ended(session)
+            now[0] += 61
+            assert session.session_id not in store
+            assert len(store) == 0
+        assert store.evicted == 1
+
+    def test_max_events_keeps_latest(self):
+        store = MemorySessionStore(max_events=2)
+        session = Session()
+        store[session.session_id] = session
+        for i in range(5):
+            event = AgentEvent(tokens_in=1, input_data={"i": i})
+            store.add_event(session, event, event.to_api_dict())
+        assert [e.input_data["i"] for e in session.events] == [3, 4]
+        assert session.total_tokens_in == 5
+
+    def test_max_bytes_evicts_ended_sessions(self):
+        store = MemorySessionStore(max_bytes=2000, ttl=None)
+        old, new = Session(), Session()
+        store[old.session_id] = old
+        event = AgentEvent(input_data={"x": "a" * 1500})
+        store.add_event(old, event, event.to_api_dict())
+        store.session_ended(old)
+        store[new.session_id] = new
+        event = AgentEvent(input_data={"x": "b" * 1500})
+        store.add_event(new, event, event.to_api_dict())
+        assert list(store) == [new.session_id]
+
+    def test_payload_size_estimate(self):
+        event = AgentEvent(
+            input_data={"prompt": "x" * 1000, "history": [{"role": "user"}] * 3},
+            tool_call=ToolCall(tool_name="search", tool_input={"q": "y" * 500}),
+        )
+        payload = event.to_api_dict()
+        estimate = _payload_bytes(payload)
+        assert estimate == pytest.approx(len(json.dumps(payload)), rel=0.25)
+
+    def test_rejects_bad_limits(self):
+        with pytest.raises(ValueError, match="max_events"):
+            MemorySessionStore(max_events=0)
+
+
+class TestSummaries:
+    def test_summarize_keeps_what_scoring_needs(self):
+        event = AgentEvent(
+            event_type="tool_call", input_data={"q": "x"}, output_data={"r": "y"},
+            tokens_in=3, duration_ms=5.0,
+            tool_call=ToolCall(
+                tool_name="search", tool_input={"q": "x"},
+                tool_output={"error": "timeout", "body": "..."},
+            ),
+        )
+        summarize_event(event)
+        assert event.input_data is None and event.output_data is None
+        assert event.tool_call.tool_name == "search"
+        assert event.tool_call.tool_input == {}
+        assert event.tool_call.tool_output == {"error": "timeout"}
+        assert (event.tokens_in, event.duration_ms) == (3, 5.0)
+
+    def test_health_and_explain_survive_dropped_bodies(self):
+        tracker = _tracker(MemorySessionStore(keep_event_bodies=False))
+        session = tracker.start_session()
+        tracker.track(
+            event_type="llm_call", model="gpt-4o", input_data={"p": "x" * 100},
+            tokens_in=10, tokens_out=5, duration_ms=20.0, reasoning="because",
+        )
+        tracker.track_tool(
+            "search", tool_input={"q": "x"}, tool_output={"hits": 3}, duration_ms=10.0,
+        )
+        before_score = tracker.health_score(session.session_id).overall_score
+        before_timeline = tracker.explain(session.session_id).split("### Event Timeline:")[1]
+        tracker.end_session()
+        assert session.events[0].input_data is None
+        assert tracker.health_score(session.session_id).overall_score == before_score
+        assert tracker.explain(session.session_id).endswith(before_timeline)
+
+
+class TestTrackerIntegration:
+    def test_default_store_is_bounded(self):
+        tracker = _tracker(None)
+        assert isinstance(tracker.sessions, MemorySessionStore)
+        assert tracker.sessions.max_sessions == 10_000
+
+    def test_ended_sessions_are_evicted(self):
+        tracker = _tracker(MemorySessionStore(max_sessions=3, ttl=None))
+        ids = []
+        for _ in range(10):
+            ids.append(tracker.start_session().session_id)
+            tracker.track(event_type="llm_call")
+            tracker.end_session()
+        assert list(tracker.sessions) == ids[-3:]
+
+    def test_custom_store_hooks(self):
+        class Recording(SessionStore):
+            def __init__(self):
+                self.data, self.ended = {}, []
+
+            def __getitem__(self, key):
+                return self.data[key]
+
+            def __setitem__(self, key, value):
+                self.data[key] = value
+
+            def __delitem__(self, key):
+                del self.data[key]
+
+            def __iter__(self):
+                return iter(self.data)
+
+            def __len__(self):
+                return len(self.data)
+
+            def session_ended(self, session):
+                self.ended.append(session.session_id)
+
+        store = Recording()
+        tracker = _tracker(store)
+        session = tracker.start_session()
+        tracker.track(event_type="llm_call")
+        tracker.end_session()
+        assert store.ended == [session.session_id]
+        assert len(session.events) == 1
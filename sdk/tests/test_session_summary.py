@@ -0,0 +1,120 @@
+"""Tests for agentlens.session_summary — sessions that keep aggregates, not events."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentlens.health import HealthScorer
+from agentlens.models import AgentEvent, Session
+from agentlens.narrative import NarrativeConfig, NarrativeGenerator
+from agentlens.session_store import MemorySessionStore
+from agentlens.session_summary import SessionSummary
+from agentlens.tracker import AgentTracker
+from agentlens.transport import Transport
+
+
+def _tracker(**store_kwargs):
+    transport = MagicMock(spec=Transport)
+    transport.endpoint = "http://test:3000"
+    return AgentTracker(transport=transport, session_store=MemorySessionStore(**store_kwargs))
+
+
+def _run(tracker):
+    session = tracker.start_session(agent_name="worker")
+    tracker.track(event_type="llm_call", model="gpt-4", tokens_in=120, tokens_out=40, duration_ms=900)
+    tracker.track(event_type="llm_call", model="claude", tokens_in=80, tokens_out=20, duration_ms=1500)
+    tracker.track_tool("search", {"q": "x"}, {"hits": 3}, duration_ms=250)
+    tracker.track_tool("search", {"q": "y"}, {"error": "timeout"}, duration_ms=5000)
+    tracker.track(event_type="tool_call", tool_name="fetch", output_data={"error": "404"}, duration_ms=30)
+    tracker.track(event_type="decision", reasoning="use search")
+    tracker.track(event_type="error", output_data={"error": "boom"}, duration_ms=float("nan"))
+    tracker.end_session()
+    return session
+
+
+class TestSummarySessions:
+    def test_session_keeps_no_events(self):
+        tracker = _tracker(keep_events=False)
+        session = _run(tracker)
+        assert session.events == []
+        assert session.event_count == 7
+        assert session.summary.counts == {"llm_call": 2, "tool_call": 3, "decision": 1, "error": 1}
+        assert (session.total_tokens_in, session.total_tokens_out) == (200, 60)
+        assert "summary" not in session.model_dump()
+
+    def test_health_score_matches_full_session(self):
+        full = _tracker()
+        lean = _tracker(keep_events=False)
+        a = full.health_score(_run(full).session_id)
+        b = lean.health_score(_run(lean).session_id)
+        assert b.overall_score == pytest.approx(a.overall_score)
+        assert [(m.name, m.value) for m in b.metrics] == [(m.name, m.value) for m in a.metrics]
+        assert (b.event_count, b.error_count, b.total_tokens, b.total_duration_ms) == (
+            a.event_count, a.error_count, a.total_tokens, a.total_duration_ms,
+        )
+
+    def test_narrative_matches_full_session(self):
+        gen = NarrativeGenerator()
+        full, lean = _tracker(), _tracker(keep_events=False)
+        a_session, b_session = _run(full), _run(lean)
+        b_session.session_id = a_session.session_id
+        b_session.started_at, b_session.ended_at = a_session.started_at, a_session.ended_at
+        for style in ("technical", "executive", "casual"):
+            cfg = NarrativeConfig(style=style)
+            a, b = gen.generate(a_session, cfg), gen.generate(b_session, cfg)
+            assert b.summary == a.summary
+            assert b.body == a.body
+            assert b.tool_summaries == a.tool_summaries
+            assert (b.error_count, b.decision_count, b.total_tokens) == (
+                a.error_count, a.decision_count, a.total_tokens,
+            )
+        titles = [s.title for s in gen.generate(b_session).sections]
+        assert titles == ["Models Used"]
+
+    def test_explain_lists_counts(self):
+        tracker = _tracker(keep_events=False)
+        session = _run(tracker)
+        text = tracker.explain(session.session_id)
+        assert "### Event Summary:" in text
+        assert "- **tool_call**: 3" in text
+        assert "- tool search: 2 calls" in text
+
+    def test_decision_steps_continue(self):
+        tracker = _tracker(keep_events=False)
+        tracker.start_session()
+        tracker.track(event_type="llm_call")
+        event = tracker.track(event_type="decision", reasoning="go")
+        assert event.decision_trace.step == 2
+
+    def test_store_folds_existing_events(self):
+        session = Session()
+        session.add_event(AgentEvent(event_type="llm_call", tokens_in=5))
+        store = MemorySessionStore(keep_events=False)
+        store[session.session_id] = session
+        assert session.events == []
+        assert session.summary.event_count == 1
+        assert session.summary.tokens_in == 5
+
+
+class TestSessionSummary:
+    def test_reservoir_is_bounded_and_totals_exact(self):
+        summary = SessionSummary(reservoir_size=16)
+        for i in range(1000):
+            summary.add(AgentEvent(duration_ms=float(i)))
+        assert len(summary.durations) == 16
+        assert summary.duration_count == 1000
+        assert summary.total_duration == sum(range(1000))
+        report = HealthScorer().score_aggregate(summary.health_aggregate())
+        latency = next(m for m in report.metrics if m.name == "avg_latency")
+        assert latency.value == pytest.approx(499.5)
+
+    def test_ignores_bad_durations(self):
+        summary = SessionSummary()
+        for value in (float("inf"), -5.0, None, 10.0):
+            summary.add(AgentEvent(duration_ms=value))
+        assert summary.durations == [10.0]
+        assert summary.total_duration == 10.0
+
+    def test_rejects_empty_reservoir(self):
+        with pytest.raises(ValueError):
+            SessionSummary(reservoir_size=0)
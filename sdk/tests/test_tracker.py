@@ -1,5 +1,8 @@
 """Tests for agentlens.tracker — session management and event tracking."""
 
+import asyncio
+import contextvars
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -151,6 +154,100 @@ class TestTrack:
         assert event.tool_call.tool_name == "calculator"
 
 
+class TestCapture:
+    def _sent(self, mock_transport):
+        return mock_transport.send_event.call_args[0][0]
+
+    @pytest.mark.parametrize("kwargs", [
+        dict(event_type="llm_call", model="gpt-4", tokens_in=3, tokens_out=4,
+             input_data={"a": 1}, output_data={"b": 2}, duration_ms=12.5),
+        dict(event_type="tool_call", input_data={"a": 1}, model="gpt-4",
+             tokens_in=3, tokens_out=4, reasoning="why", tool_name="search",
+             tool_input={"q": "x"}, tool_output={"hits": 2}, duration_ms=12.5),
+        dict(event_type="decision", reasoning="why"),
+        dict(),
+    ])
+    def test_payload_matches_track(self, tracker, mock_transport, kwargs):
+        session = tracker.start_session()
+        with tracker.span("step") as sp:
+            tracker.track(**kwargs)
+            tracked = self._sent(mock_transport)
+            tracker.capture(**kwargs)
+            captured = self._sent(mock_transport)
+        ids = {"event_id", "tool_call_id", "trace_id"}
+
+        def stable(d):
+            # IDs differ; timestamps differ by the time between the calls.
+            return {
+                k: stable(v) if isinstance(v, dict) and k in ("tool_call", "decision_trace") else
+                v[-1] if k == "timestamp" else v
+                for k, v in d.items() if k not in ids
+            }
+
+        if "decision_trace" in tracked:
+            tracked["decision_trace"]["step"] += 1
+        assert stable(captured) == stable(tracked)
+        assert captured["span_id"] == sp.span_id
+        assert captured["timestamp"].endswith("Z")
+        # What the session recorded is what was sent, span and all.
+        assert session.events._pending[-1] is captured
+        assert session.events[-1].model_dump(mode="json", exclude_none=True) == {
+            k: v for k, v in captured.items() if k != "span_id"
+        }
+
+    def test_checks_argument_types(self, tracker, mock_transport):
+        from pydantic import ValidationError
+
+        session = tracker.start_session()
+        with pytest.raises(ValidationError):
+            tracker.capture(event_type="llm_call", duration_ms="slow")
+        with pytest.raises(ValidationError):
+            tracker.capture(tokens_in="abc")
+        assert len(session.events) == 0
+        mock_transport.send_event.assert_not_called()
+        tracker.capture(tokens_in="5", duration_ms=3)
+        assert self._sent(mock_transport)["tokens_in"] == 5
+        assert self._sent(mock_transport)["duration_ms"] == 3.0
+        assert session.total_tokens_in == 5
+        assert tracker.health_score().event_count == 1
+
+    def test_session_materializes_on_read(self, tracker, mock_transport):
+        session = tracker.start_session()
+        event_id = tracker.capture(event_type="llm_call", model="m", tokens_in=5, tokens_out=1)
+        tracker.capture(tool_name="calc", tool_output={"error": "x"}, duration_ms=2.0)
+        assert session.total_tokens_in == 5
+        assert len(session.events) == 2
+        assert session.events._pending
+        first, second = session.events
+        assert not session.events._pending
+        assert first.event_id == event_id
+        assert first.session_id == session.session_id
+        assert second.tool_call.tool_name == "calc"
+        assert tracker.health_score().error_count == 1
+
+    def test_mixes_with_track_in_order(self, tracker, mock_transport):
+        session = tracker.start_session()
+        tracker.capture(event_type="a")
+        tracker.track(event_type="b")
+        tracker.capture(event_type="c")
+        assert [e.event_type for e in session.events] == ["a", "b", "c"]
+
+    def test_dropped_session_returns_none(self, mock_transport):
+        from agentlens.sampling import Sampler
+
+        tracker = AgentTracker(transport=mock_transport, sampler=Sampler(rate=0.0))
+        tracker.start_session()
+        assert tracker.capture(event_type="llm_call") is None
+        mock_transport.send_event.assert_not_called()
+
+    def test_attaches_span(self, tracker, mock_transport):
+        tracker.start_session()
+        with tracker.span("step") as sp:
+            tracker.capture(event_type="llm_call")
+            assert self._sent(mock_transport)["span_id"] == sp.span_id
+        assert sp.event_count == 1
+
+
 class TestCurrentSession:
     def test_no_session(self, tracker):
         assert tracker.current_session is None
@@ -1069,4 +1166,125 @@ class TestSpanStatusBranch:
         # Status set inside the block must not be overwritten by the auto-complete.
         assert sp.status == "completed"
         assert sp.ended_at is not None
-        assert sp.duration_ms is not None
\ No newline at end of file
+        assert sp.duration_ms is not None
+
+def _payloads(mock_transport):
+    events = [c[0][0] for c in mock_transport.send_event.call_args_list]
+    for c in mock_transport.send_events.call_args_list:
+        events.extend(c[0][0])
+    return events
+
+
+class TestContextPropagation:
+    def test_concurrent_tasks_keep_their_own_session_and_spans(self, tracker, mock_transport):
+        async def agent(i):
+            session = tracker.start_session(agent_name=f"agent-{i}")
+            with tracker.span("outer") as outer:
+                await asyncio.sleep(0)
+                with tracker.span("inner") as inner:
+                    await asyncio.sleep(0)
+                    tracker.track(event_type="llm_call", input_data={"i": i})
+                    assert tracker.current_span is inner
+                assert tracker.current_span is outer
+            tracker.end_session()
+            return session.session_id, outer, inner
+
+        async def main():
+            return await asyncio.gather(*(agent(i) for i in range(50)))
+
+        results = asyncio.run(main())
+        events = _payloads(mock_transport)
+        for sid, outer, inner in results:
+            assert inner.parent_id == outer.span_id
+            assert outer.parent_id is None
+            (llm,) = [e for e in events if e["event_type"] == "llm_call" and e["session_id"] == sid]
+            assert llm["span_id"] == inner.span_id
+            assert len(tracker.sessions[sid].events) == 1
+
+    def test_task_inherits_current_span(self, tracker, mock_transport):
+        tracker.start_session()
+
+        async def child():
+            with tracker.span("child") as sp:
+                return sp
+
+        async def main():
+            with tracker.span("parent") as parent:
+                sp = await asyncio.create_task(child())
+            return parent, sp
+
+        parent, sp = asyncio.run(main())
+        assert sp.parent_id == parent.span_id
+
+    def test_threads_keep_their_own_session(self, tracker, mock_transport):
+        barrier = threading.Barrier(2)
+        sessions = {}
+
+        def worker(name):
+            sessions[name] = tracker.start_session(agent_name=name).session_id
+            barrier.wait()
+            tracker.track(event_type="llm_call", input_data={"who": name})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in ("a", "b")]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        for event in _payloads(mock_transport):
+            if event["event_type"] == "llm_call":
+                assert event["session_id"] == sessions[event["input_data"]["who"]]
+
+    def test_thread_without_session_has_none(self, tracker, mock_transport):
+        session = tracker.start_session()
+        seen = []
+        th = threading.Thread(target=lambda: seen.append(tracker.current_session))
+        th.start()
+        th.join()
+        assert seen == [None]
+
+        th = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(lambda: seen.append(tracker.track().session_id),),
+        )
+        th.start()
+        th.join()
+        assert seen[1] == session.session_id
+
+    def test_task_without_session_does_not_see_another_tasks(self, tracker, mock_transport):
+        async def with_session(started):
+            session = tracker.start_session()
+            started.set()
+            await asyncio.sleep(0)
+            tracker.track(event_type="llm_call", input_data={"who": "a"})
+            return session
+
+        async def without_session(started):
+            await started.wait()
+            event = tracker.track(event_type="llm_call", input_data={"who": "b"})
+            return tracker.current_session, event
+
+        async def main():
+            started = asyncio.Event()
+            return await asyncio.gather(with_session(started), without_session(started))
+
+        session, (current, event) = asyncio.run(main())
+        assert current is None
+        assert event.session_id != session.session_id
+        assert [e.input_data for e in session.events] == [{"who": "a"}]
+
+    def test_end_session_in_one_task_leaves_others(self, tracker, mock_transport):
+        async def main():
+            first = tracker.start_session()
+
+            async def other():
+                second = tracker.start_session()
+                tracker.end_session()
+                return second
+
+            second = await asyncio.create_task(other())
+            assert tracker.current_session is first
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert first.status == "active"
+        assert second.status == "completed"
@@ -0,0 +1,169 @@
+"""Tests for BatchMixin (tracker_batch.py) — bulk event tracking."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from agentlens.sampling import Sampler, TailSampling
+from agentlens.session_store import MemorySessionStore
+from agentlens.tracker import AgentTracker
+from agentlens.transport import Transport
+
+
+@pytest.fixture
+def tracker():
+    transport = MagicMock(spec=Transport)
+    transport.endpoint = "http://localhost:3000"
+    return AgentTracker(transport=transport)
+
+
+def _sent(tracker):
+    """Events passed to send_events after the session_start call."""
+    return [call[0][0] for call in tracker.transport.send_events.call_args_list[1:]]
+
+
+class TestTrackMany:
+    def test_rows(self, tracker):
+        session = tracker.start_session()
+        ids = tracker.track_many([
+            {"event_type": "llm_call", "model": "gpt-4", "tokens_in": 10, "tokens_out": 2},
+            {"event_type": "tool_call", "tool_name": "search", "tool_output": {"n": 1}},
+            {"event_type": "decision", "reasoning": "stop"},
+        ])
+        assert len(ids) == 3
+        assert session.total_tokens_in == 10
+        events = list(session.events)
+        assert [e.event_id for e in events] == ids
+        assert events[1].tool_call.tool_output == {"n": 1}
+        assert events[2].decision_trace.step == 3
+        tracker.transport.send_event.assert_not_called()
+        (chunk,) = _sent(tracker)
+        assert [e["event_id"] for e in chunk] == ids
+
+    def test_columns_equal_rows(self, tracker):
+        session = tracker.start_session()
+        stamps = [datetime(2025, 1, 1, 12, 0, s, tzinfo=timezone.utc) for s in (0, 2)]
+        tracker.track_many({
+            "event_type": ["llm_call", "llm_call"],
+            "tokens_in": [5, 7],
+            "timestamp": stamps,
+        })
+        assert [e.tokens_in for e in session.events] == [5, 7]
+        assert [e.timestamp for e in session.events] == stamps
+
+    def test_chunks(self, tracker):
+        tracker.start_session()
+        tracker.track_many([{"event_type": "generic"}] * 7, chunk_size=3)
+        assert [len(chunk) for chunk in _sent(tracker)] == [3, 3, 1]
+
+    def test_unknown_field_rejected_before_anything_is_sent(self, tracker):
+        session = tracker.start_session()
+        with pytest.raises(TypeError, match="colour"):
+            tracker.track_many([{"event_type": "a"}, {"colour": "red"}])
+        assert len(session.events) == 0
+        assert _sent(tracker) == []
+
+    def test_bad_value_rejects_the_whole_call(self, tracker):
+        session = tracker.start_session()
+        for bad in ({"tokens_in": "abc"}, {"duration_ms": "slow"}, {"input_data": [1]}):
+            with pytest.raises(ValidationError):
+                tracker.track_many([{"event_type": "llm_call", "tokens_in": 1}, bad])
+        assert len(session.events) == 0
+        assert session.total_tokens_in == 0
+        assert _sent(tracker) == []
+        tracker.health_score()
+
+    def test_values_are_converted_like_track(self, tracker):
+        session = tracker.start_session()
+        tracker.track_many({
+            "tokens_in": ["5", 6.0],
+            "timestamp": ["2025-01-01T12:00:00+00:00", "2025-01-01T12:00:01Z"],
+        })
+        assert session.total_tokens_in == 11
+        (chunk,) = _sent(tracker)
+        assert [e["tokens_in"] for e in chunk] == [5, 6]
+        assert [e["timestamp"] for e in chunk] == ["2025-01-01T12:00:00Z", "2025-01-01T12:00:01Z"]
+
+    def test_ragged_columns_rejected(self, tracker):
+        tracker.start_session()
+        with pytest.raises(ValueError):
+            tracker.track_many({"event_type": ["a", "b"], "tokens_in": [1]})
+
+    def test_max_events_applies_to_batch(self):
+        transport = MagicMock(spec=Transport)
+        tracker = AgentTracker(transport=transport, session_store=MemorySessionStore(max_events=2))
+        session = tracker.start_session()
+        tracker.track_many({"event_type": ["a", "b", "c", "d"]})
+        assert [e.event_type for e in session.events] == ["c", "d"]
+
+    def test_span_and_dropped_session(self, tracker):
+        tracker.start_session()
+        with tracker.span("import") as sp:
+            tracker.track_many([{"event_type": "a"}, {"event_type": "b"}])
+        assert sp.event_count == 2
+        assert {e["span_id"] for e in _sent(tracker)[0]} == {sp.span_id}
+
+        dropped = AgentTracker(transport=MagicMock(spec=Transport), sampler=Sampler(rate=0.0))
+        dropped.start_session()
+        assert dropped.track_many([{"event_type": "a"}]) == []
+        dropped.transport.send_events.assert_not_called()
+
+    def test_payloads_match_capture(self, tracker):
+        row = dict(
+            event_type="tool_call", model="gpt-4", tokens_in=3, reasoning="why",
+            tool_name="search", tool_input={"q": "x"}, tool_output={"hits": 2},
+            duration_ms=12.5,
+        )
+        session = tracker.start_session()
+        with tracker.span("import") as sp:
+            tracker.capture(**row)
+            captured = tracker.transport.send_event.call_args[0][0]
+            tracker.track_many([row])
+            (batched,) = tracker.transport.send_events.call_args[0][0]
+        ids = {"event_id", "tool_call_id", "trace_id", "timestamp"}
+
+        def stable(d):
+            return {
+                k: stable(v) if isinstance(v, dict) and k in ("tool_call", "decision_trace") else v
+                for k, v in d.items() if k not in ids
+            }
+
+        captured["decision_trace"]["step"] += 1
+        assert stable(batched) == stable(captured)
+        assert batched["span_id"] == sp.span_id
+        assert batched["timestamp"].endswith("Z")
+        assert session.events._pending[-1] is batched
+
+    def test_deferred_session_buffers(self):
+        transport = MagicMock(spec=Transport)
+        tracker = AgentTracker(
+            transport=transport, sampler=Sampler(rate=0.0, tail=TailSampling()),
+        )
+        session = tracker.start_session()
+        tracker.track_many([{"event_type": "a"}, {"event_type": "error"}])
+        transport.send_events.assert_not_called()
+        tracker.end_session(session.session_id)
+        shipped = [e["event_type"] for e in transport.send_events.call_args[0][0]]
+        assert shipped[:3] == ["session_start", "a", "error"]
+
+
+class TestEventBatch:
+    def test_flushes_on_exit(self, tracker):
+        session = tracker.start_session()
+        with tracker.batch(chunk_size=2) as batch:
+            for i in range(3):
+                batch.add(event_type="llm_call", tokens_in=i)
+            assert len(session.events) == 0
+        assert len(batch) == 0
+        assert len(batch.event_ids) == 3
+        assert [len(chunk) for chunk in _sent(tracker)] == [2, 1]
+
+    def test_flushes_when_block_raises(self, tracker):
+        session = tracker.start_session()
+        with pytest.raises(RuntimeError):
+            with tracker.batch() as batch:
+                batch.add(event_type="llm_call")
+                raise RuntimeError("boom")
+        assert len(session.events) == 1
@@ -1,10 +1,21 @@
 """Tests for agentlens.transport — batched HTTP transport with retry logic."""
 
+import threading
 from unittest.mock import MagicMock, patch
 
 import httpx
+import pytest
 
-from agentlens.transport import Transport, _MAX_BUFFER_SIZE
+from agentlens.transport import Transport, _MAX_BUFFER_SIZE, encode_event
+
+
+def _enc(*events):
+    """Encode *events* the way the transport buffers them."""
+    return [encode_event(e) for e in events]
+
+
+def _ok():
+    return httpx.Response(200, request=httpx.Request("POST", "http://test:3000/events"))
 
 
 class TestTransportInit:
@@ -65,9 +76,9 @@ class TestFlush:
         t = Transport(endpoint="http://test:3000", batch_size=100)
         try:
             with patch.object(t, "_send_batch") as mock_send:
-                t._buffer = [{"type": "a"}, {"type": "b"}]
+                t._buffer.extend(_enc({"type": "a"}, {"type": "b"}))
                 t.flush()
-                mock_send.assert_called_once_with([{"type": "a"}, {"type": "b"}])
+                mock_send.assert_called_once_with(_enc({"type": "a"}, {"type": "b"}))
                 assert len(t._buffer) == 0
         finally:
             t._stop_event.set()
@@ -90,7 +101,7 @@ class TestSendBatch:
             mock_response.status_code = 200
             with patch.object(t._client, "post", return_value=mock_response):
                 t._consecutive_failures = 2
-                t._send_batch([{"type": "test"}])
+                t._send_batch(_enc({"type": "test"}))
                 assert t._consecutive_failures == 0
         finally:
             t._stop_event.set()
@@ -102,7 +113,7 @@ class TestSendBatch:
             mock_response.status_code = 500
             mock_response.text = "Internal Server Error"
             with patch.object(t._client, "post", return_value=mock_response):
-                events = [{"type": "test"}]
+                events = _enc({"type": "test"})
                 t._send_batch(events)
                 assert t._consecutive_failures == 1
                 assert len(t._buffer) == 1  # requeued
@@ -117,7 +128,7 @@ class TestSendBatch:
             mock_response.text = "Error"
             with patch.object(t._client, "post", return_value=mock_response):
                 t._consecutive_failures = 2  # already at max
-                t._send_batch([{"type": "test"}])
+                t._send_batch(_enc({"type": "test"}))
                 # Should drop, not requeue
                 assert len(t._buffer) == 0
                 assert t._consecutive_failures == 0  # reset after drop
@@ -130,7 +141,7 @@ class TestSendBatch:
             with patch.object(
                 t._client, "post", side_effect=httpx.ConnectError("Connection refused")
             ):
-                t._send_batch([{"type": "test"}])
+                t._send_batch(_enc({"type": "test"}))
                 assert t._consecutive_failures == 1
                 assert len(t._buffer) == 1
         finally:
@@ -149,7 +160,71 @@ class TestSendBatch:
 class TestClose:
     def test_close_stops_thread_and_flushes(self):
         t = Transport(endpoint="http://test:3000")
-        with patch.object(t, "flush") as mock_flush:
+        t._client = MagicMock()
+        t._client.post.return_value = _ok()
+        t.send_event({"type": "a"})
+        report = t.close()
+        assert t._stop_event.is_set()
+        assert not t._flush_thread.is_alive()
+        assert t._client.post.call_args[1]["content"] == b'{"events":[{"type":"a"}]}'
+        assert (report.flushed, report.persisted, report.dropped) == (1, 0, 0)
+
+
+class TestSenderWorkers:
+    def test_rejects_negative_worker_count(self):
+        with pytest.raises(ValueError, match="sender_workers"):
+            Transport(endpoint="http://test:3000", sender_workers=-1)
+
+    def test_full_batch_is_sent_by_worker_not_caller(self):
+        t = Transport(endpoint="http://test:3000", batch_size=2, sender_workers=1)
+        sent = threading.Event()
+        callers = []
+
+        def fake_send(events):
+            callers.append(threading.current_thread().name)
+            sent.set()
+
+        try:
+            with patch.object(t, "_send_batch", side_effect=fake_send):
+                t.send_events([{"type": "a"}, {"type": "b"}])
+                assert sent.wait(timeout=2.0)
+            assert callers == ["agentlens-sender-0"]
+        finally:
+            t.close()
+
+    def test_send_event_does_not_wait_for_slow_backend(self):
+        t = Transport(endpoint="http://test:3000", batch_size=1, sender_workers=1)
+        release = threading.Event()
+        try:
+            with patch.object(t, "_send_batch", side_effect=lambda events: release.wait(2.0)):
+                t.send_event({"type": "a"})
+                t.send_event({"type": "b"})
+                # Both calls returned while the worker is still blocked.
+                assert not release.is_set()
+                release.set()
+        finally:
+            t.close()
+
+    def test_close_drains_queue(self):
+        t = Transport(endpoint="http://test:3000", batch_size=100, sender_workers=2)
+        t._client = MagicMock()
+        t._client.post.return_value = _ok()
+        with patch.object(t, "_send_batch") as mock_send:
+            t._dispatch(_enc({"type": "queued"}))
+            t.send_event({"type": "a"})
+            t.close()
+        mock_send.assert_called_once_with(_enc({"type": "queued"}))
+        assert t._client.post.call_args[1]["content"] == b'{"events":[{"type":"a"}]}'
+        assert all(not w.is_alive() for w in t._sender_threads)
+
+    def test_enqueue_latency_recorded(self):
+        t = Transport(endpoint="http://test:3000", batch_size=100)
+        try:
+            t.send_event({"type": "a"})
+            t.send_events([{"type": "b"}, {"type": "c"}])
+            stats = t.enqueue_latency()
+            assert stats["count"] == 2
+            assert stats["max_ms"] >= stats["mean_ms"] >= 0.0
+        finally:
+            t._buffer.clear()
             t.close()
-            assert t._stop_event.is_set()
-            mock_flush.assert_called_once()
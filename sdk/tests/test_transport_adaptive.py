@@ -0,0 +1,120 @@
+"""Tests for agentlens.transport_adaptive — rate-driven batch size and linger."""
+
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+import agentlens
+from agentlens.transport import Transport
+from agentlens.transport_adaptive import AdaptiveBatching
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _controller(clock, **kwargs):
+    params = dict(
+        min_batch_size=10, max_batch_size=500, max_linger=5.0, max_latency=1.0,
+        smoothing=1.0, window=0.25, clock=clock,
+    )
+    params.update(kwargs)
+    return AdaptiveBatching(**params)
+
+
+class TestAdaptiveBatching:
+    def test_starts_at_lower_bound(self):
+        ctl = _controller(_Clock())
+        assert ctl.batch_size == 10
+        assert ctl.linger == 1.0
+
+    def test_rejects_bad_parameters(self):
+        with pytest.raises(ValueError):
+            _controller(_Clock(), max_latency=0)
+        with pytest.raises(ValueError):
+            _controller(_Clock(), smoothing=0)
+
+    def test_grows_under_load_up_to_cap(self):
+        clock = _Clock()
+        ctl = _controller(clock)
+        ctl.record(100)
+        clock.now += 1.0
+        assert ctl.record(100)  # 200 events/s
+        assert ctl.batch_size == 200
+        assert ctl.linger == pytest.approx(1.0)
+
+        clock.now += 1.0
+        ctl.record(2000)  # 2000 events/s
+        assert ctl.batch_size == 500
+        assert ctl.linger == pytest.approx(0.25)
+
+    def test_shrinks_back_when_idle(self):
+        clock = _Clock()
+        ctl = _controller(clock, smoothing=0.5)
+        clock.now += 1.0
+        ctl.record(4000)
+        assert ctl.batch_size == 500
+        for _ in range(20):
+            clock.now += 1.0
+            ctl.record(0)
+        assert ctl.batch_size == 10
+        assert ctl.linger == 1.0
+
+    def test_samples_only_once_per_window(self):
+        clock = _Clock()
+        ctl = _controller(clock)
+        clock.now += 0.1
+        assert not ctl.record(1000)
+        assert ctl.rate == 0.0
+
+    def test_linger_never_exceeds_flush_interval(self):
+        ctl = _controller(_Clock(), max_linger=0.5, max_latency=2.0)
+        assert ctl.linger == 0.5
+
+
+class TestTransportAdaptive:
+    def _transport(self, **kwargs):
+        with patch.object(Transport, "_flush_loop"):
+            t = Transport(endpoint="http://test:3000", **kwargs)
+        t._client = MagicMock()
+        return t
+
+    def test_disabled_by_default(self):
+        t = self._transport()
+        assert t._adaptive is None
+        assert t._next_flush_delay() == 5.0
+
+    def test_batch_size_follows_rate(self):
+        t = self._transport(max_latency=1.0)
+        clock = _Clock()
+        t._adaptive = _controller(clock)
+        t._client.post.return_value = httpx.Response(
+            200, request=httpx.Request("POST", "http://test:3000/events"),
+        )
+        t.send_events([{"n": i} for i in range(5)])
+        clock.now += 0.5
+        t.send_events([{"n": i} for i in range(995)])  # 2000 events/s
+        assert t.batch_size == 500
+        assert t._next_flush_delay() == pytest.approx(0.25)
+
+    def test_idle_transport_flushes_within_latency_budget(self):
+        t = self._transport(max_latency=0.5, flush_interval=5.0)
+        assert t._next_flush_delay() == 0.5
+
+    def test_init_exposes_batching_parameters(self):
+        tracker = agentlens.init(
+            endpoint="http://localhost:3000", batch_size=50, flush_interval=2.0,
+            max_latency=1.0, async_mode=False,
+        )
+        try:
+            transport = tracker.transport
+            assert transport.batch_size == 50
+            assert transport.flush_interval == 2.0
+            assert transport._adaptive.max_latency == 1.0
+        finally:
+            transport.close()
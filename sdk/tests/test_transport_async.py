@@ -0,0 +1,172 @@
+"""Tests for agentlens.transport_async — asyncio-native batched transport."""
+
+import asyncio
+import collections
+import json
+
+import httpx
+
+import agentlens
+from agentlens.tracker import AgentTracker
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_async import AsyncTransport, create_transport
+
+
+def _enc(*events):
+    """Encode *events* the way the transport buffers them."""
+    return [encode_event(e) for e in events]
+
+
+def _recording_client(received, status=200):
+    """Return an AsyncClient whose requests are captured into *received*."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(json.loads(request.content)["events"])
+        return httpx.Response(status, text="ok" if status < 300 else "boom")
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestAsyncSendEvents:
+    def test_send_event_never_posts_inline(self):
+        async def scenario():
+            received = []
+            t = AsyncTransport(endpoint="http://test:3000", batch_size=2)
+            t._client = _recording_client(received)
+            t.send_event({"type": "a"})
+            t.send_event({"type": "b"})
+            # Nothing has been sent yet: the caller's stack never awaits I/O.
+            assert received == []
+            await asyncio.sleep(0.05)
+            await t.aclose()
+            return received
+
+        received = asyncio.run(scenario())
+        assert received == [[{"type": "a"}, {"type": "b"}]]
+
+    def test_full_batch_is_queued_under_the_lock(self):
+        async def scenario():
+            received = []
+            t = AsyncTransport(endpoint="http://test:3000", batch_size=2)
+            t._client = _recording_client(received)
+            locked_on_append = []
+
+            class Ready(collections.deque):
+                def append(self, batch):
+                    locked_on_append.append(t._lock.locked())
+                    super().append(batch)
+
+            t._ready = Ready()
+            t.send_events([{"type": "a"}, {"type": "b"}])
+            # Queued before send_events released the lock, so a flush
+            # racing with it cannot send newer events ahead of this batch.
+            assert locked_on_append == [True]
+            assert list(t._ready) == [_enc({"type": "a"}, {"type": "b"})]
+            t.send_event({"type": "c"})
+            await t.aflush()
+            await t.aclose()
+            return received
+
+        received = asyncio.run(scenario())
+        assert [e["type"] for batch in received for e in batch] == ["a", "b", "c"]
+
+    def test_aflush_sends_buffer(self):
+        async def scenario():
+            received = []
+            t = AsyncTransport(endpoint="http://test:3000", batch_size=100)
+            t._client = _recording_client(received)
+            t.send_events([{"type": "a"}, {"type": "b"}])
+            await t.aflush()
+            assert len(t._buffer) == 0
+            await t.aclose()
+            return received
+
+        assert asyncio.run(scenario()) == [[{"type": "a"}, {"type": "b"}]]
+
+    def test_failed_send_requeues(self):
+        async def scenario():
+            received = []
+            t = AsyncTransport(endpoint="http://test:3000", batch_size=100, max_retries=3)
+            t._client = _recording_client(received, status=500)
+            t.send_event({"type": "a"})
+            await t.aflush()
+            assert t._consecutive_failures == 1
+            assert list(t._buffer) == _enc({"type": "a"})
+            t._buffer.clear()
+            await t.aclose()
+
+        asyncio.run(scenario())
+
+    def test_close_inside_loop_schedules_aclose(self):
+        async def scenario():
+            received = []
+            t = AsyncTransport(endpoint="http://test:3000", batch_size=100)
+            t._client = _recording_client(received)
+            t.send_event({"type": "a"})
+            t.close()
+            await t._close_task
+            return received
+
+        assert asyncio.run(scenario()) == [[{"type": "a"}]]
+
+    def test_created_outside_loop_flushes_blocking(self):
+        t = AsyncTransport(endpoint="http://test:3000", batch_size=100)
+        received = []
+        t._sync_client = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: received.append(json.loads(request.content)["events"])
+                or httpx.Response(200),
+            ),
+        )
+        t.send_event({"type": "a"})
+        report = t.close()
+        assert received == [[{"type": "a"}]]
+        assert report.flushed == 1
+
+
+class TestTransportSelection:
+    def test_create_transport_outside_loop_is_threaded(self):
+        t = create_transport(endpoint="http://test:3000")
+        try:
+            assert type(t) is Transport
+        finally:
+            t.close()
+
+    def test_create_transport_inside_loop_is_async(self):
+        async def scenario():
+            t = create_transport(endpoint="http://test:3000")
+            try:
+                return type(t)
+            finally:
+                await t.aclose()
+
+        assert asyncio.run(scenario()) is AsyncTransport
+
+    def test_async_mode_false_forces_threaded(self):
+        async def scenario():
+            t = create_transport(endpoint="http://test:3000", async_mode=False)
+            t.close()
+            return type(t)
+
+        assert asyncio.run(scenario()) is Transport
+
+    def test_init_inside_loop_picks_async(self):
+        async def scenario():
+            tracker = agentlens.init(api_key="k", endpoint="http://test:3000")
+            try:
+                return type(tracker.transport)
+            finally:
+                await tracker.transport.aclose()
+                agentlens._tracker = None
+
+        assert asyncio.run(scenario()) is AsyncTransport
+
+    def test_tracker_default_transport_inside_loop(self):
+        async def scenario():
+            tracker = AgentTracker()
+            try:
+                return type(tracker.transport)
+            finally:
+                await tracker.transport.aclose()
+
+        assert asyncio.run(scenario()) is AsyncTransport
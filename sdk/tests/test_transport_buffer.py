@@ -0,0 +1,172 @@
+"""Tests for agentlens.transport_buffer — bounded buffer and overflow policies."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_buffer import EventBuffer, PriorityEvent, flatten
+
+
+def _enc(*events):
+    """Encode *events* the way the transport buffers them."""
+    return [encode_event(e) for e in events]
+
+
+def _filled(policy, n, max_events=3):
+    buf = EventBuffer(max_events=max_events, max_bytes=1 << 20, policy=policy)
+    buf.extend(_enc(*({"n": i} for i in range(n))))
+    return buf
+
+
+class TestEventBuffer:
+    def test_rejects_unknown_policy(self):
+        with pytest.raises(ValueError, match="overflow_policy"):
+            EventBuffer(10, 100, policy="drop_random")
+
+    def test_prepend_drain_and_byte_accounting(self):
+        buf = EventBuffer(10, 1 << 20)
+        buf.extend(_enc({"n": 2}))
+        buf.prepend(_enc({"n": 0}, {"n": 1}))
+        assert buf.nbytes == sum(map(len, _enc({"n": 0}, {"n": 1}, {"n": 2})))
+        assert flatten(buf.drain()) == _enc({"n": 0}, {"n": 1}, {"n": 2})
+        assert len(buf) == 0 and buf.nbytes == 0
+
+    def test_drop_oldest(self):
+        buf = _filled("drop_oldest", 5)
+        assert buf.evict() == _enc({"n": 0}, {"n": 1})
+        assert list(buf) == _enc({"n": 2}, {"n": 3}, {"n": 4})
+
+    def test_drop_newest(self):
+        buf = _filled("drop_newest", 5)
+        assert buf.evict() == _enc({"n": 3}, {"n": 4})
+        assert list(buf) == _enc({"n": 0}, {"n": 1}, {"n": 2})
+
+    def test_byte_cap(self):
+        buf = EventBuffer(max_events=100, max_bytes=20)
+        buf.extend(_enc({"n": 1}, {"n": 2}, {"n": 3}))  # 7 bytes each
+        assert buf.evict() == _enc({"n": 1})
+        assert buf.nbytes == 14
+
+    def test_priority_keeps_session_boundaries_and_errors(self):
+        buf = EventBuffer(max_events=3, max_bytes=1 << 20, policy="priority")
+        events = [
+            {"event_type": "session_start"},
+            {"event_type": "llm_call", "n": 1},
+            {"event_type": "error"},
+            {"event_type": "llm_call", "n": 2},
+            {"event_type": "session_end"},
+        ]
+        for event in events:
+            buf.append(buf.tag(event, encode_event(event)))
+        evicted = buf.evict()
+        assert evicted == _enc(events[1], events[3])
+        assert list(buf) == _enc(events[0], events[2], events[4])
+        assert all(isinstance(data, PriorityEvent) for data in buf)
+
+    def test_priority_falls_back_to_oldest(self):
+        buf = EventBuffer(max_events=1, max_bytes=1 << 20, policy="priority")
+        for i in range(3):
+            event = {"event_type": "error", "n": i}
+            buf.append(buf.tag(event, encode_event(event)))
+        assert buf.evict() == _enc(
+            {"event_type": "error", "n": 0}, {"event_type": "error", "n": 1},
+        )
+
+    def test_tag_only_under_priority_policy(self):
+        event = {"event_type": "error"}
+        assert type(EventBuffer(1, 1).tag(event, b"x")) is bytes
+        assert type(EventBuffer(1, 1, "priority").tag(event, b"x")) is PriorityEvent
+
+    def test_segments_stay_consistent_across_operations(self):
+        buf = EventBuffer(max_events=600, max_bytes=1 << 30)
+        events = _enc(*({"n": i} for i in range(700)))
+        for data in events:
+            buf.append(data)
+        assert len(buf._segments) > 1
+        assert buf.evict() == events[:100]  # crosses into the head segment
+        assert len(buf) == 600
+        assert buf[0] == events[100] and buf[-1] == events[-1]
+        assert list(buf) == events[100:]
+
+        buf.prepend(events[:2])
+        assert list(buf)[:3] == [events[0], events[1], events[100]]
+        assert buf.nbytes == sum(map(len, buf))
+        assert flatten(buf.drain()) == events[:2] + events[100:]
+
+    def test_drop_newest_after_head_eviction(self):
+        buf = _filled("drop_oldest", 4, max_events=2)
+        assert buf.evict() == _enc({"n": 0}, {"n": 1})  # head segment offset
+        buf.policy = "drop_newest"
+        buf.max_events = 1
+        assert buf.evict() == _enc({"n": 3})
+        assert buf.evict() == []
+        buf.max_events = 0
+        assert buf.evict() == _enc({"n": 2})
+        assert list(buf) == [] and buf.nbytes == 0
+        buf.append(encode_event({"n": 4}))
+        assert list(buf) == _enc({"n": 4})
+
+    def test_has_room(self):
+        buf = _filled("block", 3)
+        assert not buf.has_room(1, 1)
+        # A batch that can never fit does not wait.
+        assert buf.has_room(10, 1)
+
+
+class TestTransportOverflowPolicy:
+    def _transport(self, **kwargs):
+        with patch.object(Transport, "_flush_loop"):
+            t = Transport(endpoint="http://test:3000", batch_size=1000, **kwargs)
+        t._client = MagicMock()
+        return t
+
+    def test_default_policy(self):
+        t = self._transport()
+        assert t.overflow_policy == "drop_oldest"
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            self._transport(overflow_policy="nope")
+
+    def test_drop_newest(self):
+        t = self._transport(overflow_policy="drop_newest", max_buffer_size=2)
+        for i in range(4):
+            t.send_event({"n": i})
+        assert list(t._buffer) == _enc({"n": 0}, {"n": 1})
+
+    def test_priority_through_transport(self):
+        t = self._transport(overflow_policy="priority", max_buffer_size=2)
+        t.send_event({"event_type": "session_start"})
+        t.send_events([{"event_type": "llm_call", "n": i} for i in range(3)])
+        t.send_event({"event_type": "session_end"})
+        assert list(t._buffer) == _enc(
+            {"event_type": "session_start"}, {"event_type": "session_end"},
+        )
+
+    def test_block_waits_for_flush(self):
+        t = self._transport(overflow_policy="block", max_buffer_size=2, block_timeout=5.0)
+        t.send_events([{"n": 0}, {"n": 1}])
+
+        def drain_soon():
+            time.sleep(0.1)
+            with t._lock:
+                t._drain_buffer()
+
+        drainer = threading.Thread(target=drain_soon)
+        drainer.start()
+        start = time.monotonic()
+        t.send_event({"n": 2})
+        drainer.join()
+        assert 0.05 < time.monotonic() - start < 5.0
+        assert list(t._buffer) == _enc({"n": 2})
+
+    def test_block_times_out_and_drops_newest(self):
+        t = self._transport(overflow_policy="block", max_buffer_size=2, block_timeout=0.05)
+        t.send_events([{"n": 0}, {"n": 1}])
+        start = time.monotonic()
+        t.send_event({"n": 2})
+        assert time.monotonic() - start >= 0.05
+        assert list(t._buffer) == _enc({"n": 0}, {"n": 1})
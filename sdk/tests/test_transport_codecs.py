@@ -0,0 +1,126 @@
+"""Tests for agentlens.transport_codecs and compressed batch uploads."""
+
+import gzip
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_codecs import Codec, GzipCodec, ZstdCodec, get_codec
+
+
+def _enc(*events):
+    """Encode *events* the way the transport buffers them."""
+    return [encode_event(e) for e in events]
+
+
+class _UpperCodec:
+    name = "x-upper"
+
+    def compress(self, data):
+        return data.upper()
+
+
+def _ok():
+    resp = MagicMock()
+    resp.status_code = 200
+    return resp
+
+
+class TestGetCodec:
+    def test_none_and_identity(self):
+        assert get_codec(None) is None
+        assert get_codec("identity") is None
+        assert get_codec("none") is None
+
+    def test_gzip_by_name(self):
+        codec = get_codec("GZIP")
+        assert isinstance(codec, GzipCodec)
+        assert codec.name == "gzip"
+
+    def test_unknown_name(self):
+        with pytest.raises(ValueError, match="Unknown compression codec"):
+            get_codec("lz4")
+
+    def test_custom_codec_instance(self):
+        codec = _UpperCodec()
+        assert isinstance(codec, Codec)
+        assert get_codec(codec) is codec
+
+    def test_rejects_non_codec(self):
+        with pytest.raises(TypeError):
+            get_codec(42)
+
+    def test_gzip_level_validated(self):
+        with pytest.raises(ValueError):
+            GzipCodec(level=0)
+
+    def test_zstd_missing_dependency(self):
+        with patch.dict("sys.modules", {"zstandard": None}):
+            with pytest.raises(ImportError, match="zstandard"):
+                ZstdCodec()
+
+
+class TestCompressedUploads:
+    def test_gzip_body_above_threshold(self):
+        t = Transport(endpoint="http://test:3000", compression="gzip", compression_threshold=10)
+        try:
+            events = [{"input_data": {"prompt": "x" * 500}}]
+            with patch.object(t._client, "post", return_value=_ok()) as mock_post:
+                t._send_batch(_enc(*events))
+            kwargs = mock_post.call_args[1]
+            assert kwargs["headers"]["Content-Encoding"] == "gzip"
+            assert json.loads(gzip.decompress(kwargs["content"])) == {"events": events}
+        finally:
+            t.close()
+
+    def test_small_body_not_compressed(self):
+        t = Transport(endpoint="http://test:3000", compression="gzip", compression_threshold=4096)
+        try:
+            with patch.object(t._client, "post", return_value=_ok()) as mock_post:
+                t._send_batch(_enc({"type": "a"}))
+            kwargs = mock_post.call_args[1]
+            assert "Content-Encoding" not in kwargs["headers"]
+            assert json.loads(kwargs["content"]) == {"events": [{"type": "a"}]}
+        finally:
+            t.close()
+
+    def test_pluggable_codec(self):
+        t = Transport(endpoint="http://test:3000", compression=_UpperCodec(), compression_threshold=0)
+        try:
+            with patch.object(t._client, "post", return_value=_ok()) as mock_post:
+                t._send_batch(_enc({"type": "a"}))
+            kwargs = mock_post.call_args[1]
+            assert kwargs["headers"]["Content-Encoding"] == "x-upper"
+            assert kwargs["content"] == b'{"EVENTS":[{"TYPE":"A"}]}'
+        finally:
+            t.close()
+
+    def test_415_falls_back_to_gzip_without_spending_retry(self):
+        t = Transport(endpoint="http://test:3000", compression=_UpperCodec(), compression_threshold=0)
+        try:
+            resp = MagicMock()
+            resp.status_code = 415
+            resp.headers = {"Accept-Encoding": "gzip, deflate, identity"}
+            with patch.object(t._client, "post", return_value=resp):
+                t._send_batch(_enc({"type": "a"}))
+            assert isinstance(t._codec, GzipCodec)
+            assert t._consecutive_failures == 0
+            assert list(t._buffer) == _enc({"type": "a"})
+        finally:
+            t._buffer.clear()
+            t.close()
+
+    def test_415_for_gzip_disables_compression(self):
+        t = Transport(endpoint="http://test:3000", compression="gzip", compression_threshold=0)
+        try:
+            resp = MagicMock()
+            resp.status_code = 415
+            resp.headers = {"Accept-Encoding": "identity"}
+            with patch.object(t._client, "post", return_value=resp):
+                t._send_batch(_enc({"type": "a"}))
+            assert t._codec is None
+        finally:
+            t._buffer.clear()
+            t.close()
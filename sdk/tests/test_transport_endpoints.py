@@ -0,0 +1,182 @@
+"""Tests for agentlens.transport_endpoints — load balancing and failover."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_async import AsyncTransport
+from agentlens.transport_endpoints import EndpointPool
+
+
+def _enc(*events):
+    """Encode *events* the way the transport buffers them."""
+    return [encode_event(e) for e in events]
+
+
+def _response(status):
+    return httpx.Response(
+        status, text="x", request=httpx.Request("POST", "http://test/events"),
+    )
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEndpointPool:
+    def test_rejects_empty_and_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            EndpointPool([])
+        with pytest.raises(ValueError, match="load_balancing"):
+            EndpointPool(["http://a"], strategy="random")
+
+    def test_round_robin(self):
+        pool = EndpointPool(["http://a", "http://b", "http://c/"])
+        firsts = [pool.attempt_order()[0].url for _ in range(4)]
+        assert firsts == ["http://a", "http://b", "http://c", "http://a"]
+        assert len(pool.attempt_order()) == 3
+
+    def test_least_inflight(self):
+        pool = EndpointPool(["http://a", "http://b"], strategy="least_inflight")
+        a, b = pool.endpoints
+        pool.acquire(a)
+        assert [pool.attempt_order()[0] for _ in range(3)] == [b, b, b]
+        pool.release(a, ok=True)
+        pool.acquire(b)
+        assert pool.attempt_order()[0] is a
+
+    def test_ejection_and_recovery(self):
+        clock = _Clock()
+        pool = EndpointPool(
+            ["http://a", "http://b"], eject_after=2, eject_for=10, clock=clock,
+        )
+        a, b = pool.endpoints
+        for _ in range(2):
+            pool.acquire(a)
+            pool.release(a, ok=False)
+        assert [pool.attempt_order() for _ in range(2)] == [[b], [b]]
+
+        clock.now += 10
+        assert a in pool.attempt_order()
+        pool.acquire(a)
+        pool.release(a, ok=True)
+        assert a.failures == 0
+
+    def test_all_ejected_still_probes_soonest_first(self):
+        clock = _Clock()
+        pool = EndpointPool(
+            ["http://a", "http://b"], eject_after=1, eject_for=10, clock=clock,
+        )
+        a, b = pool.endpoints
+        pool.acquire(b)
+        pool.release(b, ok=False)
+        clock.now += 1
+        pool.acquire(a)
+        pool.release(a, ok=False)
+        assert pool.attempt_order() == [b, a]
+
+    def test_single_endpoint_is_never_ejected(self):
+        pool = EndpointPool(["http://a"], eject_after=1)
+        (a,) = pool.endpoints
+        pool.acquire(a)
+        pool.release(a, ok=False)
+        assert a.ejected_until == 0.0
+
+
+class TestTransportFailover:
+    def _transport(self, endpoints, **kwargs):
+        with patch.object(Transport, "_flush_loop"):
+            t = Transport(endpoint=endpoints, batch_size=1000, **kwargs)
+        t._client = MagicMock()
+        return t
+
+    def test_single_endpoint_unchanged(self):
+        t = self._transport("http://test:3000/")
+        assert t.endpoint == "http://test:3000"
+        assert t.endpoints == ["http://test:3000"]
+
+    def test_batches_spread_across_endpoints(self):
+        t = self._transport(["http://a:3000", "http://b:3000"])
+        t._client.post.return_value = _response(200)
+        for i in range(4):
+            t._send_batch(_enc({"n": i}))
+        urls = [c.args[0] for c in t._client.post.call_args_list]
+        assert urls == ["http://a:3000/events", "http://b:3000/events"] * 2
+        assert t.endpoint == "http://a:3000"
+
+    def test_connection_error_fails_over(self):
+        t = self._transport(["http://a:3000", "http://b:3000"])
+
+        def post(url, **kwargs):
+            if url.startswith("http://a"):
+                raise httpx.ConnectError("refused")
+            return _response(200)
+
+        t._client.post.side_effect = post
+        t._send_batch(_enc({"n": 1}))
+        assert t._client.post.call_count == 2
+        assert t._consecutive_failures == 0
+        assert list(t._buffer) == []
+
+    def test_dead_endpoint_is_ejected(self):
+        t = self._transport(["http://a:3000", "http://b:3000"], eject_after=2)
+
+        def post(url, **kwargs):
+            if url.startswith("http://a"):
+                raise httpx.ConnectError("refused")
+            return _response(200)
+
+        t._client.post.side_effect = post
+        for i in range(6):
+            t._send_batch(_enc({"n": i}))
+        urls = [c.args[0] for c in t._client.post.call_args_list]
+        assert urls.count("http://a:3000/events") == 2
+
+    def test_all_endpoints_down_counts_one_failure(self):
+        t = self._transport(["http://a:3000", "http://b:3000"])
+        t._client.post.side_effect = httpx.ConnectError("refused")
+        t._send_batch(_enc({"n": 1}))
+        assert t._client.post.call_count == 2
+        assert t._consecutive_failures == 1
+        assert list(t._buffer) == _enc({"n": 1})
+
+    def test_http_error_status_does_not_fail_over(self):
+        t = self._transport(["http://a:3000", "http://b:3000"])
+        t._client.post.return_value = _response(503)
+        t._send_batch(_enc({"n": 1}))
+        t._client.post.assert_called_once()
+        assert t._endpoints.endpoints[0].failures == 1
+
+    def test_plaintext_warning_checks_every_endpoint(self):
+        with pytest.warns(UserWarning, match="plaintext"):
+            self._transport(
+                ["https://a.example.com", "http://b.example.com"], api_key="secret",
+            )
+
+    def test_async_transport_fails_over(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.host)
+            if request.url.host == "a":
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200)
+
+        async def run():
+            t = AsyncTransport(endpoint=["http://a", "http://b"])
+            await t._client.aclose()
+            t._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            await t._asend_batch(_enc({"n": 1}))
+            await t.aclose()
+            return t
+
+        t = asyncio.run(run())
+        assert seen == ["a", "b"]
+        assert t._consecutive_failures == 0
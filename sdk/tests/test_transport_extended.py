@@ -1,10 +1,17 @@
 """Additional tests for agentlens.transport — concurrency, retry logic, edge cases."""
 
+import json
 from unittest.mock import MagicMock, patch
 
 import httpx
+import pytest
 
-from agentlens.transport import Transport, _MAX_BUFFER_SIZE
+from agentlens.transport import Transport, _MAX_BUFFER_SIZE, encode_event
+
+
+def _enc(*events):
+    """Encode *events* the way the transport buffers them."""
+    return [encode_event(e) for e in events]
 
 
 class TestSendEventsEdgeCases:
@@ -14,7 +21,7 @@ class TestSendEventsEdgeCases:
             with patch.object(t, "_send_batch") as mock_send:
                 t.send_events([{"type": "a"}])
                 mock_send.assert_not_called()
-                assert t._buffer == [{"type": "a"}]
+                assert list(t._buffer) == _enc({"type": "a"})
         finally:
             t._running = False
 
@@ -45,7 +52,7 @@ class TestSendEventsEdgeCases:
             with patch.object(t, "_send_batch") as mock_send:
                 t.send_events([])
                 mock_send.assert_not_called()
-                assert t._buffer == []
+                assert list(t._buffer) == []
         finally:
             t._running = False
 
@@ -82,7 +89,7 @@ class TestSendEventsEdgeCases:
                 t.send_events(events)
                 assert len(t._buffer) == _MAX_BUFFER_SIZE
                 # The first 10 should have been dropped
-                assert t._buffer[0]["id"] == 10
+                assert json.loads(t._buffer[0])["id"] == 10
         finally:
             t._running = False
 
@@ -95,7 +102,7 @@ class TestSendBatchRetryLogic:
             mock_resp.status_code = 503
             mock_resp.text = "Service Unavailable"
             with patch.object(t._client, "post", return_value=mock_resp):
-                t._send_batch([{"type": "a"}, {"type": "b"}])
+                t._send_batch(_enc({"type": "a"}, {"type": "b"}))
                 assert t._consecutive_failures == 1
                 assert len(t._buffer) == 2
         finally:
@@ -105,16 +112,16 @@ class TestSendBatchRetryLogic:
         t = Transport(endpoint="http://test:3000", max_retries=3)
         try:
             # Pre-populate buffer with a new event that arrived during the HTTP call
-            t._buffer = [{"type": "new"}]
+            t._buffer.extend(_enc({"type": "new"}))
             mock_resp = MagicMock()
             mock_resp.status_code = 500
             mock_resp.text = "Error"
             with patch.object(t._client, "post", return_value=mock_resp):
-                t._send_batch([{"type": "old1"}, {"type": "old2"}])
+                t._send_batch(_enc({"type": "old1"}, {"type": "old2"}))
                 # Failed events should be prepended before new ones
-                assert t._buffer[0] == {"type": "old1"}
-                assert t._buffer[1] == {"type": "old2"}
-                assert t._buffer[2] == {"type": "new"}
+                assert t._buffer[0] == encode_event({"type": "old1"})
+                assert t._buffer[1] == encode_event({"type": "old2"})
+                assert t._buffer[2] == encode_event({"type": "new"})
         finally:
             t._running = False
 
@@ -125,10 +132,10 @@ class TestSendBatchRetryLogic:
             mock_resp.status_code = 500
             mock_resp.text = "Error"
             with patch.object(t._client, "post", return_value=mock_resp):
-                t._send_batch([{"type": "a"}])
+                t._send_batch(_enc({"type": "a"}))
                 assert t._consecutive_failures == 1
                 t._buffer.clear()
-                t._send_batch([{"type": "b"}])
+                t._send_batch(_enc({"type": "b"}))
                 assert t._consecutive_failures == 2
         finally:
             t._running = False
@@ -140,7 +147,7 @@ class TestSendBatchRetryLogic:
             mock_resp = MagicMock()
             mock_resp.status_code = 200
             with patch.object(t._client, "post", return_value=mock_resp):
-                t._send_batch([{"type": "a"}])
+                t._send_batch(_enc({"type": "a"}))
                 assert t._consecutive_failures == 0
         finally:
             t._running = False
@@ -153,7 +160,7 @@ class TestSendBatchRetryLogic:
             mock_resp.text = "Error"
             with patch.object(t._client, "post", return_value=mock_resp):
                 t._consecutive_failures = 2
-                t._send_batch([{"type": "a"}])
+                t._send_batch(_enc({"type": "a"}))
                 assert len(t._buffer) == 0  # dropped, not requeued
                 assert t._consecutive_failures == 0  # reset
         finally:
@@ -164,7 +171,7 @@ class TestSendBatchRetryLogic:
         try:
             with patch.object(t._client, "post",
                               side_effect=httpx.ConnectError("refused")):
-                t._send_batch([{"type": "a"}])
+                t._send_batch(_enc({"type": "a"}))
                 assert t._consecutive_failures == 1
                 assert len(t._buffer) == 1
         finally:
@@ -175,7 +182,7 @@ class TestSendBatchRetryLogic:
         try:
             with patch.object(t._client, "post",
                               side_effect=httpx.ReadTimeout("timeout")):
-                t._send_batch([{"type": "a"}])
+                t._send_batch(_enc({"type": "a"}))
                 assert t._consecutive_failures == 1
                 assert len(t._buffer) == 1
         finally:
@@ -189,12 +196,12 @@ class TestSendBatchRetryLogic:
             mock_resp.text = "Error"
             with patch.object(t._client, "post", return_value=mock_resp):
                 # First failure: requeues (failures becomes 1, <= max_retries=1)
-                t._send_batch([{"type": "a"}])
+                t._send_batch(_enc({"type": "a"}))
                 assert t._consecutive_failures == 1
                 assert len(t._buffer) == 1
                 t._buffer.clear()
                 # Second failure: drops (failures becomes 2, > max_retries=1)
-                t._send_batch([{"type": "b"}])
+                t._send_batch(_enc({"type": "b"}))
                 assert t._consecutive_failures == 0
                 assert len(t._buffer) == 0
         finally:
@@ -208,7 +215,7 @@ class TestSendBatchHTTPRequest:
             mock_resp = MagicMock()
             mock_resp.status_code = 200
             with patch.object(t._client, "post", return_value=mock_resp) as mock_post:
-                t._send_batch([{"type": "test"}])
+                t._send_batch(_enc({"type": "test"}))
                 mock_post.assert_called_once()
                 url = mock_post.call_args[0][0]
                 assert url == "http://api.example.com:3000/events"
@@ -221,7 +228,7 @@ class TestSendBatchHTTPRequest:
             mock_resp = MagicMock()
             mock_resp.status_code = 200
             with patch.object(t._client, "post", return_value=mock_resp) as mock_post:
-                t._send_batch([{"type": "test"}])
+                t._send_batch(_enc({"type": "test"}))
                 headers = mock_post.call_args[1]["headers"]
                 assert headers["Content-Type"] == "application/json"
                 assert headers["X-API-Key"] == "my-key"
@@ -235,8 +242,8 @@ class TestSendBatchHTTPRequest:
             mock_resp.status_code = 200
             with patch.object(t._client, "post", return_value=mock_resp) as mock_post:
                 events = [{"type": "a"}, {"type": "b"}]
-                t._send_batch(events)
-                body = mock_post.call_args[1]["json"]
+                t._send_batch(_enc(*events))
+                body = json.loads(mock_post.call_args[1]["content"])
                 assert body == {"events": [{"type": "a"}, {"type": "b"}]}
         finally:
             t._running = False
@@ -252,7 +259,7 @@ class TestSendBatchHTTPRequest:
                 mock_resp.status_code = status
                 mock_resp.text = f"Status {status}"
                 with patch.object(t._client, "post", return_value=mock_resp):
-                    t._send_batch([{"type": "test"}])
+                    t._send_batch(_enc({"type": "test"}))
                     assert t._consecutive_failures == 1, f"Expected failure for HTTP {status}"
             finally:
                 t._running = False
@@ -292,3 +299,92 @@ class TestCloseExtended:
         assert not t._stop_event.is_set()
         t.close()
         assert t._stop_event.is_set()
+
+
+class TestByteBatching:
+    def _ok(self):
+        resp = MagicMock()
+        resp.status_code = 200
+        return resp
+
+    def test_events_serialized_at_enqueue(self):
+        t = Transport(endpoint="http://test:3000", batch_size=10)
+        try:
+            t.send_event({"type": "a", "n": 1})
+            assert list(t._buffer) == [b'{"type":"a","n":1}']
+            assert t._buffer_bytes == len(b'{"type":"a","n":1}')
+        finally:
+            t._buffer.clear()
+            t.close()
+
+    def test_unserializable_event_dropped(self):
+        t = Transport(endpoint="http://test:3000", batch_size=10)
+        try:
+            t.send_events([{"type": "a"}, {"bad": object()}, {"type": "b"}])
+            assert list(t._buffer) == _enc({"type": "a"}, {"type": "b"})
+        finally:
+            t._buffer.clear()
+            t.close()
+
+    def test_byte_threshold_triggers_flush(self):
+        t = Transport(endpoint="http://test:3000", batch_size=1000, max_batch_bytes=100)
+        try:
+            with patch.object(t, "_send_batch") as mock_send:
+                t.send_event({"payload": "x" * 50})
+                mock_send.assert_not_called()
+                t.send_event({"payload": "y" * 50})
+                mock_send.assert_called_once()
+                assert t._buffer_bytes == 0
+        finally:
+            t.close()
+
+    def test_split_by_event_count(self):
+        t = Transport(endpoint="http://test:3000")
+        try:
+            batches = t._split_batch(_enc(*({"i": i} for i in range(1200))))
+            assert [len(b) for b in batches] == [500, 500, 200]
+        finally:
+            t.close()
+
+    def test_split_by_bytes(self):
+        t = Transport(endpoint="http://test:3000", max_batch_bytes=64)
+        try:
+            events = _enc(*({"p": "x" * 20} for _ in range(5)))  # 30 bytes each
+            batches = t._split_batch(events)
+            assert [len(b) for b in batches] == [2, 2, 1]
+            # An event larger than the cap still goes out, alone.
+            big = _enc({"p": "x" * 200})
+            assert t._split_batch(big) == [big]
+        finally:
+            t.close()
+
+    def test_send_posts_each_batch(self):
+        t = Transport(endpoint="http://test:3000")
+        try:
+            with patch.object(t._client, "post", return_value=self._ok()) as mock_post:
+                t._send_batch(_enc(*({"i": i} for i in range(700))))
+            bodies = [json.loads(c[1]["content"])["events"] for c in mock_post.call_args_list]
+            assert [len(b) for b in bodies] == [500, 200]
+            assert bodies[1][0] == {"i": 500}
+        finally:
+            t.close()
+
+    def test_failed_batch_requeues_unsent_tail_in_order(self):
+        t = Transport(endpoint="http://test:3000", max_retries=3)
+        try:
+            fail = MagicMock()
+            fail.status_code = 503
+            fail.text = "down"
+            with patch.object(t._client, "post", side_effect=[self._ok(), fail]) as mock_post:
+                events = _enc(*({"i": i} for i in range(1200)))
+                t._send_batch(events)
+            assert mock_post.call_count == 2  # third batch never attempted
+            assert list(t._buffer) == events[500:]
+            assert t._consecutive_failures == 1
+        finally:
+            t._buffer.clear()
+            t.close()
+
+    def test_rejects_non_positive_max_batch_bytes(self):
+        with pytest.raises(ValueError, match="max_batch_bytes"):
+            Transport(endpoint="http://test:3000", max_batch_bytes=0)
@@ -0,0 +1,220 @@
+"""Tests for agentlens.transport_file and the ``agentlens import`` command."""
+
+import gzip
+import io
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agentlens.cli import build_parser
+from agentlens.cli import main as cli_main
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_async import create_transport
+from agentlens.transport_file import (
+    NDJSONFileTransport,
+    NDJSONFileWriter,
+    NDJSONImporter,
+    file_path_from_endpoint,
+    read_ndjson,
+)
+
+
+def _response(status, **kwargs):
+    return httpx.Response(status, request=httpx.Request("POST", "http://test/events"), **kwargs)
+
+
+def _file_transport(path, **kwargs):
+    with patch.object(Transport, "_flush_loop"):
+        return NDJSONFileTransport(path, batch_size=100, **kwargs)
+
+
+def _lines(directory):
+    out = []
+    for name in sorted(os.listdir(directory)):
+        out.extend(json.loads(line) for line in read_ndjson(os.path.join(directory, name)))
+    return out
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep():
+    with patch("agentlens.transport_file.time.sleep"):
+        yield
+
+
+class TestNDJSONFileWriter:
+    def test_rotates_by_size_and_finishes_files(self, tmp_path):
+        writer = NDJSONFileWriter(tmp_path, max_bytes=10)
+        for i in range(3):
+            assert writer.post("http://x/events", content=b'{"n":%d}\n' % i).status_code == 202
+        names = sorted(os.listdir(tmp_path))
+        assert len(names) == 3
+        assert [n.endswith(".part") for n in names] == [False, False, True]
+        writer.close()
+        assert not any(n.endswith(".part") for n in os.listdir(tmp_path))
+        assert _lines(tmp_path) == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+    def test_rotates_by_age(self, tmp_path):
+        writer = NDJSONFileWriter(tmp_path, max_age=0)
+        writer.post("http://x/events", content=b"{}\n")
+        writer.post("http://x/events", content=b"{}\n")
+        writer.close()
+        assert len(os.listdir(tmp_path)) == 2
+
+    def test_write_errors_are_transport_errors(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        writer = NDJSONFileWriter(blocker / "sub")
+        with pytest.raises(httpx.WriteError):
+            writer.post("http://x/events", content=b"{}\n")
+
+    def test_stdout(self, capsysbinary):
+        writer = NDJSONFileWriter("-")
+        writer.post("http://x/events", content=b'{"n":1}\n')
+        writer.close()
+        assert capsysbinary.readouterr().out == b'{"n":1}\n'
+
+
+class TestNDJSONFileTransport:
+    def test_writes_batches_as_ndjson(self, tmp_path):
+        t = _file_transport(tmp_path)
+        t.send_events([{"n": i} for i in range(3)])
+        t.flush()
+        t.close()
+        assert _lines(tmp_path) == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+    def test_compressed_batches_concatenate(self, tmp_path):
+        t = _file_transport(tmp_path, compression="gzip")
+        t.send_event({"n": 1})
+        t.flush()
+        t.send_event({"n": 2})
+        t.flush()
+        t.close()
+        (name,) = os.listdir(tmp_path)
+        assert name.endswith(".ndjson.gz")
+        assert gzip.decompress((tmp_path / name).read_bytes()) == b'{"n":1}\n{"n":2}\n'
+
+    def test_rejects_msgpack_and_queries(self, tmp_path):
+        with pytest.raises(ValueError):
+            NDJSONFileTransport(tmp_path, wire_format="msgpack")
+        t = _file_transport(tmp_path)
+        with pytest.raises(RuntimeError):
+            t.get("/sessions")
+        t.close()
+
+    def test_file_endpoint(self, tmp_path):
+        assert file_path_from_endpoint(f"file://{tmp_path}") == str(tmp_path)
+        assert file_path_from_endpoint("http://localhost:3000") is None
+        with pytest.raises(ValueError):
+            file_path_from_endpoint("file://")
+        with pytest.raises(ValueError):
+            Transport(endpoint=f"file://{tmp_path}")
+        with patch.object(Transport, "_flush_loop"):
+            t = create_transport(f"file://{tmp_path}", async_mode=True)
+        assert isinstance(t, NDJSONFileTransport)
+        assert t.path == str(tmp_path)
+        t.close()
+
+
+class TestNDJSONImporter:
+    def _importer(self, **kwargs):
+        with patch.object(Transport, "_flush_loop"):
+            t = Transport(endpoint="http://test:3000")
+        t._client = MagicMock()
+        t._client.post.return_value = _response(200)
+        return NDJSONImporter(t, **kwargs)
+
+    def _posted(self, importer):
+        return [
+            json.loads(call[1]["content"])["events"]
+            for call in importer.transport._client.post.call_args_list
+        ]
+
+    def test_round_trips_file_transport_output(self, tmp_path):
+        t = _file_transport(tmp_path, compression="gzip")
+        t.send_events([{"n": i} for i in range(5)])
+        t.flush()
+        t.close()
+        (tmp_path / "notes.txt").write_text("ignored")
+
+        importer = self._importer(batch_size=2).run([tmp_path])
+        assert self._posted(importer) == [[{"n": 0}, {"n": 1}], [{"n": 2}, {"n": 3}], [{"n": 4}]]
+        assert (importer.files, importer.events, importer.batches) == (1, 5, 3)
+
+    def test_skips_malformed_lines(self, tmp_path):
+        path = tmp_path / "a.ndjson"
+        path.write_bytes(b'{"n":1}\nnot json\n\n{"n":2}\n')
+        importer = self._importer().run([path])
+        assert self._posted(importer) == [[{"n": 1}, {"n": 2}]]
+        assert importer.skipped == 1
+
+    def test_reads_stdin(self, monkeypatch):
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(encode_event({"n": 1}))))
+        importer = self._importer().run(["-"])
+        assert self._posted(importer) == [[{"n": 1}]]
+
+    def test_retries_server_errors(self, tmp_path):
+        path = tmp_path / "a.ndjson"
+        path.write_bytes(b'{"n":1}\n')
+        importer = self._importer()
+        importer.transport._client.post.side_effect = [
+            httpx.ConnectError("down"), _response(503), _response(200),
+        ]
+        importer.run([path])
+        assert importer.events == 1
+        assert importer.transport._client.post.call_count == 3
+
+    def test_skips_rejected_batch(self, tmp_path):
+        path = tmp_path / "a.ndjson"
+        path.write_bytes(b'{"n":1}\n{"n":2}\n{"n":3}\n')
+        importer = self._importer(batch_size=1, max_retries=1)
+        importer.transport._client.post.side_effect = [
+            _response(200), _response(422), _response(200),
+        ]
+        importer.run([path])
+        assert (importer.events, importer.batches, importer.skipped) == (2, 2, 1)
+        assert importer.transport._client.post.call_count == 3
+
+    def test_stops_on_rejection(self, tmp_path):
+        path = tmp_path / "a.ndjson"
+        path.write_bytes(b'{"n":1}\n')
+        importer = self._importer(max_retries=1)
+        importer.transport._client.post.return_value = _response(401)
+        with pytest.raises(httpx.HTTPStatusError):
+            importer.run([path])
+        assert importer.transport._client.post.call_count == 1
+
+        importer.transport._client.post.return_value = _response(503)
+        with pytest.raises(httpx.HTTPStatusError):
+            importer.run([path])
+        assert importer.events == 0
+
+
+class TestImportCli:
+    def test_parser(self):
+        args = build_parser().parse_args(["import", "a", "b", "--endpoint", "http://x"])
+        assert args.paths == ["a", "b"]
+        assert args.endpoint == ["http://x"]
+        assert args.batch_size == 500
+
+    def test_log_level_after_subcommand(self):
+        assert build_parser().parse_args(["import", "a", "--log-level", "DEBUG"]).log_level == "DEBUG"
+        assert build_parser().parse_args(["--log-level", "INFO", "import", "a"]).log_level == "INFO"
+        assert build_parser().parse_args(["import", "a"]).log_level == "WARNING"
+
+    def test_reports_failure(self, tmp_path, capsys):
+        path = tmp_path / "a.ndjson"
+        path.write_bytes(b'{"n":1}\n')
+        with patch.object(Transport, "_post_batch", return_value=_response(401)):
+            assert cli_main(["import", str(path)]) == 1
+        assert "Imported 0 events" in capsys.readouterr().err
+
+    def test_imports(self, tmp_path, capsys):
+        path = tmp_path / "a.ndjson"
+        path.write_bytes(b'{"n":1}\n{"n":2}\n')
+        with patch.object(Transport, "_post_batch", return_value=_response(200)) as post:
+            assert cli_main(["import", str(path), "--endpoint", "http://test:3000"]) == 0
+        assert post.call_args[0][1] == [b'{"n":1}', b'{"n":2}']
+        assert "Imported 2 events in 1 batches from 1 files" in capsys.readouterr().err
@@ -0,0 +1,119 @@
+"""Tests for agentlens.transport_http — HTTP client configuration."""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+import agentlens
+from agentlens.transport import Transport
+from agentlens.transport_async import AsyncTransport, create_transport
+from agentlens.transport_http import HTTPConfig
+
+
+def _counting_client(received):
+    def handler(request):
+        received.append(request.url.path)
+        return httpx.Response(200)
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class TestHTTPConfig:
+    def test_builds_client_with_limits_and_timeouts(self):
+        config = HTTPConfig(
+            connect_timeout=1.5, read_timeout=20.0,
+            max_connections=4, max_keepalive_connections=2,
+        )
+        assert config.timeout == httpx.Timeout(connect=1.5, read=20.0, write=10.0, pool=5.0)
+        assert config.limits.max_connections == 4
+        client = config.build_client()
+        try:
+            assert client.timeout.connect == 1.5
+            assert client.timeout.read == 20.0
+        finally:
+            client.close()
+
+    def test_validates_limits(self):
+        with pytest.raises(ValueError, match="max_connections"):
+            HTTPConfig(max_connections=0)
+        with pytest.raises(ValueError, match="max_keepalive_connections"):
+            HTTPConfig(max_connections=2, max_keepalive_connections=3)
+
+    def test_http2_needs_h2(self):
+        with patch.dict("sys.modules", {"h2": None}):
+            with pytest.raises(ImportError, match="agentlens\\[http2\\]"):
+                HTTPConfig(http2=True)
+
+
+class TestTransportClient:
+    def test_transport_uses_config(self):
+        t = Transport(endpoint="http://test:3000", http=HTTPConfig(read_timeout=42.0))
+        try:
+            assert t._client.timeout.read == 42.0
+        finally:
+            t.close()
+
+    def test_shared_client_is_not_closed(self):
+        received = []
+        client = _counting_client(received)
+        first = Transport(endpoint="http://test:3000", http_client=client, batch_size=100)
+        second = Transport(endpoint="http://test:3000", http_client=client, batch_size=100)
+        first.send_event({"n": 1})
+        second.send_event({"n": 2})
+        first.close()
+        second.close()
+        assert received == ["/events", "/events"]
+        assert not client.is_closed
+        client.close()
+
+    def test_rejects_wrong_client_type(self):
+        with pytest.raises(TypeError, match="AsyncClient"):
+            AsyncTransport(endpoint="http://test:3000", http_client=httpx.Client())
+
+    def test_create_transport_follows_client_type(self):
+        async def main():
+            client = httpx.AsyncClient()
+            t = create_transport(endpoint="http://test:3000", http_client=client)
+            kind = type(t)
+            await t.aclose()
+            assert not client.is_closed
+            await client.aclose()
+            return kind
+
+        assert asyncio.run(main()) is AsyncTransport
+        client = httpx.Client()
+        t = create_transport(endpoint="http://test:3000", http_client=client)
+        try:
+            assert type(t) is Transport
+        finally:
+            t.close()
+            client.close()
+
+    def test_init_shares_client(self):
+        received = []
+        client = _counting_client(received)
+        try:
+            tracker = agentlens.init(endpoint="http://test:3000", http_client=client)
+            assert tracker.transport._client is client
+            agentlens.init(endpoint="http://test:3000", http_client=client)
+            assert not client.is_closed
+        finally:
+            agentlens._tracker.transport.close()
+            agentlens._tracker = None
+            client.close()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="fork required")
+    def test_fork_child_gets_its_own_client(self):
+        client = httpx.Client()
+        with patch.object(Transport, "_flush_loop"):
+            t = Transport(endpoint="http://test:3000", http_client=client)
+        t._after_fork()
+        try:
+            assert t._client is not client
+            assert isinstance(t._client, httpx.Client)
+        finally:
+            t.close()
+            client.close()
@@ -0,0 +1,173 @@
+"""Tests for agentlens.transport_lanes — concurrent, session-ordered uploads."""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_async import AsyncTransport
+from agentlens.transport_lanes import lane_of, partition, session_first
+
+
+def _events(sessions, per_session):
+    return [
+        {"event_type": "llm_call", "session_id": f"s{s}", "seq": i}
+        for i in range(per_session)
+        for s in range(sessions)
+    ]
+
+
+def _response(status):
+    return httpx.Response(
+        status, text="x", request=httpx.Request("POST", "http://test/events"),
+    )
+
+
+class _RecordingPost:
+    """Thread-safe ``post`` stand-in that records bodies and concurrency."""
+
+    def __init__(self, delay=0.02, status=200):
+        self.delay = delay
+        self.status = status
+        self.bodies = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, content, headers):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.bodies.append(json.loads(content)["events"])
+        return _response(self.status)
+
+    def by_session(self):
+        seen = {}
+        for body in self.bodies:
+            for event in body:
+                seen.setdefault(event["session_id"], []).append(event["seq"])
+        return seen
+
+
+class TestLanes:
+    def test_session_first(self):
+        event = {"event_type": "x", "session_id": "s1"}
+        assert list(session_first(event)) == ["session_id", "event_type"]
+        ordered = {"session_id": "s1", "event_type": "x"}
+        assert session_first(ordered) is ordered
+        plain = {"event_type": "x"}
+        assert session_first(plain) is plain
+
+    def test_lane_of_is_stable_per_session(self):
+        a1 = encode_event(session_first({"event_type": "a", "session_id": "s1"}))
+        a2 = encode_event(session_first({"event_type": "b", "n": 2, "session_id": "s1"}))
+        only = encode_event({"session_id": "s1"})
+        assert lane_of(a1, 8) == lane_of(a2, 8) == lane_of(only, 8)
+        assert lane_of(encode_event({"event_type": "a"}), 8) == 0
+
+    def test_partition_keeps_order_within_lane(self):
+        events = [encode_event(session_first(e)) for e in _events(6, 5)]
+        lanes = partition(events, 3)
+        assert len(lanes) > 1 and sum(map(len, lanes)) == 30
+        for lane in lanes:
+            positions = [events.index(data) for data in lane]
+            assert positions == sorted(positions)
+
+
+class TestTransportInFlight:
+    def _transport(self, **kwargs):
+        with patch.object(Transport, "_flush_loop"):
+            t = Transport(endpoint="http://test:3000", batch_size=10_000, **kwargs)
+        t._client = MagicMock()
+        return t
+
+    def test_rejects_invalid_max_in_flight(self):
+        with pytest.raises(ValueError):
+            self._transport(max_in_flight=0)
+
+    def test_backlog_is_posted_concurrently_in_session_order(self):
+        t = self._transport(max_in_flight=4, max_batch_bytes=2048)
+        post = _RecordingPost()
+        t._client.post.side_effect = post
+        t.send_events(_events(16, 40))
+        t.flush()
+        assert post.peak > 1
+        assert len(post.by_session()) == 16
+        for seqs in post.by_session().values():
+            assert seqs == list(range(40))
+        t.close()
+
+    def test_single_request_is_not_split(self):
+        t = self._transport(max_in_flight=4)
+        post = _RecordingPost(delay=0)
+        t._client.post.side_effect = post
+        t.send_events(_events(4, 2))
+        t.flush()
+        assert len(post.bodies) == 1
+
+    def test_failed_lanes_requeued_as_one_failure(self):
+        t = self._transport(max_in_flight=4, max_batch_bytes=2048, max_retries=5)
+        t._client.post.side_effect = _RecordingPost(delay=0, status=503)
+        events = _events(8, 30)
+        t.send_events(events)  # over max_batch_bytes: uploads right away
+        assert t._consecutive_failures == 1
+        requeued = [json.loads(data) for data in t._buffer]
+        assert len(requeued) == len(events)
+        for s in range(8):
+            seqs = [e["seq"] for e in requeued if e["session_id"] == f"s{s}"]
+            assert seqs == list(range(30))
+
+    def test_no_drain_while_a_round_is_in_flight(self):
+        t = self._transport(max_in_flight=2)
+        t.batch_size = 2
+        t._round_active = True
+        t.send_events([{"n": 1}, {"n": 2}, {"n": 3}])
+        t._client.post.assert_not_called()
+        assert len(t._buffer) == 3
+
+        t._client.post.return_value = _response(200)
+        flusher = threading.Thread(target=t.flush)
+        flusher.start()
+        time.sleep(0.05)
+        assert flusher.is_alive()  # waits for the round in progress
+        t._end_round()
+        flusher.join(timeout=2)
+        assert not flusher.is_alive()
+        assert len(t._buffer) == 0
+        assert not t._round_active
+
+    def test_async_lanes(self):
+        peak = active = 0
+        seqs = {}
+
+        async def handler(request):
+            nonlocal peak, active
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            for event in json.loads(request.content)["events"]:
+                seqs.setdefault(event["session_id"], []).append(event["seq"])
+            return httpx.Response(200)
+
+        async def run():
+            t = AsyncTransport(
+                endpoint="http://test", batch_size=10_000,
+                max_in_flight=4, max_batch_bytes=2048,
+            )
+            await t._client.aclose()
+            t._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            t.send_events(_events(16, 20))
+            await t.aclose()
+
+        asyncio.run(run())
+        assert peak > 1
+        assert all(s == list(range(20)) for s in seqs.values())
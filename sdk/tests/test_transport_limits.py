@@ -0,0 +1,132 @@
+"""Tests for agentlens.transport_limits — rate limits and payload budget."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agentlens.transport import Transport
+from agentlens.transport_limits import EventLimits, RateLimit, TokenBucket
+from agentlens.transport_metrics import to_prometheus
+
+
+def _transport(limits, **kwargs):
+    with patch.object(Transport, "_flush_loop"):
+        t = Transport(endpoint="http://test:3000", batch_size=1000, limits=limits, **kwargs)
+    t._client = MagicMock()
+    t._client.post.return_value = httpx.Response(
+        200, request=httpx.Request("POST", "http://test:3000/events"),
+    )
+    return t
+
+
+def _posted(t):
+    t.flush()
+    return json.loads(t._client.post.call_args[1]["content"])["events"]
+
+
+class TestTokenBucket:
+    def test_refills_at_rate_up_to_burst(self):
+        bucket = TokenBucket(rate=2.0, burst=3.0, now=0.0)
+        assert [bucket.take(0.0) for _ in range(4)] == [True, True, True, False]
+        assert bucket.take(0.5)
+        assert not bucket.take(0.5)
+        assert [bucket.take(100.0) for _ in range(4)] == [True, True, True, False]
+
+    def test_rate_limit_validation(self):
+        with pytest.raises(ValueError, match="per_second"):
+            RateLimit(0)
+        assert RateLimit(0.5).bucket(0.0).burst == 1.0
+
+
+class TestRateLimits:
+    def test_per_event_type(self):
+        limits = EventLimits(rates={"llm_call": RateLimit(1, burst=2)})
+        t = _transport(limits)
+        with patch("agentlens.transport_limits.time.monotonic", return_value=10.0):
+            t.send_events([{"event_type": "llm_call", "n": i} for i in range(5)])
+            t.send_events([{"event_type": "tool_call", "n": i} for i in range(5)])
+        assert len(_posted(t)) == 7
+        stats = t.stats()
+        assert stats["events"]["dropped"]["rate_limited"] == 3
+        assert stats["limits"]["rate_limited"] == {"llm_call": 3}
+
+    def test_wildcard_and_session_lifecycle_exempt(self):
+        limits = EventLimits(rates={"*": RateLimit(1, burst=1)})
+        t = _transport(limits)
+        with patch("agentlens.transport_limits.time.monotonic", return_value=10.0):
+            for event_type in ("session_start", "generic", "generic", "session_end"):
+                t.send_event({"event_type": event_type, "session_id": "s"})
+        assert [e["event_type"] for e in _posted(t)] == ["session_start", "generic", "session_end"]
+
+    def test_errors_and_spans_bypass_wildcard_and_session_limits(self):
+        limits = EventLimits(
+            rates={"*": RateLimit(1, burst=1)}, session_rate=RateLimit(1, burst=1),
+        )
+        with patch("agentlens.transport_limits.time.monotonic", return_value=10.0):
+            assert limits.admit({"event_type": "generic", "session_id": "s"})
+            assert not limits.admit({"event_type": "generic", "session_id": "s"})
+            for event_type in ("span_start", "error", "tool_error", "agent_error", "span_end"):
+                assert limits.admit({"event_type": event_type, "session_id": "s"})
+        limits = EventLimits(rates={"error": RateLimit(1, burst=1)})
+        with patch("agentlens.transport_limits.time.monotonic", return_value=10.0):
+            assert limits.admit({"event_type": "error"})
+            assert not limits.admit({"event_type": "error"})
+
+    def test_limited_event_takes_no_token_from_other_bucket(self):
+        limits = EventLimits(
+            rates={"llm_call": RateLimit(1, burst=2)}, session_rate=RateLimit(1, burst=1),
+        )
+        with patch("agentlens.transport_limits.time.monotonic", return_value=10.0):
+            assert limits.admit({"event_type": "llm_call", "session_id": "a"})
+            # Over its session limit: must not drain the llm_call bucket.
+            assert not limits.admit({"event_type": "llm_call", "session_id": "a"})
+            assert limits.admit({"event_type": "llm_call", "session_id": "b"})
+        assert limits.stats()["session_limited"] == 1
+
+    def test_per_session_with_eviction(self):
+        limits = EventLimits(session_rate=RateLimit(1, burst=1), max_sessions=1)
+        with patch("agentlens.transport_limits.time.monotonic", return_value=10.0):
+            assert limits.admit({"event_type": "generic", "session_id": "a"})
+            assert not limits.admit({"event_type": "generic", "session_id": "a"})
+            assert limits.admit({"event_type": "generic", "session_id": "b"})
+            # "a" was evicted for "b", so it starts with a full bucket again.
+            assert limits.admit({"event_type": "generic", "session_id": "a"})
+            limits.admit({"event_type": "session_end", "session_id": "a"})
+            assert limits.admit({"event_type": "generic", "session_id": "a"})
+        assert limits.stats()["session_limited"] == 1
+
+
+class TestPayloadBudget:
+    def test_truncates_oversized_fields(self):
+        limits = EventLimits(max_field_bytes=100, preview_bytes=10)
+        t = _transport(limits)
+        event = {
+            "event_type": "llm_call",
+            "input_data": {"prompt": "x" * 500},
+            "output_data": {"text": "short"},
+            "tool_call": {"tool_name": "search", "tool_output": {"html": "y" * 500}},
+        }
+        t.send_event(event)
+        sent = _posted(t)[0]
+        stub = sent["input_data"]
+        assert stub["truncated"] is True
+        assert stub["bytes"] == len(json.dumps(event["input_data"], separators=(",", ":")))
+        assert len(stub["sha256"]) == 64
+        assert stub["preview"] == '{"prompt":'
+        assert sent["output_data"] == {"text": "short"}
+        assert sent["tool_call"]["tool_output"]["truncated"] is True
+        assert sent["tool_call"]["tool_name"] == "search"
+        assert event["input_data"] == {"prompt": "x" * 500}  # caller's dict untouched
+        stats = t.stats()
+        assert stats["events"]["truncated"] == 2
+        assert stats["limits"]["truncated"] == {"input_data": 1, "tool_call.tool_output": 1}
+        assert "agentlens_transport_fields_truncated_total 2" in to_prometheus(stats)
+
+    def test_small_events_are_not_inspected(self):
+        limits = EventLimits(max_field_bytes=1000)
+        t = _transport(limits)
+        with patch.object(limits, "truncate") as truncate:
+            t.send_event({"event_type": "generic", "input_data": {"q": "hi"}})
+        truncate.assert_not_called()
@@ -0,0 +1,150 @@
+"""Tests for agentlens.transport_metrics — transport self-telemetry."""
+
+import asyncio
+import math
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from agentlens.transport import Transport
+from agentlens.transport_async import AsyncTransport
+from agentlens.transport_metrics import Histogram, TransportMetrics, to_prometheus
+
+
+def _response(status):
+    return httpx.Response(status, request=httpx.Request("POST", "http://test/events"))
+
+
+def _transport(**kwargs):
+    with patch.object(Transport, "_flush_loop"):
+        t = Transport(endpoint="http://test:3000", **kwargs)
+    t._client = MagicMock()
+    t._client.post.return_value = _response(200)
+    return t
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        h = Histogram((1, 10))
+        for value in (0.5, 1, 3, 50):
+            h.observe(value)
+        snap = h.snapshot()
+        assert snap["buckets"] == [(1.0, 2), (10.0, 3), (math.inf, 4)]
+        assert (snap["count"], snap["sum"], snap["max"]) == (4, 54.5, 50)
+
+
+class TestTransportStats:
+    def test_counts_delivery(self):
+        t = _transport(batch_size=100)
+        t.send_event({"n": 0})
+        t.send_events([{"n": 1}, {"n": 2}])
+        stats = t.stats()
+        assert stats["events"]["enqueued"] == 3
+        assert stats["buffer"]["events"] == 3
+        assert stats["enqueue_latency"]["count"] == stats["lock_wait"]["count"] == 2
+
+        t.flush()
+        stats = t.stats()
+        assert stats["events"]["sent"] == 3
+        assert stats["requests"] == {"ok": 1, "failed": 0}
+        assert stats["buffer"]["events"] == 0
+        assert stats["batch_events"]["buckets"][0] == (1.0, 0)
+        assert stats["batch_events"]["buckets"][1] == (5.0, 1)
+        body = t._client.post.call_args[1]["content"]
+        assert stats["batch_bytes"]["sum"] == len(body)
+        assert stats["send_latency"]["count"] == 1
+
+    def test_counts_retries_and_drops(self):
+        t = _transport(batch_size=100, max_retries=1)
+        t._client.post.side_effect = httpx.ConnectError("down")
+        t.send_events([{"n": 1}, {"n": 2}])
+        t.flush()
+        assert t.stats()["events"]["retried"] == 2
+        t.flush()
+        stats = t.stats()
+        assert stats["events"]["dropped"]["retries_exhausted"] == 2
+        assert stats["events"]["sent"] == 0
+        assert stats["requests"] == {"ok": 0, "failed": 2}
+
+    def test_counts_overflow_and_unserializable(self):
+        t = _transport(batch_size=100, max_buffer_size=2)
+        t.send_events([{"n": i} for i in range(5)])
+        t.send_event({"bad": object()})
+        dropped = t.stats()["events"]["dropped"]
+        assert dropped["overflow"] == 3
+        assert dropped["unserializable"] == 1
+
+    def test_counts_spooled(self, tmp_path):
+        t = _transport(batch_size=100, spool=tmp_path)
+        t._client.post.return_value = _response(503)
+        t.send_events([{"n": 1}, {"n": 2}])
+        t.flush()
+        assert t.stats()["events"]["spooled"] == 2
+        assert t.stats()["events"]["dropped"]["retries_exhausted"] == 0
+        t._client.post.return_value = _response(200)
+        t.flush()
+        assert t.stats()["events"]["sent"] == 2
+        t.close()
+
+    def test_enqueue_latency_from_stats(self):
+        t = _transport(batch_size=100)
+        t.send_event({"n": 1})
+        latency = t.enqueue_latency()
+        assert latency["count"] == 1
+        assert latency["max_ms"] == t.stats()["enqueue_latency"]["max"] * 1000
+
+    def test_async_transport_counts_requests(self):
+        async def main():
+            t = AsyncTransport(endpoint="http://test:3000", batch_size=100)
+            t._client = httpx.AsyncClient(
+                transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+            )
+            t.send_events([{"n": 1}, {"n": 2}])
+            await t.aflush()
+            stats = t.stats()
+            await t.aclose()
+            return stats
+
+        stats = asyncio.run(main())
+        assert stats["events"]["sent"] == 2
+        assert stats["requests"]["ok"] == 1
+
+
+class TestPrometheus:
+    def _stats(self):
+        metrics = TransportMetrics()
+        metrics.record_enqueue(3, 0.002, 0.0)
+        metrics.record_request(3, 2048, 0.03, ok=True)
+        metrics.record_drop("overflow", 4)
+        stats = metrics.snapshot()
+        stats["buffer"] = {"events": 7, "bytes": 700, "max_events": 10, "max_bytes": 1000}
+        return stats
+
+    def test_text_format(self):
+        text = to_prometheus(self._stats(), labels={"service": 'a"b'})
+        lines = text.splitlines()
+        assert "# TYPE agentlens_transport_events_sent_total counter" in lines
+        assert 'agentlens_transport_events_sent_total{service="a\\"b"} 3' in lines
+        assert (
+            'agentlens_transport_events_dropped_total{reason="overflow",service="a\\"b"} 4'
+            in lines
+        )
+        assert 'agentlens_transport_buffer_events{service="a\\"b"} 7' in lines
+        assert 'agentlens_transport_batch_events_bucket{le="5.0",service="a\\"b"} 1' in lines
+        assert 'agentlens_transport_batch_events_bucket{le="+Inf",service="a\\"b"} 1' in lines
+        assert "# TYPE agentlens_transport_enqueue_seconds summary" in lines
+        assert not text.rstrip().endswith("# EOF")
+
+    def test_openmetrics_format(self):
+        text = to_prometheus(self._stats(), namespace="x", openmetrics=True)
+        lines = text.splitlines()
+        assert "# TYPE x_requests counter" in lines
+        assert 'x_requests_total{outcome="ok"} 1' in lines
+        assert "x_send_seconds_count 1" in lines
+        assert lines[-1] == "# EOF"
+
+    def test_renders_transport_stats(self):
+        t = _transport()
+        t.send_event({"n": 1})
+        t.flush()
+        assert "agentlens_transport_events_sent_total 1" in to_prometheus(t.stats())
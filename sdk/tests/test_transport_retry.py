@@ -0,0 +1,207 @@
+"""Tests for agentlens.transport_retry — backoff, circuit breaker, Retry-After."""
+
+import email.utils
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_retry import CircuitBreaker, ExponentialBackoff, parse_retry_after
+
+
+def _enc(*events):
+    """Encode *events* the way the transport buffers them."""
+    return [encode_event(e) for e in events]
+
+
+def _response(status, headers=None):
+    return httpx.Response(
+        status, headers=headers, text="x",
+        request=httpx.Request("POST", "http://test/events"),
+    )
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestExponentialBackoff:
+    def test_delay_is_jittered_within_exponential_ceiling(self):
+        backoff = ExponentialBackoff(base=1.0, cap=100.0)
+        for attempt, ceiling in [(0, 1.0), (1, 2.0), (3, 8.0)]:
+            for _ in range(50):
+                assert 0.0 <= backoff.delay(attempt) <= ceiling
+
+    def test_delay_is_capped(self):
+        backoff = ExponentialBackoff(base=1.0, cap=5.0)
+        assert all(backoff.delay(1000) <= 5.0 for _ in range(50))
+
+    def test_rejects_bad_parameters(self):
+        with pytest.raises(ValueError):
+            ExponentialBackoff(base=0)
+        with pytest.raises(ValueError):
+            ExponentialBackoff(multiplier=0.5)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=_Clock())
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.is_open()
+        assert not breaker.allow_request()
+
+    def test_half_open_allows_single_probe(self):
+        clock = _Clock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+        assert not breaker.is_open()
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()
+
+    def test_probe_success_closes(self):
+        clock = _Clock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+        breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.failures == 0
+        assert breaker.allow_request()
+
+    def test_probe_failure_reopens(self):
+        clock = _Clock()
+        breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=10, clock=clock)
+        for _ in range(5):
+            breaker.record_failure()
+        clock.now += 10
+        breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+
+class TestParseRetryAfter:
+    def test_delta_seconds(self):
+        assert parse_retry_after("120") == 120.0
+
+    def test_http_date(self):
+        now = time.time()
+        header = email.utils.formatdate(now + 30, usegmt=True)
+        assert parse_retry_after(header, now=now) == pytest.approx(30, abs=1)
+
+    def test_invalid_or_missing(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("") is None
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(MagicMock()) is None
+
+    def test_clamped(self):
+        assert parse_retry_after("-5") == 0.0
+        assert parse_retry_after("999999") == 600.0
+
+
+class TestTransportBackoff:
+    def _transport(self, **kwargs):
+        with patch.object(Transport, "_flush_loop"):
+            t = Transport(endpoint="http://test:3000", **kwargs)
+        t._client = MagicMock()
+        return t
+
+    def test_failure_schedules_backoff(self):
+        t = self._transport(backoff=ExponentialBackoff(base=10.0, cap=10.0))
+        t._client.post.side_effect = httpx.ConnectError("down")
+        with patch("agentlens.transport_retry.random.uniform", return_value=7.0):
+            t._send_batch(_enc({"n": 1}))
+        assert t._retry_at - time.monotonic() == pytest.approx(7.0, abs=0.5)
+        assert not t._may_send()
+
+    def test_full_batches_wait_for_backoff(self):
+        t = self._transport(batch_size=2)
+        t._retry_at = time.monotonic() + 60
+        t.send_events([{"n": 1}, {"n": 2}, {"n": 3}])
+        t._client.post.assert_not_called()
+        assert len(t._buffer) == 3
+
+    def test_429_honours_retry_after(self):
+        t = self._transport()
+        t._client.post.return_value = _response(429, {"Retry-After": "42"})
+        t._send_batch(_enc({"n": 1}))
+        assert t._retry_at - time.monotonic() == pytest.approx(42, abs=0.5)
+        assert list(t._buffer) == _enc({"n": 1})
+
+    def test_success_clears_backoff(self):
+        t = self._transport()
+        t._retry_at = time.monotonic() + 60
+        t._client.post.return_value = _response(200)
+        t.send_event({"n": 1})
+        t.flush()  # explicit flushes ignore the backoff
+        t._client.post.assert_called_once()
+        assert t._retry_at == 0.0
+        assert t._may_send()
+
+    def test_next_flush_delay_tracks_pending_retry(self):
+        t = self._transport(flush_interval=5.0)
+        assert t._next_flush_delay() == 5.0
+        t._retry_at = time.monotonic() + 1.0
+        assert 0 < t._next_flush_delay() <= 1.0
+
+
+class TestTransportCircuitBreaker:
+    def _transport(self, **kwargs):
+        with patch.object(Transport, "_flush_loop"):
+            t = Transport(endpoint="http://test:3000", max_retries=100, **kwargs)
+        t._client = MagicMock()
+        return t
+
+    def test_open_circuit_short_circuits_sends(self):
+        t = self._transport(circuit_breaker=CircuitBreaker(failure_threshold=2))
+        t._client.post.side_effect = httpx.ConnectError("down")
+        t._send_batch(_enc({"n": 1}))
+        t.flush()
+        assert t.circuit_breaker.state == CircuitBreaker.OPEN
+        assert t._client.post.call_count == 2
+
+        failures = t._consecutive_failures
+        t.flush()
+        # No request, no extra failure, events kept.
+        assert t._client.post.call_count == 2
+        assert t._consecutive_failures == failures
+        assert list(t._buffer) == _enc({"n": 1})
+
+    def test_half_open_probe_recovers(self):
+        clock = _Clock()
+        t = self._transport(
+            circuit_breaker=CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock),
+        )
+        t._client.post.side_effect = httpx.ConnectError("down")
+        t._send_batch(_enc({"n": 1}))
+        assert t.circuit_breaker.is_open()
+
+        clock.now += 5
+        t._client.post.side_effect = None
+        t._client.post.return_value = _response(200)
+        t.flush()
+        assert t.circuit_breaker.state == CircuitBreaker.CLOSED
+        assert list(t._buffer) == []
+
+    def test_open_circuit_defers_to_spool(self, tmp_path):
+        t = self._transport(
+            circuit_breaker=CircuitBreaker(failure_threshold=1), spool=tmp_path,
+        )
+        t.circuit_breaker.record_failure()
+        t._send_batch(_enc({"n": 1}))
+        t._client.post.assert_not_called()
+        assert t.spool.peek(10, 1 << 20) == _enc({"n": 1})
@@ -0,0 +1,152 @@
+"""Tests for agentlens.transport_shutdown — deadline-bounded shutdown."""
+
+import asyncio
+import json
+import os
+import signal
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agentlens.transport import Transport, _deadline_post, close_all, encode_event
+from agentlens.transport_async import AsyncTransport
+from agentlens.transport_shutdown import ShutdownReport, install_signal_handlers
+
+
+def _ok():
+    return httpx.Response(200, request=httpx.Request("POST", "http://test:3000/events"))
+
+
+def _transport(**kwargs):
+    with patch.object(Transport, "_flush_loop"):
+        t = Transport(endpoint="http://test:3000", batch_size=1000, **kwargs)
+    t._client = MagicMock()
+    t._client.post.return_value = _ok()
+    return t
+
+
+def _hang(url, *, timeout, **kwargs):
+    time.sleep(timeout)
+    raise httpx.ReadTimeout("timed out")
+
+
+class TestClose:
+    def test_posts_lanes_concurrently(self):
+        t = _transport(max_in_flight=4)
+        threads = set()
+        barrier = threading.Barrier(2, timeout=2.0)
+
+        def post(url, **kwargs):
+            threads.add(threading.current_thread().name)
+            barrier.wait()
+            return _ok()
+
+        t._client.post.side_effect = post
+        t.send_events([{"session_id": s, "n": i} for s in ("a", "b") for i in range(2)])
+        report = t.close()
+        assert report.flushed == 4
+        assert len(threads) == 2
+
+    def test_deadline_bounds_a_hanging_backend(self):
+        t = _transport()
+        t._client.post.side_effect = _hang
+        t.send_events([{"n": 1}, {"n": 2}])
+        start = time.monotonic()
+        report = t.close(timeout=0.2)
+        assert time.monotonic() - start < 1.0
+        assert (report.flushed, report.persisted, report.dropped) == (0, 0, 2)
+        assert t.stats()["events"]["dropped"]["shutdown"] == 2
+
+    def test_spills_to_spool(self, tmp_path):
+        t = _transport(spool=tmp_path)
+        t._client.post.return_value = httpx.Response(
+            503, request=httpx.Request("POST", "http://test:3000/events"),
+        )
+        t.send_events([{"n": 1}, {"n": 2}])
+        report = t.close(timeout=1.0)
+        assert (report.flushed, report.persisted, report.dropped) == (0, 2, 0)
+
+        replay = _transport(spool=tmp_path)
+        replay.flush()
+        body = json.loads(replay._client.post.call_args[1]["content"])
+        assert body["events"] == [{"n": 1}, {"n": 2}]
+        replay.close()
+
+    def test_drains_spool_before_buffer(self, tmp_path):
+        t = _transport(spool=tmp_path)
+        t.spool.append([encode_event({"n": 0})])
+        t.send_event({"n": 1})
+        report = t.close()
+        bodies = [json.loads(c[1]["content"])["events"] for c in t._client.post.call_args_list]
+        assert bodies == [[{"n": 0}], [{"n": 1}]]
+        assert report.flushed == 2
+
+    def test_open_circuit_skips_sending(self, tmp_path):
+        t = _transport(spool=tmp_path)
+        for _ in range(5):
+            t.circuit_breaker.record_failure()
+        t.send_event({"n": 1})
+        report = t.close()
+        t._client.post.assert_not_called()
+        assert report.persisted == 1
+
+    def test_deadline_post(self):
+        post = MagicMock(return_value="ok")
+        bounded = _deadline_post(post, time.monotonic() + 5.0)
+        assert bounded("http://x", content=b"") == "ok"
+        assert 0 < post.call_args[1]["timeout"] <= 5.0
+        with pytest.raises(httpx.TimeoutException):
+            _deadline_post(post, time.monotonic() - 1.0)("http://x", content=b"")
+
+
+class TestAsyncClose:
+    def test_aclose_respects_deadline(self):
+        async def slow(request):
+            await asyncio.sleep(5.0)
+            return httpx.Response(200)
+
+        async def main():
+            t = AsyncTransport(endpoint="http://test:3000", batch_size=100)
+            t._client = httpx.AsyncClient(transport=httpx.MockTransport(slow))
+            t.send_event({"n": 1})
+            start = time.monotonic()
+            report = await t.aclose(timeout=0.2)
+            return report, time.monotonic() - start
+
+        report, elapsed = asyncio.run(main())
+        assert elapsed < 1.0
+        assert report.dropped == 1
+
+
+class TestCloseAll:
+    def test_closes_every_live_transport(self):
+        first, second = _transport(), _transport()
+        first.send_event({"n": 1})
+        second.send_events([{"n": 2}, {"n": 3}])
+        with patch("agentlens.transport._live_transports", {first, second}):
+            report = close_all(timeout=2.0)
+        assert report.flushed == 3
+        assert first._stop_event.is_set() and second._stop_event.is_set()
+
+    def test_report_arithmetic(self):
+        total = ShutdownReport(1, 2, 3, 0.5) + ShutdownReport(flushed=1, elapsed=0.25)
+        assert total.to_dict() == {"flushed": 2, "persisted": 2, "dropped": 3, "elapsed": 0.75}
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="POSIX signals required")
+class TestSignalHandlers:
+    def test_closes_transports_then_chains(self):
+        seen = []
+        previous = signal.signal(signal.SIGUSR1, lambda signum, frame: seen.append(signum))
+        try:
+            install_signal_handlers([signal.SIGUSR1], timeout=1.0)
+            install_signal_handlers([signal.SIGUSR1], timeout=1.0)  # idempotent
+            with patch("agentlens.transport.close_all") as mock_close_all:
+                os.kill(os.getpid(), signal.SIGUSR1)
+            mock_close_all.assert_called_once_with(1.0)
+            assert seen == [signal.SIGUSR1]
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
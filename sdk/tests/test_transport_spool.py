@@ -0,0 +1,245 @@
+"""Tests for agentlens.transport_spool — the durable on-disk event spool."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_spool import DiskSpool
+
+
+def _enc(*events):
+    """Encode *events* the way the transport buffers them."""
+    return [encode_event(e) for e in events]
+
+
+def _ok():
+    return httpx.Response(200, request=httpx.Request("POST", "http://test/events"))
+
+
+def _posted(mock_post):
+    """Return the event lists of every batch posted through *mock_post*."""
+    return [json.loads(c[1]["content"])["events"] for c in mock_post.call_args_list]
+
+
+class TestDiskSpool:
+    def test_append_peek_ack(self, tmp_path):
+        spool = DiskSpool(tmp_path)
+        spool.append(_enc({"n": 1}, {"n": 2}))
+        spool.append(_enc({"n": 3}))
+        assert not spool.is_empty()
+        assert spool.peek(10, 1 << 20) == _enc({"n": 1}, {"n": 2}, {"n": 3})
+        # Un-acked peeks are repeatable.
+        assert spool.peek(2, 1 << 20) == _enc({"n": 1}, {"n": 2})
+        spool.ack()
+        assert spool.peek(10, 1 << 20) == _enc({"n": 3})
+        spool.ack()
+        assert spool.peek(10, 1 << 20) == []
+        assert spool.is_empty()
+
+    def test_peek_respects_byte_limit_but_returns_one(self, tmp_path):
+        spool = DiskSpool(tmp_path)
+        big = _enc({"p": "x" * 100}, {"p": "y" * 100})
+        spool.append(big)
+        assert spool.peek(10, 10) == big[:1]
+
+    def test_rotates_segments_and_deletes_drained_ones(self, tmp_path):
+        spool = DiskSpool(tmp_path, segment_bytes=16)
+        for i in range(5):
+            spool.append(_enc({"n": i, "pad": "abcdefgh"}))
+        assert len(list(tmp_path.glob("*.seg"))) == 5
+        # A peek spans segment boundaries.
+        assert len(spool.peek(10, 1 << 20)) == 5
+        for i in range(5):
+            assert spool.peek(1, 1 << 20) == _enc({"n": i, "pad": "abcdefgh"})
+            spool.ack()
+        assert spool.peek(10, 1 << 20) == []
+        assert spool.is_empty()
+        # Only the still-open active segment is left on disk.
+        assert len(list(tmp_path.glob("*.seg"))) == 1
+
+    def test_survives_reopen_with_cursor(self, tmp_path):
+        spool = DiskSpool(tmp_path)
+        spool.append(_enc({"n": 1}, {"n": 2}, {"n": 3}))
+        spool.peek(1, 1 << 20)
+        spool.ack()
+        spool.close()
+
+        reopened = DiskSpool(tmp_path)
+        assert reopened.peek(10, 1 << 20) == _enc({"n": 2}, {"n": 3})
+        # New writes go after the replayed events.
+        reopened.ack()
+        reopened.append(_enc({"n": 4}))
+        assert reopened.peek(10, 1 << 20) == _enc({"n": 4})
+
+    def test_ignores_torn_tail_record(self, tmp_path):
+        spool = DiskSpool(tmp_path)
+        spool.append(_enc({"n": 1}))
+        spool.close()
+        segment = next(tmp_path.glob("*.seg"))
+        with open(segment, "ab") as f:
+            f.write(b'{"n":2')  # crash mid-write
+        assert DiskSpool(tmp_path).peek(10, 1 << 20) == _enc({"n": 1})
+
+    def test_size_cap_discards_oldest_segments(self, tmp_path):
+        spool = DiskSpool(tmp_path, max_bytes=40, segment_bytes=10)
+        for i in range(10):
+            spool.append(_enc({"n": i}))
+        assert spool.dropped_bytes > 0
+        remaining = []
+        while True:
+            batch = spool.peek(100, 1 << 20)
+            if not batch:
+                break
+            remaining.extend(batch)
+            spool.ack()
+        assert remaining == _enc(*({"n": i} for i in range(10 - len(remaining), 10)))
+
+    def test_pending_bytes_tracks_appends_acks_and_cap(self, tmp_path):
+        spool = DiskSpool(tmp_path, max_bytes=40, segment_bytes=10)
+        for i in range(10):
+            spool.append(_enc({"n": i}))
+            on_disk = sum(p.stat().st_size for p in tmp_path.glob("*.seg"))
+            assert spool.pending_bytes == on_disk
+        spool.peek(1, 1 << 20)
+        spool.ack()
+        on_disk = sum(p.stat().st_size for p in tmp_path.glob("*.seg"))
+        assert spool.pending_bytes == on_disk - spool._cursor_offset
+
+    def test_rejects_unknown_fsync_policy(self, tmp_path):
+        with pytest.raises(ValueError, match="fsync"):
+            DiskSpool(tmp_path, fsync="sometimes")
+
+    def test_adopts_spool_of_exited_worker(self, tmp_path):
+        worker = DiskSpool(tmp_path).for_child(2**22 + 1)
+        worker.append(_enc({"n": 1}, {"n": 2}))
+        worker.close()
+        with patch("agentlens.transport_spool._process_exists", return_value=False):
+            spool = DiskSpool(tmp_path)
+        assert spool.peek(10, 1 << 20) == _enc({"n": 1}, {"n": 2})
+        assert not (tmp_path / f"worker-{2**22 + 1}").exists()
+
+    def test_leaves_spool_of_running_worker(self, tmp_path):
+        worker = DiskSpool(tmp_path).for_child(2**22 + 1)
+        worker.append(_enc({"n": 1}))
+        worker.close()
+        with patch("agentlens.transport_spool._process_exists", return_value=True):
+            spool = DiskSpool(tmp_path)
+        assert spool.is_empty()
+        assert DiskSpool(worker.directory).peek(10, 1 << 20) == _enc({"n": 1})
+
+    def test_fsync_always(self, tmp_path):
+        spool = DiskSpool(tmp_path, fsync="always")
+        with patch("agentlens.transport_spool.os.fsync") as mock_fsync:
+            spool.append(_enc({"n": 1}))
+        assert mock_fsync.called
+
+
+class TestTransportSpooling:
+    def _transport(self, tmp_path, **kwargs):
+        with patch.object(Transport, "_flush_loop"):
+            return Transport(
+                endpoint="http://test:3000", batch_size=100, spool=tmp_path, **kwargs,
+            )
+
+    def test_path_is_wrapped_in_disk_spool(self, tmp_path):
+        t = self._transport(tmp_path)
+        assert isinstance(t.spool, DiskSpool)
+        t._buffer.clear()
+
+    def test_failed_send_goes_to_spool_not_retry_buffer(self, tmp_path):
+        t = self._transport(tmp_path)
+        t._client = MagicMock()
+        t._client.post.side_effect = httpx.ConnectError("down")
+        t.send_event({"n": 1})
+        t.flush()
+        assert list(t._buffer) == []
+        assert t.spool.peek(10, 1 << 20) == _enc({"n": 1})
+
+    def test_spool_drains_in_order_on_recovery(self, tmp_path):
+        t = self._transport(tmp_path)
+        t._client = MagicMock()
+        t._client.post.side_effect = httpx.ConnectError("down")
+        t.send_event({"n": 1})
+        t.flush()
+        t.send_event({"n": 2})
+        t.flush()
+        assert t._client.post.call_count == 2
+
+        t._client.post.reset_mock(side_effect=True)
+        t._client.post.return_value = _ok()
+        t.send_event({"n": 3})
+        t.flush()
+        assert _posted(t._client.post) == [[{"n": 1}, {"n": 2}, {"n": 3}]]
+        assert t.spool.is_empty()
+
+    def test_never_drops_after_max_retries(self, tmp_path):
+        t = self._transport(tmp_path, max_retries=1)
+        t._client = MagicMock()
+        t._client.post.side_effect = httpx.ConnectError("down")
+        for i in range(5):
+            t.send_event({"n": i})
+            t.flush()
+        t.spool.close()
+        assert DiskSpool(tmp_path).peek(100, 1 << 20) == _enc(*({"n": i} for i in range(5)))
+
+    def test_buffer_overflow_spills_to_spool(self, tmp_path):
+        t = self._transport(tmp_path, max_buffer_size=3)
+        t.send_events([{"n": i} for i in range(5)])
+        assert list(t._buffer) == _enc({"n": 2}, {"n": 3}, {"n": 4})
+        assert t.spool.peek(10, 1 << 20) == _enc({"n": 0}, {"n": 1})
+        t._buffer.clear()
+
+    def test_new_transport_replays_previous_spool(self, tmp_path):
+        DiskSpool(tmp_path).append(_enc({"n": 1}, {"n": 2}))
+        t = self._transport(tmp_path)
+        t._client = MagicMock()
+        t._client.post.return_value = _ok()
+        t.flush()  # empty buffer, but the spool is drained
+        assert _posted(t._client.post) == [[{"n": 1}, {"n": 2}]]
+        assert t.spool.is_empty()
+
+    def test_rejected_spooled_batch_stays_on_disk(self, tmp_path):
+        DiskSpool(tmp_path).append(_enc({"n": 1}))
+        t = self._transport(tmp_path)
+        t._client = MagicMock()
+        t._client.post.return_value = httpx.Response(
+            503, request=httpx.Request("POST", "http://test/events"),
+        )
+        t.flush()
+        assert t._consecutive_failures == 1
+        assert t.spool.peek(10, 1 << 20) == _enc({"n": 1})
+
+    def test_permanently_rejected_batch_is_dropped(self, tmp_path):
+        t = self._transport(tmp_path)
+        t._client = MagicMock()
+        request = httpx.Request("POST", "http://test/events")
+        t._client.post.return_value = httpx.Response(503, request=request)
+        t.send_event({"n": 1})
+        t.flush()
+        assert t.spool.peek(10, 1 << 20) == _enc({"n": 1})
+
+        t._client.post.return_value = httpx.Response(413, request=request)
+        t._retry_at = 0.0
+        t.flush()
+        assert t.spool.is_empty()
+        assert t.stats()["events"]["dropped"]["rejected"] == 1
+
+        t._client.post.reset_mock()
+        t._client.post.return_value = _ok()
+        t.send_event({"n": 2})
+        t.flush()
+        assert _posted(t._client.post) == [[{"n": 2}]]
+
+    def test_throttled_spooled_batch_is_kept(self, tmp_path):
+        DiskSpool(tmp_path).append(_enc({"n": 1}))
+        t = self._transport(tmp_path)
+        t._client = MagicMock()
+        t._client.post.return_value = httpx.Response(
+            429, request=httpx.Request("POST", "http://test/events"),
+        )
+        t.flush()
+        assert t.spool.peek(10, 1 << 20) == _enc({"n": 1})
+        assert t.stats()["events"]["dropped"]["rejected"] == 0
@@ -0,0 +1,275 @@
+"""Tests for fork safety and agentlens.transport_uds — per-host aggregation."""
+
+import json
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agentlens.collector import DEFAULT_SOCKET, build_parser
+from agentlens.collector import main as collector_main
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_async import create_transport
+from agentlens.transport_spool import DiskSpool
+from agentlens.transport_uds import (
+    Collector,
+    UnixSocketTransport,
+    bind_socket,
+    connect_aggregator,
+    decode_frame,
+    encode_frame,
+    read_frames,
+    socket_path_from_endpoint,
+)
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets required",
+)
+
+
+@pytest.fixture
+def sock_path():
+    # AF_UNIX paths are limited to ~100 bytes; pytest's tmp_path can be longer.
+    directory = tempfile.mkdtemp(prefix="al-")
+    yield os.path.join(directory, "agg.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def _upstream():
+    with patch.object(Transport, "_flush_loop"):
+        t = Transport(endpoint="http://test:3000", batch_size=10_000)
+    t._client = MagicMock()
+    t._client.post.return_value = httpx.Response(
+        200, request=httpx.Request("POST", "http://test:3000/events"),
+    )
+    return t
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestFrames:
+    def test_round_trip(self):
+        events = [encode_event({"n": 1}), encode_event({"text": "a\nb"})]
+        frame = encode_frame(events)
+        a, b = socket.socketpair()
+        with a, b:
+            a.sendall(frame + encode_frame([]))
+            a.close()
+            payloads = list(read_frames(b))
+        assert [decode_frame(p) for p in payloads] == [events, []]
+
+    def test_oversized_frame_rejected(self):
+        a, b = socket.socketpair()
+        with a, b:
+            a.sendall((1 << 30).to_bytes(4, "big"))
+            with pytest.raises(ValueError):
+                next(read_frames(b))
+
+    def test_truncated_frame(self):
+        a, b = socket.socketpair()
+        with a, b:
+            a.sendall(encode_frame([b"{}"])[:-1])
+            a.close()
+            with pytest.raises(ConnectionError):
+                list(read_frames(b))
+
+
+class TestBindSocket:
+    def test_second_binder_defers_to_live_listener(self, sock_path):
+        first = bind_socket(sock_path)
+        try:
+            assert first is not None
+            assert oct(os.stat(sock_path).st_mode & 0o777) == oct(0o600)
+            assert bind_socket(sock_path) is None
+        finally:
+            first.close()
+
+    def test_stale_socket_is_replaced(self, sock_path):
+        stale = bind_socket(sock_path)
+        stale.close()  # the file stays behind, nobody listens
+        sock = bind_socket(sock_path)
+        assert sock is not None
+        sock.close()
+
+
+class TestCollector:
+    def test_forwards_client_events(self, sock_path):
+        upstream = _upstream()
+        collector = Collector(upstream, sock_path).start()
+        with patch.object(Transport, "_flush_loop"):
+            client = UnixSocketTransport(sock_path, batch_size=2)
+        events = [{"event_type": "llm_call", "session_id": "s1", "n": i} for i in range(3)]
+        client.send_events(events)
+        client.close()
+        assert _wait_for(lambda: collector.events == 3)
+        received = [json.loads(data) for data in upstream._buffer]
+        assert received == events
+        assert upstream._buffer[0].startswith(b'{"session_id":')
+        collector.close()
+        assert not os.path.exists(sock_path)
+
+    def test_drops_lines_that_are_not_json_objects(self, sock_path):
+        upstream = _upstream()
+        collector = Collector(upstream, sock_path).start()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(sock_path)
+            conn.sendall(encode_frame([b'{"n":1}', b"not json", b"[1,2]", b'{"n":2}']))
+        assert _wait_for(lambda: len(upstream._buffer) == 2)
+        assert [json.loads(data) for data in upstream._buffer] == [{"n": 1}, {"n": 2}]
+        assert upstream.stats()["events"]["dropped"]["unserializable"] == 2
+        collector.close()
+
+    def test_client_without_collector_retries(self, sock_path):
+        with patch.object(Transport, "_flush_loop"):
+            client = UnixSocketTransport(sock_path)
+        client.send_event({"n": 1})
+        client.flush()
+        assert client._consecutive_failures == 1
+        assert list(client._buffer) == [encode_event({"n": 1})]
+        client._buffer.clear()
+        client.close()
+
+    def test_request_helpers_use_http_endpoint(self, sock_path):
+        with patch.object(Transport, "_flush_loop"):
+            client = UnixSocketTransport(sock_path, endpoint="http://api:3000")
+        client._api_client = MagicMock()
+        client._api_client.request.return_value = httpx.Response(
+            200, json={}, request=httpx.Request("GET", "http://api:3000/x"),
+        )
+        client.get("/x")
+        assert client._api_client.request.call_args[0][:2] == ("GET", "http://api:3000/x")
+        client.close()
+
+
+class TestConnectAggregator:
+    def test_first_process_uploads_others_connect(self, sock_path):
+        with patch.object(Transport, "_flush_loop"):
+            leader = connect_aggregator(sock_path, batch_size=1)
+            follower = connect_aggregator(sock_path, batch_size=1)
+        try:
+            assert leader._collector is not None
+            assert follower._collector is None
+            upstream = leader._collector.transport
+            upstream._client = MagicMock()
+            upstream.batch_size = 10_000
+            follower.send_event({"from": "follower"})
+            leader.send_event({"from": "leader"})
+            assert _wait_for(lambda: len(upstream._buffer) == 2)
+        finally:
+            follower.close()
+            upstream._client.post.return_value = httpx.Response(
+                200, request=httpx.Request("POST", "http://localhost:3000/events"),
+            )
+            leader.close()
+        assert upstream._client.post.called
+
+
+class TestFork:
+    def test_child_spool_is_separate(self, tmp_path):
+        spool = DiskSpool(tmp_path)
+        child = spool.for_child(1234)
+        assert child.directory == tmp_path / "worker-1234"
+        assert child.max_bytes == spool.max_bytes
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork required")
+    def test_transport_reinitialised_in_child(self):
+        t = Transport(endpoint="http://test:3000", batch_size=10_000)
+        t.send_event({"n": 1})
+        parent_client = t._client
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            try:
+                state = {
+                    "buffer": len(t._buffer),
+                    "flusher_alive": t._flush_thread.is_alive(),
+                    "new_client": t._client is not parent_client,
+                }
+                os.write(write_fd, json.dumps(state).encode())
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd) as f:
+            state = json.loads(f.read())
+        assert state == {"buffer": 0, "flusher_alive": True, "new_client": True}
+        assert len(t._buffer) == 1
+        t._client = MagicMock()
+        t._client.post.return_value = httpx.Response(
+            200, request=httpx.Request("POST", "http://test:3000/events"),
+        )
+        t.close()
+
+
+class TestUdsEndpoint:
+    def test_socket_path_from_endpoint(self):
+        assert socket_path_from_endpoint("uds:///run/al.sock") == "/run/al.sock"
+        assert socket_path_from_endpoint("http://localhost:3000") is None
+        with pytest.raises(ValueError):
+            socket_path_from_endpoint("uds://")
+
+    def test_create_transport_maps_scheme(self, sock_path):
+        with patch.object(Transport, "_flush_loop"):
+            t = create_transport(f"uds://{sock_path}", api_key="k", batch_size=5)
+        assert isinstance(t, UnixSocketTransport)
+        assert t.socket_path == sock_path
+        assert t.batch_size == 5
+        t.close()
+
+    def test_plain_transport_rejects_scheme(self, sock_path):
+        with pytest.raises(ValueError, match="UnixSocketTransport"):
+            Transport(endpoint=f"uds://{sock_path}")
+
+
+class TestCollectorCli:
+    def test_parser_defaults(self):
+        args = build_parser().parse_args(["--endpoint", "http://a", "--endpoint", "http://b"])
+        assert args.endpoint == ["http://a", "http://b"]
+        assert args.socket == DEFAULT_SOCKET
+        assert args.socket_mode == 0o600
+        assert build_parser().parse_args(["--socket-mode", "660"]).socket_mode == 0o660
+
+    def test_refuses_socket_in_use(self, sock_path):
+        listener = bind_socket(sock_path)
+        try:
+            assert collector_main(["--socket", sock_path]) == 1
+        finally:
+            listener.close()
+
+    def test_serves_until_interrupted(self, sock_path):
+        received = []
+        serve_forever = Collector.serve_forever
+
+        def serve(collector):
+            threading.Thread(target=serve_forever, args=(collector,), daemon=True).start()
+            with patch.object(Transport, "_flush_loop"):
+                client = UnixSocketTransport(f"uds://{sock_path}")
+            client.send_event({"n": 1})
+            client.close()
+            assert _wait_for(lambda: collector.events == 1)
+            received.extend(collector.transport._buffer)
+            collector.transport._buffer.clear()
+            raise KeyboardInterrupt
+
+        previous = signal.getsignal(signal.SIGTERM)
+        try:
+            with patch.object(Collector, "serve_forever", autospec=True, side_effect=serve):
+                assert collector_main(["--socket", sock_path, "--socket-mode", "660"]) == 0
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+        assert received == [encode_event({"n": 1})]
+        assert not os.path.exists(sock_path)
@@ -0,0 +1,199 @@
+"""Tests for agentlens.transport_wire — the MessagePack wire format."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from agentlens.models import AgentEvent, ToolCall
+from agentlens.transport import Transport, encode_event
+from agentlens.transport_lanes import lane_of, session_first
+from agentlens.transport_uds import UnixSocketTransport
+from agentlens.transport_wire import (
+    INTERNED_STRINGS,
+    MSGPACK_CONTENT_TYPE,
+    decode_batch,
+    decode_event,
+    encode_batch,
+    encode_event_msgpack,
+)
+
+
+def _ok():
+    return httpx.Response(200, request=httpx.Request("POST", "http://test/events"))
+
+
+class TestEncoding:
+    def test_round_trips_model_events(self):
+        events = [
+            AgentEvent(
+                session_id="s1", event_type="llm_call", model="gpt-4o",
+                tokens_in=120, tokens_out=70_000, duration_ms=812.5,
+                input_data={"prompt": "héllo", "n": [1, -5, -200, 3.5, None, True, 2**40]},
+            ).to_api_dict(),
+            AgentEvent(
+                session_id="s1", event_type="tool_call",
+                tool_call=ToolCall(tool_name="search", tool_input={"q": "x"}),
+            ).to_api_dict(),
+        ]
+        body = encode_batch([encode_event_msgpack(e) for e in events])
+        assert decode_batch(body) == events
+        assert len(body) < len(b",".join(encode_event(e) for e in events))
+
+    def test_interns_known_strings(self):
+        data = encode_event_msgpack({"event_type": "session_start"})
+        code = INTERNED_STRINGS.index
+        assert data == bytes((0x81, 0xD4, 1, code("event_type"), 0xD4, 1, code("session_start")))
+
+    def test_utc_timestamps_become_epoch_micros(self):
+        stamp = "2026-01-02T03:04:05.000123+00:00"
+        data = encode_event_msgpack({"timestamp": stamp})
+        assert data[4:6] == b"\xd7\x02"
+        assert int.from_bytes(data[6:], "big", signed=True) == 1767323045000123
+        assert decode_event(data) == {"timestamp": stamp}
+
+    def test_z_timestamps_use_their_own_extension(self):
+        stamp = "2026-01-02T03:04:05.000123Z"
+        data = encode_event_msgpack({"timestamp": stamp})
+        assert data[4:6] == b"\xd7\x03"
+        assert int.from_bytes(data[6:], "big", signed=True) == 1767323045000123
+        assert decode_event(data) == {"timestamp": stamp}
+
+    def test_model_payload_timestamps_are_packed(self):
+        event = AgentEvent(
+            event_type="tool_call",
+            tool_call=ToolCall(tool_name="search", tool_input={"q": "x"}),
+        )
+        for payload in (AgentEvent(event_type="llm_call").to_api_dict(), event.to_api_dict()):
+            data = encode_event_msgpack(payload)
+            stamps = data.count(b"\xd7\x03")
+            assert stamps == 1 + ("tool_call" in payload)
+            assert decode_event(data) == payload
+
+    def test_other_timestamps_stay_text(self):
+        for value in (
+            "2026-01-02T03:04:05", "2026-01-02T03:04:05+02:00", "2026-01-02T03:04:05Z",
+            "2026-01-02T03:04:05.000000+00:00", "2026-01-02T03:04:05.123+00:00",
+            "2026-W01-1T03:04:05+00:00", "yesterday",
+        ):
+            assert decode_event(encode_event_msgpack({"timestamp": value})) == {"timestamp": value}
+        assert decode_event(encode_event_msgpack({"note": "2026-01-02T03:04:05+00:00"})) == {
+            "note": "2026-01-02T03:04:05+00:00",
+        }
+
+    def test_keys_coerced_like_json(self):
+        for event in ({1: "a", None: "b", 2.5: "d"}, {True: "c", False: "e"}):
+            assert decode_event(encode_event_msgpack(event)) == json.loads(encode_event(event))
+
+    def test_rejects_what_json_rejects(self):
+        with pytest.raises(TypeError):
+            encode_event_msgpack({"x": object()})
+        with pytest.raises(ValueError):
+            encode_event_msgpack({"x": float("nan")})
+        with pytest.raises(ValueError):
+            encode_event_msgpack({"x": 2**64})
+
+    def test_large_containers(self):
+        event = {"items": list(range(70_000)), "text": "x" * 70_000}
+        event.update({f"k{i}": i for i in range(20)})
+        assert decode_event(encode_event_msgpack(event)) == event
+
+    def test_decode_rejects_malformed_data(self):
+        data = encode_event_msgpack({"session_id": "s1"})
+        with pytest.raises(ValueError):
+            decode_event(data[:-1])
+        with pytest.raises(ValueError):
+            decode_event(data + b"\x00")
+        with pytest.raises(ValueError):
+            decode_event(b"\xc1")
+
+    def test_lane_of_reads_msgpack_session(self):
+        def enc(event):
+            return encode_event_msgpack(session_first(event))
+
+        a = enc({"event_type": "a", "session_id": "s1"})
+        b = enc({"event_type": "b", "n": 2, "session_id": "s1"})
+        assert lane_of(a, 64) == lane_of(b, 64)
+        assert len({lane_of(enc({"session_id": f"s{i}"}), 8) for i in range(32)}) > 1
+        assert lane_of(encode_event_msgpack({"event_type": "a"}), 8) == 0
+
+
+class TestTransportWireFormat:
+    def _transport(self, **kwargs):
+        with patch.object(Transport, "_flush_loop"):
+            t = Transport(
+                endpoint="http://test:3000", batch_size=100, wire_format="msgpack", **kwargs,
+            )
+        t._client = MagicMock()
+        t._client.post.return_value = _ok()
+        return t
+
+    def test_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            Transport(endpoint="http://test:3000", wire_format="xml")
+
+    def test_posts_msgpack_batches(self):
+        t = self._transport()
+        events = [{"event_type": "llm_call", "session_id": "s1", "n": i} for i in range(3)]
+        t.send_events(events)
+        t.flush()
+        kwargs = t._client.post.call_args[1]
+        assert kwargs["headers"]["Content-Type"] == MSGPACK_CONTENT_TYPE
+        assert decode_batch(kwargs["content"]) == events
+
+    def test_compresses_msgpack_batches(self):
+        import gzip
+
+        t = self._transport(compression="gzip", compression_threshold=0)
+        t.send_event({"n": 1})
+        t.flush()
+        kwargs = t._client.post.call_args[1]
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert decode_batch(gzip.decompress(kwargs["content"])) == [{"n": 1}]
+
+    def test_spool_stores_json(self, tmp_path):
+        t = self._transport(spool=tmp_path)
+        t._client.post.side_effect = httpx.ConnectError("down")
+        t.send_event({"n": 1, "timestamp": "2026-01-02T03:04:05+00:00"})
+        t.flush()
+        assert t.spool.peek(10, 1 << 20) == [
+            encode_event({"n": 1, "timestamp": "2026-01-02T03:04:05+00:00"}),
+        ]
+
+        t._client.post.side_effect = None
+        t.flush()
+        kwargs = t._client.post.call_args[1]
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        assert json.loads(kwargs["content"])["events"][0]["n"] == 1
+        t.close()
+
+    def test_async_transport_spools_json(self, tmp_path):
+        import asyncio
+
+        from agentlens.transport_async import AsyncTransport
+
+        async def main():
+            t = AsyncTransport(
+                endpoint="http://test:3000", batch_size=100, wire_format="msgpack",
+                spool=tmp_path,
+            )
+            t.spool.append([encode_event({"n": 0})])
+            t._client = httpx.AsyncClient(
+                transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+            )
+            await t._asend_batch([encode_event_msgpack({"n": 1})])
+            pending = t.spool.peek(10, 1 << 20)
+            await t.aclose()
+            return pending
+
+        assert asyncio.run(main()) == [encode_event({"n": 0}), encode_event({"n": 1})]
+
+    def test_send_serialized_transcodes_json(self):
+        t = self._transport()
+        t.send_serialized([encode_event({"n": 1})])
+        assert list(t._buffer) == [encode_event_msgpack({"n": 1})]
+
+    def test_unix_socket_transport_stays_json(self, tmp_path):
+        with pytest.raises(ValueError):
+            UnixSocketTransport(str(tmp_path / "s.sock"), wire_format="msgpack")